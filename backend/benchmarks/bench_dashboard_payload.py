@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Payload size and serialization benchmark for /dashboard
+
+Compares FastAPI's default jsonable_encoder + json path with FastJSONResponse,
+and reports gzip/brotli sizes, for synthetic households of increasing size.
+
+    python benchmarks/bench_dashboard_payload.py [--sizes 50 500 5000]
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src', 'kitchen_tracker'))
+
+from fastapi.encoders import jsonable_encoder
+from models.family_member import FamilyMember
+from models.recurring_activity import RecurringActivity
+from models.activity_completion import ActivityCompletion, ActivityStatus
+from models.household_digest import dashboard_from_statuses
+from utils.compression import brotli, compress
+from utils.json_response import FastJSONResponse
+
+
+def build_dashboard(activity_count: int) -> dict:
+    """Build a dashboard payload for a synthetic household"""
+    random.seed(activity_count)
+    household_id = "bench-household"
+    members = [FamilyMember(f"Member {i}", "person", household_id) for i in range(max(2, activity_count // 10))]
+
+    statuses = []
+    for i in range(activity_count):
+        member = random.choice(members)
+        frequency = random.choice(['daily', 'weekly', 'monthly'])
+        activity = RecurringActivity(
+            name=f"Activity {i}",
+            assigned_to=member.member_id,
+            frequency=frequency,
+            household_id=household_id,
+            frequency_config={'day_of_week': random.randint(0, 6)} if frequency == 'weekly' else {},
+            category=random.choice(['medication', 'feeding', 'chore', 'health'])
+        )
+        completion = None
+        if random.random() < 0.8:
+            completion = ActivityCompletion(
+                activity_id=activity.activity_id,
+                member_id=member.member_id,
+                household_id=household_id,
+                completion_date=(date.today() - timedelta(days=random.randint(0, 40))).isoformat(),
+                notes="done" if random.random() < 0.2 else None
+            )
+        statuses.append(ActivityStatus(activity, completion, member.name).to_dict())
+
+    # Reuse the real categorization without touching storage
+    return dashboard_from_statuses(household_id, date.today().isoformat(), statuses)
+
+
+def default_render(content) -> bytes:
+    """What FastAPI does for a returned dict: jsonable_encoder, then JSONResponse.render"""
+    return json.dumps(
+        jsonable_encoder(content), ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def fast_render(content) -> bytes:
+    return FastJSONResponse(content).body
+
+
+def time_per_call(func, content, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func(content)
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[50, 500, 5000], help="activities per household")
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'activities':>10} {'default ms':>11} {'fast ms':>9} {'speedup':>8} "
+          f"{'raw KB':>8} {'gzip KB':>8} {'br KB':>8}")
+    for size in args.sizes:
+        dashboard = build_dashboard(size)
+        default_ms = time_per_call(default_render, dashboard, args.repeat)
+        fast_ms = time_per_call(fast_render, dashboard, args.repeat)
+
+        body = fast_render(dashboard)
+        gzip_size = len(compress(body, 'gzip'))
+        br_size = f"{len(compress(body, 'br')) / 1024:8.1f}" if brotli else f"{'n/a':>8}"
+        print(f"{size:>10} {default_ms:>11.2f} {fast_ms:>9.2f} {default_ms / fast_ms:>7.1f}x "
+              f"{len(body) / 1024:>8.1f} {gzip_size / 1024:>8.1f} {br_size}")
+
+
+if __name__ == '__main__':
+    main()
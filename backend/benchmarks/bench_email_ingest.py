@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Throughput benchmark for Home Chef email ingestion
+
+Writes a corpus of synthetic order emails (quoted-printable and base64 HTML
+parts, padded with the tracking pixels and footer markup real emails carry)
+to a temporary directory, then reports emails/s and MB/s for:
+
+  - the streaming parser (MimeStream + MealLinkParser) reading each file in chunks
+  - a baseline that loads the whole message with email.message_from_bytes and
+    runs a regex over the decoded document
+  - end-to-end ingestion (parse + batched meal upserts) on the memory engine
+
+    python benchmarks/bench_email_ingest.py [--emails 500] [--meals 6] [--padding-kb 60]
+"""
+
+import argparse
+import base64
+import email
+import os
+import quopri
+import random
+import re
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src', 'kitchen_tracker'))
+
+from dal.email_source import LocalEmailSource
+from dal.engines import create_engine, set_engine
+from services.email_ingest import EmailIngestor
+from services.meal_service import MealService
+from utils.homechef_email import parse_email_stream
+
+DISHES = ["Chicken", "Salmon", "Pork Chops", "Steak", "Shrimp", "Tofu", "Meatballs", "Tacos", "Gnocchi"]
+STYLES = ["Margherita", "Honey-Garlic", "Cajun", "Tuscan", "Sesame", "Chipotle", "Lemon-Herb", "Teriyaki"]
+MONTHS = [("January", 31), ("March", 31), ("May", 31), ("July", 31), ("September", 30), ("November", 30)]
+WEEKDAY_NAMES = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+BASELINE_PATTERN = re.compile(
+    r'<a[^>]*style="[^"]*color:\s*#4a4a4a[^"]*font-weight:\s*bold[^"]*"[^>]*>([^<]+)</a>', re.I
+)
+
+
+def synthetic_email(index: int, meals: int, padding_kb: int) -> bytes:
+    rng = random.Random(index)
+    month, days = rng.choice(MONTHS)
+    date_text = f"{rng.choice(WEEKDAY_NAMES)}, {month} {rng.randint(1, days)}"
+    links = ''.join(
+        f'<tr><td><a href="https://click.e.homechef.com/?qs={index}-{i}" '
+        f'style="color:#4a4a4a; font-weight:bold; text-decoration:none">'
+        f'{rng.choice(STYLES)} {rng.choice(DISHES)} {i}</a></td></tr>'
+        for i in range(meals)
+    )
+    padding = ''.join(
+        f'<img src="https://click.e.homechef.com/open.aspx?p={index}-{i}" width="1" height="1" alt="">'
+        for i in range(padding_kb * 1024 // 90)
+    )
+    html = (
+        f'<html><body><table><tr><td>Your order will arrive by end of the day on '
+        f'<strong>{date_text}</strong>.</td></tr>{links}'
+        f'<tr><td><a href="https://www.homechef.com/menu" style="color:#4a4a4a; font-weight:bold">Menu</a>'
+        f'</td></tr></table>{padding}</body></html>'
+    ).encode('utf-8')
+
+    if index % 2:
+        encoding, body = 'base64', base64.encodebytes(html)
+    else:
+        encoding, body = 'quoted-printable', quopri.encodestring(html)
+    return (
+        b'From: Home Chef <noreply@homechef.com>\r\n'
+        b'Subject: Your Home Chef order is on its way!\r\n'
+        b'MIME-Version: 1.0\r\n'
+        b'Content-Type: multipart/alternative; boundary="hc-boundary"\r\n\r\n'
+        b'--hc-boundary\r\n'
+        b'Content-Type: text/plain; charset="utf-8"\r\n\r\n'
+        b'Your order is on its way.\r\n'
+        b'--hc-boundary\r\n'
+        b'Content-Type: text/html; charset="utf-8"\r\n'
+        b'Content-Transfer-Encoding: ' + encoding.encode() + b'\r\n\r\n'
+        + body.replace(b'\n', b'\r\n') +
+        b'\r\n--hc-boundary--\r\n'
+    )
+
+
+def write_corpus(directory: str, emails: int, meals: int, padding_kb: int) -> int:
+    total = 0
+    os.makedirs(os.path.join(directory, 'inbound'), exist_ok=True)
+    for i in range(emails):
+        raw = synthetic_email(i, meals, padding_kb)
+        with open(os.path.join(directory, 'inbound', f'message-{i:06d}'), 'wb') as f:
+            f.write(raw)
+        total += len(raw)
+    return total
+
+
+def baseline_parse(raw: bytes) -> list:
+    message = email.message_from_bytes(raw)
+    for part in message.walk():
+        if part.get_content_type() == 'text/html':
+            html = part.get_payload(decode=True).decode(part.get_content_charset() or 'utf-8', 'replace')
+            return [name.strip() for name in BASELINE_PATTERN.findall(html) if name.strip() != 'Menu']
+    return []
+
+
+def timed(label: str, emails: int, total_bytes: int, work) -> None:
+    start = time.perf_counter()
+    work()
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<36} {emails / elapsed:>9,.0f} emails/s  {total_bytes / elapsed / 1e6:>8,.1f} MB/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--emails', type=int, default=500, help="emails in the corpus")
+    parser.add_argument('--meals', type=int, default=6, help="meals per email")
+    parser.add_argument('--padding-kb', type=int, default=60, help="extra markup per email")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        total_bytes = write_corpus(directory, args.emails, args.meals, args.padding_kb)
+        source = LocalEmailSource(directory)
+        keys = list(source.list_keys('inbound/'))
+        print(f"\n{len(keys)} emails, {total_bytes / 1e6:.1f} MB")
+
+        def streaming():
+            for key in keys:
+                assert len(parse_email_stream(source.open(key))) == args.meals
+
+        def baseline():
+            for key in keys:
+                assert len(baseline_parse(b''.join(source.open(key)))) == args.meals
+
+        set_engine(create_engine('memory'))
+        ingestor = EmailIngestor(source=source, meal_service=MealService())
+
+        def ingest():
+            for key in keys:
+                ingestor.ingest(key, "bench-household")
+
+        timed("streaming parser", len(keys), total_bytes, streaming)
+        timed("message_from_bytes + regex", len(keys), total_bytes, baseline)
+        timed("ingest (memory engine)", len(keys), total_bytes, ingest)
+        set_engine(None)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Memory and throughput benchmark for loading completions into model objects
+
+Loads N stored completion items (as DynamoDB returns them) through
+ActivityCompletion.from_dict, then runs the date-heavy access pattern
+ActivityStatus uses. A dict-backed copy of the previous model is included
+for comparison.
+
+    python benchmarks/bench_models.py [--count 100000]
+"""
+
+import argparse
+import gc
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+import uuid
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src', 'kitchen_tracker'))
+
+from models.activity_completion import ActivityCompletion
+
+
+class DictBackedCompletion:
+    """The pre-slots model: __dict__ instances, dates re-parsed on every access"""
+
+    def __init__(self, activity_id, member_id, household_id, completion_date=None, completed_at=None,
+                 completed_by=None, notes=None, completion_id=None):
+        self.completion_id = completion_id or str(uuid.uuid4())
+        self.activity_id = activity_id
+        self.member_id = member_id
+        self.household_id = household_id
+        self.completion_date = completion_date or date.today().isoformat()
+        self.completed_at = completed_at or datetime.utcnow().isoformat()
+        self.completed_by = completed_by or member_id
+        self.notes = notes
+
+    @property
+    def completion_date_obj(self) -> date:
+        return date.fromisoformat(self.completion_date)
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        return cls(
+            activity_id=data['activity_id'],
+            member_id=data['member_id'],
+            household_id=data['household_id'],
+            completion_date=data.get('completion_date'),
+            completed_at=data.get('completed_at'),
+            completed_by=data.get('completed_by'),
+            notes=data.get('notes'),
+            completion_id=data.get('completion_id')
+        )
+
+
+def build_items(count: int) -> list:
+    """Stored completion items spread over a year, serialized like a query response page"""
+    random.seed(count)
+    activity_ids = [str(uuid.uuid4()) for _ in range(200)]
+    member_ids = [str(uuid.uuid4()) for _ in range(6)]
+    start = date.today() - timedelta(days=365)
+    items = []
+    for _ in range(count):
+        completion = ActivityCompletion(
+            activity_id=random.choice(activity_ids),
+            member_id=random.choice(member_ids),
+            household_id="bench-household",
+            completion_date=(start + timedelta(days=random.randint(0, 365))).isoformat(),
+            notes="made substitutions" if random.random() < 0.1 else None
+        )
+        items.append(json.dumps(completion.to_dict()))
+    return items
+
+
+def measure(model_class, items: list) -> dict:
+    gc.collect()
+    tracemalloc.start()
+    # Each item decodes to fresh strings, as boto3 deserialization does
+    decoded = [json.loads(item) for item in items]
+    start = time.perf_counter()
+    loaded = [model_class.from_dict(item) for item in decoded]
+    load_seconds = time.perf_counter() - start
+
+    # Retained memory (objects plus the strings they keep alive) once the raw items are dropped
+    del decoded
+    gc.collect()
+    memory_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    # ActivityStatus.to_dict reads the completion date several times per render
+    start = time.perf_counter()
+    today = date.today()
+    for completion in loaded:
+        for _ in range(4):
+            (today - completion.completion_date_obj).days
+    access_seconds = time.perf_counter() - start
+
+    return {
+        'load_per_sec': len(items) / load_seconds,
+        'access_per_sec': len(items) / access_seconds,
+        'bytes_per_object': memory_bytes / len(items)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--count', type=int, default=100000)
+    args = parser.parse_args()
+
+    items = build_items(args.count)
+    print(f"{args.count} completions")
+    print(f"{'model':>22} {'from_dict/s':>12} {'status reads/s':>15} {'bytes/object':>13}")
+    for label, model_class in [('dict-backed (before)', DictBackedCompletion), ('slotted', ActivityCompletion)]:
+        result = measure(model_class, items)
+        print(f"{label:>22} {result['load_per_sec']:>12,.0f} {result['access_per_sec']:>15,.0f} "
+              f"{result['bytes_per_object']:>13,.0f}")
+
+
+if __name__ == '__main__':
+    main()
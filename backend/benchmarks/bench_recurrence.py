@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Evaluation cost of compiled recurrence rules as they get more complex
+
+For rules from plain daily up to every-other-week-on-three-days and
+nth-weekday-every-quarter, evaluates the status methods ActivityStatus
+derives (occurs_on, get_next_due_date, get_current_period_status) for each
+day of a span, and reports ns per evaluation. Compiling the rule again on
+every call is shown for comparison.
+
+    python benchmarks/bench_recurrence.py [--days 20000]
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src', 'kitchen_tracker'))
+
+from models.recurrence import Recurrence, _compile
+from models.recurring_activity import RecurringActivity
+
+RULES = [
+    ("daily", 'daily', {}),
+    ("weekly, one day", 'weekly', {'day_of_week': 2}),
+    ("monthly, day 31", 'monthly', {'day_of_month': 31}),
+    ("every 30 days", 'daily', {'interval': 30, 'start_date': "2020-01-01"}),
+    ("Mon/Wed/Fri", 'weekly', {'days_of_week': [0, 2, 4]}),
+    ("Mon/Wed/Fri, twice a day", 'weekly', {'days_of_week': [0, 2, 4], 'times_per_day': 2}),
+    ("every 2 weeks, Tue/Thu/Sat", 'weekly', {'interval': 2, 'days_of_week': [1, 3, 5],
+                                              'start_date': "2020-01-06"}),
+    ("2nd Tuesday, quarterly", 'monthly', {'interval': 3, 'nth_weekday': {'n': 2, 'weekday': 1},
+                                           'start_date': "2020-01-01"}),
+]
+
+
+def timed(days: list, evaluate) -> float:
+    start = time.perf_counter()
+    for day in days:
+        evaluate(day)
+    return (time.perf_counter() - start) / len(days) * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--days', type=int, default=20000, help="days evaluated per rule")
+    args = parser.parse_args()
+
+    first = date(2020, 1, 1)
+    days = [first + timedelta(days=n) for n in range(args.days)]
+    print(f"\n{'rule':<30} {'occurs_on':>10} {'next_due':>10} {'status':>10} {'recompiled':>11}   (ns/eval)")
+    for label, frequency, config in RULES:
+        activity = RecurringActivity(label, "m1", frequency, "h1", frequency_config=config)
+        recurrence = activity.recurrence
+        last = first - timedelta(days=3)
+
+        def recompiled(day):
+            _compile.cache_clear()
+            Recurrence.compile(frequency, config, activity.created_at[:10]).occurs_on(day)
+
+        print(f"{label:<30} "
+              f"{timed(days, recurrence.occurs_on):>10,.0f} "
+              f"{timed(days, activity.get_next_due_date):>10,.0f} "
+              f"{timed(days, lambda day: activity.get_current_period_status(last, day)):>10,.0f} "
+              f"{timed(days[:2000], recompiled):>11,.0f}")
+
+
+if __name__ == '__main__':
+    main()
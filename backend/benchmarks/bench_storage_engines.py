@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Throughput benchmark for the storage engines
+
+Runs the same repository workload - completion writes, point reads,
+HouseholdDateIndex range queries and complete-style transactions - on each
+engine and reports operations per second. The dynamodb run uses moto, so it
+measures the emulator plus boto3 serialization, not DynamoDB itself.
+
+    python benchmarks/bench_storage_engines.py [--count 5000] [--engines memory sqlite dynamodb]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src', 'kitchen_tracker'))
+
+from boto3.dynamodb.conditions import Key
+from dal.engines import create_engine, set_engine
+from dal.activity_completion_repository import ActivityCompletionRepository
+from dal.recurring_activity_repository import RecurringActivityRepository
+from models.activity_completion import ActivityCompletion
+from models.recurring_activity import RecurringActivity
+
+HOUSEHOLD_ID = "bench-household"
+
+
+def timed(label: str, count: int, work) -> None:
+    start = time.perf_counter()
+    work()
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<28} {count:>7} ops  {elapsed:7.2f}s  {count / elapsed:>10,.0f} ops/s")
+
+
+def run_workload(count: int) -> None:
+    random.seed(count)
+    activity_repo = RecurringActivityRepository()
+    completion_repo = ActivityCompletionRepository()
+
+    activities = [RecurringActivity(f"Activity {i}", f"member-{i % 5}", "daily", HOUSEHOLD_ID) for i in range(50)]
+    for activity in activities:
+        activity_repo.create(activity)
+
+    today = date.today()
+    completions = [
+        ActivityCompletion(random.choice(activities).activity_id, f"member-{i % 5}", HOUSEHOLD_ID,
+                           completion_date=(today - timedelta(days=random.randint(0, 365))).isoformat())
+        for i in range(count)
+    ]
+
+    def writes():
+        for completion in completions:
+            completion_repo.create(completion)
+
+    def reads():
+        for completion in completions:
+            completion_repo.get_by_id(completion.completion_id)
+
+    queries = max(1, count // 50)
+
+    def range_queries():
+        for _ in range(queries):
+            end = today - timedelta(days=random.randint(0, 330))
+            kwargs = {
+                'IndexName': 'HouseholdDateIndex',
+                'KeyConditionExpression': Key('household_id').eq(HOUSEHOLD_ID) &
+                Key('completion_date').between((end - timedelta(days=30)).isoformat(), end.isoformat())
+            }
+            while True:
+                response = completion_repo.table.query(**kwargs)
+                if 'LastEvaluatedKey' not in response:
+                    break
+                kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+    transactions = max(1, count // 5)
+
+    def complete_transactions():
+        for i in range(transactions):
+            activity = activities[i % len(activities)]
+            completion = ActivityCompletion(activity.activity_id, "member-0", HOUSEHOLD_ID)
+            completion_repo.transact_write([
+                completion_repo.create_op(completion),
+                activity_repo.last_completion_op(activity.activity_id, completion.to_dict())
+            ])
+
+    timed("put completion", count, writes)
+    timed("get completion by id", count, reads)
+    timed("30-day household range", queries, range_queries)
+    timed("complete transaction", transactions, complete_transactions)
+
+
+def bench_engine(name: str, count: int) -> None:
+    if name == 'dynamodb':
+        try:
+            from moto import mock_aws
+        except ImportError:
+            print("\ndynamodb: skipped (moto is not installed)")
+            return
+        sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'tests'))
+        from test_storage_engines import create_dynamodb_tables
+        os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+        os.environ.setdefault('AWS_ACCESS_KEY_ID', 'testing')
+        os.environ.setdefault('AWS_SECRET_ACCESS_KEY', 'testing')
+        print("\ndynamodb (moto emulation)")
+        with mock_aws():
+            create_dynamodb_tables()
+            set_engine(create_engine('dynamodb'))
+            run_workload(count)
+    elif name == 'sqlite':
+        with tempfile.TemporaryDirectory() as directory:
+            engine = create_engine('sqlite', path=os.path.join(directory, 'bench.db'))
+            set_engine(engine)
+            print("\nsqlite (WAL file)")
+            run_workload(count)
+            engine.close()
+    else:
+        set_engine(create_engine(name))
+        print(f"\n{name}")
+        run_workload(count)
+    set_engine(None)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--count', type=int, default=5000, help="completions written per engine")
+    parser.add_argument('--engines', nargs='+', default=['memory', 'sqlite', 'dynamodb'],
+                        choices=['memory', 'sqlite', 'dynamodb'])
+    args = parser.parse_args()
+
+    for name in args.engines:
+        bench_engine(name, args.count)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,7 +1,9 @@
-from fastapi import FastAPI, HTTPException, Query
+from fastapi import FastAPI, HTTPException, Query, Header, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
+from fastapi.concurrency import run_in_threadpool
 from typing import Optional, Dict, Any, List
-from datetime import date, datetime
+from datetime import date, datetime, timedelta
 import json
 import os
 import sys
@@ -19,6 +21,15 @@ try:
     from models.recurring_activity import RecurringActivity
     from models.activity_completion import ActivityCompletion
     from services.kitchen_service import KitchenService
+    from services.meal_service import MealService, calculate_week_of
+    from dal.base_repository import ConflictError
+    from services.email_ingest import EmailIngestor, email_keys
+    from services.event_broker import event_from_change, format_sse
+    from services.reminders import ReminderScheduler
+    from services.single_flight import SingleFlight
+    from utils.homechef_email import parse_homechef_email
+    from utils.json_response import FastJSONResponse
+    from utils.compression import CompressionMiddleware
     print("All imports successful!")
 except ImportError as e:
     print(f"Import error: {e}")
@@ -34,6 +45,22 @@ except ImportError as e:
         print("✓ ActivityCompletion imported")
         from services.kitchen_service import KitchenService
         print("✓ KitchenService imported")
+        from services.meal_service import MealService, calculate_week_of
+        print("✓ MealService imported")
+        from dal.base_repository import ConflictError
+        print("✓ ConflictError imported")
+        from services.email_ingest import EmailIngestor, email_keys
+        from utils.homechef_email import parse_homechef_email
+        print("✓ email ingestion imported")
+        from services.event_broker import event_from_change, format_sse
+        print("✓ event_broker imported")
+        from services.reminders import ReminderScheduler
+        print("✓ reminders imported")
+        from services.single_flight import SingleFlight
+        print("✓ single_flight imported")
+        from utils.json_response import FastJSONResponse
+        from utils.compression import CompressionMiddleware
+        print("✓ response utils imported")
         print("Individual imports successful!")
     except ImportError as e2:
         print(f"Individual imports also failed: {e2}")
@@ -45,7 +72,8 @@ from pydantic import BaseModel
 app = FastAPI(
     title="Kitchen Tracker API",
     version="1.0.0",
-    description="Family activity and task tracking system"
+    description="Family activity and task tracking system",
+    default_response_class=FastJSONResponse
 )
 
 print("FastAPI app created!")
@@ -68,8 +96,28 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize service
+# Compress large responses ourselves unless API Gateway already does it
+# (see MinimumCompressionSize in template.yaml)
+if not os.getenv('AWS_LAMBDA_FUNCTION_NAME'):
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=int(os.getenv('COMPRESSION_MIN_SIZE', '1024'))
+    )
+
+# Initialize services
 kitchen_service = KitchenService()
+meal_service = MealService()
+
+# Identical household reads that overlap (several screens refreshing at once) share one computation
+household_reads = SingleFlight()
+
+async def coalesced_read(household_id: str, route, func, *args, **kwargs):
+    """Run a household read once for every identical request in flight for the same household version"""
+    version = await run_in_threadpool(kitchen_service.household_version, household_id)
+    return await household_reads.run((household_id, route, version), func, *args, **kwargs)
+
+# Meals belong to the deployment's household (the email processor writes them there)
+MEAL_HOUSEHOLD_ID = os.getenv('HOUSEHOLD_ID', 'default')
 
 # Pydantic models for request/response
 class FamilyMemberCreate(BaseModel):
@@ -116,7 +164,7 @@ async def get_family_members(household_id: str = Query(default="default")):
     """Get all family members for a household"""
     try:
         members = kitchen_service.get_family_members(household_id)
-        return [member.to_dict() for member in members]
+        return FastJSONResponse([member.to_dict() for member in members])
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -127,13 +175,14 @@ async def create_family_member(
 ):
     """Create a new family member"""
     try:
-        new_member = kitchen_service.create_family_member(
-            name=member.name,
-            member_type=member.member_type,
-            household_id=household_id,
-            pet_type=member.pet_type
-        )
-        return new_member.to_dict()
+        with kitchen_service.unit_of_work():
+            new_member = kitchen_service.create_family_member(
+                name=member.name,
+                member_type=member.member_type,
+                household_id=household_id,
+                pet_type=member.pet_type
+            )
+            return FastJSONResponse(new_member.to_dict())
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -144,7 +193,7 @@ async def get_family_member(member_id: str):
         member = kitchen_service.get_family_member(member_id)
         if not member:
             raise HTTPException(status_code=404, detail="Family member not found")
-        return member.to_dict()
+        return FastJSONResponse(member.to_dict())
     except HTTPException:
         raise
     except Exception as e:
@@ -154,23 +203,24 @@ async def get_family_member(member_id: str):
 async def update_family_member(member_id: str, member_update: FamilyMemberUpdate):
     """Update a family member"""
     try:
-        # Get existing member
-        existing_member = kitchen_service.get_family_member(member_id)
-        if not existing_member:
-            raise HTTPException(status_code=404, detail="Family member not found")
+        with kitchen_service.unit_of_work():
+            # Get existing member
+            existing_member = kitchen_service.get_family_member(member_id)
+            if not existing_member:
+                raise HTTPException(status_code=404, detail="Family member not found")
         
-        # Update fields that were provided
-        if member_update.name is not None:
-            existing_member.name = member_update.name
-        if member_update.member_type is not None:
-            existing_member.member_type = member_update.member_type
-        if member_update.pet_type is not None:
-            existing_member.pet_type = member_update.pet_type
-        if member_update.is_active is not None:
-            existing_member.is_active = member_update.is_active
+            # Update fields that were provided
+            if member_update.name is not None:
+                existing_member.name = member_update.name
+            if member_update.member_type is not None:
+                existing_member.member_type = member_update.member_type
+            if member_update.pet_type is not None:
+                existing_member.pet_type = member_update.pet_type
+            if member_update.is_active is not None:
+                existing_member.is_active = member_update.is_active
         
-        updated_member = kitchen_service.update_family_member(existing_member)
-        return updated_member.to_dict()
+            updated_member = kitchen_service.update_family_member(existing_member)
+            return FastJSONResponse(updated_member.to_dict())
     except HTTPException:
         raise
     except Exception as e:
@@ -180,10 +230,11 @@ async def update_family_member(member_id: str, member_update: FamilyMemberUpdate
 async def delete_family_member(member_id: str):
     """Delete a family member"""
     try:
-        success = kitchen_service.delete_family_member(member_id)
-        if not success:
-            raise HTTPException(status_code=404, detail="Family member not found")
-        return {"message": "Family member deleted successfully"}
+        with kitchen_service.unit_of_work():
+            success = kitchen_service.delete_family_member(member_id)
+            if not success:
+                raise HTTPException(status_code=404, detail="Family member not found")
+            return {"message": "Family member deleted successfully"}
     except HTTPException:
         raise
     except Exception as e:
@@ -191,11 +242,32 @@ async def delete_family_member(member_id: str):
 
 # Activities endpoints
 @app.get("/activities")
-async def get_activities(household_id: str = Query(default="default")):
-    """Get all activities with status for a household"""
+async def get_activities(
+    household_id: str = Query(default="default"),
+    member: Optional[str] = Query(default=None, description="Only activities assigned to this member_id"),
+    category: Optional[str] = Query(default=None),
+    frequency: Optional[str] = Query(default=None),
+    status: Optional[str] = Query(default=None, description="completed, due, overdue or upcoming"),
+    sort: Optional[str] = Query(default=None, description="Comma-separated fields, '-' prefix for descending"),
+    fields: Optional[str] = Query(default=None, description="Comma-separated fields to return")
+):
+    """Get activities with status for a household"""
     try:
-        activities_with_status = kitchen_service.get_activities_with_status(household_id)
-        return activities_with_status
+        activities_with_status = await coalesced_read(
+            household_id,
+            ('/activities', member, category, frequency, status, sort, fields),
+            kitchen_service.get_activities_with_status,
+            household_id,
+            member_id=member,
+            category=category,
+            frequency=frequency,
+            status=status,
+            sort=sort,
+            fields=fields
+        )
+        return FastJSONResponse(activities_with_status)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -206,17 +278,20 @@ async def create_activity(
 ):
     """Create a new recurring activity"""
     try:
-        new_activity = kitchen_service.create_activity(
-            name=activity.name,
-            assigned_to=activity.assigned_to,
-            frequency=activity.frequency,
-            household_id=household_id,
-            frequency_config=activity.frequency_config,
-            category=activity.category
-        )
+        with kitchen_service.unit_of_work():
+            new_activity = kitchen_service.create_activity(
+                name=activity.name,
+                assigned_to=activity.assigned_to,
+                frequency=activity.frequency,
+                household_id=household_id,
+                frequency_config=activity.frequency_config,
+                category=activity.category
+            )
         
-        activity_status = kitchen_service.get_activity_status(new_activity.activity_id)
-        return activity_status.to_dict()
+            activity_status = kitchen_service.get_activity_status(new_activity.activity_id)
+            return FastJSONResponse(activity_status.to_dict())
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -227,7 +302,7 @@ async def get_activity(activity_id: str):
         activity_status = kitchen_service.get_activity_status(activity_id)
         if not activity_status:
             raise HTTPException(status_code=404, detail="Activity not found")
-        return activity_status.to_dict()
+        return FastJSONResponse(activity_status.to_dict())
     except HTTPException:
         raise
     except Exception as e:
@@ -237,28 +312,31 @@ async def get_activity(activity_id: str):
 async def update_activity(activity_id: str, activity_update: ActivityUpdate):
     """Update a recurring activity"""
     try:
-        existing_activity = kitchen_service.get_activity(activity_id)
-        if not existing_activity:
-            raise HTTPException(status_code=404, detail="Activity not found")
+        with kitchen_service.unit_of_work():
+            existing_activity = kitchen_service.get_activity(activity_id)
+            if not existing_activity:
+                raise HTTPException(status_code=404, detail="Activity not found")
         
-        if activity_update.name is not None:
-            existing_activity.name = activity_update.name
-        if activity_update.assigned_to is not None:
-            existing_activity.assigned_to = activity_update.assigned_to
-        if activity_update.frequency is not None:
-            existing_activity.frequency = activity_update.frequency
-        if activity_update.frequency_config is not None:
-            existing_activity.frequency_config = activity_update.frequency_config
-        if activity_update.category is not None:
-            existing_activity.category = activity_update.category
-        if activity_update.is_active is not None:
-            existing_activity.is_active = activity_update.is_active
+            if activity_update.name is not None:
+                existing_activity.name = activity_update.name
+            if activity_update.assigned_to is not None:
+                existing_activity.assigned_to = activity_update.assigned_to
+            if activity_update.frequency is not None:
+                existing_activity.frequency = activity_update.frequency
+            if activity_update.frequency_config is not None:
+                existing_activity.frequency_config = activity_update.frequency_config
+            if activity_update.category is not None:
+                existing_activity.category = activity_update.category
+            if activity_update.is_active is not None:
+                existing_activity.is_active = activity_update.is_active
         
-        updated_activity = kitchen_service.update_activity(existing_activity)
-        activity_status = kitchen_service.get_activity_status(updated_activity.activity_id)
-        return activity_status.to_dict()
+            updated_activity = kitchen_service.update_activity(existing_activity)
+            activity_status = kitchen_service.get_activity_status(updated_activity.activity_id)
+            return FastJSONResponse(activity_status.to_dict())
     except HTTPException:
         raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -266,10 +344,11 @@ async def update_activity(activity_id: str, activity_update: ActivityUpdate):
 async def delete_activity(activity_id: str):
     """Delete a recurring activity"""
     try:
-        success = kitchen_service.delete_activity(activity_id)
-        if not success:
-            raise HTTPException(status_code=404, detail="Activity not found")
-        return {"message": "Activity deleted successfully"}
+        with kitchen_service.unit_of_work():
+            success = kitchen_service.delete_activity(activity_id)
+            if not success:
+                raise HTTPException(status_code=404, detail="Activity not found")
+            return {"message": "Activity deleted successfully"}
     except HTTPException:
         raise
     except Exception as e:
@@ -279,20 +358,25 @@ async def delete_activity(activity_id: str):
 @app.post("/activities/{activity_id}/complete")
 async def complete_activity(activity_id: str, completion: ActivityCompletionRequest):
     """Mark an activity as completed"""
-    try:
+    def complete():
         activity = kitchen_service.get_activity(activity_id)
         if not activity:
             raise HTTPException(status_code=404, detail="Activity not found")
-        
-        completion_record = kitchen_service.complete_activity(
+        return kitchen_service.complete_activity(
             activity_id=activity_id,
             completed_by=completion.completed_by,
             completion_date=completion.completion_date,
             notes=completion.notes
         )
-        return completion_record.to_dict()
+    
+    try:
+        # Completions of the same activity racing each other are redone from a fresh read
+        completion_record = kitchen_service.retry_on_conflict(complete)
+        return FastJSONResponse(completion_record.to_dict())
     except HTTPException:
         raise
+    except ConflictError:
+        raise HTTPException(status_code=409, detail="Activity is being completed concurrently; try again")
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -300,13 +384,14 @@ async def complete_activity(activity_id: str, completion: ActivityCompletionRequ
 async def undo_activity_completion(activity_id: str, completion: ActivityCompletionRequest):
     """Undo an activity completion"""
     try:
-        success = kitchen_service.undo_activity_completion(
-            activity_id, 
-            completion.completion_date
-        )
-        if not success:
-            raise HTTPException(status_code=404, detail="No completion found to undo")
-        return {"message": "Activity completion undone successfully"}
+        with kitchen_service.unit_of_work():
+            success = kitchen_service.undo_activity_completion(
+                activity_id, 
+                completion.completion_date
+            )
+            if not success:
+                raise HTTPException(status_code=404, detail="No completion found to undo")
+            return {"message": "Activity completion undone successfully"}
     except HTTPException:
         raise
     except Exception as e:
@@ -316,17 +401,55 @@ async def undo_activity_completion(activity_id: str, completion: ActivityComplet
 @app.get("/family-members/{member_id}/activities")
 async def get_member_activities(
     member_id: str, 
-    household_id: str = Query(default="default")
+    household_id: str = Query(default="default")  # Kept for compatibility; the member's household is used
 ):
     """Get all activities for a specific family member"""
     try:
-        activities = kitchen_service.get_activities_for_member(member_id, household_id)
-        activities_with_status = []
-        for activity in activities:
-            status = kitchen_service.get_activity_status(activity.activity_id)
-            if status:
-                activities_with_status.append(status.to_dict())
-        return activities_with_status
+        activities_with_status = kitchen_service.get_member_activities_with_status(member_id)
+        if activities_with_status is None:
+            raise HTTPException(status_code=404, detail="Family member not found")
+        return FastJSONResponse(activities_with_status)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/family-members/{member_id}/stats")
+async def get_member_stats(member_id: str):
+    """Get a family member's completion streaks and on-time rate"""
+    try:
+        stats = kitchen_service.get_member_stats(member_id)
+        if stats is None:
+            raise HTTPException(status_code=404, detail="Family member not found")
+        return FastJSONResponse(stats)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/activities/{activity_id}/stats")
+async def get_activity_stats(activity_id: str):
+    """Get an activity's completion streaks and on-time rate"""
+    try:
+        stats = kitchen_service.get_activity_stats(activity_id)
+        if stats is None:
+            raise HTTPException(status_code=404, detail="Activity not found")
+        return FastJSONResponse(stats)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/activities/{activity_id}/history")
+async def get_activity_history(activity_id: str, year: Optional[int] = Query(default=None, ge=1970, le=9999)):
+    """Get a year of an activity's completed periods for a heatmap (default this year)"""
+    try:
+        history = kitchen_service.get_activity_history(activity_id, year)
+        if history is None:
+            raise HTTPException(status_code=404, detail="Activity not found")
+        return FastJSONResponse(history)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -335,8 +458,9 @@ async def get_member_activities(
 async def get_dashboard(household_id: str = Query(default="default")):
     """Get complete dashboard data"""
     try:
-        dashboard_data = kitchen_service.get_dashboard_data(household_id)
-        return dashboard_data
+        dashboard_data = await coalesced_read(household_id, '/dashboard',
+                                              kitchen_service.get_dashboard_data, household_id)
+        return FastJSONResponse(dashboard_data)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -345,7 +469,56 @@ async def get_summary(household_id: str = Query(default="default")):
     """Get household summary"""
     try:
         summary = kitchen_service.get_household_summary(household_id)
-        return summary
+        return FastJSONResponse(summary)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/metrics")
+async def get_metrics():
+    """Counters for this container's read paths"""
+    household_cache = kitchen_service.household_cache
+    return FastJSONResponse({
+        'single_flight': household_reads.stats(),
+        'household_cache': household_cache.cache_info() if household_cache is not None else None
+    })
+
+@app.get("/history")
+async def get_household_history(household_id: str = Query(default="default"),
+                                year: Optional[int] = Query(default=None, ge=1970, le=9999)):
+    """Get activities completed per day across the household for a year (default this year)"""
+    try:
+        history = kitchen_service.get_household_history(household_id, year)
+        return FastJSONResponse(history)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/completions")
+async def get_completion_counts(
+    household_id: str = Query(default="default"),
+    from_date: Optional[str] = Query(default=None, alias="from"),
+    to_date: Optional[str] = Query(default=None, alias="to"),
+    member: Optional[str] = Query(default=None),
+    activity: Optional[str] = Query(default=None),
+    group_by: str = Query(default="day")
+):
+    """Get completion counts for a date range grouped by day, week, month, member or category"""
+    try:
+        counts = kitchen_service.get_completion_counts(
+            household_id, from_date, to_date, member_id=member, activity_id=activity, group_by=group_by)
+        return FastJSONResponse(counts)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/schedule")
+async def get_schedule(household_id: str = Query(default="default"), days: int = Query(default=14, ge=1, le=90)):
+    """Get every activity occurrence due over the next `days` days"""
+    try:
+        schedule = kitchen_service.get_schedule(household_id, days)
+        return FastJSONResponse(schedule)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -354,7 +527,7 @@ async def get_activities_due_today(household_id: str = Query(default="default"))
     """Get activities due today"""
     try:
         due_today = kitchen_service.get_activities_due_today(household_id)
-        return due_today
+        return FastJSONResponse(due_today)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -363,7 +536,7 @@ async def get_overdue_activities(household_id: str = Query(default="default")):
     """Get overdue activities"""
     try:
         overdue = kitchen_service.get_overdue_activities(household_id)
-        return overdue
+        return FastJSONResponse(overdue)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -372,10 +545,181 @@ async def get_completed_activities_today(household_id: str = Query(default="defa
     """Get activities completed today"""
     try:
         completed_today = kitchen_service.get_completed_activities_today(household_id)
-        return completed_today
+        return FastJSONResponse(completed_today)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
     
+# Incremental sync endpoint
+@app.get("/changes")
+async def get_changes(
+    household_id: str = Query(default="default"),
+    since: Optional[str] = Query(default=None),
+    limit: int = Query(default=500, ge=1, le=1000)
+):
+    """Get members, activities and completions changed since a sync token"""
+    try:
+        return FastJSONResponse(kitchen_service.get_changes(household_id, since, limit))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+# Live update stream
+EVENT_HEARTBEAT_SECONDS = 15
+
+async def replay_changes(change_log_repo, household_id: str, since: str, page_size: int = 500):
+    """Every change after `since`, page by page, without blocking the event loop"""
+    while True:
+        changes, has_more = await run_in_threadpool(change_log_repo.get_changes_since, household_id, since, page_size)
+        for change in changes:
+            yield change
+        if not has_more or not changes:
+            break
+        since = changes[-1].change_key
+
+@app.get("/events")
+async def stream_events(
+    household_id: str = Query(default="default"),
+    last_event_id: Optional[str] = Header(default=None)
+):
+    """Stream household changes as Server-Sent Events
+
+    Local-only: it needs a host that streams responses, such as uvicorn. The
+    deployed API (API Gateway REST through Mangum) buffers whole bodies, so
+    template.yaml has no route for it; deployed clients poll /changes instead.
+    """
+    # Subscribe before replaying so nothing committed in between is lost
+    subscription = kitchen_service.event_broker.subscribe(household_id)
+
+    async def event_stream():
+        last_sent = last_event_id
+        try:
+            # Reconnecting EventSource clients resume from the change log
+            if last_event_id:
+                async for change in replay_changes(kitchen_service.change_log_repo, household_id, last_event_id):
+                    last_sent = change.change_key
+                    yield format_sse(event_from_change(change))
+            
+            while True:
+                event = await subscription.get(timeout=EVENT_HEARTBEAT_SECONDS)
+                if event is None:
+                    yield ": keep-alive\n\n"
+                elif not last_sent or event['id'] > last_sent:
+                    # Skip events the replay above already delivered
+                    last_sent = event['id']
+                    yield format_sse(event)
+        finally:
+            subscription.close()
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+# Meal endpoints
+# These return {"error": ...} bodies, which the meal clients and tests expect
+def meal_error(status_code: int, message: str) -> FastJSONResponse:
+    return FastJSONResponse({"error": message}, status_code=status_code)
+
+async def read_json_body(request: Request) -> Dict[str, Any]:
+    """Parse a JSON object body, raising ValueError with a client-facing message"""
+    try:
+        body = json.loads(await request.body())
+    except ValueError:
+        raise ValueError("Invalid JSON in request body")
+    if not isinstance(body, dict):
+        raise ValueError("Invalid JSON in request body: expected an object")
+    return body
+
+@app.get("/meals")
+async def get_meals(
+    household_id: str = Query(default=MEAL_HOUSEHOLD_ID),
+    week_of: Optional[str] = Query(default=None, description="Monday of the delivery week (YYYY-MM-DD)")
+):
+    """Get meals, optionally for one delivery week"""
+    try:
+        meals = meal_service.get_meals(household_id, week_of)
+        return FastJSONResponse([meal.to_dict() for meal in meals])
+    except Exception as e:
+        return meal_error(500, str(e))
+
+@app.post("/meals/setup")
+async def setup_meal(request: Request, household_id: str = Query(default=MEAL_HOUSEHOLD_ID)):
+    """Add a delivered meal (from a Home Chef email or by hand)"""
+    try:
+        body = await read_json_body(request)
+        if not body.get('name'):
+            return meal_error(400, "Missing required field: name")
+        meal = meal_service.setup_meal(
+            household_id=household_id,
+            name=body['name'],
+            delivery_date=body.get('delivery_date'),
+            recipe_url=body.get('recipe_link') or body.get('recipe_url'),
+            source=body.get('source')
+        )
+        return FastJSONResponse(meal.to_dict(), status_code=201)
+    except ValueError as e:
+        return meal_error(400, str(e))
+    except Exception as e:
+        return meal_error(500, str(e))
+
+@app.post("/meals/cook")
+async def cook_meal(request: Request, household_id: str = Query(default=MEAL_HOUSEHOLD_ID)):
+    """Record that a meal was cooked"""
+    try:
+        body = await read_json_body(request)
+        if not body.get('meal_id'):
+            return meal_error(400, "Missing required field: meal_id")
+        record = meal_service.cook_meal(
+            household_id=household_id,
+            meal_id=body['meal_id'],
+            cooked_by=body.get('cooked_by'),
+            notes=body.get('notes')
+        )
+        return FastJSONResponse(record.to_dict(), status_code=201)
+    except ValueError as e:
+        return meal_error(400, str(e))
+    except Exception as e:
+        return meal_error(500, str(e))
+
+@app.get("/meals/records")
+async def get_meal_records(
+    household_id: str = Query(default=MEAL_HOUSEHOLD_ID),
+    meal_id: Optional[str] = Query(default=None)
+):
+    """Get cook records, optionally for one meal"""
+    try:
+        records = meal_service.get_meal_records(household_id, meal_id)
+        return FastJSONResponse([record.to_dict() for record in records])
+    except Exception as e:
+        return meal_error(500, str(e))
+
+@app.get("/meals/{meal_id}")
+async def get_meal(meal_id: str, household_id: str = Query(default=MEAL_HOUSEHOLD_ID)):
+    """Get a specific meal"""
+    try:
+        meal = meal_service.get_meal(household_id, meal_id)
+        if not meal:
+            return meal_error(404, f"Meal {meal_id} not found")
+        return FastJSONResponse(meal.to_dict())
+    except Exception as e:
+        return meal_error(500, str(e))
+
+@app.put("/meals/{meal_id}/status")
+async def update_meal_status(meal_id: str, request: Request, household_id: str = Query(default=MEAL_HOUSEHOLD_ID)):
+    """Set a meal's status (ordered, delivered or cooked)"""
+    try:
+        body = await read_json_body(request)
+        if not body.get('status'):
+            return meal_error(400, "Missing required field: status")
+        meal = meal_service.update_meal_status(household_id, meal_id, body['status'])
+        if not meal:
+            return meal_error(404, f"Meal {meal_id} not found")
+        return FastJSONResponse(meal.to_dict())
+    except ValueError as e:
+        return meal_error(400, str(e))
+    except Exception as e:
+        return meal_error(500, str(e))
+
 # Lambda handler for AWS
 def lambda_handler(event, context):
     """AWS Lambda handler"""
@@ -396,4 +740,71 @@ def lambda_handler(event, context):
             "statusCode": 500, 
             "headers": {"Content-Type": "application/json"},
             "body": json.dumps({"error": f"Handler error: {str(e)}"})
-        }
\ No newline at end of file
+        }
+
+# Email processing (SES stores Home Chef emails in S3, then invokes this)
+_email_ingestors = {}
+
+def _email_ingestor(bucket: Optional[str]) -> "EmailIngestor":
+    """One ingestor per bucket, reused across warm invocations"""
+    if bucket not in _email_ingestors:
+        source = None
+        if bucket:
+            from dal.email_source import S3EmailSource
+            source = S3EmailSource(bucket)
+        _email_ingestors[bucket] = EmailIngestor(source=source, meal_service=meal_service)
+    return _email_ingestors[bucket]
+
+def email_lambda_handler(event, context):
+    """AWS Lambda handler for SES receipt / S3 object-created events"""
+    print(f"Received email event: {event}")  # Debug logging
+    household_id = os.getenv('HOUSEHOLD_ID', 'default')
+    results = []
+    for bucket, key in email_keys(event):
+        try:
+            result = _email_ingestor(bucket).ingest(key, household_id)
+            if result['duplicate']:
+                print(f"Skipped {key}: duplicate of an ingested email ({result['content_hash'][:12]})")
+            else:
+                print(f"Processed {key}: {result['meals_found']} meals found, {result['meals_created']} new")
+            results.append(result)
+        except Exception as e:
+            print(f"Error processing email {key}: {e}")
+            import traceback
+            traceback.print_exc()
+            return {
+                "statusCode": 500,
+                "body": json.dumps({"error": f"Error processing email {key}: {str(e)}"})
+            }
+    dedupe = EmailIngestor.dedupe_info()
+    print(f"Email dedupe counters: {dedupe}")
+    return {"statusCode": 200, "body": json.dumps({"processed": results, "dedupe": dedupe})}
+
+# Reminders (EventBridge schedule invokes this every REMINDER_WINDOW_MINUTES)
+def reminder_lambda_handler(event, context):
+    """AWS Lambda handler that sends the reminders falling due before the next scheduled run"""
+    from utils.timezone_utils import get_local_datetime
+    
+    window = timedelta(minutes=int(os.getenv('REMINDER_WINDOW_MINUTES', '15')))
+    result = ReminderScheduler().run(get_local_datetime(), window)
+    print(f"Reminders: {result}")
+    return {"statusCode": 200, "body": json.dumps(result)}
+
+# Daily digests (scheduled just after the household's midnight)
+def digest_lambda_handler(event, context):
+    """AWS Lambda handler that precomputes today's dashboard digest for every household"""
+    from jobs.build_household_digests import main
+    
+    main([])
+    return {"statusCode": 200, "body": json.dumps({"built": True})}
+
+# Dashboard projection (DynamoDB Streams on the ChangeLog table invokes this)
+def projector_lambda_handler(event, context):
+    """AWS Lambda handler that applies committed change-log entries to the materialized dashboards"""
+    from services.change_stream import entries_from_stream_event
+    
+    entries = entries_from_stream_event(event)
+    # Errors propagate so the batch is retried
+    kitchen_service.change_stream.deliver(entries)
+    print(f"Projected {len(entries)} changes")
+    return {"statusCode": 200, "body": json.dumps({"projected": len(entries)})}
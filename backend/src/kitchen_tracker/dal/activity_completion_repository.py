@@ -1,6 +1,7 @@
-from typing import List, Optional
+from typing import Dict, Iterator, List, Optional
 from datetime import date, datetime, timedelta
 import boto3
+from boto3.dynamodb.conditions import Key, Attr
 
 # Import with fallback for Lambda environment
 try:
@@ -37,6 +38,22 @@ class ActivityCompletionRepository(BaseRepository):
                 raise ValueError(f"Completion with ID {completion.completion_id} already exists")
             raise e
     
+    def create_op(self, completion: ActivityCompletion) -> dict:
+        """Transaction item that creates a completion record"""
+        return {'Put': {
+            'TableName': self.table_name,
+            'Item': completion.to_dict(),
+            'ConditionExpression': 'attribute_not_exists(completion_id)'
+        }}
+    
+    def delete_op(self, completion_id: str) -> dict:
+        """Transaction item that hard deletes a completion record"""
+        return {'Delete': {
+            'TableName': self.table_name,
+            'Key': {'completion_id': completion_id},
+            'ConditionExpression': 'attribute_exists(completion_id)'
+        }}
+    
     def get_by_id(self, completion_id: str) -> Optional[ActivityCompletion]:
         """Get a completion record by ID"""
         try:
@@ -71,6 +88,65 @@ class ActivityCompletionRepository(BaseRepository):
             print(f"Error getting completions for activity {activity_id}: {e}")
             return []
     
+    def iter_by_activity_id(self, activity_id: str) -> Iterator[ActivityCompletion]:
+        """Every completion of an activity, oldest first, following pagination"""
+        query_kwargs = {
+            'IndexName': 'ActivityIndex',
+            'KeyConditionExpression': Key('activity_id').eq(activity_id)
+        }
+        while True:
+            response = self.table.query(**query_kwargs)
+            for item in response.get('Items', []):
+                yield ActivityCompletion.from_dict(item)
+            if 'LastEvaluatedKey' not in response:
+                return
+            query_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+    
+    def iter_by_household_range(self, household_id: str, start_date: str = None, end_date: str = None,
+                                member_id: str = None, activity_id: str = None) -> Iterator[ActivityCompletion]:
+        """A household's completions between two dates (inclusive, either open), oldest first"""
+        for item in self.iter_household_range_items(household_id, start_date, end_date, member_id, activity_id):
+            yield ActivityCompletion.from_dict(item)
+    
+    def iter_household_range_items(self, household_id: str, start_date: str = None, end_date: str = None,
+                                   member_id: str = None, activity_id: str = None,
+                                   attributes: List[str] = None) -> Iterator[Dict]:
+        """Raw completion items between two dates (inclusive, either open), oldest first
+
+        A HouseholdDateIndex range query followed page by page; member and
+        activity are filtered server-side, and `attributes` trims each item
+        to the ones a caller aggregates over.
+        """
+        key_condition = Key('household_id').eq(household_id)
+        if start_date and end_date:
+            key_condition = key_condition & Key('completion_date').between(start_date, end_date)
+        elif start_date:
+            key_condition = key_condition & Key('completion_date').gte(start_date)
+        elif end_date:
+            key_condition = key_condition & Key('completion_date').lte(end_date)
+        
+        query_kwargs = {'IndexName': 'HouseholdDateIndex', 'KeyConditionExpression': key_condition}
+        filters = []
+        if member_id:
+            filters.append(Attr('member_id').eq(member_id))
+        if activity_id:
+            filters.append(Attr('activity_id').eq(activity_id))
+        if filters:
+            filter_expression = filters[0]
+            for condition in filters[1:]:
+                filter_expression = filter_expression & condition
+            query_kwargs['FilterExpression'] = filter_expression
+        if attributes:
+            query_kwargs['ProjectionExpression'] = ', '.join(f"#p{i}" for i in range(len(attributes)))
+            query_kwargs['ExpressionAttributeNames'] = {f"#p{i}": name for i, name in enumerate(attributes)}
+        
+        while True:
+            response = self.table.query(**query_kwargs)
+            yield from response.get('Items', [])
+            if 'LastEvaluatedKey' not in response:
+                return
+            query_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+    
     def get_by_member_id(self, member_id: str, household_id: str, limit: int = 50) -> List[ActivityCompletion]:
         """Get completion records for a specific family member"""
         try:
@@ -96,24 +172,11 @@ class ActivityCompletionRepository(BaseRepository):
             return []
     
     def get_by_household_id(self, household_id: str, days_back: int = 30) -> List[ActivityCompletion]:
-        """Get completion records for a household within a date range"""
+        """Get completion records for a household within a date range, most recent first"""
         try:
             start_date = (date.today() - timedelta(days=days_back)).isoformat()
-            
-            response = self.table.scan(
-                FilterExpression='household_id = :household_id AND completion_date >= :start_date',
-                ExpressionAttributeValues={
-                    ':household_id': household_id,
-                    ':start_date': start_date
-                }
-            )
-            
-            completions = []
-            for item in response.get('Items', []):
-                completions.append(ActivityCompletion.from_dict(item))
-            
-            # Sort by completion date descending (most recent first)
-            completions.sort(key=lambda c: c.completion_date, reverse=True)
+            completions = list(self.iter_by_household_range(household_id, start_date))
+            completions.reverse()
             return completions
             
         except ClientError as e:
@@ -1,13 +1,25 @@
-import boto3
 import os
 from typing import Dict, List, Optional, Any
 from boto3.dynamodb.conditions import Key
+from botocore.exceptions import ClientError
+
+# Import with fallback for Lambda environment
+try:
+    from .engines import get_engine
+except ImportError:
+    # Lambda environment - use absolute imports
+    from dal.engines import get_engine
+
+class ConflictError(ValueError):
+    """A transaction lost a conditional write to a concurrent one; retrying from fresh reads can succeed"""
+
 
 class BaseRepository:
     def __init__(self, table_name: str):
-        self.dynamodb = boto3.resource('dynamodb')
+        # DynamoDB unless STORAGE_ENGINE picks the in-memory or SQLite engine
+        self.engine = get_engine()
         self.table_name = table_name
-        self.table = self.dynamodb.Table(self.table_name)
+        self.table = self.engine.table(self.table_name)
     
     def put_item(self, item: Dict[str, Any]) -> bool:
         """Create or update an item"""
@@ -43,6 +55,51 @@ class BaseRepository:
             print(f"Error querying items: {e}")
             return []
     
+    def transact_write(self, transact_items: List[Dict[str, Any]]) -> None:
+        """Apply Put/Update/Delete/ConditionCheck items atomically, possibly across tables"""
+        try:
+            self.engine.transact_write_items(transact_items)
+        except ClientError as e:
+            if e.response['Error']['Code'] != 'TransactionCanceledException':
+                raise e
+            # Surface a failed condition the same way the single-item writes do
+            reasons = e.response.get('CancellationReasons', [])
+            for item, reason in zip(transact_items, reasons):
+                if reason.get('Code') == 'ConditionalCheckFailed':
+                    op = next(iter(item.values()))
+                    key = op.get('Key') or op.get('Item')
+                    raise ConflictError(f"Conditional check failed in {op['TableName']} for {key}")
+            raise e
+    
+    @staticmethod
+    def stats_update(before, after, conditional: bool = True) -> tuple:
+        """(SET clause, ADD clause, values, condition) moving CompletionStats counters from before to after
+
+        Counts are applied with ADD and the streak fields with SET. The
+        condition pins the total the change was computed from, so two writers
+        working from the same read cannot both apply. Without conditional the
+        condition is None: the ADDs commute, so concurrent updates all land,
+        and the streak fields are last-writer-wins until the next rebuild.
+        """
+        values = {
+            ':stats_total': after.total_completions - (before.total_completions if before else 0),
+            ':stats_on_time': after.on_time_completions - (before.on_time_completions if before else 0),
+            ':stats_current': after.current_streak,
+            ':stats_longest': after.longest_streak,
+            ':stats_period': after.streak_period
+        }
+        if not conditional:
+            condition = None
+        elif before is None:
+            condition = 'attribute_not_exists(total_completions)'
+        else:
+            condition = 'total_completions = :stats_expected'
+            values[':stats_expected'] = before.total_completions
+        set_clause = ('current_streak = :stats_current, longest_streak = :stats_longest, '
+                      'streak_period = :stats_period')
+        add_clause = 'total_completions :stats_total, on_time_completions :stats_on_time'
+        return set_clause, add_clause, values, condition
+    
     def delete_item(self, user_id: str, item_id: str) -> bool:
         """Delete an item"""
         try:
@@ -0,0 +1,129 @@
+from typing import List, Optional, Tuple
+from datetime import datetime, timedelta
+from boto3.dynamodb.conditions import Key
+
+# Import with fallback for Lambda environment
+try:
+    from ..models.change_entry import ChangeEntry
+    from ..models.recurring_activity import convert_decimals
+except ImportError:
+    # Lambda environment - use absolute imports
+    from models.change_entry import ChangeEntry
+    from models.recurring_activity import convert_decimals
+try:
+    from .base_repository import BaseRepository
+except ImportError:
+    # Lambda environment - use absolute imports
+    from dal.base_repository import BaseRepository
+from botocore.exceptions import ClientError
+
+
+class ChangeLogRepository(BaseRepository):
+    """Per-household change log keyed by household_id + change_key"""
+
+    # Entries expire through the table's TTL; older tokens force a full refresh
+    RETENTION_DAYS = 7
+    # An entry is keyed on its writer's clock when built, before a unit of work commits it,
+    # so it can land a little below a token a client already holds; sync re-reads this far back
+    SYNC_OVERLAP_SECONDS = 5
+    OVERLAP_LIMIT = 1000
+
+    def __init__(self):
+        import os
+        table_name = os.getenv('CHANGE_LOG_TABLE', 'ChangeLog')
+        super().__init__(table_name)
+
+    def put_op(self, entry: ChangeEntry) -> dict:
+        """Transaction item that appends a change entry"""
+        item = entry.to_dict()
+        expires = datetime.utcnow() + timedelta(days=self.RETENTION_DAYS)
+        item['expires_at'] = int(expires.timestamp())
+        return {'Put': {
+            'TableName': self.table_name,
+            'Item': item
+        }}
+
+    def get_changes_since(self, household_id: str, since: str = None, limit: int = 500,
+                          overlap: float = 0) -> Tuple[List[ChangeEntry], bool]:
+        """Get changes after the `since` token in commit order; returns (entries, has_more)
+
+        With overlap, changes up to that many seconds behind `since` are
+        returned first, again: callers dedupe them by change_id. They do not
+        count towards limit, so paging still moves forward.
+        """
+        key_condition = Key('household_id').eq(household_id)
+        if not since:
+            return self._query_changes(household_id, key_condition, limit)
+
+        entries = []
+        if overlap:
+            entries, _ = self._query_changes(
+                household_id, key_condition & Key('change_key').between(self._overlap_start(since, overlap), since),
+                self.OVERLAP_LIMIT)
+        changes, has_more = self._query_changes(household_id, key_condition & Key('change_key').gt(since), limit)
+        return entries + changes, has_more
+
+    @staticmethod
+    def _overlap_start(since: str, overlap: float) -> str:
+        """Lowest key a change committed up to `overlap` seconds before the token can have"""
+        try:
+            changed_at = datetime.fromisoformat(since.split('_', 1)[0])
+        except ValueError:
+            return since
+        return (changed_at - timedelta(seconds=overlap)).isoformat(timespec='microseconds')
+
+    def _query_changes(self, household_id: str, key_condition,
+                       limit: int) -> Tuple[List[ChangeEntry], bool]:
+        entries = []
+        query_kwargs = {
+            'KeyConditionExpression': key_condition,
+            'ScanIndexForward': True
+        }
+        try:
+            while True:
+                query_kwargs['Limit'] = limit - len(entries) + 1
+                response = self.table.query(**query_kwargs)
+                for item in response.get('Items', []):
+                    entries.append(ChangeEntry.from_dict(convert_decimals(item)))
+
+                if len(entries) > limit or 'LastEvaluatedKey' not in response:
+                    break
+                query_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+        except ClientError as e:
+            print(f"Error getting changes for household {household_id}: {e}")
+            return [], False
+
+        # One extra item was requested to know whether another page exists
+        has_more = len(entries) > limit
+        return entries[:limit], has_more
+
+    def get_latest_token(self, household_id: str) -> Optional[str]:
+        """Get the change_key of the newest entry for a household"""
+        try:
+            response = self.table.query(
+                KeyConditionExpression=Key('household_id').eq(household_id),
+                ScanIndexForward=False,
+                Limit=1,
+                ProjectionExpression='change_key'
+            )
+            items = response.get('Items', [])
+            return items[0]['change_key'] if items else None
+        except ClientError as e:
+            print(f"Error getting latest change for household {household_id}: {e}")
+            return None
+
+    @staticmethod
+    def token_age(token: str) -> float:
+        """Seconds since the change a token names was committed"""
+        changed_at = datetime.fromisoformat(token.split('_', 1)[0])
+        return (datetime.utcnow() - changed_at).total_seconds()
+
+    @classmethod
+    def is_token_expired(cls, since: str) -> bool:
+        """Check if a token is older than the retention window"""
+        changed_at = since.split('_', 1)[0]
+        try:
+            token_time = datetime.fromisoformat(changed_at)
+        except ValueError:
+            return True
+        return token_time < datetime.utcnow() - timedelta(days=cls.RETENTION_DAYS)
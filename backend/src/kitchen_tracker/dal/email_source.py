@@ -0,0 +1,81 @@
+import os
+from typing import Iterator
+
+import boto3
+
+# Raw emails are read in pieces this size
+CHUNK_SIZE = 64 * 1024
+
+
+class EmailSource:
+    """Where SES-delivered raw emails are kept: list keys, stream one email's bytes
+
+    Keys are listed in ascending order, optionally starting after a given
+    key, so a long run can resume from the last key it finished.
+    """
+
+    def list_keys(self, prefix: str = '', start_after: str = None) -> Iterator[str]:
+        raise NotImplementedError
+
+    def open(self, key: str) -> Iterator[bytes]:
+        raise NotImplementedError
+
+
+class S3EmailSource(EmailSource):
+    """The EmailStorageBucket SES writes to"""
+
+    def __init__(self, bucket: str, client=None):
+        self.bucket = bucket
+        self.client = client or boto3.client('s3')
+
+    def list_keys(self, prefix: str = '', start_after: str = None) -> Iterator[str]:
+        paginator = self.client.get_paginator('list_objects_v2')
+        kwargs = {'Bucket': self.bucket, 'Prefix': prefix}
+        if start_after:
+            kwargs['StartAfter'] = start_after
+        for page in paginator.paginate(**kwargs):
+            for obj in page.get('Contents', []):
+                yield obj['Key']
+
+    def open(self, key: str) -> Iterator[bytes]:
+        body = self.client.get_object(Bucket=self.bucket, Key=key)['Body']
+        try:
+            yield from body.iter_chunks(CHUNK_SIZE)
+        finally:
+            body.close()
+
+
+class LocalEmailSource(EmailSource):
+    """A directory of raw .eml files standing in for the bucket (local runs, tests, benchmarks)"""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    def list_keys(self, prefix: str = '', start_after: str = None) -> Iterator[str]:
+        keys = []
+        for root, dirs, files in os.walk(self.directory):
+            for name in files:
+                key = os.path.relpath(os.path.join(root, name), self.directory).replace(os.sep, '/')
+                if key.startswith(prefix) and (start_after is None or key > start_after):
+                    keys.append(key)
+        # Same order as S3 lists keys
+        yield from sorted(keys)
+
+    def open(self, key: str) -> Iterator[bytes]:
+        with open(os.path.join(self.directory, *key.split('/')), 'rb') as f:
+            while True:
+                chunk = f.read(CHUNK_SIZE)
+                if not chunk:
+                    return
+                yield chunk
+
+
+def create_email_source(bucket: str = None) -> EmailSource:
+    """EMAIL_SOURCE_DIR selects a local directory; otherwise the S3 bucket (EMAIL_BUCKET)"""
+    directory = os.getenv('EMAIL_SOURCE_DIR')
+    if directory:
+        return LocalEmailSource(directory)
+    bucket = bucket or os.getenv('EMAIL_BUCKET')
+    if not bucket:
+        raise ValueError("Set EMAIL_BUCKET (or EMAIL_SOURCE_DIR for a local directory)")
+    return S3EmailSource(bucket)
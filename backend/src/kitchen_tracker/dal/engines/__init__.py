@@ -0,0 +1,62 @@
+"""
+Storage engines behind the repositories
+
+STORAGE_ENGINE selects one per process:
+
+    dynamodb  boto3 DynamoDB (default; what Lambda uses)
+    memory    indexed in-process tables, for tests and benchmarks
+    sqlite    one SQLite file (SQLITE_PATH), for single-box self-hosting
+"""
+
+import os
+import threading
+
+# Import with fallback for Lambda environment
+try:
+    from .base import StorageEngine
+except ImportError:
+    # Lambda environment - use absolute imports
+    from dal.engines.base import StorageEngine
+
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def create_engine(name: str = None, **options) -> StorageEngine:
+    """Build an engine by name; options go to its constructor"""
+    name = (name or os.getenv('STORAGE_ENGINE', 'dynamodb')).lower()
+    if name == 'dynamodb':
+        try:
+            from .dynamodb import DynamoDBEngine
+        except ImportError:
+            from dal.engines.dynamodb import DynamoDBEngine
+        return DynamoDBEngine(**options)
+    if name == 'memory':
+        try:
+            from .memory import MemoryEngine
+        except ImportError:
+            from dal.engines.memory import MemoryEngine
+        return MemoryEngine(**options)
+    if name == 'sqlite':
+        try:
+            from .sqlite import SQLiteEngine
+        except ImportError:
+            from dal.engines.sqlite import SQLiteEngine
+        return SQLiteEngine(**options)
+    raise ValueError(f"Unknown STORAGE_ENGINE '{name}'; use dynamodb, memory or sqlite")
+
+
+def get_engine() -> StorageEngine:
+    """The process-wide engine, shared by every repository"""
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            _engine = create_engine()
+        return _engine
+
+
+def set_engine(engine: StorageEngine = None) -> None:
+    """Replace the process-wide engine (None re-reads STORAGE_ENGINE on next use)"""
+    global _engine
+    with _engine_lock:
+        _engine = engine
@@ -0,0 +1,331 @@
+import threading
+from contextlib import contextmanager
+from decimal import Decimal
+from typing import Any, Dict, Iterator, List, Optional
+
+from botocore.exceptions import ClientError
+
+# Import with fallback for Lambda environment
+try:
+    from .expressions import (ExpressionError, apply_update, build, evaluate, in_range, key_bounds,
+                              normalize, parse_condition, parse_update, project)
+    from .schemas import KeySchema, TableSchema, schema_for
+except ImportError:
+    # Lambda environment - use absolute imports
+    from dal.engines.expressions import (ExpressionError, apply_update, build, evaluate, in_range, key_bounds,
+                                         normalize, parse_condition, parse_update, project)
+    from dal.engines.schemas import KeySchema, TableSchema, schema_for
+
+
+class StorageEngine:
+    """Where repositories keep their items
+
+    An engine hands out table objects with the subset of the boto3 Table API
+    the repositories use (get_item, put_item, update_item, delete_item,
+    query, scan, batch_writer) and applies TransactItems atomically. Errors
+    are raised as botocore ClientErrors with DynamoDB's codes, so repository
+    error handling is the same on every engine.
+    """
+
+    name = 'base'
+
+    def table(self, table_name: str):
+        raise NotImplementedError
+
+    def transact_write_items(self, transact_items: List[Dict[str, Any]]) -> None:
+        raise NotImplementedError
+
+
+def client_error(code: str, message: str, operation: str, **extra) -> ClientError:
+    response = {'Error': {'Code': code, 'Message': message}}
+    response.update(extra)
+    return ClientError(response, operation)
+
+
+class LocalEngine(StorageEngine):
+    """Shared behaviour of the engines that evaluate DynamoDB semantics themselves"""
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self._tables: Dict[str, 'LocalTable'] = {}
+
+    def table(self, table_name: str) -> 'LocalTable':
+        with self.lock:
+            if table_name not in self._tables:
+                self._tables[table_name] = self._create_table(table_name, schema_for(table_name))
+            return self._tables[table_name]
+
+    def _create_table(self, table_name: str, schema: TableSchema) -> 'LocalTable':
+        raise NotImplementedError
+
+    @contextmanager
+    def atomic(self):
+        """Hold the engine lock (and a storage transaction) for a multi-item write"""
+        with self.lock:
+            yield
+
+    def transact_write_items(self, transact_items: List[Dict[str, Any]]) -> None:
+        if len(transact_items) > 100:
+            raise client_error('ValidationException', "Member must have length less than or equal to 100",
+                               'TransactWriteItems')
+        with self.atomic():
+            planned, reasons, seen = [], [], set()
+            for transact_item in transact_items:
+                (action, body), = transact_item.items()
+                table = self.table(body['TableName'])
+                key = table.key_of(body['Key'] if 'Key' in body else normalize(body['Item']))
+                if (body['TableName'], key) in seen:
+                    raise client_error('ValidationException',
+                                       "Transaction request cannot include multiple operations on one item",
+                                       'TransactWriteItems')
+                seen.add((body['TableName'], key))
+
+                current = table.load(key)
+                passed = table.condition_passes(body, current)
+                reasons.append({'Code': 'None'} if passed else {'Code': 'ConditionalCheckFailed',
+                                                               'Message': 'The conditional request failed'})
+                planned.append((action, table, key, body, current))
+
+            if any(reason['Code'] != 'None' for reason in reasons):
+                raise client_error('TransactionCanceledException',
+                                   "Transaction cancelled, please refer cancellation reasons for specific reasons",
+                                   'TransactWriteItems', CancellationReasons=reasons)
+
+            for action, table, key, body, current in planned:
+                if action == 'Put':
+                    table.store(normalize(body['Item']))
+                elif action == 'Update':
+                    table.store(table.updated_item(body, key, current))
+                elif action == 'Delete' and current is not None:
+                    table.remove(key)
+
+
+class LocalTable:
+    """boto3 Table work-alike over an engine's storage primitives
+
+    Subclasses implement load/store/remove by primary key and ordered
+    iteration over the table and its indexes; everything else - conditions,
+    updates, key conditions, filters, Limit and pagination - lives here.
+    """
+
+    def __init__(self, engine: LocalEngine, name: str, schema: TableSchema):
+        self.engine = engine
+        self.name = name
+        self.table_name = name
+        self.schema = schema
+
+    # Storage primitives
+    def load(self, key: tuple) -> Optional[Dict]:
+        raise NotImplementedError
+
+    def store(self, item: Dict) -> None:
+        raise NotImplementedError
+
+    def remove(self, key: tuple) -> None:
+        raise NotImplementedError
+
+    def iterate(self, index: KeySchema, index_name: Optional[str], hash_value: Any,
+                predicate: Optional[tuple], forward: bool, start_after: Optional[tuple]) -> Iterator[Dict]:
+        """Items whose index hash equals hash_value, ordered by (range, primary key)"""
+        raise NotImplementedError
+
+    def iterate_all(self, start_after: Optional[tuple]) -> Iterator[Dict]:
+        """Every item, ordered by primary key"""
+        raise NotImplementedError
+
+    # Keys
+    def key_of(self, item: Dict) -> tuple:
+        hash_key, range_key = self.schema.key
+        if hash_key not in item or (range_key and range_key not in item):
+            raise client_error('ValidationException', "The provided key element does not match the schema",
+                               'GetItem')
+        # Key attributes can never be empty strings, so '' stands in for "no range key"
+        return (normalize(item[hash_key]), normalize(item[range_key]) if range_key else '')
+
+    def key_dict(self, item: Dict, index: KeySchema = None) -> Dict:
+        """Primary key attributes, plus the index's when paginating an index"""
+        keys = [k for k in (self.schema.key.hash_key, self.schema.key.range_key) if k]
+        if index:
+            keys += [k for k in (index.hash_key, index.range_key) if k and k not in keys]
+        return {k: item[k] for k in keys}
+
+    def index_position(self, item: Dict, index: Optional[KeySchema]) -> tuple:
+        """Sort position of an item within an index: (range value, primary key)"""
+        range_key = index.range_key if index else None
+        return (item[range_key] if range_key else '', self.key_of(item))
+
+    # Conditions and updates
+    @staticmethod
+    def condition_passes(body: Dict, current: Optional[Dict]) -> bool:
+        if not body.get('ConditionExpression'):
+            return True
+        expression, names, values = build(body['ConditionExpression'], body.get('ExpressionAttributeNames'),
+                                          body.get('ExpressionAttributeValues'))
+        return evaluate(parse_condition(expression, names, values), current)
+
+    def updated_item(self, body: Dict, key: tuple, current: Optional[Dict]) -> Dict:
+        base = dict(current) if current is not None else dict(body['Key'])
+        expression = body.get('UpdateExpression')
+        if not expression:
+            return normalize(base)
+        names = body.get('ExpressionAttributeNames') or {}
+        values = {k: normalize(v) for k, v in (body.get('ExpressionAttributeValues') or {}).items()}
+        updated = apply_update(parse_update(expression, names, values), base)
+        if self.key_of(updated) != key:
+            raise client_error('ValidationException', "Cannot update attribute; it is part of the key", 'UpdateItem')
+        return updated
+
+    def _check(self, body: Dict, current: Optional[Dict], operation: str):
+        try:
+            passed = self.condition_passes(body, current)
+        except ExpressionError as e:
+            raise client_error('ValidationException', str(e), operation)
+        if not passed:
+            raise client_error('ConditionalCheckFailedException', "The conditional request failed", operation)
+
+    # boto3 Table API
+    def get_item(self, Key: Dict, ProjectionExpression: str = None, ExpressionAttributeNames: Dict = None,
+                 ConsistentRead: bool = False) -> Dict:
+        item = self.load(self.key_of(Key))
+        if item is None:
+            return {}
+        return {'Item': project(item, ProjectionExpression, ExpressionAttributeNames)}
+
+    def put_item(self, Item: Dict, ReturnValues: str = 'NONE', **condition) -> Dict:
+        item = normalize(Item)
+        with self.engine.atomic():
+            current = self.load(self.key_of(item))
+            self._check(condition, current, 'PutItem')
+            self.store(item)
+        return {'Attributes': current} if ReturnValues == 'ALL_OLD' and current else {}
+
+    def update_item(self, Key: Dict, ReturnValues: str = 'NONE', **body) -> Dict:
+        body['Key'] = Key
+        key = self.key_of(Key)
+        with self.engine.atomic():
+            current = self.load(key)
+            self._check(body, current, 'UpdateItem')
+            try:
+                updated = self.updated_item(body, key, current)
+            except ExpressionError as e:
+                raise client_error('ValidationException', str(e), 'UpdateItem')
+            self.store(updated)
+        if ReturnValues in ('ALL_NEW', 'UPDATED_NEW'):
+            return {'Attributes': updated}
+        if ReturnValues in ('ALL_OLD', 'UPDATED_OLD') and current:
+            return {'Attributes': current}
+        return {}
+
+    def delete_item(self, Key: Dict, ReturnValues: str = 'NONE', **condition) -> Dict:
+        key = self.key_of(Key)
+        with self.engine.atomic():
+            current = self.load(key)
+            self._check(condition, current, 'DeleteItem')
+            if current is not None:
+                self.remove(key)
+        return {'Attributes': current} if ReturnValues == 'ALL_OLD' and current else {}
+
+    def query(self, KeyConditionExpression, IndexName: str = None, FilterExpression=None,
+              ExpressionAttributeNames: Dict = None, ExpressionAttributeValues: Dict = None,
+              ScanIndexForward: bool = True, Limit: int = None, ExclusiveStartKey: Dict = None,
+              ProjectionExpression: str = None, Select: str = None, ConsistentRead: bool = False) -> Dict:
+        index = self.schema.indexes[IndexName] if IndexName else self.schema.key
+        if IndexName and IndexName not in self.schema.indexes:
+            raise client_error('ValidationException', f"The table does not have the specified index: {IndexName}",
+                               'Query')
+        try:
+            expression, names, values = build(KeyConditionExpression, ExpressionAttributeNames,
+                                              ExpressionAttributeValues, is_key_condition=True)
+            hash_value, predicate = key_bounds(parse_condition(expression, names, values),
+                                               index.hash_key, index.range_key)
+        except ExpressionError as e:
+            raise client_error('ValidationException', str(e), 'Query')
+
+        start_after = self.index_position(normalize(ExclusiveStartKey), index) if ExclusiveStartKey else None
+        items = self.iterate(index, IndexName, normalize(hash_value), predicate, ScanIndexForward, start_after)
+        # Only an index (not the table) needs the index keys in LastEvaluatedKey
+        return self._page(items, FilterExpression, ExpressionAttributeNames, ExpressionAttributeValues,
+                          Limit, ProjectionExpression, Select, index if IndexName else None, 'Query')
+
+    def scan(self, FilterExpression=None, ExpressionAttributeNames: Dict = None,
+             ExpressionAttributeValues: Dict = None, Limit: int = None, ExclusiveStartKey: Dict = None,
+             ProjectionExpression: str = None, Select: str = None, Segment: int = None,
+             TotalSegments: int = None, ConsistentRead: bool = False) -> Dict:
+        start_after = self.key_of(normalize(ExclusiveStartKey)) if ExclusiveStartKey else None
+        items = self.iterate_all(start_after)
+        if TotalSegments:
+            items = (item for item in items if segment_of(self.key_of(item), TotalSegments) == Segment)
+        return self._page(items, FilterExpression, ExpressionAttributeNames, ExpressionAttributeValues,
+                          Limit, ProjectionExpression, Select, None, 'Scan')
+
+    def _page(self, items: Iterator[Dict], filter_expression, names, values, limit, projection,
+              select, index: Optional[KeySchema], operation: str) -> Dict:
+        condition = None
+        if filter_expression is not None:
+            try:
+                expression, filter_names, filter_values = build(filter_expression, names, values)
+                condition = parse_condition(expression, filter_names, filter_values)
+            except ExpressionError as e:
+                raise client_error('ValidationException', str(e), operation)
+
+        matched, scanned, last = [], 0, None
+        for item in items:
+            scanned += 1
+            last = item
+            if condition is None or evaluate(condition, item):
+                matched.append(item)
+            if limit is not None and scanned >= limit:
+                break
+        else:
+            last = None
+
+        response = {'Count': len(matched), 'ScannedCount': scanned}
+        if select != 'COUNT':
+            response['Items'] = [project(item, projection, names) for item in matched]
+        if last is not None:
+            response['LastEvaluatedKey'] = self.key_dict(last, index)
+        return response
+
+    def batch_writer(self, overwrite_by_pkeys: List[str] = None) -> 'LocalBatchWriter':
+        return LocalBatchWriter(self)
+
+
+class LocalBatchWriter:
+    """Context manager matching boto3's batch_writer: buffer, then write"""
+
+    def __init__(self, table: LocalTable):
+        self.table = table
+        self.pending: Dict[tuple, Optional[Dict]] = {}
+
+    def put_item(self, Item: Dict):
+        item = normalize(Item)
+        self.pending[self.table.key_of(item)] = item
+
+    def delete_item(self, Key: Dict):
+        self.pending[self.table.key_of(Key)] = None
+
+    def __enter__(self) -> 'LocalBatchWriter':
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        with self.table.engine.atomic():
+            for key, item in self.pending.items():
+                if item is None:
+                    self.table.remove(key)
+                else:
+                    self.table.store(item)
+        self.pending = {}
+
+
+def segment_of(key: tuple, total_segments: int) -> int:
+    """Stable scan segment for a primary key (same answer in every process)"""
+    import zlib
+    return zlib.crc32(repr(key).encode()) % total_segments
+
+
+def sort_value(value: Any) -> Any:
+    """Order-preserving value for range keys that may be numbers or strings"""
+    return float(value) if isinstance(value, Decimal) else value
+
+
+__all__ = ['StorageEngine', 'LocalEngine', 'LocalTable', 'client_error', 'in_range', 'sort_value', 'segment_of']
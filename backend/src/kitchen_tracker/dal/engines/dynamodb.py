@@ -0,0 +1,34 @@
+import threading
+from typing import Any, Dict, List
+
+import boto3
+
+# Import with fallback for Lambda environment
+try:
+    from .base import StorageEngine
+except ImportError:
+    # Lambda environment - use absolute imports
+    from dal.engines.base import StorageEngine
+
+
+class DynamoDBEngine(StorageEngine):
+    """The production engine: boto3 DynamoDB tables, unchanged"""
+
+    name = 'dynamodb'
+
+    def __init__(self):
+        # boto3 resources are not thread-safe, so each thread gets its own
+        self._local = threading.local()
+
+    @property
+    def resource(self):
+        if not hasattr(self._local, 'resource'):
+            self._local.resource = boto3.resource('dynamodb')
+        return self._local.resource
+
+    def table(self, table_name: str):
+        return self.resource.Table(table_name)
+
+    def transact_write_items(self, transact_items: List[Dict[str, Any]]) -> None:
+        # The resource's client serializes plain Python values, same as Table calls
+        self.resource.meta.client.transact_write_items(TransactItems=transact_items)
@@ -0,0 +1,501 @@
+"""
+DynamoDB expression evaluation for the local storage engines
+
+Covers the condition, key-condition, filter, update and projection syntax
+the repositories use: comparisons, BETWEEN, IN, AND/OR/NOT, the
+attribute_exists/attribute_not_exists/attribute_type/begins_with/contains
+functions and size(); SET (with +, -, if_not_exists, list_append), REMOVE,
+ADD and DELETE updates. boto3 condition objects (Key/Attr) are first turned
+into expression strings with boto3's own builder, so both forms behave the
+same way.
+"""
+
+import re
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Tuple
+
+from boto3.dynamodb.conditions import ConditionBase, ConditionExpressionBuilder
+
+
+class ExpressionError(ValueError):
+    """Malformed expression (DynamoDB answers these with a ValidationException)"""
+
+
+_MISSING = object()
+
+_TOKEN = re.compile(r"""
+    \s*(?:
+        (?P<op><>|<=|>=|=|<|>|\(|\)|,|\+|-|\[|\]|\.)
+      | (?P<value>:[A-Za-z0-9_]+)
+      | (?P<name>\#[A-Za-z0-9_]+)
+      | (?P<word>[A-Za-z_][A-Za-z0-9_]*)
+      | (?P<number>\d+)
+    )""", re.VERBOSE)
+
+_KEYWORDS = {'AND', 'OR', 'NOT', 'BETWEEN', 'IN', 'SET', 'REMOVE', 'ADD', 'DELETE'}
+_CONDITION_FUNCTIONS = {'attribute_exists', 'attribute_not_exists', 'attribute_type', 'begins_with', 'contains'}
+
+
+def normalize(value: Any) -> Any:
+    """Copy a value into DynamoDB's type model: numbers become Decimal, floats are rejected"""
+    if isinstance(value, bool) or value is None or isinstance(value, (str, bytes)):
+        return value
+    if isinstance(value, float):
+        # Same rule as boto3's serializer, so code that works locally works on AWS
+        raise TypeError("Float types are not supported. Use Decimal types instead.")
+    if isinstance(value, (int, Decimal)):
+        return Decimal(value)
+    if isinstance(value, dict):
+        return {k: normalize(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [normalize(v) for v in value]
+    if isinstance(value, (set, frozenset)):
+        return {normalize(v) for v in value}
+    raise TypeError(f"Unsupported type {type(value).__name__} for DynamoDB")
+
+
+def build(expression, names: Dict = None, values: Dict = None,
+          is_key_condition: bool = False) -> Tuple[str, Dict, Dict]:
+    """Expression string plus names/values, accepting boto3 condition objects"""
+    names = dict(names or {})
+    values = {k: normalize(v) for k, v in (values or {}).items()}
+    if isinstance(expression, ConditionBase):
+        built = ConditionExpressionBuilder().build_expression(expression, is_key_condition=is_key_condition)
+        names.update(built.attribute_name_placeholders)
+        values.update({k: normalize(v) for k, v in built.attribute_value_placeholders.items()})
+        expression = built.condition_expression
+    return expression, names, values
+
+
+class _Parser:
+    def __init__(self, text: str, names: Dict[str, str], values: Dict[str, Any]):
+        self.tokens = self._tokenize(text)
+        self.position = 0
+        self.names = names
+        self.values = values
+
+    @staticmethod
+    def _tokenize(text: str) -> List[Tuple[str, str]]:
+        tokens = []
+        position = 0
+        text = text.rstrip()
+        while position < len(text):
+            match = _TOKEN.match(text, position)
+            if not match or match.end() == position:
+                raise ExpressionError(f"Invalid expression near '{text[position:]}'")
+            kind = match.lastgroup
+            token = match.group(kind)
+            if kind == 'word' and token.upper() in _KEYWORDS:
+                kind, token = 'keyword', token.upper()
+            tokens.append((kind, token))
+            position = match.end()
+        return tokens
+
+    # Token helpers
+    def peek(self, offset: int = 0) -> Tuple[Optional[str], Optional[str]]:
+        index = self.position + offset
+        return self.tokens[index] if index < len(self.tokens) else (None, None)
+
+    def take(self, expected: str = None) -> str:
+        kind, token = self.peek()
+        if token is None or (expected is not None and token != expected):
+            raise ExpressionError(f"Expected {expected or 'more input'}, got {token}")
+        self.position += 1
+        return token
+
+    def accept(self, token: str) -> bool:
+        if self.peek()[1] == token:
+            self.position += 1
+            return True
+        return False
+
+    def done(self) -> bool:
+        return self.position >= len(self.tokens)
+
+    # Operands
+    def path(self) -> tuple:
+        segments = [self._name()]
+        while True:
+            if self.accept('.'):
+                segments.append(self._name())
+            elif self.accept('['):
+                segments.append(int(self.take()))
+                self.take(']')
+            else:
+                return ('path', tuple(segments))
+
+    def _name(self) -> str:
+        kind, token = self.peek()
+        if kind == 'name':
+            self.position += 1
+            if token not in self.names:
+                raise ExpressionError(f"Undefined attribute name {token}")
+            return self.names[token]
+        if kind in ('word', 'keyword'):
+            self.position += 1
+            return token
+        raise ExpressionError(f"Expected an attribute name, got {token}")
+
+    def operand(self) -> tuple:
+        kind, token = self.peek()
+        if kind == 'value':
+            self.position += 1
+            if token not in self.values:
+                raise ExpressionError(f"Undefined attribute value {token}")
+            return ('value', self.values[token])
+        if kind == 'word' and token == 'size' and self.peek(1)[1] == '(':
+            self.position += 2
+            target = self.path()
+            self.take(')')
+            return ('size', target)
+        return self.path()
+
+    # Conditions
+    def condition(self) -> tuple:
+        node = self._and()
+        while self.peek() == ('keyword', 'OR'):
+            self.position += 1
+            node = ('or', node, self._and())
+        return node
+
+    def _and(self) -> tuple:
+        node = self._not()
+        while self.peek() == ('keyword', 'AND'):
+            self.position += 1
+            node = ('and', node, self._not())
+        return node
+
+    def _not(self) -> tuple:
+        if self.peek() == ('keyword', 'NOT'):
+            self.position += 1
+            return ('not', self._not())
+        return self._primary()
+
+    def _primary(self) -> tuple:
+        kind, token = self.peek()
+        if token == '(':
+            self.position += 1
+            node = self.condition()
+            self.take(')')
+            return node
+        if kind == 'word' and token in _CONDITION_FUNCTIONS and self.peek(1)[1] == '(':
+            self.position += 2
+            args = [self.operand()]
+            while self.accept(','):
+                args.append(self.operand())
+            self.take(')')
+            return ('func', token, tuple(args))
+
+        left = self.operand()
+        kind, token = self.peek()
+        if token in ('=', '<>', '<', '<=', '>', '>='):
+            self.position += 1
+            return ('cmp', token, left, self.operand())
+        if token == 'BETWEEN':
+            self.position += 1
+            low = self.operand()
+            self.take('AND')
+            return ('between', left, low, self.operand())
+        if token == 'IN':
+            self.position += 1
+            self.take('(')
+            options = [self.operand()]
+            while self.accept(','):
+                options.append(self.operand())
+            self.take(')')
+            return ('in', left, tuple(options))
+        raise ExpressionError(f"Expected a comparison, got {token}")
+
+    # Updates
+    def update(self) -> List[tuple]:
+        actions = []
+        while not self.done():
+            clause = self.take()
+            if clause not in ('SET', 'REMOVE', 'ADD', 'DELETE'):
+                raise ExpressionError(f"Unknown update clause {clause}")
+            while True:
+                target = self.path()
+                if clause == 'SET':
+                    self.take('=')
+                    actions.append(('set', target, self._set_value()))
+                elif clause == 'REMOVE':
+                    actions.append(('remove', target))
+                else:
+                    actions.append((clause.lower(), target, self.operand()))
+                if not self.accept(','):
+                    break
+        return actions
+
+    def _set_value(self) -> tuple:
+        node = self._set_operand()
+        kind, token = self.peek()
+        if token in ('+', '-'):
+            self.position += 1
+            return ('arith', token, node, self._set_operand())
+        return node
+
+    def _set_operand(self) -> tuple:
+        kind, token = self.peek()
+        if kind == 'word' and token in ('if_not_exists', 'list_append') and self.peek(1)[1] == '(':
+            self.position += 2
+            first = self._set_value()
+            self.take(',')
+            second = self._set_value()
+            self.take(')')
+            return (token, first, second)
+        return self.operand()
+
+
+def parse_condition(expression: str, names: Dict = None, values: Dict = None) -> tuple:
+    parser = _Parser(expression, names or {}, values or {})
+    node = parser.condition()
+    if not parser.done():
+        raise ExpressionError(f"Unexpected '{parser.peek()[1]}' in condition")
+    return node
+
+
+def parse_update(expression: str, names: Dict = None, values: Dict = None) -> List[tuple]:
+    return _Parser(expression, names or {}, values or {}).update()
+
+
+# Evaluation
+def get_path(item: Dict, segments: tuple) -> Any:
+    value = item
+    for segment in segments:
+        if isinstance(segment, int):
+            if not isinstance(value, list) or segment >= len(value):
+                return _MISSING
+            value = value[segment]
+        else:
+            if not isinstance(value, dict) or segment not in value:
+                return _MISSING
+            value = value[segment]
+    return value
+
+
+def _operand_value(node: tuple, item: Dict) -> Any:
+    if node[0] == 'value':
+        return node[1]
+    if node[0] == 'size':
+        value = get_path(item, node[1][1])
+        if value is _MISSING or isinstance(value, (bool, Decimal)) or value is None:
+            return _MISSING
+        return Decimal(len(value))
+    return get_path(item, node[1])
+
+
+def _comparable(left: Any, right: Any) -> bool:
+    if left is _MISSING or right is _MISSING:
+        return False
+    if isinstance(left, bool) or isinstance(right, bool):
+        return isinstance(left, bool) and isinstance(right, bool)
+    if isinstance(left, Decimal) and isinstance(right, Decimal):
+        return True
+    return type(left) is type(right)
+
+
+def _compare(op: str, left: Any, right: Any) -> bool:
+    if op == '=':
+        return _comparable(left, right) and left == right
+    if op == '<>':
+        return not (_comparable(left, right) and left == right)
+    if not _comparable(left, right) or not isinstance(left, (str, bytes, Decimal)):
+        return False
+    if op == '<':
+        return left < right
+    if op == '<=':
+        return left <= right
+    if op == '>':
+        return left > right
+    return left >= right
+
+
+_TYPE_CODES = {
+    'S': lambda v: isinstance(v, str), 'N': lambda v: isinstance(v, Decimal) and not isinstance(v, bool),
+    'B': lambda v: isinstance(v, bytes), 'BOOL': lambda v: isinstance(v, bool), 'NULL': lambda v: v is None,
+    'M': lambda v: isinstance(v, dict), 'L': lambda v: isinstance(v, list),
+    'SS': lambda v: isinstance(v, set) and all(isinstance(x, str) for x in v),
+    'NS': lambda v: isinstance(v, set) and all(isinstance(x, Decimal) for x in v)
+}
+
+
+def evaluate(node: tuple, item: Optional[Dict]) -> bool:
+    """Evaluate a parsed condition against an item (None means the item does not exist)"""
+    item = item or {}
+    kind = node[0]
+    if kind == 'and':
+        return evaluate(node[1], item) and evaluate(node[2], item)
+    if kind == 'or':
+        return evaluate(node[1], item) or evaluate(node[2], item)
+    if kind == 'not':
+        return not evaluate(node[1], item)
+    if kind == 'cmp':
+        return _compare(node[1], _operand_value(node[2], item), _operand_value(node[3], item))
+    if kind == 'between':
+        value = _operand_value(node[1], item)
+        return (_compare('>=', value, _operand_value(node[2], item)) and
+                _compare('<=', value, _operand_value(node[3], item)))
+    if kind == 'in':
+        value = _operand_value(node[1], item)
+        return any(_compare('=', value, _operand_value(option, item)) for option in node[2])
+
+    name, args = node[1], node[2]
+    first = _operand_value(args[0], item)
+    if name == 'attribute_exists':
+        return first is not _MISSING
+    if name == 'attribute_not_exists':
+        return first is _MISSING
+    if name == 'attribute_type':
+        return first is not _MISSING and _TYPE_CODES.get(_operand_value(args[1], item), lambda v: False)(first)
+    second = _operand_value(args[1], item)
+    if name == 'begins_with':
+        return isinstance(first, (str, bytes)) and type(first) is type(second) and first.startswith(second)
+    # contains
+    if isinstance(first, str) and isinstance(second, str):
+        return second in first
+    if isinstance(first, (set, list)):
+        return second in first
+    return False
+
+
+def _set_value(node: tuple, item: Dict) -> Any:
+    kind = node[0]
+    if kind == 'if_not_exists':
+        existing = _set_value(node[1], item)
+        return existing if existing is not _MISSING else _set_value(node[2], item)
+    if kind == 'list_append':
+        first, second = _set_value(node[1], item), _set_value(node[2], item)
+        if not isinstance(first, list) or not isinstance(second, list):
+            raise ExpressionError("list_append operands must be lists")
+        return first + second
+    if kind == 'arith':
+        left, right = _set_value(node[2], item), _set_value(node[3], item)
+        if not isinstance(left, Decimal) or not isinstance(right, Decimal):
+            raise ExpressionError("An operand in the update expression has an incorrect data type")
+        return left + right if node[1] == '+' else left - right
+    return _operand_value(node, item)
+
+
+def _assign(item: Dict, segments: tuple, value: Any):
+    target = item
+    for segment in segments[:-1]:
+        target = target[segment] if isinstance(segment, int) else target.setdefault(segment, {})
+    last = segments[-1]
+    if isinstance(last, int) and isinstance(target, list):
+        if last >= len(target):
+            target.append(value)
+        else:
+            target[last] = value
+    else:
+        target[last] = value
+
+
+def _remove(item: Dict, segments: tuple):
+    parent = get_path(item, segments[:-1]) if len(segments) > 1 else item
+    last = segments[-1]
+    if isinstance(parent, dict):
+        parent.pop(last, None)
+    elif isinstance(parent, list) and isinstance(last, int) and last < len(parent):
+        parent.pop(last)
+
+
+def apply_update(actions: List[tuple], item: Dict) -> Dict:
+    """Apply parsed update actions to a copy of item (values are read before any write)"""
+    resolved = []
+    for action in actions:
+        if action[0] == 'set':
+            resolved.append(('set', action[1], _set_value(action[2], item)))
+        elif action[0] == 'remove':
+            resolved.append(action)
+        else:
+            resolved.append((action[0], action[1], _operand_value(action[2], item)))
+
+    updated = normalize(item)
+    for action in resolved:
+        segments = action[1][1]
+        if action[0] == 'set':
+            if action[2] is _MISSING:
+                raise ExpressionError("The provided expression refers to an attribute that does not exist in the item")
+            _assign(updated, segments, normalize(action[2]))
+        elif action[0] == 'remove':
+            _remove(updated, segments)
+        elif action[0] == 'add':
+            current = get_path(updated, segments)
+            if isinstance(action[2], Decimal):
+                base = Decimal(0) if current is _MISSING else current
+                if not isinstance(base, Decimal):
+                    raise ExpressionError("ADD requires a number or set attribute")
+                _assign(updated, segments, base + action[2])
+            elif isinstance(action[2], set):
+                _assign(updated, segments, (set() if current is _MISSING else set(current)) | action[2])
+            else:
+                raise ExpressionError("ADD requires a number or set value")
+        else:  # delete from set
+            current = get_path(updated, segments)
+            if isinstance(current, set):
+                remaining = current - action[2]
+                if remaining:
+                    _assign(updated, segments, remaining)
+                else:
+                    _remove(updated, segments)
+    return updated
+
+
+def project(item: Dict, expression: Optional[str], names: Dict = None) -> Dict:
+    """Top-level attributes named in a ProjectionExpression"""
+    if not expression:
+        return item
+    parser = _Parser(expression, names or {}, {})
+    attributes = [parser.path()[1]]
+    while parser.accept(','):
+        attributes.append(parser.path()[1])
+    projected = {}
+    for segments in attributes:
+        value = get_path(item, segments)
+        if value is not _MISSING:
+            _assign(projected, segments[:1], item[segments[0]] if len(segments) > 1 else value)
+    return projected
+
+
+def key_bounds(node: tuple, hash_key: str, range_key: Optional[str]) -> Tuple[Any, Optional[tuple]]:
+    """Split a key condition into (hash value, range predicate)
+
+    The range predicate is (op, value[, value]) with op one of =, <, <=, >,
+    >=, between, begins_with - what a key condition may use.
+    """
+    parts = []
+    pending = [node]
+    while pending:
+        current = pending.pop()
+        if current[0] == 'and':
+            pending.extend([current[2], current[1]])
+        else:
+            parts.append(current)
+
+    hash_value, range_predicate = _MISSING, None
+    for part in parts:
+        if part[0] == 'cmp' and part[1] == '=' and part[2][0] == 'path' and part[2][1] == (hash_key,):
+            hash_value = part[3][1]
+        elif part[0] == 'cmp' and part[2][0] == 'path' and part[2][1] == (range_key,):
+            range_predicate = (part[1], part[3][1])
+        elif part[0] == 'between' and part[1][1] == (range_key,):
+            range_predicate = ('between', part[2][1], part[3][1])
+        elif part[0] == 'func' and part[1] == 'begins_with' and part[2][0][1] == (range_key,):
+            range_predicate = ('begins_with', part[2][1][1])
+        else:
+            raise ExpressionError("Query key condition not supported")
+    if hash_value is _MISSING:
+        raise ExpressionError(f"Query condition missed key schema element: {hash_key}")
+    return hash_value, range_predicate
+
+
+def in_range(value: Any, predicate: Optional[tuple]) -> bool:
+    """Whether a range-key value satisfies a key_bounds predicate"""
+    if predicate is None:
+        return True
+    op = predicate[0]
+    if op == 'between':
+        return _compare('>=', value, predicate[1]) and _compare('<=', value, predicate[2])
+    if op == 'begins_with':
+        return isinstance(value, str) and value.startswith(predicate[1])
+    return _compare(op, value, predicate[1])
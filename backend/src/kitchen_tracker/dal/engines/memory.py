@@ -0,0 +1,125 @@
+import copy
+from bisect import bisect_left, bisect_right, insort
+from typing import Any, Dict, Iterator, List, Optional
+
+# Import with fallback for Lambda environment
+try:
+    from .base import LocalEngine, LocalTable, in_range
+    from .schemas import KeySchema, TableSchema
+except ImportError:
+    # Lambda environment - use absolute imports
+    from dal.engines.base import LocalEngine, LocalTable, in_range
+    from dal.engines.schemas import KeySchema, TableSchema
+
+
+class MemoryEngine(LocalEngine):
+    """Process-local engine for tests, benchmarks and local development
+
+    Each table keeps its items in a dict by primary key and, per index
+    (including the table's own range key), a sorted list of positions per
+    hash value, so queries are a bisect plus a slice.
+    """
+
+    name = 'memory'
+
+    def _create_table(self, table_name: str, schema: TableSchema) -> 'MemoryTable':
+        return MemoryTable(self, table_name, schema)
+
+
+class MemoryTable(LocalTable):
+
+    def __init__(self, engine: MemoryEngine, name: str, schema: TableSchema):
+        super().__init__(engine, name, schema)
+        self.items: Dict[tuple, Dict] = {}
+        # index name (None for the table) -> hash value -> sorted [(range, primary key)]
+        self.positions: Dict[Optional[str], Dict[Any, List[tuple]]] = {None: {}}
+        for index_name in schema.indexes:
+            self.positions[index_name] = {}
+
+    def _indexes(self):
+        yield None, self.schema.key
+        yield from self.schema.indexes.items()
+
+    def load(self, key: tuple) -> Optional[Dict]:
+        item = self.items.get(key)
+        return copy.deepcopy(item) if item is not None else None
+
+    def store(self, item: Dict) -> None:
+        key = self.key_of(item)
+        if key in self.items:
+            self.remove(key)
+        self.items[key] = item
+        for index_name, index in self._indexes():
+            # Sparse indexes: items without the index keys are not in them
+            if index.hash_key in item and (not index.range_key or index.range_key in item):
+                insort(self.positions[index_name].setdefault(item[index.hash_key], []),
+                       self._position(item, index))
+
+    def remove(self, key: tuple) -> None:
+        item = self.items.pop(key, None)
+        if item is None:
+            return
+        for index_name, index in self._indexes():
+            if index.hash_key not in item or (index.range_key and index.range_key not in item):
+                continue
+            bucket = self.positions[index_name].get(item[index.hash_key], [])
+            position = self._position(item, index)
+            at = bisect_left(bucket, position)
+            if at < len(bucket) and bucket[at] == position:
+                bucket.pop(at)
+
+    def _position(self, item: Dict, index: KeySchema) -> tuple:
+        return (item[index.range_key] if index.range_key else '', self.key_of(item))
+
+    def iterate(self, index: KeySchema, index_name: Optional[str], hash_value: Any,
+                predicate: Optional[tuple], forward: bool, start_after: Optional[tuple]) -> Iterator[Dict]:
+        bucket = self.positions[index_name].get(hash_value, [])
+        # Narrow to the key condition's range first, then to the page
+        low, high = _bounds(bucket, predicate)
+        if start_after is not None:
+            if forward:
+                low = max(low, bisect_right(bucket, start_after, low, high))
+            else:
+                high = min(high, bisect_left(bucket, start_after, low, high))
+        window = range(low, high) if forward else range(high - 1, low - 1, -1)
+        for at in window:
+            range_value, key = bucket[at]
+            if not in_range(range_value, predicate):
+                continue
+            item = self.items.get(key)
+            if item is not None:
+                yield copy.deepcopy(item)
+
+    def iterate_all(self, start_after: Optional[tuple]) -> Iterator[Dict]:
+        keys = sorted(self.items)
+        if start_after is not None:
+            keys = keys[bisect_right(keys, start_after):]
+        for key in keys:
+            item = self.items.get(key)
+            if item is not None:
+                yield copy.deepcopy(item)
+
+
+def _bounds(bucket: List[tuple], predicate: Optional[tuple]) -> tuple:
+    """Slice of a sorted position list that can satisfy a range predicate"""
+    low, high = 0, len(bucket)
+    if predicate is None:
+        return low, high
+    op, value = predicate[0], predicate[1]
+    if op in ('=', '>=', 'between', 'begins_with'):
+        low = bisect_left(bucket, value, key=_range_of)
+    elif op == '>':
+        low = bisect_right(bucket, value, key=_range_of)
+    if op in ('=', '<='):
+        high = bisect_right(bucket, value, key=_range_of)
+    elif op == '<':
+        high = bisect_left(bucket, value, key=_range_of)
+    elif op == 'between':
+        high = bisect_right(bucket, predicate[2], key=_range_of)
+    elif op == 'begins_with':
+        high = bisect_left(bucket, value + '\U0010ffff', key=_range_of)
+    return low, high
+
+
+def _range_of(position: tuple) -> Any:
+    return position[0]
@@ -0,0 +1,57 @@
+"""
+Key schemas for the local storage engines
+
+DynamoDB reads these from the tables themselves; the in-memory and SQLite
+engines need them spelled out. Keep in step with template.yaml.
+"""
+
+import os
+from typing import Dict, NamedTuple, Optional
+
+
+class KeySchema(NamedTuple):
+    hash_key: str
+    range_key: Optional[str] = None
+
+
+class TableSchema(NamedTuple):
+    key: KeySchema
+    indexes: Dict[str, KeySchema] = {}
+
+
+# Logical table -> (environment variable holding its name, default name, schema)
+TABLES = {
+    'FamilyMembers': ('FAMILY_MEMBERS_TABLE', 'FamilyMembers', TableSchema(
+        KeySchema('member_id'),
+        {'HouseholdIndex': KeySchema('household_id')}
+    )),
+    'RecurringActivities': ('RECURRING_ACTIVITIES_TABLE', 'RecurringActivities', TableSchema(
+        KeySchema('activity_id'),
+        {'HouseholdIndex': KeySchema('household_id'), 'AssignedToIndex': KeySchema('assigned_to'),
+         'NextDueIndex': KeySchema('reminder_shard', 'next_due_at')}
+    )),
+    'ActivityCompletions': ('ACTIVITY_COMPLETIONS_TABLE', 'ActivityCompletions', TableSchema(
+        KeySchema('completion_id'),
+        {'ActivityIndex': KeySchema('activity_id', 'completion_date'),
+         'HouseholdDateIndex': KeySchema('household_id', 'completion_date')}
+    )),
+    'ChangeLog': ('CHANGE_LOG_TABLE', 'ChangeLog', TableSchema(
+        KeySchema('household_id', 'change_key')
+    )),
+    'Household': ('HOUSEHOLD_TABLE', 'HouseholdData', TableSchema(
+        KeySchema('pk', 'sk')
+    )),
+    'Meals': ('MEALS_TABLE', 'Meals', TableSchema(
+        KeySchema('user_id', 'item_id'),
+        {'TypeDateIndex': KeySchema('user_id', 'type_date'),
+         'MealHistoryIndex': KeySchema('user_id', 'meal_cooked')}
+    ))
+}
+
+
+def schema_for(table_name: str) -> TableSchema:
+    """Schema of a table by its configured (environment) name"""
+    for env_var, default_name, schema in TABLES.values():
+        if table_name == os.getenv(env_var, default_name):
+            return schema
+    raise ValueError(f"No schema registered for table {table_name}")
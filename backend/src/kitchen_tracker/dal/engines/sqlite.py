@@ -0,0 +1,217 @@
+import base64
+import json
+import os
+import sqlite3
+from contextlib import contextmanager
+from decimal import Decimal
+from typing import Any, Dict, Iterator, Optional
+
+# Import with fallback for Lambda environment
+try:
+    from .base import LocalEngine, LocalTable, in_range, sort_value
+    from .schemas import KeySchema, TableSchema
+except ImportError:
+    # Lambda environment - use absolute imports
+    from dal.engines.base import LocalEngine, LocalTable, in_range, sort_value
+    from dal.engines.schemas import KeySchema, TableSchema
+
+
+def _encode(value: Any) -> Any:
+    """JSON-safe form of a DynamoDB value, tagging the types JSON lacks"""
+    if isinstance(value, Decimal):
+        return {'__N': str(value)}
+    if isinstance(value, bytes):
+        return {'__B': base64.b64encode(value).decode()}
+    if isinstance(value, set):
+        members = sorted(value)
+        if all(isinstance(v, Decimal) for v in members):
+            return {'__NS': [str(v) for v in members]}
+        return {'__SS': members}
+    if isinstance(value, dict):
+        return {k: _encode(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_encode(v) for v in value]
+    return value
+
+
+def _decode(value: Dict) -> Any:
+    if '__N' in value:
+        return Decimal(value['__N'])
+    if '__B' in value:
+        return base64.b64decode(value['__B'])
+    if '__NS' in value:
+        return {Decimal(v) for v in value['__NS']}
+    if '__SS' in value:
+        return set(value['__SS'])
+    return value
+
+
+class SQLiteEngine(LocalEngine):
+    """Single-file engine for self-hosted, single-box deployments
+
+    Each DynamoDB table is an SQL table holding the item as JSON, its primary
+    key columns and one (hash, range) column pair per global secondary index,
+    each with a covering SQL index - so household, activity and completion
+    date queries are index range scans.
+    """
+
+    name = 'sqlite'
+
+    # Rows fetched per round trip while paging through a query
+    FETCH_SIZE = 200
+
+    def __init__(self, path: str = None):
+        super().__init__()
+        self.path = path or os.getenv('SQLITE_PATH', 'kitchen_tracker.db')
+        # Access is serialized by the engine lock; transactions are managed explicitly
+        self.connection = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        if self.path != ':memory:':
+            self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('PRAGMA synchronous=NORMAL')
+        self._depth = 0
+
+    def _create_table(self, table_name: str, schema: TableSchema) -> 'SQLiteTable':
+        return SQLiteTable(self, table_name, schema)
+
+    @contextmanager
+    def atomic(self):
+        with self.lock:
+            outermost = self._depth == 0
+            if outermost:
+                self.connection.execute('BEGIN IMMEDIATE')
+            self._depth += 1
+            try:
+                yield
+            except BaseException:
+                self._depth -= 1
+                if outermost:
+                    self.connection.execute('ROLLBACK')
+                raise
+            self._depth -= 1
+            if outermost:
+                self.connection.execute('COMMIT')
+
+    def execute(self, sql: str, parameters=()) -> sqlite3.Cursor:
+        with self.lock:
+            return self.connection.execute(sql, parameters)
+
+    def close(self):
+        with self.lock:
+            self.connection.close()
+
+
+class SQLiteTable(LocalTable):
+
+    def __init__(self, engine: SQLiteEngine, name: str, schema: TableSchema):
+        super().__init__(engine, name, schema)
+        self.sql_name = '"' + name.replace('"', '""') + '"'
+        # Column pair per index; the table's own key is index "pk"
+        self.columns = {None: ('hk', 'rk')}
+        for position, index_name in enumerate(schema.indexes):
+            self.columns[index_name] = (f"i{position}_h", f"i{position}_r")
+
+        index_columns = ''.join(f", {h}, {r}" for index_name, (h, r) in self.columns.items() if index_name)
+        engine.execute(f"CREATE TABLE IF NOT EXISTS {self.sql_name} "
+                       f"(hk NOT NULL, rk NOT NULL, item TEXT NOT NULL{index_columns}, PRIMARY KEY (hk, rk))")
+        for index_name, (h, r) in self.columns.items():
+            if index_name:
+                index_sql_name = '"' + f"{name}_{index_name}".replace('"', '""') + '"'
+                engine.execute(f"CREATE INDEX IF NOT EXISTS {index_sql_name} ON {self.sql_name} ({h}, {r}, hk, rk)")
+
+    def _key_params(self, key: tuple) -> tuple:
+        return (sort_value(key[0]), sort_value(key[1]))
+
+    def _row(self, item: Dict) -> Dict[str, Any]:
+        key = self.key_of(item)
+        row = {'hk': sort_value(key[0]), 'rk': sort_value(key[1]), 'item': json.dumps(_encode(item))}
+        for index_name, index in self.schema.indexes.items():
+            h, r = self.columns[index_name]
+            indexed = index.hash_key in item and (not index.range_key or index.range_key in item)
+            row[h] = sort_value(item[index.hash_key]) if indexed else None
+            row[r] = (sort_value(item[index.range_key]) if index.range_key else '') if indexed else None
+        return row
+
+    @staticmethod
+    def _item(text: str) -> Dict:
+        return json.loads(text, object_hook=_decode)
+
+    def load(self, key: tuple) -> Optional[Dict]:
+        row = self.engine.execute(f"SELECT item FROM {self.sql_name} WHERE hk = ? AND rk = ?",
+                                  self._key_params(key)).fetchone()
+        return self._item(row[0]) if row else None
+
+    def store(self, item: Dict) -> None:
+        row = self._row(item)
+        columns = ', '.join(row)
+        placeholders = ', '.join('?' for _ in row)
+        self.engine.execute(f"INSERT OR REPLACE INTO {self.sql_name} ({columns}) VALUES ({placeholders})",
+                            tuple(row.values()))
+
+    def remove(self, key: tuple) -> None:
+        self.engine.execute(f"DELETE FROM {self.sql_name} WHERE hk = ? AND rk = ?", self._key_params(key))
+
+    def iterate(self, index: KeySchema, index_name: Optional[str], hash_value: Any,
+                predicate: Optional[tuple], forward: bool, start_after: Optional[tuple]) -> Iterator[Dict]:
+        h, r = self.columns[index_name]
+        where = [f"{h} = ?"]
+        params = [sort_value(hash_value)]
+        if index.range_key:
+            where.append(f"{r} IS NOT NULL")
+            if predicate is not None:
+                clause, values = self._range_sql(r, predicate)
+                where.append(clause)
+                params += values
+
+        direction = 'ASC' if forward else 'DESC'
+        order = f"ORDER BY {r} {direction}, hk {direction}, rk {direction}"
+        comparison = '>' if forward else '<'
+        position = None
+        if start_after is not None:
+            position = (sort_value(start_after[0]), sort_value(start_after[1][0]), sort_value(start_after[1][1]))
+
+        while True:
+            sql_where = list(where)
+            sql_params = list(params)
+            if position is not None:
+                # Keyset pagination over (range, primary key)
+                sql_where.append(f"({r}, hk, rk) {comparison} (?, ?, ?)")
+                sql_params += list(position)
+            rows = self.engine.execute(
+                f"SELECT item, {r}, hk, rk FROM {self.sql_name} WHERE {' AND '.join(sql_where)} {order} LIMIT ?",
+                sql_params + [self.engine.FETCH_SIZE]
+            ).fetchall()
+            for text, range_value, hk, rk in rows:
+                item = self._item(text)
+                if index.range_key and not in_range(item[index.range_key], predicate):
+                    continue
+                yield item
+            if len(rows) < self.engine.FETCH_SIZE:
+                return
+            position = rows[-1][1:]
+
+    @staticmethod
+    def _range_sql(column: str, predicate: tuple) -> tuple:
+        op = predicate[0]
+        if op == 'between':
+            return f"{column} BETWEEN ? AND ?", [sort_value(predicate[1]), sort_value(predicate[2])]
+        if op == 'begins_with':
+            # Prefix range; in_range() re-checks exactly
+            return f"{column} >= ? AND {column} < ?", [predicate[1], predicate[1] + '\U0010ffff']
+        return f"{column} {op} ?", [sort_value(predicate[1])]
+
+    def iterate_all(self, start_after: Optional[tuple]) -> Iterator[Dict]:
+        position = self._key_params(start_after) if start_after is not None else None
+        while True:
+            if position is None:
+                rows = self.engine.execute(f"SELECT item, hk, rk FROM {self.sql_name} ORDER BY hk, rk LIMIT ?",
+                                           (self.engine.FETCH_SIZE,)).fetchall()
+            else:
+                rows = self.engine.execute(
+                    f"SELECT item, hk, rk FROM {self.sql_name} WHERE (hk, rk) > (?, ?) ORDER BY hk, rk LIMIT ?",
+                    (*position, self.engine.FETCH_SIZE)
+                ).fetchall()
+            for text, hk, rk in rows:
+                yield self._item(text)
+            if len(rows) < self.engine.FETCH_SIZE:
+                return
+            position = rows[-1][1:]
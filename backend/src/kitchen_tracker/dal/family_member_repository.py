@@ -1,5 +1,6 @@
 from typing import List, Optional
 import boto3
+from boto3.dynamodb.conditions import Key, Attr
 from botocore.exceptions import ClientError
 
 # Import helper for Lambda environment
@@ -31,6 +32,55 @@ class FamilyMemberRepository(BaseRepository):
                 raise ValueError(f"Family member with ID {family_member.member_id} already exists")
             raise e
     
+    def create_op(self, family_member: FamilyMember) -> dict:
+        """Transaction item that creates a family member"""
+        return {'Put': {
+            'TableName': self.table_name,
+            'Item': family_member.to_dict(),
+            'ConditionExpression': 'attribute_not_exists(member_id)'
+        }}
+    
+    def update_op(self, family_member: FamilyMember) -> dict:
+        """Transaction item that updates a family member's editable fields
+
+        Only user-editable attributes are written so the completion counters a
+        concurrent completion adjusts are never overwritten by a stale copy.
+        """
+        update_expression = 'SET #name = :name, member_type = :member_type, is_active = :is_active'
+        values = {
+            ':name': family_member.name,
+            ':member_type': family_member.member_type,
+            ':is_active': family_member.is_active
+        }
+        if family_member.member_type == 'pet' and family_member.pet_type:
+            update_expression += ', pet_type = :pet_type'
+            values[':pet_type'] = family_member.pet_type
+        else:
+            update_expression += ' REMOVE pet_type'
+        return {'Update': {
+            'TableName': self.table_name,
+            'Key': {'member_id': family_member.member_id},
+            'UpdateExpression': update_expression,
+            'ExpressionAttributeNames': {'#name': 'name'},
+            'ExpressionAttributeValues': values,
+            'ConditionExpression': 'attribute_exists(member_id)'
+        }}
+
+    def stats_op(self, member_id: str, before, after, conditional: bool = True) -> dict:
+        """Transaction item that moves a member's completion counters from before to after
+
+        Completions pass conditional=False: one member's completions of
+        different activities can commit at once, and must not cancel each other.
+        """
+        set_clause, add_clause, values, condition = self.stats_update(before, after, conditional)
+        return {'Update': {
+            'TableName': self.table_name,
+            'Key': {'member_id': member_id},
+            'UpdateExpression': f"SET {set_clause} ADD {add_clause}",
+            'ExpressionAttributeValues': values,
+            'ConditionExpression': 'attribute_exists(member_id)' + (f" AND {condition}" if condition else '')
+        }}
+    
     def get_by_id(self, member_id: str) -> Optional[FamilyMember]:
         """Get a family member by ID"""
         try:
@@ -45,17 +95,19 @@ class FamilyMemberRepository(BaseRepository):
     def get_by_household_id(self, household_id: str) -> List[FamilyMember]:
         """Get all family members for a household"""
         try:
-            response = self.table.scan(
-                FilterExpression='household_id = :household_id AND is_active = :is_active',
-                ExpressionAttributeValues={
-                    ':household_id': household_id,
-                    ':is_active': True
-                }
-            )
-            
+            query_kwargs = {
+                'IndexName': 'HouseholdIndex',
+                'KeyConditionExpression': Key('household_id').eq(household_id),
+                'FilterExpression': Attr('is_active').eq(True)
+            }
             members = []
-            for item in response.get('Items', []):
-                members.append(FamilyMember.from_dict(item))
+            while True:
+                response = self.table.query(**query_kwargs)
+                for item in response.get('Items', []):
+                    members.append(FamilyMember.from_dict(item))
+                if 'LastEvaluatedKey' not in response:
+                    break
+                query_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
             
             # Sort by member type (people first, then pets) and then by name
             members.sort(key=lambda m: (m.member_type, m.name.lower()))
@@ -65,6 +117,22 @@ class FamilyMemberRepository(BaseRepository):
             print(f"Error getting family members for household {household_id}: {e}")
             return []
     
+    def get_household_ids(self) -> List[str]:
+        """Every household with a family member (a full table scan, for maintenance jobs)"""
+        try:
+            scan_kwargs = {'ProjectionExpression': 'household_id'}
+            household_ids = set()
+            while True:
+                response = self.table.scan(**scan_kwargs)
+                household_ids.update(item['household_id'] for item in response.get('Items', []))
+                if 'LastEvaluatedKey' not in response:
+                    break
+                scan_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+            return sorted(household_ids)
+        except ClientError as e:
+            print(f"Error scanning household IDs: {e}")
+            return []
+    
     def get_people_by_household_id(self, household_id: str) -> List[FamilyMember]:
         """Get only people (not pets) for a household"""
         try:
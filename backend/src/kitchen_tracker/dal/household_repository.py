@@ -0,0 +1,230 @@
+import os
+from datetime import date
+from typing import Any, Dict, List, Optional
+from boto3.dynamodb.conditions import Key, Attr
+from botocore.exceptions import ClientError
+
+# Import with fallback for Lambda environment
+try:
+    from ..models.family_member import FamilyMember
+    from ..models.recurring_activity import RecurringActivity
+    from ..models.activity_completion import ActivityCompletion
+    from ..models.meal import Meal, MealRecord
+    from ..models.household_digest import HouseholdDigest
+    from .base_repository import BaseRepository
+except ImportError:
+    # Lambda environment - use absolute imports
+    from models.family_member import FamilyMember
+    from models.recurring_activity import RecurringActivity
+    from models.activity_completion import ActivityCompletion
+    from models.meal import Meal, MealRecord
+    from models.household_digest import HouseholdDigest
+    from dal.base_repository import BaseRepository
+
+
+class HouseholdRepository(BaseRepository):
+    """Single-table layout: one partition per household, typed sort keys
+
+    Every item for a household shares pk = HOUSEHOLD#<household_id>. Sort keys
+    are grouped so the history that grows without bound sorts first and
+    current state last:
+
+        0#COOKED#<cooked_date>#<record_id>          meal cook history
+        0#DIGEST                                    materialized dashboard (any layout)
+        1#COMPLETION#<completion_date>#<id>         activity completions
+        2#ACTIVITY#<activity_id>                    current state ...
+        2#MEAL#<meal_id>
+        2#MEMBER#<member_id>
+        3#META                                      migration marker
+
+    so `sk >= 1#COMPLETION#<since>` returns recent completions plus all
+    current state in one paginated Query. The per-entity tables stay
+    authoritative for point reads; a household is only read from here once
+    its META marker exists. The digest item is written whichever layout is
+    in use.
+    """
+
+    COOKED_PREFIX = '0#COOKED#'
+    COMPLETION_PREFIX = '1#COMPLETION#'
+    ACTIVITY_PREFIX = '2#ACTIVITY#'
+    MEAL_PREFIX = '2#MEAL#'
+    MEMBER_PREFIX = '2#MEMBER#'
+    META_SK = '3#META'
+    DIGEST_SK = '0#DIGEST'
+
+    def __init__(self):
+        table_name = os.getenv('HOUSEHOLD_TABLE', 'HouseholdData')
+        super().__init__(table_name)
+
+    @staticmethod
+    def enabled() -> bool:
+        """Whether the single-table layout is switched on (STORAGE_LAYOUT=single_table)"""
+        return os.getenv('STORAGE_LAYOUT', 'tables') == 'single_table'
+
+    @staticmethod
+    def partition_key(household_id: str) -> str:
+        return f"HOUSEHOLD#{household_id}"
+
+    # Item builders
+    def to_item(self, entity) -> Dict[str, Any]:
+        """Household-table item for a model object"""
+        if isinstance(entity, FamilyMember):
+            sk, entity_type, entity_id = self.MEMBER_PREFIX + entity.member_id, 'member', entity.member_id
+        elif isinstance(entity, RecurringActivity):
+            sk, entity_type, entity_id = self.ACTIVITY_PREFIX + entity.activity_id, 'activity', entity.activity_id
+        elif isinstance(entity, ActivityCompletion):
+            sk = f"{self.COMPLETION_PREFIX}{entity.completion_date}#{entity.completion_id}"
+            entity_type, entity_id = 'completion', entity.completion_id
+        elif isinstance(entity, Meal):
+            sk, entity_type, entity_id = self.MEAL_PREFIX + entity.meal_id, 'meal', entity.meal_id
+        elif isinstance(entity, MealRecord):
+            sk = f"{self.COOKED_PREFIX}{entity.cooked_date}#{entity.record_id}"
+            entity_type, entity_id = 'meal_record', entity.record_id
+        else:
+            raise ValueError(f"No household-table layout for {type(entity).__name__}")
+
+        item = entity.to_dict()
+        item.update({
+            'pk': self.partition_key(entity.household_id),
+            'sk': sk,
+            'entity_type': entity_type,
+            'entity_id': entity_id
+        })
+        return item
+
+    @classmethod
+    def from_item(cls, item: Dict[str, Any]):
+        """Model object for a household-table item, or None for non-entity items"""
+        data = {k: v for k, v in item.items() if k not in ('pk', 'sk', 'entity_type', 'entity_id')}
+        entity_type = item.get('entity_type')
+        if entity_type == 'member':
+            return FamilyMember.from_dict(data)
+        if entity_type == 'activity':
+            return RecurringActivity.from_dict(data)
+        if entity_type == 'completion':
+            return ActivityCompletion.from_dict(data)
+        if entity_type == 'meal':
+            return Meal.from_dict(data)
+        if entity_type == 'meal_record':
+            return MealRecord.from_dict(data)
+        return None
+
+    # Transaction items, appended to the per-entity table writes
+    def put_op(self, entity) -> dict:
+        """Transaction item that writes an entity's current state"""
+        return {'Put': {
+            'TableName': self.table_name,
+            'Item': self.to_item(entity)
+        }}
+
+    def delete_op(self, entity) -> dict:
+        """Transaction item that removes an entity's item (completions are hard deleted)"""
+        item = self.to_item(entity)
+        return {'Delete': {
+            'TableName': self.table_name,
+            'Key': {'pk': item['pk'], 'sk': item['sk']}
+        }}
+
+    # Bulk writes for the migration
+    def batch_put(self, entities: List) -> int:
+        """Write entities with BatchWriteItem (unprocessed items are retried); returns the count"""
+        with self.table.batch_writer(overwrite_by_pkeys=['pk', 'sk']) as batch:
+            for entity in entities:
+                batch.put_item(Item=self.to_item(entity))
+        return len(entities)
+
+    def delete_completion(self, household_id: str, completion_id: str) -> bool:
+        """Delete a completion knowing only its id (its date is part of the sort key)"""
+        query_kwargs = {
+            'KeyConditionExpression': Key('pk').eq(self.partition_key(household_id)) &
+                                      Key('sk').begins_with(self.COMPLETION_PREFIX),
+            'FilterExpression': Attr('entity_id').eq(completion_id)
+        }
+        try:
+            while True:
+                response = self.table.query(**query_kwargs)
+                for item in response.get('Items', []):
+                    self.table.delete_item(Key={'pk': item['pk'], 'sk': item['sk']})
+                    return True
+
+                if 'LastEvaluatedKey' not in response:
+                    return False
+                query_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+        except ClientError as e:
+            print(f"Error deleting completion {completion_id} from household table: {e}")
+            return False
+
+    def mark_migrated(self, household_id: str, migrated_at: str) -> bool:
+        """Write the marker that lets reads use this household's partition"""
+        return self.put_item({
+            'pk': self.partition_key(household_id),
+            'sk': self.META_SK,
+            'entity_type': 'meta',
+            'migrated_at': migrated_at
+        })
+
+    # Daily digests
+    def put_digest(self, digest: HouseholdDigest, expected_version: Optional[int] = None) -> bool:
+        """Store a digest; with expected_version, only over the stored digest at that version"""
+        item = digest.to_item()
+        item.update({'pk': self.partition_key(digest.household_id), 'sk': self.DIGEST_SK, 'entity_type': 'digest'})
+        put_kwargs = {'Item': item}
+        if expected_version is not None:
+            put_kwargs['ConditionExpression'] = '#version = :version'
+            put_kwargs['ExpressionAttributeNames'] = {'#version': 'version'}
+            put_kwargs['ExpressionAttributeValues'] = {':version': expected_version}
+        try:
+            self.table.put_item(**put_kwargs)
+            return True
+        except ClientError as e:
+            if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                print(f"Error storing digest for household {digest.household_id}: {e}")
+            return False
+
+    def get_digest(self, household_id: str) -> Optional[HouseholdDigest]:
+        try:
+            response = self.table.get_item(Key={'pk': self.partition_key(household_id), 'sk': self.DIGEST_SK})
+            return HouseholdDigest.from_item(response['Item']) if 'Item' in response else None
+        except ClientError as e:
+            print(f"Error getting digest for household {household_id}: {e}")
+            return None
+
+    # Reads
+    def get_household(self, household_id: str, completions_since: date = None) -> Optional[Dict[str, List]]:
+        """Members, activities, meals and completions since a date, from one paginated Query
+
+        Returns None if the household has not been migrated, so callers can
+        fall back to the per-entity tables.
+        """
+        since = (completions_since or date.today()).isoformat()
+        query_kwargs = {
+            'KeyConditionExpression': Key('pk').eq(self.partition_key(household_id)) &
+                                      Key('sk').gte(self.COMPLETION_PREFIX + since)
+        }
+        household = {'members': [], 'activities': [], 'completions': [], 'meals': []}
+        migrated = False
+        collections = {
+            FamilyMember: household['members'],
+            RecurringActivity: household['activities'],
+            ActivityCompletion: household['completions'],
+            Meal: household['meals']
+        }
+        try:
+            while True:
+                response = self.table.query(**query_kwargs)
+                for item in response.get('Items', []):
+                    if item['sk'] == self.META_SK:
+                        migrated = True
+                        continue
+                    entity = self.from_item(item)
+                    if entity is not None:
+                        collections[type(entity)].append(entity)
+
+                if 'LastEvaluatedKey' not in response:
+                    break
+                query_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+        except ClientError as e:
+            print(f"Error querying household {household_id}: {e}")
+            return None
+
+        return household if migrated else None
@@ -1,58 +1,326 @@
-from typing import List, Optional
+import os
+import uuid
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+from boto3.dynamodb.conditions import Attr, Key
+from botocore.exceptions import ClientError
 from .base_repository import BaseRepository
 
 class MealRepository(BaseRepository):
-    """Repository for meal-related operations"""
-    
-    def create_meal(self, meal) -> bool:
-        """Create a new meal"""
+    """Repository for meal-related operations
+
+    Meals and meal records share one partition per household (user_id). Two
+    sparse GSIs on that partition turn the common lookups into range queries:
+
+        TypeDateIndex     type_date = "meal#<week_of>" or "meal_record#<cooked_date>"
+        MealHistoryIndex  meal_cooked = "<original_meal_id>#<cooked_date>" (records only)
+
+    Each week also has a materialized WeeklyMealPlan item (item_id
+    "plan#<week_of>") holding every meal of the week under its own
+    "meal#<meal_id>" attribute, so one meal can be added or patched with a
+    single UpdateItem and the week view is one get_item.
+
+    Ingested emails leave a receipt (item_id "email#<content_hash>"), the
+    dedupe index that lets a repeated email be recognized with one read.
+    Plans and receipts carry no index keys, so the GSIs never see them.
+    """
+
+    TYPE_DATE_INDEX = 'TypeDateIndex'
+    MEAL_HISTORY_INDEX = 'MealHistoryIndex'
+
+    # How far back get_available_meals looks for delivered, uncooked kits
+    AVAILABLE_WEEKS = 8
+
+    PLAN_PREFIX = 'plan#'
+    PLAN_MEAL_PREFIX = 'meal#'
+    EMAIL_RECEIPT_PREFIX = 'email#'
+
+    # DynamoDB's limit on items per TransactWriteItems call
+    MAX_TRANSACTION_ITEMS = 100
+
+    def __init__(self):
+        table_name = os.getenv('MEALS_TABLE', 'Meals')
+        super().__init__(table_name)
+
+    @staticmethod
+    def index_keys(data: Dict[str, Any]) -> Dict[str, str]:
+        """GSI key attributes for a stored meal or meal record item"""
+        if data.get('record_type') == 'meal':
+            return {'type_date': f"meal#{data['week_of']}"}
+        if data.get('record_type') == 'meal_record':
+            meal_id = data.get('original_meal_id', data['meal_id'])
+            return {
+                'type_date': f"meal_record#{data['cooked_date']}",
+                'meal_cooked': f"{meal_id}#{data['cooked_date']}"
+            }
+        return {}
+
+    def _query_index(self, index_name: str, key_condition, filter_expression=None,
+                     forward: bool = True) -> List[Dict[str, Any]]:
+        """Every item matching a key condition on a GSI, following pagination"""
+        query_kwargs = {
+            'IndexName': index_name,
+            'KeyConditionExpression': key_condition,
+            'ScanIndexForward': forward
+        }
+        if filter_expression is not None:
+            query_kwargs['FilterExpression'] = filter_expression
+
+        items = []
+        try:
+            while True:
+                response = self.table.query(**query_kwargs)
+                items.extend(response.get('Items', []))
+                if 'LastEvaluatedKey' not in response:
+                    return items
+                query_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+        except ClientError as e:
+            print(f"Error querying {index_name}: {e}")
+            return []
+
+    def _meal_item(self, meal) -> Dict[str, Any]:
         data = meal.to_dict()
         data['record_type'] = 'meal'
         data['user_id'] = meal.household_id
         data['item_id'] = meal.meal_id
-        return self.put_item(data)
-    
+        data.update(self.index_keys(data))
+        return data
+
+    def create_meal(self, meal) -> bool:
+        """Create a new meal"""
+        return self.put_item(self._meal_item(meal))
+
+    def create_meal_op(self, meal) -> dict:
+        """Transaction item that creates a meal"""
+        return {'Put': {
+            'TableName': self.table_name,
+            'Item': self._meal_item(meal),
+            'ConditionExpression': 'attribute_not_exists(item_id)'
+        }}
+
+    def plan_meal_op(self, meal) -> dict:
+        """Transaction item that adds (or replaces) a meal in its week's plan, creating the plan if needed"""
+        return self.plan_meals_op([meal])
+
+    def plan_meals_op(self, meals: List, keep_existing: bool = False) -> dict:
+        """Transaction item that adds meals of one household and week to the week's plan
+
+        With keep_existing, meals the plan already holds are left as they are.
+        """
+        first = meals[0]
+        names, values, assignments = {}, {}, []
+        for position, meal in enumerate(meals):
+            names[f"#meal{position}"] = f"{self.PLAN_MEAL_PREFIX}{meal.meal_id}"
+            values[f":meal{position}"] = meal.to_dict()
+            if keep_existing:
+                assignments.append(f"#meal{position} = if_not_exists(#meal{position}, :meal{position})")
+            else:
+                assignments.append(f"#meal{position} = :meal{position}")
+        values.update({
+            ':record_type': 'weekly_plan',
+            ':household_id': first.household_id,
+            ':week_of': first.week_of,
+            ':plan_id': str(uuid.uuid4()),
+            ':created_at': datetime.utcnow().isoformat()
+        })
+        return {'Update': {
+            'TableName': self.table_name,
+            'Key': {'user_id': first.household_id, 'item_id': f"{self.PLAN_PREFIX}{first.week_of}"},
+            'UpdateExpression': 'SET ' + ', '.join(assignments) + ', record_type = :record_type, '
+                                'household_id = :household_id, week_of = :week_of, '
+                                'plan_id = if_not_exists(plan_id, :plan_id), '
+                                'created_at = if_not_exists(created_at, :created_at)',
+            'ExpressionAttributeNames': names,
+            'ExpressionAttributeValues': values
+        }}
+
+    def create_meals(self, meals: List, mirror_ops: Callable[[List], List[dict]] = None) -> List:
+        """Create many meals and add them to their week plans; returns the meals that were new
+
+        Each household-week is one transaction. Meals that already exist (by
+        meal_id) are dropped and the rest retried, so repeated imports of
+        the same meals write nothing twice. mirror_ops(meals) adds writes
+        (one per meal) to each transaction, after the meal creates.
+        """
+        weeks: Dict[tuple, List] = {}
+        for meal in meals:
+            weeks.setdefault((meal.household_id, meal.week_of), []).append(meal)
+
+        # Leave room for the plan update, and the mirror writes, in each transaction
+        chunk = (self.MAX_TRANSACTION_ITEMS - 1) // (2 if mirror_ops else 1)
+        created = []
+        for week_meals in weeks.values():
+            for start in range(0, len(week_meals), chunk):
+                created += self._create_week_meals(week_meals[start:start + chunk], mirror_ops)
+        return created
+
+    def _create_week_meals(self, meals: List, mirror_ops: Callable[[List], List[dict]] = None) -> List:
+        while meals:
+            ops = [self.create_meal_op(meal) for meal in meals] + [self.plan_meals_op(meals, keep_existing=True)]
+            if mirror_ops:
+                ops += mirror_ops(meals)
+            try:
+                self.engine.transact_write_items(ops)
+                return meals
+            except ClientError as e:
+                if e.response['Error']['Code'] != 'TransactionCanceledException':
+                    raise e
+                reasons = e.response.get('CancellationReasons', [])
+                existing = {position for position, reason in enumerate(reasons[:len(meals)])
+                            if reason.get('Code') == 'ConditionalCheckFailed'}
+                if not existing:
+                    raise e
+                meals = [meal for position, meal in enumerate(meals) if position not in existing]
+        return []
+
+    def get_weekly_plan(self, household_id: str, week_of: str):
+        """Get the materialized plan for a week (one keyed read), or None if it was never built"""
+        from models.meal import WeeklyMealPlan
+
+        data = self.get_item(household_id, f"{self.PLAN_PREFIX}{week_of}")
+        if not data or data.get('record_type') != 'weekly_plan':
+            return None
+        meals = [value for name, value in data.items() if name.startswith(self.PLAN_MEAL_PREFIX)]
+        meals.sort(key=lambda meal: (meal.get('created_at', ''), meal['meal_id']))
+        return WeeklyMealPlan.from_dict({**data, 'meals': meals})
+
+    def save_weekly_plan(self, plan) -> bool:
+        """Write a whole plan item (used to build plans for weeks stored before plans existed)"""
+        item = {
+            'user_id': plan.household_id,
+            'item_id': f"{self.PLAN_PREFIX}{plan.week_of}",
+            'record_type': 'weekly_plan',
+            'plan_id': plan.plan_id,
+            'household_id': plan.household_id,
+            'week_of': plan.week_of,
+            'created_at': plan.created_at
+        }
+        for meal in plan.meals:
+            item[f"{self.PLAN_MEAL_PREFIX}{meal.meal_id}"] = meal.to_dict()
+        return self.put_item(item)
+
+    def get_email_receipt(self, household_id: str, content_hash: str) -> Optional[Dict[str, Any]]:
+        """The receipt left by an already ingested email with this content hash, if any"""
+        data = self.get_item(household_id, f"{self.EMAIL_RECEIPT_PREFIX}{content_hash}")
+        return data if data and data.get('record_type') == 'email_receipt' else None
+
+    def create_email_receipt(self, household_id: str, content_hash: str, email_key: str,
+                             meal_ids: List[str]) -> bool:
+        """Record an ingested email; False if another delivery of it got there first"""
+        try:
+            self.table.put_item(
+                Item={
+                    'user_id': household_id,
+                    'item_id': f"{self.EMAIL_RECEIPT_PREFIX}{content_hash}",
+                    'record_type': 'email_receipt',
+                    'content_hash': content_hash,
+                    'email_key': email_key,
+                    'meal_ids': meal_ids,
+                    'received_at': datetime.utcnow().isoformat()
+                },
+                ConditionExpression='attribute_not_exists(item_id)'
+            )
+            return True
+        except ClientError as e:
+            if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                print(f"Error recording email {email_key}: {e}")
+            return False
+
     def get_meal(self, household_id: str, meal_id: str):
         """Get a specific meal by ID"""
         from models.meal import Meal
-        
+
         data = self.get_item(household_id, meal_id)
         if data and data.get('record_type') == 'meal':
             return Meal.from_dict(data)
         return None
-    
+
     def get_household_meals(self, household_id: str, week_of: str = None) -> List:
         """Get meals for a household, optionally filtered by week"""
         from models.meal import Meal
-        
-        items = self.query_by_user(household_id)
-        meals = []
-        
-        for item_data in items:
-            if item_data.get('record_type') == 'meal':
-                meal = Meal.from_dict(item_data)
-                
-                if week_of is None or meal.week_of == week_of:
-                    meals.append(meal)
-        
-        return meals
-    
-    def update_meal_status(self, household_id: str, meal_id: str, status: str) -> bool:
-        """Update meal status (ordered -> delivered -> cooked)"""
-        meal = self.get_meal(household_id, meal_id)
-        if meal:
-            meal.status = status
-            return self.create_meal(meal)  # Update existing
-        return False
-    
+
+        if week_of:
+            sort_condition = Key('type_date').eq(f"meal#{week_of}")
+        else:
+            sort_condition = Key('type_date').begins_with("meal#")
+
+        items = self._query_index(self.TYPE_DATE_INDEX, Key('user_id').eq(household_id) & sort_condition)
+        return [Meal.from_dict(item) for item in items]
+
+    def get_available_meals(self, household_id: str, today: date = None) -> List:
+        """Get delivered, not yet cooked meals from recent delivery weeks"""
+        from models.meal import Meal
+
+        today = today or date.today()
+        since = today - timedelta(weeks=self.AVAILABLE_WEEKS)
+        items = self._query_index(
+            self.TYPE_DATE_INDEX,
+            Key('user_id').eq(household_id) &
+            Key('type_date').between(f"meal#{since.isoformat()}", f"meal#{today.isoformat()}"),
+            filter_expression=Attr('status').eq('delivered')
+        )
+        return [Meal.from_dict(item) for item in items]
+
+    def update_meal_status(self, household_id: str, meal_id: str, status: str):
+        """Update meal status (ordered -> delivered -> cooked); returns the updated meal, or None if missing"""
+        from models.meal import Meal
+
+        try:
+            response = self.table.update_item(
+                Key={'user_id': household_id, 'item_id': meal_id},
+                UpdateExpression='SET #status = :status',
+                ConditionExpression='record_type = :meal',
+                ExpressionAttributeNames={'#status': 'status'},
+                ExpressionAttributeValues={':status': status, ':meal': 'meal'},
+                ReturnValues='ALL_NEW'
+            )
+        except ClientError as e:
+            if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
+                return None
+            print(f"Error updating status of meal {meal_id}: {e}")
+            return None
+        return Meal.from_dict(response['Attributes'])
+
+    def meal_status_op(self, household_id: str, meal_id: str, status: str) -> dict:
+        """Transaction item that sets a stored meal's status"""
+        return {'Update': {
+            'TableName': self.table_name,
+            'Key': {'user_id': household_id, 'item_id': meal_id},
+            'UpdateExpression': 'SET #status = :status',
+            'ConditionExpression': 'record_type = :meal',
+            'ExpressionAttributeNames': {'#status': 'status'},
+            'ExpressionAttributeValues': {':status': status, ':meal': 'meal'}
+        }}
+
+    def set_plan_meal_status(self, household_id: str, week_of: str, meal_id: str, status: str) -> bool:
+        """Patch one meal's status inside its week's plan; False if the plan does not hold that meal"""
+        try:
+            self.table.update_item(
+                Key={'user_id': household_id, 'item_id': f"{self.PLAN_PREFIX}{week_of}"},
+                UpdateExpression='SET #meal.#status = :status',
+                ConditionExpression='attribute_exists(#meal)',
+                ExpressionAttributeNames={'#meal': f"{self.PLAN_MEAL_PREFIX}{meal_id}", '#status': 'status'},
+                ExpressionAttributeValues={':status': status}
+            )
+            return True
+        except ClientError as e:
+            if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                print(f"Error updating plan for week {week_of}: {e}")
+            return False
+
     def get_meals_by_week(self, household_id: str, week_of: str) -> List:
         """Get all meals for a specific week"""
         return self.get_household_meals(household_id, week_of)
-    
+
     def create_meal_record(self, meal_record) -> bool:
         """Create a meal cooking record"""
-        from models.meal import MealRecord
-        
+        return self.put_item(self._meal_record_item(meal_record))
+
+    def create_meal_record_op(self, meal_record) -> dict:
+        """Transaction item that creates a meal cooking record"""
+        return {'Put': {'TableName': self.table_name, 'Item': self._meal_record_item(meal_record)}}
+
+    def _meal_record_item(self, meal_record) -> Dict[str, Any]:
         data = meal_record.to_dict()
         data['record_type'] = 'meal_record'
         data['user_id'] = meal_record.household_id
@@ -60,22 +328,58 @@ class MealRepository(BaseRepository):
         # Store original meal_id for queries
         data['original_meal_id'] = data['meal_id']
         data['meal_id'] = meal_record.record_id  # Use record_id as DynamoDB key
-        return self.put_item(data)
-    
+        data.update(self.index_keys(data))
+        return data
+
     def get_meal_records(self, household_id: str, meal_id: str = None) -> List:
-        """Get meal cooking records, optionally filtered by meal_id"""
+        """Get meal cooking records, optionally filtered by meal_id, oldest first"""
         from models.meal import MealRecord
-        
-        items = self.query_by_user(household_id)
+
+        if meal_id:
+            items = self._query_index(
+                self.MEAL_HISTORY_INDEX,
+                Key('user_id').eq(household_id) & Key('meal_cooked').begins_with(f"{meal_id}#")
+            )
+        else:
+            items = self._query_index(
+                self.TYPE_DATE_INDEX,
+                Key('user_id').eq(household_id) & Key('type_date').begins_with("meal_record#")
+            )
+
         records = []
-        
         for item_data in items:
-            if (item_data.get('record_type') == 'meal_record'):
-                # Check if filtering by meal_id
-                if meal_id is None or item_data.get('original_meal_id') == meal_id:
-                    # Restore original structure
-                    record_data = item_data.copy()
-                    record_data['meal_id'] = record_data.get('original_meal_id', record_data['meal_id'])
-                    records.append(MealRecord.from_dict(record_data))
-        
-        return records
\ No newline at end of file
+            # Restore original structure
+            record_data = item_data.copy()
+            record_data['meal_id'] = record_data.get('original_meal_id', record_data['meal_id'])
+            records.append(MealRecord.from_dict(record_data))
+        return records
+
+    def backfill_index_keys(self, exclusive_start_key: Optional[Dict] = None) -> Optional[Dict]:
+        """Add GSI keys to one scan page of items stored before the indexes existed
+
+        Returns the LastEvaluatedKey to continue from, or None when done.
+        """
+        scan_kwargs = {'FilterExpression': Attr('record_type').exists() & Attr('type_date').not_exists()}
+        if exclusive_start_key:
+            scan_kwargs['ExclusiveStartKey'] = exclusive_start_key
+        response = self.table.scan(**scan_kwargs)
+
+        for item in response.get('Items', []):
+            keys = self.index_keys(item)
+            if not keys:
+                continue
+            names = {f"#{name}": name for name in keys}
+            values = {f":{name}": value for name, value in keys.items()}
+            try:
+                self.table.update_item(
+                    Key={'user_id': item['user_id'], 'item_id': item['item_id']},
+                    UpdateExpression='SET ' + ', '.join(f"#{name} = :{name}" for name in keys),
+                    ConditionExpression='attribute_exists(item_id)',
+                    ExpressionAttributeNames=names,
+                    ExpressionAttributeValues=values
+                )
+            except ClientError as e:
+                # Deleted since the scan read it; nothing to backfill
+                if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                    raise e
+        return response.get('LastEvaluatedKey')
@@ -1,5 +1,7 @@
-from typing import List, Optional
+import zlib
+from typing import Dict, Iterator, List, Optional
 import boto3
+from boto3.dynamodb.conditions import Key, Attr
 
 # Import with fallback for Lambda environment
 try:
@@ -17,6 +19,12 @@ from botocore.exceptions import ClientError
 
 
 class RecurringActivityRepository(BaseRepository):
+    # Activities awaiting a reminder carry reminder_shard and next_due_at, which
+    # put them in the sparse NextDueIndex ordered by due time. The items are
+    # spread over REMINDER_SHARDS partition keys so no single key runs hot.
+    REMINDER_INDEX = 'NextDueIndex'
+    REMINDER_SHARDS = 8
+    
     def __init__(self):
         import os
         table_name = os.getenv('RECURRING_ACTIVITIES_TABLE', 'RecurringActivities')
@@ -36,6 +44,225 @@ class RecurringActivityRepository(BaseRepository):
                 raise ValueError(f"Activity with ID {activity.activity_id} already exists")
             raise e
     
+    @classmethod
+    def reminder_shard(cls, activity_id: str) -> str:
+        return f"shard-{zlib.crc32(activity_id.encode()) % cls.REMINDER_SHARDS}"
+    
+    @classmethod
+    def reminder_shards(cls) -> List[str]:
+        return [f"shard-{shard}" for shard in range(cls.REMINDER_SHARDS)]
+    
+    def _schedule_reminder(self, op: dict, activity_id: str, next_due_at: Optional[str]) -> dict:
+        """Add (re)arming the activity's next reminder to an Update transaction item"""
+        if next_due_at:
+            update = op['Update']
+            update['UpdateExpression'] = update['UpdateExpression'].replace(
+                'SET ', 'SET reminder_shard = :reminder_shard, next_due_at = :next_due_at, ', 1)
+            update['ExpressionAttributeValues'][':reminder_shard'] = self.reminder_shard(activity_id)
+            update['ExpressionAttributeValues'][':next_due_at'] = next_due_at
+        return op
+    
+    def create_op(self, activity: RecurringActivity, next_due_at: str = None) -> dict:
+        """Transaction item that creates an activity, with its first reminder when next_due_at is given"""
+        item = activity.to_dict()
+        if next_due_at:
+            item.update(reminder_shard=self.reminder_shard(activity.activity_id), next_due_at=next_due_at)
+        return {'Put': {
+            'TableName': self.table_name,
+            'Item': item,
+            'ConditionExpression': 'attribute_not_exists(activity_id)'
+        }}
+    
+    def update_op(self, activity: RecurringActivity, next_due_at: str = None) -> dict:
+        """Transaction item that updates an activity's editable fields
+
+        Only user-editable attributes are written so a concurrent completion's
+        last_completion snapshot is never overwritten by a stale copy.
+        """
+        op = {'Update': {
+            'TableName': self.table_name,
+            'Key': {'activity_id': activity.activity_id},
+            'UpdateExpression': ('SET #name = :name, assigned_to = :assigned_to, frequency = :frequency, '
+                                 'frequency_config = :frequency_config, category = :category, '
+                                 'is_active = :is_active'),
+            'ExpressionAttributeNames': {'#name': 'name'},
+            'ExpressionAttributeValues': {
+                ':name': activity.name,
+                ':assigned_to': activity.assigned_to,
+                ':frequency': activity.frequency,
+                ':frequency_config': activity.frequency_config,
+                ':category': activity.category,
+                ':is_active': activity.is_active
+            },
+            'ConditionExpression': 'attribute_exists(activity_id)'
+        }}
+        return self._schedule_reminder(op, activity.activity_id, next_due_at)
+    
+    def last_completion_op(self, activity_id: str, completion: Optional[dict], stats: tuple = None,
+                           history: Dict[str, bytes] = None, next_due_at: str = None) -> dict:
+        """Transaction item that sets the latest-completion snapshot (None when there is none)
+
+        stats=(before, after) moves the completion counters, history sets
+        completion bitmaps, and next_due_at re-arms the reminder, in the same update.
+        """
+        if stats is None:
+            op = {'Update': {
+                'TableName': self.table_name,
+                'Key': {'activity_id': activity_id},
+                'UpdateExpression': 'SET last_completion = :completion',
+                'ExpressionAttributeValues': {':completion': completion},
+                'ConditionExpression': 'attribute_exists(activity_id)'
+            }}
+            return self._schedule_reminder(op, activity_id, next_due_at)
+        op = self.stats_op(activity_id, *stats, history=history)
+        op['Update']['UpdateExpression'] = op['Update']['UpdateExpression'].replace(
+            'SET ', 'SET last_completion = :completion, ', 1)
+        op['Update']['ExpressionAttributeValues'][':completion'] = completion
+        return self._schedule_reminder(op, activity_id, next_due_at)
+    
+    def stats_op(self, activity_id: str, before, after, history: Dict[str, bytes] = None) -> dict:
+        """Transaction item that moves an activity's completion counters from before to after
+
+        history maps history_<year> attributes to their new bitmaps. They are
+        computed from the item as read, so they ride on the counters' condition.
+        """
+        set_clause, add_clause, values, condition = self.stats_update(before, after)
+        for attribute, packed in (history or {}).items():
+            set_clause += f", {attribute} = :{attribute}"
+            values[f":{attribute}"] = packed
+        return {'Update': {
+            'TableName': self.table_name,
+            'Key': {'activity_id': activity_id},
+            'UpdateExpression': f"SET {set_clause} ADD {add_clause}",
+            'ExpressionAttributeValues': values,
+            'ConditionExpression': f"attribute_exists(activity_id) AND {condition}"
+        }}
+    
+    def backfill_last_completion(self, activity_id: str, completion: Optional[dict]) -> bool:
+        """Store the snapshot for an item written before snapshots existed"""
+        try:
+            self.table.update_item(
+                Key={'activity_id': activity_id},
+                UpdateExpression='SET last_completion = :completion',
+                ExpressionAttributeValues={':completion': completion},
+                # Never overwrite a snapshot a completion wrote in the meantime
+                ConditionExpression='attribute_exists(activity_id) AND attribute_not_exists(last_completion)'
+            )
+            return True
+        except ClientError as e:
+            if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                print(f"Error backfilling last completion for activity {activity_id}: {e}")
+            return False
+    
+    def soft_delete_op(self, activity_id: str) -> dict:
+        """Transaction item that marks an activity inactive and drops its pending reminder"""
+        return {'Update': {
+            'TableName': self.table_name,
+            'Key': {'activity_id': activity_id},
+            'UpdateExpression': 'SET is_active = :is_active REMOVE reminder_shard',
+            'ExpressionAttributeValues': {':is_active': False},
+            'ConditionExpression': 'attribute_exists(activity_id)'
+        }}
+    
+    def iter_due_reminders(self, shard: str, until: str, page_size: int = 100) -> Iterator[dict]:
+        """Items in one reminder shard due at or before `until`, earliest first, a page at a time"""
+        query_kwargs = {
+            'IndexName': self.REMINDER_INDEX,
+            'KeyConditionExpression': Key('reminder_shard').eq(shard) & Key('next_due_at').lte(until),
+            'Limit': page_size
+        }
+        try:
+            while True:
+                response = self.table.query(**query_kwargs)
+                yield from response.get('Items', [])
+                
+                if 'LastEvaluatedKey' not in response:
+                    return
+                query_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+        except ClientError as e:
+            print(f"Error querying reminders in {shard}: {e}")
+    
+    def claim_reminder(self, activity_id: str, next_due_at: str) -> bool:
+        """Take a due reminder out of the index; False if another run (or a completion) got there first"""
+        try:
+            self.table.update_item(
+                Key={'activity_id': activity_id},
+                UpdateExpression='REMOVE reminder_shard',
+                ConditionExpression='next_due_at = :due AND attribute_exists(reminder_shard)',
+                ExpressionAttributeValues={':due': next_due_at}
+            )
+            return True
+        except ClientError as e:
+            if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                print(f"Error claiming reminder for activity {activity_id}: {e}")
+            return False
+    
+    def release_reminder(self, activity_id: str, next_due_at: str) -> bool:
+        """Put a claimed reminder back after a failed send, unless the activity moved on meanwhile"""
+        try:
+            self.table.update_item(
+                Key={'activity_id': activity_id},
+                UpdateExpression='SET reminder_shard = :shard',
+                ConditionExpression=('next_due_at = :due AND attribute_not_exists(reminder_shard) '
+                                     'AND is_active = :is_active'),
+                ExpressionAttributeValues={':shard': self.reminder_shard(activity_id), ':due': next_due_at,
+                                           ':is_active': True}
+            )
+            return True
+        except ClientError as e:
+            if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                print(f"Error releasing reminder for activity {activity_id}: {e}")
+            return False
+    
+    def rearm_reminder(self, activity_id: str, sent_due_at: str, next_due_at: str) -> bool:
+        """Schedule the reminder after a sent one, unless the activity moved on meanwhile"""
+        try:
+            self.table.update_item(
+                Key={'activity_id': activity_id},
+                UpdateExpression='SET reminder_shard = :shard, next_due_at = :next',
+                ConditionExpression=('next_due_at = :due AND attribute_not_exists(reminder_shard) '
+                                     'AND is_active = :is_active'),
+                ExpressionAttributeValues={':shard': self.reminder_shard(activity_id), ':due': sent_due_at,
+                                           ':next': next_due_at, ':is_active': True}
+            )
+            return True
+        except ClientError as e:
+            if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                print(f"Error rescheduling reminder for activity {activity_id}: {e}")
+            return False
+    
+    def arm_reminder(self, activity_id: str, next_due_at: str) -> bool:
+        """Schedule the first reminder of an activity written before reminders existed"""
+        try:
+            self.table.update_item(
+                Key={'activity_id': activity_id},
+                UpdateExpression='SET reminder_shard = :shard, next_due_at = :due',
+                ConditionExpression=('attribute_exists(activity_id) AND attribute_not_exists(next_due_at) '
+                                     'AND is_active = :is_active'),
+                ExpressionAttributeValues={':shard': self.reminder_shard(activity_id), ':due': next_due_at,
+                                           ':is_active': True}
+            )
+            return True
+        except ClientError as e:
+            if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                print(f"Error scheduling reminder for activity {activity_id}: {e}")
+            return False
+    
+    def iter_unscheduled(self) -> Iterator[RecurringActivity]:
+        """Active activities that have never had a reminder scheduled"""
+        scan_kwargs = {'FilterExpression': Attr('is_active').eq(True) & Attr('next_due_at').not_exists()}
+        try:
+            while True:
+                response = self.table.scan(**scan_kwargs)
+                for item in response.get('Items', []):
+                    yield RecurringActivity.from_dict(item)
+                
+                if 'LastEvaluatedKey' not in response:
+                    return
+                scan_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+        except ClientError as e:
+            print(f"Error scanning activities without reminders: {e}")
+    
     def get_by_id(self, activity_id: str) -> Optional[RecurringActivity]:
         """Get an activity by ID"""
         try:
@@ -47,20 +274,42 @@ class RecurringActivityRepository(BaseRepository):
             print(f"Error getting activity {activity_id}: {e}")
             return None
     
+    def query_activities(self, household_id: str, member_id: str = None, category: str = None,
+                         frequency: str = None) -> List[RecurringActivity]:
+        """Get active activities through the narrowest index, filtering the rest server-side"""
+        if member_id:
+            index_name = 'AssignedToIndex'
+            key_condition = Key('assigned_to').eq(member_id)
+            filter_expression = Attr('household_id').eq(household_id) & Attr('is_active').eq(True)
+        else:
+            index_name = 'HouseholdIndex'
+            key_condition = Key('household_id').eq(household_id)
+            filter_expression = Attr('is_active').eq(True)
+        
+        if category:
+            filter_expression = filter_expression & Attr('category').eq(category)
+        if frequency:
+            filter_expression = filter_expression & Attr('frequency').eq(frequency.lower())
+        
+        query_kwargs = {
+            'IndexName': index_name,
+            'KeyConditionExpression': key_condition,
+            'FilterExpression': filter_expression
+        }
+        activities = []
+        while True:
+            response = self.table.query(**query_kwargs)
+            for item in response.get('Items', []):
+                activities.append(RecurringActivity.from_dict(item))
+            
+            if 'LastEvaluatedKey' not in response:
+                return activities
+            query_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+    
     def get_by_household_id(self, household_id: str) -> List[RecurringActivity]:
         """Get all activities for a household"""
         try:
-            response = self.table.scan(
-                FilterExpression='household_id = :household_id AND is_active = :is_active',
-                ExpressionAttributeValues={
-                    ':household_id': household_id,
-                    ':is_active': True
-                }
-            )
-            
-            activities = []
-            for item in response.get('Items', []):
-                activities.append(RecurringActivity.from_dict(item))
+            activities = self.query_activities(household_id)
             
             # Sort by name
             activities.sort(key=lambda a: a.name.lower())
@@ -73,18 +322,7 @@ class RecurringActivityRepository(BaseRepository):
     def get_by_member_id(self, member_id: str, household_id: str) -> List[RecurringActivity]:
         """Get all activities assigned to a specific family member"""
         try:
-            response = self.table.scan(
-                FilterExpression='household_id = :household_id AND assigned_to = :member_id AND is_active = :is_active',
-                ExpressionAttributeValues={
-                    ':household_id': household_id,
-                    ':member_id': member_id,
-                    ':is_active': True
-                }
-            )
-            
-            activities = []
-            for item in response.get('Items', []):
-                activities.append(RecurringActivity.from_dict(item))
+            activities = self.query_activities(household_id, member_id=member_id)
             
             # Sort by name
             activities.sort(key=lambda a: a.name.lower())
@@ -94,22 +332,10 @@ class RecurringActivityRepository(BaseRepository):
             print(f"Error getting activities for member {member_id}: {e}")
             return []
     
-    
     def get_by_category(self, household_id: str, category: str) -> List[RecurringActivity]:
         """Get all activities in a specific category"""
         try:
-            response = self.table.scan(
-                FilterExpression='household_id = :household_id AND category = :category AND is_active = :is_active',
-                ExpressionAttributeValues={
-                    ':household_id': household_id,
-                    ':category': category,
-                    ':is_active': True
-                }
-            )
-            
-            activities = []
-            for item in response.get('Items', []):
-                activities.append(RecurringActivity.from_dict(item))
+            activities = self.query_activities(household_id, category=category)
             
             # Sort by assigned member, then by name
             activities.sort(key=lambda a: (a.assigned_to, a.name.lower()))
@@ -122,18 +348,7 @@ class RecurringActivityRepository(BaseRepository):
     def get_by_frequency(self, household_id: str, frequency: str) -> List[RecurringActivity]:
         """Get all activities with a specific frequency"""
         try:
-            response = self.table.scan(
-                FilterExpression='household_id = :household_id AND frequency = :frequency AND is_active = :is_active',
-                ExpressionAttributeValues={
-                    ':household_id': household_id,
-                    ':frequency': frequency,
-                    ':is_active': True
-                }
-            )
-            
-            activities = []
-            for item in response.get('Items', []):
-                activities.append(RecurringActivity.from_dict(item))
+            activities = self.query_activities(household_id, frequency=frequency)
             
             # Sort by assigned member, then by name
             activities.sort(key=lambda a: (a.assigned_to, a.name.lower()))
@@ -189,53 +404,6 @@ class RecurringActivityRepository(BaseRepository):
             print(f"Error deleting activity {activity_id}: {e}")
             return False
         
-    def get_by_member_id(self, member_id: str, household_id: str) -> List[RecurringActivity]:
-        """Get all activities assigned to a specific member"""
-        try:
-            response = self.table.scan(
-                FilterExpression='household_id = :household_id AND assigned_to = :member_id AND is_active = :is_active',
-                ExpressionAttributeValues={
-                    ':household_id': household_id,
-                    ':member_id': member_id,
-                    ':is_active': True
-                }
-            )
-            
-            activities = []
-            for item in response.get('Items', []):
-                activities.append(RecurringActivity.from_dict(item))
-            
-            # Sort by name
-            activities.sort(key=lambda a: a.name.lower())
-            return activities
-            
-        except ClientError as e:
-            print(f"Error getting activities for member {member_id}: {e}")
-            return []
-        
-    def get_by_member_id(self, member_id: str, household_id: str) -> List[RecurringActivity]:
-        """Get all activities assigned to a specific member"""
-        try:
-            response = self.table.scan(
-                FilterExpression='household_id = :household_id AND assigned_to = :member_id AND is_active = :is_active',
-                ExpressionAttributeValues={
-                    ':household_id': household_id,
-                    ':member_id': member_id,
-                    ':is_active': True
-                }
-            )
-            
-            activities = []
-            for item in response.get('Items', []):
-                activities.append(RecurringActivity.from_dict(item))
-            
-            activities.sort(key=lambda a: a.name.lower())
-            return activities
-            
-        except ClientError as e:
-            print(f"Error getting activities for member {member_id}: {e}")
-            return []
-
     def update(self, activity: RecurringActivity) -> RecurringActivity:
         """Update an existing activity"""
         try:
@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+"""
+Add the TypeDateIndex / MealHistoryIndex keys to meals stored before those
+indexes existed
+
+    python src/kitchen_tracker/jobs/backfill_meal_indexes.py
+
+New writes already carry the keys; items without them are invisible to the
+index queries, so run this once after deploying the indexes. It is safe to
+re-run: only items still missing type_date are touched.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dal.meal_repository import MealRepository
+
+
+def main():
+    repo = MealRepository()
+    pages = 0
+    start_key = None
+    while True:
+        start_key = repo.backfill_index_keys(start_key)
+        pages += 1
+        print(f"Backfilled scan page {pages}")
+        if not start_key:
+            break
+    print(f"Done: {repo.table_name} scanned in {pages} pages")
+
+
+if __name__ == '__main__':
+    main()
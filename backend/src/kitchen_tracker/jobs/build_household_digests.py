@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Precompute each household's dashboard and summary digest for the day
+
+    python src/kitchen_tracker/jobs/build_household_digests.py [--household-id ID ...] [--force]
+
+Runs just after midnight (DigestFunction in template.yaml) so the first
+dashboard loads of the morning read one stored item instead of every
+household rebuilding its dashboard at once. Households that already have
+today's digest are skipped unless --force; the dashboard projector keeps it
+current through the day, and reads build it themselves if this job has not run.
+"""
+
+import argparse
+import json
+import os
+import sys
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dal.family_member_repository import FamilyMemberRepository
+from services.kitchen_service import KitchenService
+from utils.timezone_utils import get_local_date
+
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--household-id', action='append', dest='household_ids',
+                        help="Household to build (repeatable; default all)")
+    parser.add_argument('--force', action='store_true', help="Rebuild digests already built today")
+    args = parser.parse_args(argv)
+
+    household_ids = args.household_ids or FamilyMemberRepository().get_household_ids()
+    service = KitchenService()
+    # The household's day, not the Lambda's (UTC): the schedule runs at midnight in HOUSEHOLD_TIMEZONE
+    today = get_local_date().isoformat()
+    results = {'built': 0, 'skipped': 0}
+    for household_id in household_ids:
+        existing = None if args.force else service.digest_repo.get_digest(household_id)
+        if existing is not None and existing.digest_date == today:
+            results['skipped'] += 1
+            continue
+        digest = service.build_household_digest(household_id)
+        results['built'] += 1
+        print(f"{household_id}: {digest.dashboard['summary']}")
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
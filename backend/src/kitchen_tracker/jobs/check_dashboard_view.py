@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Compare each household's materialized dashboard with a full recompute
+
+    python src/kitchen_tracker/jobs/check_dashboard_view.py [--household-id ID ...] [--repair]
+
+Prints the differences per household and exits non-zero if any view is
+inconsistent. --repair rebuilds the inconsistent views.
+"""
+
+import argparse
+import json
+import os
+import sys
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dal.family_member_repository import FamilyMemberRepository
+from services.kitchen_service import KitchenService
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--household-id', action='append', dest='household_ids',
+                        help="Household to check (repeatable; default all)")
+    parser.add_argument('--repair', action='store_true', help="Rebuild views that are inconsistent")
+    args = parser.parse_args(argv)
+
+    household_ids = args.household_ids or FamilyMemberRepository().get_household_ids()
+    service = KitchenService()
+    results = []
+    for household_id in household_ids:
+        result = service.projector.check(household_id)
+        if not result['consistent'] and args.repair:
+            service.build_household_digest(household_id)
+            result['repaired'] = True
+        results.append(result)
+    print(json.dumps(results, indent=2))
+    return 0 if all(r['consistent'] for r in results) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
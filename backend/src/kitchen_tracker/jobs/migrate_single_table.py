@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Backfill the single-table household layout from the per-entity tables
+
+    python src/kitchen_tracker/jobs/migrate_single_table.py --checkpoint migrate.json \\
+        [--workers 8] [--segments 4] [--meals-table NAME]
+
+Deploy with STORAGE_LAYOUT=single_table first, so live writes are mirrored
+into the household table while this runs; reads keep using the per-entity
+tables for each household until its META marker is written.
+
+Phase 1 scans every source table in parallel segments and batch-writes the
+items into household partitions. Phase 2, per household, replays the change
+log from just before the run started (re-reading each changed entity from
+its source table, which repairs items the scan copied before a concurrent
+write), re-copies its meals (meal writes are not in the change log) and then
+writes the META marker.
+
+Progress is saved to the checkpoint file after every page; re-running with
+the same file resumes where it stopped.
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+from boto3.dynamodb.conditions import Key
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.family_member import FamilyMember
+from models.recurring_activity import RecurringActivity, convert_decimals
+from models.activity_completion import ActivityCompletion
+from models.meal import Meal, MealRecord
+from dal.family_member_repository import FamilyMemberRepository
+from dal.recurring_activity_repository import RecurringActivityRepository
+from dal.activity_completion_repository import ActivityCompletionRepository
+from dal.change_log_repository import ChangeLogRepository
+from dal.household_repository import HouseholdRepository
+
+
+# Change log entries this much older than the run start are replayed too,
+# to cover clock skew between writers and this job
+REPLAY_MARGIN = timedelta(minutes=5)
+
+
+def meal_from_item(item: Dict) -> Optional[object]:
+    """Meal or MealRecord for a meals-table item (record_type tells them apart)"""
+    if item.get('record_type') == 'meal':
+        return Meal.from_dict(item)
+    if item.get('record_type') == 'meal_record':
+        # Records are stored under their record_id; the meal they belong to is kept aside
+        data = dict(item)
+        data['meal_id'] = data.get('original_meal_id', data['meal_id'])
+        return MealRecord.from_dict(data)
+    return None
+
+
+def source_tables(meals_table: str = None) -> Dict[str, Callable[[Dict], object]]:
+    """Source table name -> item to model converter"""
+    sources = {
+        os.getenv('FAMILY_MEMBERS_TABLE', 'FamilyMembers'): FamilyMember.from_dict,
+        os.getenv('RECURRING_ACTIVITIES_TABLE', 'RecurringActivities'): RecurringActivity.from_dict,
+        os.getenv('ACTIVITY_COMPLETIONS_TABLE', 'ActivityCompletions'): ActivityCompletion.from_dict
+    }
+    if meals_table:
+        sources[meals_table] = meal_from_item
+    return sources
+
+
+class Checkpoint:
+    """Migration progress in a JSON file, saved atomically after every change"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.lock = threading.Lock()
+        if os.path.exists(path):
+            with open(path) as f:
+                self.state = json.load(f)
+        else:
+            self.state = {
+                'started_at': datetime.utcnow().isoformat(),
+                'segments': {},
+                'households': [],
+                'households_done': [],
+                'items_written': 0
+            }
+            self.save()
+
+    def save(self):
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, 'w') as f:
+            json.dump(self.state, f, indent=2)
+        os.replace(temp_path, self.path)
+
+    def segment(self, table_name: str, segment: int) -> Dict:
+        return self.state['segments'].get(f"{table_name}:{segment}", {'done': False, 'last_key': None})
+
+    def record_page(self, table_name: str, segment: int, last_key: Optional[Dict],
+                    household_ids: set, written: int):
+        """Remember the next page to read and the households seen so far"""
+        with self.lock:
+            self.state['segments'][f"{table_name}:{segment}"] = {'done': last_key is None, 'last_key': last_key}
+            known = set(self.state['households'])
+            self.state['households'].extend(sorted(household_ids - known))
+            self.state['items_written'] += written
+            self.save()
+
+    def household_done(self, household_id: str):
+        with self.lock:
+            self.state['households_done'].append(household_id)
+            self.save()
+
+
+class SingleTableMigration:
+    """Parallel, resumable copy of the per-entity tables into household partitions"""
+
+    def __init__(self, checkpoint: Checkpoint, workers: int = 8, segments: int = 4, meals_table: str = None):
+        self.checkpoint = checkpoint
+        self.workers = workers
+        # Segment numbers in the checkpoint only make sense with the same total
+        self.segments = checkpoint.state.setdefault('total_segments', segments)
+        self.sources = source_tables(meals_table)
+        self.meals_table = meals_table
+        # boto3 resources are not thread-safe; each worker builds its own repositories
+        self._local = threading.local()
+
+    def _repos(self) -> threading.local:
+        if not hasattr(self._local, 'household'):
+            self._local.household = HouseholdRepository()
+            self._local.members = FamilyMemberRepository()
+            self._local.activities = RecurringActivityRepository()
+            self._local.completions = ActivityCompletionRepository()
+            self._local.change_log = ChangeLogRepository()
+        return self._local
+
+    def copy_segment(self, table_name: str, segment: int) -> int:
+        """Scan one segment of a source table page by page; returns items written"""
+        repos = self._repos()
+        table = repos.household.engine.table(table_name)
+        to_entity = self.sources[table_name]
+        progress = self.checkpoint.segment(table_name, segment)
+        if progress['done']:
+            return 0
+
+        scan_kwargs = {'Segment': segment, 'TotalSegments': self.segments}
+        if progress['last_key']:
+            scan_kwargs['ExclusiveStartKey'] = progress['last_key']
+
+        written = 0
+        while True:
+            response = table.scan(**scan_kwargs)
+            entities = [to_entity(convert_decimals(item)) for item in response.get('Items', [])]
+            entities = [e for e in entities if e is not None]
+            repos.household.batch_put(entities)
+            written += len(entities)
+
+            last_key = response.get('LastEvaluatedKey')
+            self.checkpoint.record_page(table_name, segment, last_key,
+                                        {e.household_id for e in entities}, len(entities))
+            if not last_key:
+                return written
+            scan_kwargs['ExclusiveStartKey'] = last_key
+
+    def recopy_meals(self, household_id: str) -> int:
+        """Copy a household's meals and meal records again, over what the scan may have read before a write"""
+        if not self.meals_table:
+            return 0
+        table = self._repos().household.engine.table(self.meals_table)
+        query_kwargs = {'KeyConditionExpression': Key('user_id').eq(household_id), 'ConsistentRead': True}
+        copied = 0
+        while True:
+            response = table.query(**query_kwargs)
+            entities = [meal_from_item(convert_decimals(item)) for item in response.get('Items', [])]
+            copied += self._repos().household.batch_put([e for e in entities if e is not None])
+            if 'LastEvaluatedKey' not in response:
+                return copied
+            query_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+    def finish_household(self, household_id: str) -> int:
+        """Replay changes made since the run started and re-copy meals, then mark the household migrated"""
+        repos = self._repos()
+        started_at = datetime.fromisoformat(self.checkpoint.state['started_at'])
+        since = (started_at - REPLAY_MARGIN).isoformat()
+        loaders = {
+            'member': repos.members.get_by_id,
+            'activity': repos.activities.get_by_id,
+            'completion': repos.completions.get_by_id
+        }
+
+        replayed = 0
+        while True:
+            changes, has_more = repos.change_log.get_changes_since(household_id, since)
+            for change in changes:
+                entity = loaders[change.entity_type](change.entity_id)
+                if entity is not None:
+                    repos.household.batch_put([entity])
+                elif change.entity_type == 'completion':
+                    repos.household.delete_completion(household_id, change.entity_id)
+                replayed += 1
+            if not has_more or not changes:
+                break
+            since = changes[-1].change_key
+        self.recopy_meals(household_id)
+
+        repos.household.mark_migrated(household_id, datetime.utcnow().isoformat())
+        self.checkpoint.household_done(household_id)
+        return replayed
+
+    def run(self) -> Dict:
+        if ChangeLogRepository.is_token_expired(self.checkpoint.state['started_at']):
+            raise ValueError("Checkpoint is older than the change log retention; start with a new checkpoint file")
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            futures = [executor.submit(self.copy_segment, table_name, segment)
+                       for table_name in self.sources for segment in range(self.segments)]
+            copied = sum(future.result() for future in as_completed(futures))
+
+            remaining = [h for h in self.checkpoint.state['households']
+                         if h not in set(self.checkpoint.state['households_done'])]
+            futures = [executor.submit(self.finish_household, household_id) for household_id in remaining]
+            replayed = sum(future.result() for future in as_completed(futures))
+
+        return {
+            'items_copied': copied,
+            'items_written_total': self.checkpoint.state['items_written'],
+            'households_migrated': len(remaining),
+            'changes_replayed': replayed,
+            'seconds': round(time.perf_counter() - start, 2)
+        }
+
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--checkpoint', required=True, help="Progress file; reuse it to resume")
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--segments', type=int, default=4, help="Parallel scan segments per source table")
+    parser.add_argument('--meals-table', default=os.getenv('MEALS_TABLE'),
+                        help="Meals table to include (user_id/item_id layout)")
+    args = parser.parse_args(argv)
+
+    checkpoint = Checkpoint(args.checkpoint)
+    migration = SingleTableMigration(checkpoint, workers=args.workers, segments=args.segments,
+                                     meals_table=args.meals_table)
+    result = migration.run()
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Recompute streak / on-time counters and activity history bitmaps from completions
+
+    python src/kitchen_tracker/jobs/rebuild_completion_stats.py [--household-id ID ...]
+
+Completions and undos keep the counters current in the same transaction as
+the completion write, so this is only needed for items created before the
+counters or bitmaps existed, or to repair drift. Without --household-id every household
+found in the family members table is rebuilt. Only counters that differ are
+written, each conditioned on the value that was read; a conflict means a
+completion landed meanwhile, and running again picks it up.
+"""
+
+import argparse
+import json
+import os
+import sys
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dal.family_member_repository import FamilyMemberRepository
+from services.kitchen_service import KitchenService
+
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--household-id', action='append', dest='household_ids',
+                        help="Household to rebuild (repeatable; default all)")
+    args = parser.parse_args(argv)
+
+    household_ids = args.household_ids or FamilyMemberRepository().get_household_ids()
+    service = KitchenService()
+    results = {}
+    for household_id in household_ids:
+        results[household_id] = service.rebuild_completion_stats(household_id)
+        print(f"{household_id}: {results[household_id]}")
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Replay households' change logs through the dashboard projector
+
+    python src/kitchen_tracker/jobs/replay_dashboard_view.py [--household-id ID ...] [--since TOKEN] [--rebuild]
+
+Use after the projector missed changes (a failed stream batch past its
+retries, an in-process projection error) or after changing how the view is
+projected. Entries after --since (default: every entry still retained) are
+applied in commit order; projection is idempotent, so overlap with what the
+view already holds is harmless. --rebuild recomputes the view from current
+state first.
+"""
+
+import argparse
+import json
+import os
+import sys
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dal.family_member_repository import FamilyMemberRepository
+from services.kitchen_service import KitchenService
+
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--household-id', action='append', dest='household_ids',
+                        help="Household to replay (repeatable; default all)")
+    parser.add_argument('--since', default=None, help="Change token to replay after")
+    parser.add_argument('--rebuild', action='store_true', help="Rebuild the view before replaying")
+    args = parser.parse_args(argv)
+
+    household_ids = args.household_ids or FamilyMemberRepository().get_household_ids()
+    service = KitchenService()
+    results = [service.projector.replay(household_id, since=args.since, rebuild=args.rebuild)
+               for household_id in household_ids]
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Re-ingest archived Home Chef order emails (e.g. after a parser change)
+
+    python src/kitchen_tracker/jobs/reprocess_emails.py --checkpoint reprocess.json \\
+        [--directory DIR | --bucket NAME] [--prefix inbound/] [--household-id ID] \\
+        [--workers 4] [--concurrency 8] [--batch-size 200]
+
+Emails are taken in key order a batch at a time: objects are downloaded on
+threads, parsed in a process pool, then deduplicated - an email whose
+content hash was already seen is skipped, and meals are merged on their
+natural (household, week_of, name) ID - and written one transaction per
+household-week, several weeks at once. Meals that already exist are left
+alone (a cooked meal stays cooked), so a re-run writes nothing new.
+
+Progress is saved to the checkpoint file after every batch; re-running with
+the same file resumes after the last finished key.
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime
+from itertools import islice
+from typing import Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dal.email_source import EmailSource, LocalEmailSource, S3EmailSource, create_email_source
+from dal.meal_repository import MealRepository
+from services.email_ingest import EMAIL_MEAL_SOURCE
+from services.meal_service import MealService
+from utils.homechef_email import content_hash, parse_homechef_email
+
+COUNTERS = ['emails', 'duplicate_emails', 'meals_found', 'duplicate_meals', 'meals_created']
+
+
+class Checkpoint:
+    """Reprocessing progress in a JSON file, saved atomically after every batch"""
+
+    def __init__(self, path: str):
+        self.path = path
+        if os.path.exists(path):
+            with open(path) as f:
+                self.state = json.load(f)
+        else:
+            self.state = {'started_at': datetime.utcnow().isoformat(), 'last_key': None, 'content_hashes': []}
+            self.state.update({counter: 0 for counter in COUNTERS})
+            self.save()
+
+    def save(self):
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, 'w') as f:
+            json.dump(self.state, f, indent=2)
+        os.replace(temp_path, self.path)
+
+    def record_batch(self, last_key: str, counts: Dict[str, int], content_hashes: set):
+        self.state['last_key'] = last_key
+        for counter in COUNTERS:
+            self.state[counter] += counts.get(counter, 0)
+        self.state['content_hashes'] = sorted(content_hashes)
+        self.save()
+
+
+class EmailReprocessor:
+    """Batched, parallel, resumable re-ingestion of stored order emails"""
+
+    def __init__(self, source: EmailSource, checkpoint: Checkpoint, household_id: str, prefix: str = '',
+                 workers: int = 4, concurrency: int = 8, batch_size: int = 200):
+        self.source = source
+        self.checkpoint = checkpoint
+        self.household_id = household_id
+        self.prefix = prefix
+        self.workers = workers
+        self.concurrency = concurrency
+        self.batch_size = batch_size
+        self.meal_service = MealService()
+        # Keeps migrated households' partitions in step, as MealService.import_meals does
+        self.mirror_ops = self.meal_service.mirror_callback()
+        self.content_hashes = set(checkpoint.state['content_hashes'])
+        # boto3 resources are not thread-safe; each writer thread builds its own repository
+        self._local = threading.local()
+
+    def _repo(self) -> MealRepository:
+        if not hasattr(self._local, 'meals'):
+            self._local.meals = MealRepository()
+        return self._local.meals
+
+    def _read(self, key: str) -> bytes:
+        return b''.join(self.source.open(key))
+
+    def _write_week(self, meals: List) -> int:
+        return len(self._repo().create_meals(meals, mirror_ops=self.mirror_ops))
+
+    def dedupe(self, parsed_emails: List[List[Dict]], counts: Dict[str, int]) -> List:
+        """Meals to write for a batch of parsed emails, skipping repeated emails and meals"""
+        meals = {}
+        for parsed in parsed_emails:
+            if not parsed:
+                continue
+            digest = content_hash(parsed)
+            if digest in self.content_hashes:
+                counts['duplicate_emails'] += 1
+                continue
+            self.content_hashes.add(digest)
+            for meal in self.meal_service.meals_from_email(self.household_id, parsed, EMAIL_MEAL_SOURCE):
+                counts['meals_found'] += 1
+                if meal.meal_id in meals:
+                    counts['duplicate_meals'] += 1
+                else:
+                    meals[meal.meal_id] = meal
+        return list(meals.values())
+
+    def run(self) -> Dict:
+        keys = self.source.list_keys(self.prefix, start_after=self.checkpoint.state['last_key'])
+        totals = {counter: 0 for counter in COUNTERS}
+        start = time.perf_counter()
+        parse_pool = ProcessPoolExecutor(max_workers=self.workers) if self.workers > 1 else None
+        try:
+            with ThreadPoolExecutor(max_workers=self.concurrency) as io_pool:
+                while True:
+                    batch = list(islice(keys, self.batch_size))
+                    if not batch:
+                        break
+                    counts = {counter: 0 for counter in COUNTERS}
+                    counts['emails'] = len(batch)
+
+                    raw_emails = list(io_pool.map(self._read, batch))
+                    if parse_pool:
+                        chunksize = max(1, len(raw_emails) // (self.workers * 4))
+                        parsed = list(parse_pool.map(parse_homechef_email, raw_emails, chunksize=chunksize))
+                    else:
+                        parsed = [parse_homechef_email(raw) for raw in raw_emails]
+                    del raw_emails
+
+                    weeks: Dict[tuple, List] = {}
+                    for meal in self.dedupe(parsed, counts):
+                        weeks.setdefault((meal.household_id, meal.week_of), []).append(meal)
+                    counts['meals_created'] = sum(io_pool.map(self._write_week, weeks.values()))
+
+                    self.checkpoint.record_batch(batch[-1], counts, self.content_hashes)
+                    for counter in COUNTERS:
+                        totals[counter] += counts[counter]
+                    elapsed = time.perf_counter() - start
+                    print(f"{totals['emails']} emails, {totals['meals_created']} meals created, "
+                          f"{totals['emails'] / elapsed:.1f} emails/s (through {batch[-1]})")
+        finally:
+            if parse_pool:
+                parse_pool.shutdown()
+
+        elapsed = time.perf_counter() - start
+        totals['seconds'] = round(elapsed, 2)
+        totals['emails_per_second'] = round(totals['emails'] / elapsed, 1) if elapsed else 0.0
+        return totals
+
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--checkpoint', required=True, help="Progress file; reuse it to resume")
+    location = parser.add_mutually_exclusive_group()
+    location.add_argument('--directory', help="Local directory of raw emails instead of the bucket")
+    location.add_argument('--bucket', help="Email bucket (default EMAIL_BUCKET)")
+    parser.add_argument('--prefix', default=os.getenv('EMAIL_PREFIX', ''))
+    parser.add_argument('--household-id', default=os.getenv('HOUSEHOLD_ID', 'default'))
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help="Parser processes")
+    parser.add_argument('--concurrency', type=int, default=8, help="Downloads and week writes in flight")
+    parser.add_argument('--batch-size', type=int, default=200, help="Emails per checkpointed batch")
+    args = parser.parse_args(argv)
+
+    if args.directory:
+        source = LocalEmailSource(args.directory)
+    elif args.bucket:
+        source = S3EmailSource(args.bucket)
+    else:
+        source = create_email_source()
+
+    reprocessor = EmailReprocessor(source, Checkpoint(args.checkpoint), args.household_id, prefix=args.prefix,
+                                   workers=args.workers, concurrency=args.concurrency,
+                                   batch_size=args.batch_size)
+    result = reprocessor.run()
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Send the activity reminders that are due, or schedule reminders for older activities
+
+    python src/kitchen_tracker/jobs/send_reminders.py [--window-minutes 15] [--sink log|webhook|email]
+    python src/kitchen_tracker/jobs/send_reminders.py --backfill
+
+The deployed ReminderFunction does the same on a schedule. Runs may overlap:
+each reminder is claimed before it is sent, so it goes out once. Activities
+created before reminders existed have no next_due_at and are never picked
+up until --backfill (or their next completion) schedules them.
+"""
+
+import argparse
+import json
+import os
+import sys
+from datetime import timedelta
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.kitchen_service import KitchenService
+from services.reminders import ReminderScheduler, create_reminder_sink
+from utils.timezone_utils import get_local_datetime
+
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--window-minutes', type=int, default=15,
+                        help="Also send reminders due this many minutes ahead")
+    parser.add_argument('--sink', default=None, help="Reminder sink (default REMINDER_SINK or log)")
+    parser.add_argument('--batch-size', type=int, default=25, help="Reminders per sink call")
+    parser.add_argument('--backfill', action='store_true',
+                        help="Schedule reminders for activities that have none instead of sending")
+    args = parser.parse_args(argv)
+
+    if args.backfill:
+        result = KitchenService().backfill_reminders()
+    else:
+        scheduler = ReminderScheduler(sink=create_reminder_sink(args.sink), batch_size=args.batch_size)
+        result = scheduler.run(get_local_datetime(), timedelta(minutes=args.window_minutes))
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == '__main__':
+    main()
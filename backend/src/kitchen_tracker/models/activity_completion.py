@@ -1,10 +1,25 @@
+import sys
+import threading
 import uuid
+from collections import OrderedDict
 from datetime import datetime, date
-from typing import Optional
+
+# Import with fallback for Lambda environment
+try:
+    from .completion_stats import CompletionStats
+except ImportError:
+    # Lambda environment - use absolute imports
+    from models.completion_stats import CompletionStats
 
 class ActivityCompletion:
     """Records when a recurring activity was completed"""
     
+    # Slotted: analytics loads hundreds of thousands of these at once
+    __slots__ = (
+        'completion_id', 'activity_id', 'member_id', 'household_id', '_completion_date',
+        'completion_date_obj', 'completed_at', '_completed_at_obj', 'completed_by', 'notes'
+    )
+    
     def __init__(
         self,
         activity_id: str,
@@ -22,18 +37,27 @@ class ActivityCompletion:
         self.household_id = household_id
         self.completion_date = completion_date or date.today().isoformat()
         self.completed_at = completed_at or datetime.utcnow().isoformat()
+        self._completed_at_obj = None
         self.completed_by = completed_by or member_id  # defaults to assigned person
         self.notes = notes
     
     @property
-    def completion_date_obj(self) -> date:
-        """Return completion_date as a date object"""
-        return date.fromisoformat(self.completion_date)
+    def completion_date(self) -> str:
+        return self._completion_date
+    
+    @completion_date.setter
+    def completion_date(self, value: str):
+        # Parsed once here into a plain slot; status checks read it many times
+        self._completion_date = value
+        self.completion_date_obj = date.fromisoformat(value)
     
     @property
     def completed_at_obj(self) -> datetime:
         """Return completed_at as a datetime object"""
-        return datetime.fromisoformat(self.completed_at.replace('Z', '+00:00'))
+        # Rarely needed, so parsed on first use and cached
+        if self._completed_at_obj is None:
+            self._completed_at_obj = datetime.fromisoformat(self.completed_at.replace('Z', '+00:00'))
+        return self._completed_at_obj
     
     def to_dict(self) -> dict:
         result = {
@@ -54,6 +78,22 @@ class ActivityCompletion:
     
     @classmethod
     def from_dict(cls, data: dict) -> 'ActivityCompletion':
+        # Stored items carry every generated field, so skip __init__'s defaults.
+        # Ids repeat across a household's history; interning keeps one copy each.
+        if data.get('completion_id') and data.get('completion_date') and data.get('completed_at'):
+            completion = cls.__new__(cls)
+            completion.completion_id = data['completion_id']
+            completion.activity_id = sys.intern(data['activity_id'])
+            completion.member_id = sys.intern(data['member_id'])
+            completion.household_id = sys.intern(data['household_id'])
+            completion._completion_date = data['completion_date']
+            completion.completion_date_obj = date.fromisoformat(data['completion_date'])
+            completion.completed_at = data['completed_at']
+            completion._completed_at_obj = None
+            completion.completed_by = sys.intern(data.get('completed_by') or data['member_id'])
+            completion.notes = data.get('notes')
+            return completion
+        
         return cls(
             activity_id=data['activity_id'],
             member_id=data['member_id'],
@@ -97,52 +137,92 @@ class ActivityCompletion:
 
 
 class ActivityStatus:
-    """Helper class to represent activity status with completion context"""
+    """Helper class to represent activity status with completion context
+
+    Derived fields are computed once, at construction, against a single
+    reference date. The result depends only on the schedule, the last
+    completion date and that date, so it is memoized across instances in a
+    bounded LRU: repeated dashboard renders within a day reuse it.
+    """
+    
+    CACHE_SIZE = 4096
+    _cache = OrderedDict()
+    _cache_lock = threading.Lock()
+    cache_hits = 0
+    cache_misses = 0
     
     def __init__(
         self,
         activity: 'RecurringActivity',  # Import will be handled at runtime
         last_completion: ActivityCompletion = None,
-        member_name: str = None
+        member_name: str = None,
+        today: date = None,
+        period_completions: int = None  # Completions in the current slot, for times_per_day rules
     ):
         self.activity = activity
         self.last_completion = last_completion
         self.member_name = member_name
+        self.today = today or date.today()
+        self.period_completions = period_completions
+        self.last_completed_date = last_completion.completion_date_obj if last_completion else None
+        
+        self.is_due_today, self.is_overdue, self.status, self.next_due_date = self._derive()
     
-    @property
-    def last_completed_date(self) -> Optional[date]:
-        """Get the last completion date as a date object"""
-        if self.last_completion:
-            return self.last_completion.completion_date_obj
-        return None
-    
-    @property
-    def is_due_today(self) -> bool:
-        """Check if activity is due today"""
-        return self.activity.is_due_today(self.last_completed_date)
-    
-    @property
-    def is_overdue(self) -> bool:
-        """Check if activity is overdue"""
-        return self.activity.is_overdue(self.last_completed_date)
+    def _derive(self) -> tuple:
+        """(is_due_today, is_overdue, status, next_due_date), from the cache when possible"""
+        activity = self.activity
+        # Compiled recurrences are shared per rule, so the object stands in for the schedule
+        key = (activity.activity_id, activity.recurrence, self.last_completed_date, self.today,
+               self.period_completions)
+        
+        cls = ActivityStatus
+        with cls._cache_lock:
+            derived = cls._cache.get(key)
+            if derived is not None:
+                cls._cache.move_to_end(key)
+                cls.cache_hits += 1
+                return derived
+        
+        last_completed = self.last_completed_date
+        derived = (
+            activity.is_due_today(last_completed, self.today, self.period_completions),
+            activity.is_overdue(last_completed, self.today),
+            activity.get_current_period_status(last_completed, self.today, self.period_completions),
+            # Due today if never completed
+            activity.get_next_due_date(last_completed) if last_completed else self.today
+        )
+        
+        with cls._cache_lock:
+            cls.cache_misses += 1
+            cls._cache[key] = derived
+            if len(cls._cache) > cls.CACHE_SIZE:
+                cls._cache.popitem(last=False)
+        return derived
     
-    @property
-    def status(self) -> str:
-        """Get current status: 'completed', 'due', 'overdue', 'upcoming'"""
-        return self.activity.get_current_period_status(self.last_completed_date)
+    @classmethod
+    def cache_info(cls) -> dict:
+        """Hit/miss counters and current size of the derived-field cache"""
+        with cls._cache_lock:
+            return {'hits': cls.cache_hits, 'misses': cls.cache_misses,
+                    'size': len(cls._cache), 'max_size': cls.CACHE_SIZE}
     
-    @property
-    def next_due_date(self) -> date:
-        """Get the next due date"""
-        if self.last_completed_date:
-            return self.activity.get_next_due_date(self.last_completed_date)
-        else:
-            return date.today()  # Due today if never completed
+    @classmethod
+    def clear_cache(cls):
+        """Drop memoized results and reset the counters"""
+        with cls._cache_lock:
+            cls._cache.clear()
+            cls.cache_hits = 0
+            cls.cache_misses = 0
     
     def to_dict(self) -> dict:
         """Convert to dictionary for API responses"""
         result = self.activity.to_dict()
+        result.pop('last_completion', None)  # Flattened into the fields below
+        for attribute in CompletionStats.ATTRIBUTES:
+            result.pop(attribute, None)  # Summarized under 'stats'
+        stats = self.activity.stats
         result.update({
+            'stats': stats.summary(self.activity.recurrence, self.today) if stats is not None else None,
             'member_name': self.member_name,
             'last_completed_date': self.last_completed_date.isoformat() if self.last_completed_date else None,
             'last_completed_by': self.last_completion.completed_by if self.last_completion else None,
@@ -150,10 +230,11 @@ class ActivityStatus:
             'is_overdue': self.is_overdue,
             'status': self.status,
             'next_due_date': self.next_due_date.isoformat(),
+            'period_completions': self.period_completions,
             'completed': self.status == 'completed'  # For frontend compatibility
         })
         
         if self.last_completion and self.last_completion.notes:
             result['last_completion_notes'] = self.last_completion.notes
             
-        return result
\ No newline at end of file
+        return result
@@ -0,0 +1,69 @@
+import uuid
+from datetime import datetime
+
+class ChangeEntry:
+    """One row in a household's change log, used for incremental client sync"""
+
+    ENTITY_TYPES = ['member', 'activity', 'completion']
+    OPERATIONS = ['upsert', 'delete']
+
+    def __init__(
+        self,
+        household_id: str,
+        entity_type: str,   # "member", "activity" or "completion"
+        entity_id: str,
+        operation: str,     # "upsert" or "delete"
+        data: dict = None,  # snapshot of the entity after the change (upserts only)
+        changed_at: str = None,
+        change_id: str = None
+    ):
+        self.change_id = change_id or str(uuid.uuid4())
+        self.household_id = household_id
+        self.entity_type = entity_type
+        self.entity_id = entity_id
+        self.operation = operation
+        self.data = data
+        # Fixed width, so keys sort by time even when the microseconds are 0
+        self.changed_at = changed_at or datetime.utcnow().isoformat(timespec='microseconds')
+
+        if self.entity_type not in self.ENTITY_TYPES:
+            raise ValueError(f"entity_type must be one of {self.ENTITY_TYPES}")
+        if self.operation not in self.OPERATIONS:
+            raise ValueError(f"operation must be one of {self.OPERATIONS}")
+
+    @property
+    def change_key(self) -> str:
+        """Sort key within the household; also the (URL-safe) sync token"""
+        return f"{self.changed_at}_{self.change_id}"
+
+    def to_dict(self) -> dict:
+        result = {
+            'household_id': self.household_id,
+            'change_key': self.change_key,
+            'change_id': self.change_id,
+            'entity_type': self.entity_type,
+            'entity_id': self.entity_id,
+            'operation': self.operation,
+            'changed_at': self.changed_at
+        }
+
+        # Deletes only carry the id
+        if self.data is not None:
+            result['data'] = self.data
+
+        return result
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'ChangeEntry':
+        return cls(
+            household_id=data['household_id'],
+            entity_type=data['entity_type'],
+            entity_id=data['entity_id'],
+            operation=data['operation'],
+            data=data.get('data'),
+            changed_at=data.get('changed_at'),
+            change_id=data.get('change_id')
+        )
+
+    def __repr__(self) -> str:
+        return f"ChangeEntry({self.operation} {self.entity_type}={self.entity_id} at {self.changed_at})"
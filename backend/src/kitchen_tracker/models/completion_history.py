@@ -0,0 +1,128 @@
+from datetime import date, timedelta
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+HISTORY_ATTRIBUTE_PREFIX = 'history_'
+
+
+def days_in_year(year: int) -> int:
+    return (date(year + 1, 1, 1) - date(year, 1, 1)).days
+
+
+@lru_cache(maxsize=32)
+def period_masks(year: int, frequency: str) -> Tuple[Tuple[str, int], ...]:
+    """(period key, day mask) for every period starting in `year`
+
+    Bit i of a mask is day i counted from January 1st; the last week's mask
+    runs past December 31st into the next year's bits. Period keys match
+    completion_stats.period_of.
+    """
+    start = date(year, 1, 1)
+    length = days_in_year(year)
+    if frequency == 'weekly':
+        first_monday = (7 - start.weekday()) % 7
+        return tuple(((start + timedelta(days=offset)).isoformat(), 0b1111111 << offset)
+                     for offset in range(first_monday, length, 7))
+    if frequency == 'monthly':
+        masks = []
+        for month in range(1, 13):
+            offset = (date(year, month, 1) - start).days
+            month_days = ((date(year + month // 12, month % 12 + 1, 1)) - date(year, month, 1)).days
+            masks.append((f"{year:04d}-{month:02d}", ((1 << month_days) - 1) << offset))
+        return tuple(masks)
+    return tuple(((start + timedelta(days=offset)).isoformat(), 1 << offset) for offset in range(length))
+
+
+class CompletionHistory:
+    """The days an activity was completed, as one packed bitmap per calendar year
+
+    Each year is stored as a Binary attribute history_<year> on the activity
+    item: bit i (little-endian) set when the activity was completed on day i
+    of the year, 46 bytes for a full year. Whatever the frequency, the days
+    are kept; weekly and monthly heatmap cells are folded from them with
+    period_masks, and household heatmaps add bitmaps together (day_counts).
+    """
+
+    __slots__ = ('years',)
+
+    def __init__(self, years: Dict[int, int] = None):
+        self.years = dict(years or {})
+
+    @staticmethod
+    def attribute(year: int) -> str:
+        return f"{HISTORY_ATTRIBUTE_PREFIX}{year}"
+
+    def bits(self, year: int) -> int:
+        return self.years.get(year, 0)
+
+    def packed(self, year: int) -> bytes:
+        return self.bits(year).to_bytes((days_in_year(year) + 7) // 8, 'little')
+
+    def is_completed(self, day: date) -> bool:
+        return bool(self.bits(day.year) >> (day.timetuple().tm_yday - 1) & 1)
+
+    def mark(self, day: date, completed: bool) -> Dict[str, bytes]:
+        """Set or clear one day; returns the item attribute to write"""
+        bit = 1 << (day.timetuple().tm_yday - 1)
+        bits = self.bits(day.year)
+        self.years[day.year] = bits | bit if completed else bits & ~bit
+        return {self.attribute(day.year): self.packed(day.year)}
+
+    def cells(self, year: int, frequency: str) -> List[Tuple[str, bool]]:
+        """(period key, completed) for each period of the activity's frequency starting in `year`"""
+        span = self.bits(year) | self.bits(year + 1) << days_in_year(year)
+        return [(period, bool(span & mask)) for period, mask in period_masks(year, frequency)]
+
+    @classmethod
+    def from_days(cls, days: Iterable[date]) -> 'CompletionHistory':
+        history = cls()
+        for day in days:
+            history.mark(day, True)
+        return history
+
+    def to_item(self) -> Dict[str, bytes]:
+        return {self.attribute(year): self.packed(year) for year in sorted(self.years)}
+
+    @classmethod
+    def from_item(cls, data: Dict[str, Any]) -> Optional['CompletionHistory']:
+        """Bitmaps stored on an item, or None if its completions were never recorded in them
+
+        Only an item with no bitmaps and no completions (a new activity) has
+        an empty history; anything older is rebuilt from completions.
+        """
+        years = {}
+        for attribute, value in data.items():
+            if attribute.startswith(HISTORY_ATTRIBUTE_PREFIX):
+                # boto3 returns Binary wrappers, the other engines bytes
+                years[int(attribute[len(HISTORY_ATTRIBUTE_PREFIX):])] = int.from_bytes(
+                    bytes(getattr(value, 'value', value)), 'little')
+        if not years and data.get('total_completions') != 0:
+            return None
+        return cls(years)
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, CompletionHistory) and (
+            {y: b for y, b in self.years.items() if b} == {y: b for y, b in other.years.items() if b})
+
+    def __repr__(self) -> str:
+        return f"CompletionHistory({ {year: bin(bits).count('1') for year, bits in sorted(self.years.items())} })"
+
+
+def day_counts(histories: Iterable[CompletionHistory], year: int) -> List[int]:
+    """Number of histories completed on each day of `year`
+
+    The bitmaps are summed as a bit-sliced counter: planes[k] holds bit k
+    of every day's count, so each activity costs a few whole-year bitwise
+    operations instead of one per day.
+    """
+    planes: List[int] = []
+    for history in histories:
+        carry = history.bits(year)
+        for k, plane in enumerate(planes):
+            if not carry:
+                break
+            planes[k], carry = plane ^ carry, plane & carry
+        if carry:
+            planes.append(carry)
+
+    return [sum(((plane >> day) & 1) << k for k, plane in enumerate(planes)) for day in range(days_in_year(year))]
@@ -0,0 +1,195 @@
+from datetime import date, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+STREAK_UNITS = {'daily': 'days', 'weekly': 'weeks', 'monthly': 'months'}
+
+
+def period_of(day: date, frequency) -> str:
+    """Key of the schedule period a date falls in: the day, the week's Monday, or YYYY-MM
+
+    frequency may also be an activity's Recurrence, whose slots are its periods.
+    """
+    if not isinstance(frequency, str):
+        return frequency.period_key(day)
+    if frequency == 'weekly':
+        return (day - timedelta(days=day.weekday())).isoformat()
+    if frequency == 'monthly':
+        return day.strftime('%Y-%m')
+    return day.isoformat()
+
+
+def next_period(period: str, frequency) -> str:
+    if not isinstance(frequency, str):
+        return frequency.next_period_key(period)
+    if frequency == 'monthly':
+        year, month = (int(part) for part in period.split('-'))
+        return f"{year + month // 12:04d}-{month % 12 + 1:02d}"
+    return (date.fromisoformat(period) + timedelta(days=7 if frequency == 'weekly' else 1)).isoformat()
+
+
+def previous_period(period: str, frequency) -> str:
+    if not isinstance(frequency, str):
+        return frequency.previous_period_key(period)
+    if frequency == 'monthly':
+        year, month = (int(part) for part in period.split('-'))
+        return f"{year - (month == 1):04d}-{(month - 2) % 12 + 1:02d}"
+    return (date.fromisoformat(period) - timedelta(days=7 if frequency == 'weekly' else 1)).isoformat()
+
+
+class CompletionStats:
+    """Streak and on-time counters of an activity (in its own periods) or a member (in days)
+
+    Stored as top-level attributes of the activity or member item, so the
+    complete and undo transactions adjust them with ADD and SET:
+
+        total_completions     completions recorded
+        on_time_completions   of those, made before the activity was overdue
+        current_streak        consecutive periods with a completion, ending at streak_period
+        longest_streak
+        streak_period         latest period with a completion (see period_of)
+
+    after_completion/after_undo return None when a change cannot be applied
+    from the counters alone (a backdated completion, undoing anything but
+    the head of the streak); the caller then rebuilds from history.
+    """
+
+    __slots__ = ('total_completions', 'on_time_completions', 'current_streak', 'longest_streak', 'streak_period')
+
+    ATTRIBUTES = __slots__
+
+    def __init__(self, total_completions: int = 0, on_time_completions: int = 0, current_streak: int = 0,
+                 longest_streak: int = 0, streak_period: str = None):
+        self.total_completions = total_completions
+        self.on_time_completions = on_time_completions
+        self.current_streak = current_streak
+        self.longest_streak = longest_streak
+        self.streak_period = streak_period
+
+    def after_completion(self, period: str, on_time: bool, frequency: str) -> Optional['CompletionStats']:
+        """Counters once a completion in `period` is added, or None if it lands before the streak"""
+        if self.streak_period and period < self.streak_period:
+            return None
+        if period == self.streak_period:
+            streak = self.current_streak
+        elif self.streak_period and period == next_period(self.streak_period, frequency):
+            streak = self.current_streak + 1
+        else:
+            streak = 1
+        return CompletionStats(self.total_completions + 1, self.on_time_completions + int(on_time),
+                               streak, max(self.longest_streak, streak), period)
+
+    def after_undo(self, period: str, on_time: bool, period_still_completed: bool,
+                   frequency: str) -> Optional['CompletionStats']:
+        """Counters once a completion in `period` is removed, or None if only history can tell
+
+        period_still_completed: another completion remains in the same period.
+        """
+        total = self.total_completions - 1
+        on_time_total = self.on_time_completions - int(on_time)
+        if total <= 0:
+            return CompletionStats()
+        if period_still_completed:
+            return CompletionStats(total, on_time_total, self.current_streak, self.longest_streak, self.streak_period)
+        if period == self.streak_period and 1 < self.current_streak < self.longest_streak:
+            # The head of a streak that is not the longest: shorten it by one period
+            return CompletionStats(total, on_time_total, self.current_streak - 1, self.longest_streak,
+                                   previous_period(period, frequency))
+        return None
+
+    @classmethod
+    def from_history(cls, completions: Iterable[Tuple[date, bool]], frequency: str) -> 'CompletionStats':
+        """Counters for (completion_date, on_time) pairs in any order"""
+        stats = cls()
+        periods = set()
+        for day, on_time in completions:
+            stats.total_completions += 1
+            stats.on_time_completions += int(on_time)
+            periods.add(period_of(day, frequency))
+
+        for period in sorted(periods):
+            if stats.streak_period and period == next_period(stats.streak_period, frequency):
+                stats.current_streak += 1
+            else:
+                stats.current_streak = 1
+            stats.longest_streak = max(stats.longest_streak, stats.current_streak)
+            stats.streak_period = period
+        return stats
+
+    def summary(self, frequency: str, today: date = None) -> Dict[str, Any]:
+        """Display values; the current streak reads 0 once a whole period has passed without a completion"""
+        current = self.current_streak
+        if self.streak_period:
+            last_period = previous_period(period_of(today or date.today(), frequency), frequency)
+            if self.streak_period < last_period:
+                current = 0
+        return {
+            'current_streak': current,
+            'longest_streak': self.longest_streak,
+            'streak_unit': STREAK_UNITS.get(frequency, 'days') if isinstance(frequency, str) else frequency.streak_unit,
+            'total_completions': self.total_completions,
+            'on_time_completions': self.on_time_completions,
+            'on_time_rate': round(self.on_time_completions / self.total_completions, 3)
+            if self.total_completions else None
+        }
+
+    def to_item(self) -> Dict[str, Any]:
+        return {attribute: getattr(self, attribute) for attribute in self.ATTRIBUTES}
+
+    @classmethod
+    def from_item(cls, data: Dict[str, Any]) -> Optional['CompletionStats']:
+        """Counters stored on an item, or None for items written before they existed"""
+        if 'total_completions' not in data:
+            return None
+        return cls(
+            int(data.get('total_completions') or 0),
+            int(data.get('on_time_completions') or 0),
+            int(data.get('current_streak') or 0),
+            int(data.get('longest_streak') or 0),
+            data.get('streak_period')
+        )
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, CompletionStats) and self.to_item() == other.to_item()
+
+    def __repr__(self) -> str:
+        return (f"CompletionStats(total={self.total_completions}, on_time={self.on_time_completions}, "
+                f"streak={self.current_streak}/{self.longest_streak} through {self.streak_period})")
+
+
+def on_time_flags(completions: List, activity) -> List[Tuple[date, bool]]:
+    """(completion_date, on_time) for one activity's completions
+
+    A completion is on time unless the activity was already overdue, counting
+    from the completion before it; the first completion is always on time.
+    """
+    flags, previous = [], None
+    for completion in sorted(completions, key=lambda c: c.completion_date):
+        day = completion.completion_date_obj
+        flags.append((day, previous is None or activity is None or not activity.is_overdue(previous, day)))
+        previous = day
+    return flags
+
+
+def build_stats(activities: Dict[str, Any], completions: Iterable) -> Tuple[Dict[str, CompletionStats],
+                                                                            Dict[str, CompletionStats]]:
+    """Activity and member counters recomputed from completion history
+
+    activities maps activity_id to RecurringActivity; completions of activities
+    not in it still count for their member (as on time).
+    """
+    by_activity: Dict[str, List] = {}
+    for completion in completions:
+        by_activity.setdefault(completion.activity_id, []).append(completion)
+
+    activity_stats, member_days = {}, {}
+    for activity_id, activity_completions in by_activity.items():
+        activity = activities.get(activity_id)
+        flags = on_time_flags(activity_completions, activity)
+        if activity is not None:
+            activity_stats[activity_id] = CompletionStats.from_history(flags, activity.recurrence)
+        by_date = sorted(activity_completions, key=lambda c: c.completion_date)
+        for completion, flag in zip(by_date, flags):
+            member_days.setdefault(completion.member_id, []).append(flag)
+
+    member_stats = {member_id: CompletionStats.from_history(days, 'daily') for member_id, days in member_days.items()}
+    return activity_stats, member_stats
@@ -2,9 +2,18 @@ import uuid
 from datetime import datetime
 from typing import Optional
 
+# Import with fallback for Lambda environment
+try:
+    from .completion_stats import CompletionStats
+except ImportError:
+    # Lambda environment - use absolute imports
+    from models.completion_stats import CompletionStats
+
 class FamilyMember:
     """Represents a person or pet in the household"""
     
+    __slots__ = ('member_id', 'name', 'member_type', 'pet_type', 'household_id', 'created_at', 'is_active', 'stats')
+    
     def __init__(
         self,
         name: str,
@@ -20,6 +29,8 @@ class FamilyMember:
         self.household_id = household_id
         self.created_at = datetime.utcnow().isoformat()
         self.is_active = True
+        # Day-streak and on-time counters over all the member's activities
+        self.stats = CompletionStats()
         
         # Validate member type
         if self.member_type not in ['person', 'pet']:
@@ -42,11 +53,26 @@ class FamilyMember:
         # Only include pet_type if it's a pet
         if self.member_type == 'pet' and self.pet_type:
             result['pet_type'] = self.pet_type
+        if self.stats is not None:
+            result.update(self.stats.to_item())
             
         return result
     
     @classmethod
     def from_dict(cls, data: dict) -> 'FamilyMember':
+        # Stored items were validated on creation, so skip __init__'s defaults
+        if data.get('member_id') and 'created_at' in data:
+            member = cls.__new__(cls)
+            member.member_id = data['member_id']
+            member.name = data['name']
+            member.member_type = data['member_type'].lower()
+            member.pet_type = data['pet_type'].lower() if data.get('pet_type') else None
+            member.household_id = data['household_id']
+            member.created_at = data['created_at']
+            member.is_active = data.get('is_active', True)
+            member.stats = CompletionStats.from_item(data)
+            return member
+        
         member = cls(
             name=data['name'],
             member_type=data['member_type'],
@@ -59,6 +85,7 @@ class FamilyMember:
             member.created_at = data['created_at']
         if 'is_active' in data:
             member.is_active = data['is_active']
+        member.stats = CompletionStats.from_item(data)
             
         return member
     
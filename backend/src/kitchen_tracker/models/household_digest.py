@@ -0,0 +1,109 @@
+import gzip
+import json
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+# Dashboard list for each activity status; anything else counts as upcoming
+DASHBOARD_LISTS = {'completed': 'completed_today', 'overdue': 'overdue', 'due': 'due_today'}
+
+
+def dashboard_from_statuses(household_id: str, day: str, activities: Iterable[Dict]) -> Dict[str, Any]:
+    """Dashboard payload for activity status dicts, already in display order"""
+    lists = {'due_today': [], 'overdue': [], 'completed_today': [], 'upcoming': []}
+    for activity_data in activities:
+        lists[DASHBOARD_LISTS.get(activity_data.get('status', 'due'), 'upcoming')].append(activity_data)
+
+    return {
+        'household_id': household_id,
+        'date': day,
+        'summary': {
+            'total_activities': sum(len(items) for items in lists.values()),
+            'due_today': len(lists['due_today']),
+            'overdue': len(lists['overdue']),
+            'completed_today': len(lists['completed_today']),
+            'upcoming': len(lists['upcoming'])
+        },
+        **lists
+    }
+
+
+class HouseholdDigest:
+    """A household's materialized dashboard and summary for one day
+
+    Built in full once a day, then kept current by the dashboard projector,
+    which patches the activities each committed change touches.
+    change_token is the newest change-log entry applied; version counts
+    writes, so concurrent projectors replace the item only over the version
+    they read. Stored as one item whose snapshot is gzipped JSON, since
+    status payloads hold floats DynamoDB will not take as numbers.
+    """
+
+    __slots__ = ('household_id', 'digest_date', 'change_token', 'built_at', 'dashboard', 'summary', 'version')
+
+    def __init__(self, household_id: str, digest_date: str, change_token: Optional[str],
+                 dashboard: Dict[str, Any], summary: Dict[str, Any], built_at: str = None, version: int = 0):
+        self.household_id = household_id
+        self.digest_date = digest_date
+        self.change_token = change_token
+        self.built_at = built_at or datetime.utcnow().isoformat()
+        self.dashboard = dashboard
+        self.summary = summary
+        self.version = version
+
+    def activities(self) -> List[Dict]:
+        """Every activity on the dashboard, in display order"""
+        items = [a for key in ('due_today', 'overdue', 'completed_today', 'upcoming') for a in self.dashboard[key]]
+        return sorted(items, key=lambda a: a['name'].lower())
+
+    def patch(self, statuses: Dict[str, Optional[Dict]], change_token: str) -> None:
+        """Replace the given activities' entries (None removes one) and record change_token
+
+        Entries hold each activity's current status, so applying a change again,
+        or out of order, gives the same result.
+        """
+        activities = [a for a in self.activities() if a['activity_id'] not in statuses]
+        activities += [status for status in statuses.values() if status is not None]
+        activities.sort(key=lambda a: a['name'].lower())
+
+        self.dashboard = dashboard_from_statuses(self.household_id, self.digest_date, activities)
+        # The household listing only holds active activities
+        self.summary['activities'] = {'total': len(activities), 'active': len(activities)}
+        self.change_token = max(self.change_token or '', change_token)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'household_id': self.household_id,
+            'digest_date': self.digest_date,
+            'change_token': self.change_token,
+            'built_at': self.built_at,
+            'version': self.version,
+            'dashboard': self.dashboard,
+            'summary': self.summary
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'HouseholdDigest':
+        return cls(data['household_id'], data['digest_date'], data.get('change_token'), data['dashboard'],
+                   data['summary'], built_at=data.get('built_at'), version=data.get('version', 0))
+
+    def to_item(self) -> Dict[str, Any]:
+        snapshot = json.dumps({'dashboard': self.dashboard, 'summary': self.summary}, default=str)
+        item = {
+            'household_id': self.household_id,
+            'digest_date': self.digest_date,
+            'built_at': self.built_at,
+            'version': self.version,
+            'snapshot': gzip.compress(snapshot.encode(), compresslevel=6)
+        }
+        if self.change_token:
+            item['change_token'] = self.change_token
+        return item
+
+    @classmethod
+    def from_item(cls, item: Dict[str, Any]) -> 'HouseholdDigest':
+        # boto3 returns Binary wrappers, the other engines bytes
+        packed = bytes(getattr(item['snapshot'], 'value', item['snapshot']))
+        snapshot = json.loads(gzip.decompress(packed))
+        return cls(item['household_id'], item['digest_date'], item.get('change_token'),
+                   snapshot['dashboard'], snapshot['summary'], built_at=item.get('built_at'),
+                   version=int(item.get('version', 0)))
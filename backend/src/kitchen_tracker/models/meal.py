@@ -3,6 +3,13 @@ from datetime import datetime, date
 from typing import Optional
 
 class Meal:
+    __slots__ = (
+        'meal_id', 'name', 'household_id', 'week_of', 'recipe_url', 'delivery_date',
+        'status', 'created_at', 'is_active', 'source'
+    )
+    
+    STATUSES = ['ordered', 'delivered', 'cooked']
+    
     def __init__(
         self,
         name: str,
@@ -10,7 +17,8 @@ class Meal:
         week_of: str,  # YYYY-MM-DD format (Monday of delivery week)
         recipe_url: str = None,
         delivery_date: str = None,
-        meal_id: str = None
+        meal_id: str = None,
+        source: str = None  # "home_chef_email", "manual", ...
     ):
         self.meal_id = meal_id or str(uuid.uuid4())
         self.name = name  # "Bacon Cheeseburger Flatbreads", "Creamy Tuscan Chicken"
@@ -21,6 +29,7 @@ class Meal:
         self.status = "ordered"  # ordered -> delivered -> cooked
         self.created_at = datetime.utcnow().isoformat()
         self.is_active = True
+        self.source = source
     
     def mark_delivered(self, delivery_date: str = None):
         """Mark meal as delivered"""
@@ -42,18 +51,35 @@ class Meal:
             'delivery_date': self.delivery_date,
             'status': self.status,
             'created_at': self.created_at,
-            'is_active': self.is_active
+            'is_active': self.is_active,
+            'source': self.source
         }
     
     @classmethod
     def from_dict(cls, data: dict) -> 'Meal':
+        # Stored items carry every generated field, so skip __init__'s defaults
+        if data.get('meal_id') and 'created_at' in data:
+            meal = cls.__new__(cls)
+            meal.meal_id = data['meal_id']
+            meal.name = data['name']
+            meal.household_id = data['household_id']
+            meal.week_of = data['week_of']
+            meal.recipe_url = data.get('recipe_url')
+            meal.delivery_date = data.get('delivery_date')
+            meal.status = data.get('status', 'ordered')
+            meal.created_at = data['created_at']
+            meal.is_active = data.get('is_active', True)
+            meal.source = data.get('source')
+            return meal
+        
         meal = cls(
             name=data['name'],
             household_id=data['household_id'],
             week_of=data['week_of'],
             recipe_url=data.get('recipe_url'),
             delivery_date=data.get('delivery_date'),
-            meal_id=data.get('meal_id')
+            meal_id=data.get('meal_id'),
+            source=data.get('source')
         )
         if 'status' in data:
             meal.status = data['status']
@@ -66,6 +92,11 @@ class Meal:
 
 class MealRecord:
     """Records when a meal was cooked"""
+    __slots__ = (
+        'record_id', 'meal_id', 'household_id', 'cooked_by', '_cooked_date', 'cooked_date_obj',
+        'cooked_at', 'notes'
+    )
+    
     def __init__(
         self,
         meal_id: str,
@@ -84,6 +115,16 @@ class MealRecord:
         self.cooked_at = cooked_at or datetime.utcnow().isoformat()
         self.notes = notes
     
+    @property
+    def cooked_date(self) -> str:
+        return self._cooked_date
+    
+    @cooked_date.setter
+    def cooked_date(self, value: str):
+        # Parsed once; cook history is grouped and sorted by date
+        self._cooked_date = value
+        self.cooked_date_obj = date.fromisoformat(value)
+    
     def to_dict(self) -> dict:
         return {
             'record_id': self.record_id,
@@ -97,6 +138,18 @@ class MealRecord:
     
     @classmethod
     def from_dict(cls, data: dict) -> 'MealRecord':
+        # Stored items carry every generated field, so skip __init__'s defaults
+        if data.get('record_id') and data.get('cooked_date') and data.get('cooked_at'):
+            record = cls.__new__(cls)
+            record.record_id = data['record_id']
+            record.meal_id = data['meal_id']
+            record.household_id = data['household_id']
+            record.cooked_by = data.get('cooked_by')
+            record.cooked_date = data['cooked_date']
+            record.cooked_at = data['cooked_at']
+            record.notes = data.get('notes')
+            return record
+        
         return cls(
             meal_id=data['meal_id'],
             household_id=data['household_id'],
@@ -109,7 +162,11 @@ class MealRecord:
 
 
 class WeeklyMealPlan:
-    """Groups meals by delivery week for easy viewing"""
+    """Groups meals by delivery week for easy viewing
+
+    Stored materialized, one item per household and week, so a week view is
+    a single keyed read (see MealRepository.get_weekly_plan).
+    """
     def __init__(
         self,
         week_of: str,  # YYYY-MM-DD format (Monday of week)
@@ -138,4 +195,16 @@ class WeeklyMealPlan:
             'household_id': self.household_id,
             'meals': [meal.to_dict() for meal in self.meals],
             'created_at': self.created_at
-        }
\ No newline at end of file
+        }
+    
+    @classmethod
+    def from_dict(cls, data: dict) -> 'WeeklyMealPlan':
+        plan = cls(
+            week_of=data['week_of'],
+            household_id=data['household_id'],
+            meals=[Meal.from_dict(meal) for meal in data.get('meals', [])],
+            plan_id=data.get('plan_id')
+        )
+        if 'created_at' in data:
+            plan.created_at = data['created_at']
+        return plan
\ No newline at end of file
@@ -0,0 +1,239 @@
+from bisect import bisect_right
+from datetime import date, timedelta
+from functools import lru_cache
+from typing import Any, Callable, Dict, Optional, Tuple
+
+# Import with fallback for Lambda environment
+try:
+    from .completion_stats import STREAK_UNITS
+except ImportError:
+    # Lambda environment - use absolute imports
+    from models.completion_stats import STREAK_UNITS
+
+FREQUENCIES = ('daily', 'weekly', 'monthly')
+
+
+def _month_index(day: date) -> int:
+    return day.year * 12 + day.month - 1
+
+
+def _month_start(index: int) -> date:
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _month_length(index: int) -> int:
+    return (_month_start(index + 1) - _month_start(index)).days
+
+
+class Recurrence:
+    """A compiled schedule: when an activity occurs and which completion covers which occurrence
+
+    Built from an activity's frequency and frequency_config (all keys optional):
+
+        interval       every N days / weeks / months, counted from start_date
+        start_date     ISO date the intervals are aligned to (default: the activity's creation)
+        days_of_week   weekly: list of weekdays, 0=Monday (legacy day_of_week; default Sunday)
+        day_of_month   monthly: 1-31, clamped to the month's last day; -1 is the last day (default 1)
+        nth_weekday    monthly: {"n": 1-4 or -1 for the last, "weekday": 0-6}, e.g. the 2nd Tuesday
+        times_per_day  completions needed on each due day (default 1)
+
+    Time is cut into periods (interval days, weeks or months) and each period
+    into slots, one per occurrence: a slot starts at the period start or at
+    an occurrence, whichever comes first, and runs to the next one. A
+    completion anywhere in a slot covers its occurrence - completing Monday
+    covers a Wednesday-only chore, as the single-day rules always did.
+
+    Everything that depends only on the rule is worked out by compile();
+    occurs_on is a closure specialized to the rule, and the other methods
+    are constant-time arithmetic on day ordinals, so evaluation cost does
+    not grow with the rule's complexity.
+    """
+
+    __slots__ = ('frequency', 'interval', 'anchor', 'weekdays', 'day_of_month', 'nth_weekday', 'times_per_day',
+                 'occurs_on', '_origin', '_length', '_offsets', '_boundaries', '_months')
+
+    MONTH_CACHE_SIZE = 1200
+
+    def __init__(self, frequency: str, interval: int, anchor: date, weekdays: Tuple[int, ...] = (),
+                 day_of_month: int = None, nth_weekday: Tuple[int, int] = None, times_per_day: int = 1):
+        self.frequency = frequency
+        self.interval = interval
+        self.anchor = anchor
+        self.weekdays = weekdays
+        self.day_of_month = day_of_month
+        self.nth_weekday = nth_weekday
+        self.times_per_day = times_per_day
+
+        # Daily and weekly periods have a fixed length in days: a slot is found
+        # from the day's offset into its period. Monthly slots are worked out
+        # once per month and kept in _months.
+        if frequency == 'daily':
+            self._origin, self._length, self._offsets = anchor.toordinal(), interval, (0,)
+        elif frequency == 'weekly':
+            self._origin, self._length, self._offsets = anchor.toordinal() - anchor.weekday(), 7 * interval, weekdays
+        else:
+            self._origin, self._length, self._offsets = None, None, ()
+        self._boundaries = (0,) + self._offsets[1:]
+        self._months: Dict[int, Tuple[int, int, int]] = {}
+        self.occurs_on: Callable[[date], bool] = self._build_predicate()
+
+    @classmethod
+    def compile(cls, frequency: str, config: Dict[str, Any] = None, created: date = None) -> 'Recurrence':
+        """The recurrence for a frequency and frequency_config; raises ValueError for an invalid rule"""
+        frequency = (frequency or '').lower()
+        if frequency not in FREQUENCIES:
+            raise ValueError("frequency must be 'daily', 'weekly', or 'monthly'")
+        config = config or {}
+        try:
+            interval = int(config.get('interval', 1))
+            key = (
+                frequency,
+                interval,
+                # Only intervals need an anchor; every interval-1 rule shares one compiled object
+                (config.get('start_date') or (created or date(1970, 1, 1)).isoformat()) if interval > 1 else None,
+                tuple(sorted({int(d) for d in config.get('days_of_week', [config.get('day_of_week', 6)])})),
+                int(config.get('day_of_month', 1)),
+                (int(config['nth_weekday']['n']), int(config['nth_weekday']['weekday']))
+                if config.get('nth_weekday') else None,
+                int(config.get('times_per_day', 1))
+            )
+        except (TypeError, ValueError, KeyError):
+            raise ValueError(f"Invalid frequency_config {config}")
+        return _compile(*key)
+
+    # Slots, as day ordinals
+    def _slot(self, ordinal: int) -> Tuple[int, int, int]:
+        """(slot start, the slot's occurrence, next slot start) for the slot containing a day ordinal"""
+        if self._length is None:
+            day = date.fromordinal(ordinal)
+            month = day.year * 12 + day.month - 1
+            slot = self._months.get(month)
+            if slot is None:
+                if len(self._months) >= self.MONTH_CACHE_SIZE:
+                    self._months.clear()
+                slot = self._months[month] = self._month_slot(month)
+            return slot
+
+        offset = (ordinal - self._origin) % self._length
+        base = ordinal - offset
+        boundaries = self._boundaries
+        if len(boundaries) == 1:
+            return base, base + self._offsets[0], base + self._length
+        i = bisect_right(boundaries, offset) - 1
+        end = boundaries[i + 1] if i + 1 < len(boundaries) else self._length
+        return base + boundaries[i], base + self._offsets[i], base + end
+
+    def _month_slot(self, month: int) -> Tuple[int, int, int]:
+        """Slot (one per period) of the monthly period containing a month index"""
+        anchor_month = _month_index(self.anchor)
+        first = anchor_month + (month - anchor_month) // self.interval * self.interval
+        start = _month_start(first)
+        length = _month_length(first)
+        if self.nth_weekday:
+            n, weekday = self.nth_weekday
+            if n > 0:
+                occurrence = start.replace(day=(weekday - start.weekday()) % 7 + 1 + 7 * (n - 1))
+            else:
+                last = start.replace(day=length)
+                occurrence = last - timedelta(days=(last.weekday() - weekday) % 7)
+        else:
+            occurrence = start.replace(day=length if self.day_of_month == -1 else min(self.day_of_month, length))
+        return start.toordinal(), occurrence.toordinal(), _month_start(first + self.interval).toordinal()
+
+    def slot(self, day: date) -> Tuple[date, date, date]:
+        """(slot start, the slot's occurrence, next slot start) for the slot containing day"""
+        return tuple(date.fromordinal(ordinal) for ordinal in self._slot(day.toordinal()))
+
+    def next_due(self, completed: date) -> date:
+        """Occurrence of the slot after the one a completion on `completed` covers"""
+        return date.fromordinal(self._slot(self._slot(completed.toordinal())[2])[1])
+
+    def is_complete(self, last_completed: Optional[date], today: date, period_completions: int = None) -> bool:
+        """Whether a completion on last_completed (with period_completions in the slot) covers today's slot"""
+        if last_completed is None or last_completed.toordinal() < self._slot(today.toordinal())[0]:
+            return False
+        return period_completions is None or period_completions >= self.times_per_day
+
+    def status(self, last_completed: Optional[date], today: date, period_completions: int = None) -> str:
+        """'completed', 'due', 'overdue' or 'upcoming' for the earliest occurrence not yet covered"""
+        now = today.toordinal()
+        start, due, _ = self._slot(now)
+        if last_completed is not None:
+            last = last_completed.toordinal()
+            if last >= start:
+                if period_completions is None or period_completions >= self.times_per_day:
+                    return 'completed'
+            else:
+                due = self._slot(self._slot(last)[2])[1]
+        if now > due:
+            return 'overdue'
+        return 'due' if now == due else 'upcoming'
+
+    # Streak periods (see completion_stats): one per slot, keyed like period_of
+    @property
+    def streak_unit(self) -> str:
+        if self.interval == 1 and len(self.weekdays) <= 1:
+            return STREAK_UNITS[self.frequency]
+        return 'occurrences'
+
+    def period_key(self, day: date) -> str:
+        start = self.slot(day)[0]
+        if self.frequency == 'monthly':
+            return start.strftime('%Y-%m')
+        return start.isoformat()
+
+    def _key_date(self, key: str) -> date:
+        return date.fromisoformat(f"{key}-01" if self.frequency == 'monthly' else key)
+
+    def next_period_key(self, key: str) -> str:
+        return self.period_key(self.slot(self._key_date(key))[2])
+
+    def previous_period_key(self, key: str) -> str:
+        return self.period_key(self.slot(self._key_date(key))[0] - timedelta(days=1))
+
+    def _build_predicate(self) -> Callable[[date], bool]:
+        """occurs_on specialized to this rule"""
+        if self.frequency == 'daily':
+            if self.interval == 1:
+                return lambda day: True
+            origin, interval = self._origin, self.interval
+            return lambda day: (day.toordinal() - origin) % interval == 0
+
+        if self.frequency == 'weekly':
+            weekdays = frozenset(self.weekdays)
+            if self.interval == 1:
+                return lambda day: day.weekday() in weekdays
+            origin, span = self._origin, self._length
+            return lambda day: day.weekday() in weekdays and (day.toordinal() - day.weekday() - origin) % span == 0
+
+        months, slot = self._months, self._slot
+
+        def occurs_monthly(day: date) -> bool:
+            ordinal = day.toordinal()
+            cached = months.get(day.year * 12 + day.month - 1)
+            return (cached or slot(ordinal))[1] == ordinal
+        return occurs_monthly
+
+    def __repr__(self) -> str:
+        return (f"Recurrence({self.frequency}, every {self.interval}, weekdays={self.weekdays}, "
+                f"day_of_month={self.day_of_month}, nth_weekday={self.nth_weekday}, x{self.times_per_day})")
+
+
+@lru_cache(maxsize=4096)
+def _compile(frequency: str, interval: int, start_date: Optional[str], weekdays: Tuple[int, ...], day_of_month: int,
+             nth_weekday: Optional[Tuple[int, int]], times_per_day: int) -> Recurrence:
+    """Validated, shared Recurrence for a normalized rule"""
+    if interval < 1:
+        raise ValueError("interval must be at least 1")
+    if times_per_day < 1:
+        raise ValueError("times_per_day must be at least 1")
+    if frequency == 'weekly' and (not weekdays or not all(0 <= d <= 6 for d in weekdays)):
+        raise ValueError("days_of_week must be weekdays 0 (Monday) to 6 (Sunday)")
+    if frequency == 'monthly':
+        if not (1 <= day_of_month <= 31 or day_of_month == -1):
+            raise ValueError("day_of_month must be 1-31 or -1 for the last day")
+        if nth_weekday and (nth_weekday[0] not in (1, 2, 3, 4, -1) or not 0 <= nth_weekday[1] <= 6):
+            raise ValueError("nth_weekday needs n of 1-4 or -1 and a weekday 0-6")
+    anchor = date.fromisoformat(start_date[:10]) if start_date else date(1970, 1, 1)
+    return Recurrence(frequency, interval, anchor, weekdays if frequency == 'weekly' else (),
+                      day_of_month, nth_weekday if frequency == 'monthly' else None, times_per_day)
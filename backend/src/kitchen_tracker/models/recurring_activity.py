@@ -1,8 +1,21 @@
 import uuid
-from datetime import datetime, date, timedelta
+from datetime import datetime, date
 from typing import Dict, Any, Optional
 from decimal import Decimal
 
+# Import with fallback for Lambda environment
+try:
+    from .completion_history import CompletionHistory
+    from .completion_stats import CompletionStats
+    from .recurrence import Recurrence
+    from ..utils.timezone_utils import utc_to_local_date
+except ImportError:
+    # Lambda environment - use absolute imports
+    from models.completion_history import CompletionHistory
+    from models.completion_stats import CompletionStats
+    from models.recurrence import Recurrence
+    from utils.timezone_utils import utc_to_local_date
+
 def convert_decimals(obj):
     """Convert DynamoDB Decimal objects to int/float for JSON serialization"""
     if isinstance(obj, list):
@@ -21,6 +34,12 @@ def convert_decimals(obj):
 class RecurringActivity:
     """Represents a recurring activity assigned to a family member"""
     
+    __slots__ = (
+        'activity_id', 'name', 'assigned_to', 'frequency', 'frequency_config', 'category',
+        'household_id', 'created_at', 'is_active', 'last_completion', 'last_completion_known', 'stats',
+        'history', '_recurrence', '_recurrence_source'
+    )
+    
     def __init__(
         self,
         name: str,
@@ -41,127 +60,106 @@ class RecurringActivity:
         self.created_at = datetime.utcnow().isoformat()
         self.is_active = True
         
-        # Validate frequency
-        if self.frequency not in ['daily', 'weekly', 'monthly']:
-            raise ValueError("frequency must be 'daily', 'weekly', or 'monthly'")
-    
-    def get_next_due_date(self, from_date: date = None) -> date:
-        """Calculate when this activity is next due"""
-        if from_date is None:
-            from_date = date.today()
-        
-        if self.frequency == 'daily':
-            return from_date + timedelta(days=1)
+        # Snapshot of the most recent completion (ActivityCompletion.to_dict()), kept
+        # on the activity item so status reads need no completion lookup. Items stored
+        # before the snapshot existed leave it unknown.
+        self.last_completion = None
+        self.last_completion_known = True
         
-        elif self.frequency == 'weekly':
-            # Default to Sunday (6) if not specified, 0=Monday, 6=Sunday
-            target_day = self.frequency_config.get('day_of_week', 6)
-            days_ahead = target_day - from_date.weekday()
-            if days_ahead <= 0:  # Target day already happened this week
-                days_ahead += 7
-            return from_date + timedelta(days=days_ahead)
+        # Streak and on-time counters (CompletionStats), stored as item attributes;
+        # None on items written before the counters existed
+        self.stats = CompletionStats()
         
-        elif self.frequency == 'monthly':
-            # Default to 1st of month if not specified
-            target_day = self.frequency_config.get('day_of_month', 1)
-            next_month = from_date.replace(day=1) + timedelta(days=32)
-            next_month = next_month.replace(day=1)  # First day of next month
-            try:
-                return next_month.replace(day=min(target_day, 28))  # Safe day
-            except ValueError:
-                return next_month.replace(day=28)  # Fallback for invalid dates
+        # Per-year completion bitmaps (CompletionHistory), stored as item attributes
+        # but left out of to_dict; None until rebuilt for items that predate them
+        self.history = CompletionHistory()
         
+        # Validates frequency and frequency_config
+        self._recurrence_source = None
+        self.recurrence
+    
+    @property
+    def recurrence(self) -> Recurrence:
+        """The compiled schedule, rebuilt only when frequency, frequency_config or created_at is replaced"""
+        cached = self._recurrence_source
+        if (cached is None or cached[1] is not self.frequency_config or cached[0] != self.frequency
+                or cached[2] != self.created_at):
+            self._recurrence = Recurrence.compile(self.frequency, self.frequency_config, self.created_at[:10])
+            self._recurrence_source = (self.frequency, self.frequency_config, self.created_at)
+        return self._recurrence
+    
+    def get_next_due_date(self, from_date: date = None) -> date:
+        """Calculate when this activity is next due after a completion on from_date"""
+        return self.recurrence.next_due(from_date or date.today())
+    
+    # Local time of day reminders go out on the due date
+    REMINDER_TIME = '08:00'
+    
+    def next_reminder_at(self, last_completed_date: date = None) -> str:
+        """When the next reminder is due, as local "YYYY-MM-DDTHH:MM"
+
+        That is the first occurrence the last completion does not cover; an
+        activity never completed is reminded from the day it was created.
+        """
+        if last_completed_date is not None:
+            due = self.get_next_due_date(last_completed_date)
         else:
-            # Fallback - default to daily
-            return from_date + timedelta(days=1)
+            # Reminder times are household-local, created_at is UTC
+            created = utc_to_local_date(self.created_at)
+            due = max(self.recurrence.slot(created)[1], created)
+        return f"{due.isoformat()}T{self.REMINDER_TIME}"
+    
+    def following_reminder_at(self, due_at: str, after: str) -> str:
+        """The reminder after one sent for due_at, should the activity stay incomplete
+
+        That is the first occurrence reminded later than `after` (the end of
+        the run's window), so an activity overdue for a while is not sent
+        again for each occurrence it missed.
+        """
+        due = self.recurrence.next_due(date.fromisoformat(due_at[:10]))
+        # Jump over the slots already behind us rather than stepping through them
+        due = max(due, self.recurrence.slot(date.fromisoformat(after[:10]))[1])
+        while f"{due.isoformat()}T{self.REMINDER_TIME}" <= after:
+            due = self.recurrence.next_due(due)
+        return f"{due.isoformat()}T{self.REMINDER_TIME}"
+    
+    def is_period_complete(self, last_completed_date: date = None, today: date = None,
+                           period_completions: int = None) -> bool:
+        """Whether the current slot's occurrence is done
+
+        period_completions counts the completions in the slot for rules with
+        times_per_day; when unknown, the last completion alone decides.
+        """
+        return self.recurrence.is_complete(last_completed_date, today or date.today(), period_completions)
     
-    def is_due_today(self, last_completed_date: date = None) -> bool:
+    def is_due_today(self, last_completed_date: date = None, today: date = None,
+                     period_completions: int = None) -> bool:
         """Check if activity is due today based on last completion"""
-        today = date.today()
+        today = today or date.today()
         
         if last_completed_date is None:
             return True  # Never completed, so due today
         
-        if self.frequency == 'daily':
-            # Due if not completed today
-            return last_completed_date < today
-        
-        elif self.frequency == 'weekly':
-            # Due if it's the target day and hasn't been completed this week
-            target_day = self.frequency_config.get('day_of_week', 6)
-            if today.weekday() != target_day:
-                return False  # Not the right day
-            
-            # Check if completed this week
-            days_since_monday = today.weekday()
-            week_start = today - timedelta(days=days_since_monday)
-            return last_completed_date < week_start
-        
-        elif self.frequency == 'monthly':
-            # Due if it's the target day and hasn't been completed this month
-            target_day = self.frequency_config.get('day_of_month', 1)
-            if today.day != target_day:
-                return False  # Not the right day
-            
-            # Check if completed this month
-            month_start = today.replace(day=1)
-            return last_completed_date < month_start
-        
-        return False
+        return self.recurrence.occurs_on(today) and not self.recurrence.is_complete(
+            last_completed_date, today, period_completions)
     
-    def is_overdue(self, last_completed_date: date = None) -> bool:
+    def is_overdue(self, last_completed_date: date = None, today: date = None) -> bool:
         """Check if activity is overdue"""
         if last_completed_date is None:
             # If never completed, consider overdue after 1 day
             return True
         
-        today = date.today()
+        today = today or date.today()
         next_due = self.get_next_due_date(last_completed_date)
         return today > next_due
     
-    def get_current_period_status(self, last_completed_date: date = None) -> str:
+    def get_current_period_status(self, last_completed_date: date = None, today: date = None,
+                                  period_completions: int = None) -> str:
         """Get status for current period: 'completed', 'due', 'overdue', 'upcoming'"""
-        today = date.today()
-        
-        if self.frequency == 'daily':
-            if last_completed_date == today:
-                return 'completed'
-            elif last_completed_date is None or last_completed_date < today:
-                return 'overdue' if last_completed_date and (today - last_completed_date).days > 1 else 'due'
-            else:
-                return 'upcoming'
-        
-        elif self.frequency == 'weekly':
-            target_day = self.frequency_config.get('day_of_week', 6)
-            days_since_monday = today.weekday()
-            week_start = today - timedelta(days=days_since_monday)
-            
-            if last_completed_date and last_completed_date >= week_start:
-                return 'completed'
-            elif today.weekday() == target_day:
-                return 'due'
-            elif today.weekday() > target_day:
-                return 'overdue'
-            else:
-                return 'upcoming'
-        
-        elif self.frequency == 'monthly':
-            target_day = self.frequency_config.get('day_of_month', 1)
-            month_start = today.replace(day=1)
-            
-            if last_completed_date and last_completed_date >= month_start:
-                return 'completed'
-            elif today.day == target_day:
-                return 'due'
-            elif today.day > target_day:
-                return 'overdue'
-            else:
-                return 'upcoming'
-        
-        return 'due'
+        return self.recurrence.status(last_completed_date, today or date.today(), period_completions)
     
     def to_dict(self) -> dict:
-        return {
+        result = {
             'activity_id': self.activity_id,
             'name': self.name,
             'assigned_to': self.assigned_to,
@@ -172,9 +170,41 @@ class RecurringActivity:
             'created_at': self.created_at,
             'is_active': self.is_active
         }
+        
+        # Only include the snapshot once it is known (None means never completed)
+        if self.last_completion_known:
+            result['last_completion'] = self.last_completion
+        if self.stats is not None:
+            result.update(self.stats.to_item())
+            
+        return result
     
     @classmethod
     def from_dict(cls, data: dict) -> 'RecurringActivity':
+        # Stored items carry every generated field, so skip __init__'s defaults.
+        # Only frequency_config can hold DynamoDB Decimals.
+        if data.get('activity_id') and 'created_at' in data:
+            frequency = data['frequency'].lower()
+            if frequency not in ['daily', 'weekly', 'monthly']:
+                raise ValueError("frequency must be 'daily', 'weekly', or 'monthly'")
+            
+            activity = cls.__new__(cls)
+            activity.activity_id = data['activity_id']
+            activity.name = data['name']
+            activity.assigned_to = data['assigned_to']
+            activity.frequency = frequency
+            activity.frequency_config = convert_decimals(data.get('frequency_config') or {})
+            activity.category = data.get('category')
+            activity.household_id = data['household_id']
+            activity.created_at = data['created_at']
+            activity.is_active = data.get('is_active', True)
+            activity.last_completion = data.get('last_completion')
+            activity.last_completion_known = 'last_completion' in data
+            activity.stats = CompletionStats.from_item(data)
+            activity.history = CompletionHistory.from_item(data)
+            activity._recurrence_source = None
+            return activity
+        
         # Convert any Decimal objects from DynamoDB
         clean_data = convert_decimals(data)
         
@@ -192,6 +222,10 @@ class RecurringActivity:
             activity.created_at = clean_data['created_at']
         if 'is_active' in clean_data:
             activity.is_active = clean_data['is_active']
+        activity.last_completion = clean_data.get('last_completion')
+        activity.last_completion_known = 'last_completion' in clean_data
+        activity.stats = CompletionStats.from_item(clean_data)
+        activity.history = CompletionHistory.from_item(data)
             
         return activity
     
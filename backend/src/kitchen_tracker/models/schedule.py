@@ -0,0 +1,81 @@
+import heapq
+import threading
+from collections import OrderedDict
+from datetime import date, timedelta
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+def expand_occurrences(starts: Iterable[Tuple[date, Any]], end: date) -> Iterator[Tuple[date, Any]]:
+    """(due date, activity) for every occurrence up to `end`, in date order
+
+    starts pairs each activity with its first due date. Activities sit in a
+    heap keyed on their next due date and are advanced with
+    get_next_due_date one occurrence at a time, so the cost follows the
+    number of occurrences, not days times activities. Ties keep the order of
+    `starts`.
+    """
+    heap = [(due, position, activity) for position, (due, activity) in enumerate(starts) if due <= end]
+    heapq.heapify(heap)
+    while heap:
+        due, position, activity = heap[0]
+        yield due, activity
+        following = activity.get_next_due_date(due)
+        if following <= end:
+            heapq.heapreplace(heap, (following, position, activity))
+        else:
+            heapq.heappop(heap)
+
+
+class ScheduleCache:
+    """Expanded schedules per household, dropped whenever the household changes
+
+    An entry is only valid for the day it was built on and for windows up
+    to the one it covers; it also records the household's newest change-log
+    token, so a write made by another process is noticed on the next read.
+    """
+
+    CACHE_SIZE = 1024
+    _entries = OrderedDict()
+    _lock = threading.Lock()
+    hits = 0
+    misses = 0
+
+    @classmethod
+    def get(cls, household_id: str, today: date, days: int, token: Optional[str]) -> Optional[List[Dict]]:
+        """Cached occurrences for the window, or None"""
+        with cls._lock:
+            entry = cls._entries.get(household_id)
+            if entry is None or entry['today'] != today or entry['days'] < days or entry['token'] != token:
+                cls.misses += 1
+                return None
+            cls._entries.move_to_end(household_id)
+            cls.hits += 1
+        last_day = (today + timedelta(days=days - 1)).isoformat()
+        return [occurrence for occurrence in entry['occurrences'] if occurrence['date'] <= last_day]
+
+    @classmethod
+    def put(cls, household_id: str, today: date, days: int, token: Optional[str], occurrences: List[Dict]):
+        with cls._lock:
+            cls._entries[household_id] = {'today': today, 'days': days, 'token': token, 'occurrences': occurrences}
+            cls._entries.move_to_end(household_id)
+            if len(cls._entries) > cls.CACHE_SIZE:
+                cls._entries.popitem(last=False)
+
+    @classmethod
+    def invalidate(cls, household_id: str):
+        with cls._lock:
+            cls._entries.pop(household_id, None)
+
+    @classmethod
+    def cache_info(cls) -> dict:
+        """Hit/miss counters and current number of cached households"""
+        with cls._lock:
+            return {'hits': cls.hits, 'misses': cls.misses, 'size': len(cls._entries), 'max_size': cls.CACHE_SIZE}
+
+    @classmethod
+    def clear_cache(cls):
+        """Drop every entry and reset the counters"""
+        with cls._lock:
+            cls._entries.clear()
+            cls.hits = 0
+            cls.misses = 0
@@ -0,0 +1,86 @@
+import os
+from typing import Callable, Dict, List
+
+from boto3.dynamodb.types import TypeDeserializer
+
+# Import with fallback for Lambda environment
+try:
+    from ..models.change_entry import ChangeEntry
+    from ..models.recurring_activity import convert_decimals
+except ImportError:
+    # Lambda environment - use absolute imports
+    from models.change_entry import ChangeEntry
+    from models.recurring_activity import convert_decimals
+
+_deserializer = TypeDeserializer()
+
+
+def entries_from_stream_event(event: Dict) -> List[ChangeEntry]:
+    """Change entries inserted into the ChangeLog table, from a DynamoDB Streams event
+
+    Only INSERTs are changes; MODIFY never happens and REMOVE is TTL expiry.
+    """
+    entries = []
+    for record in event.get('Records', []):
+        if record.get('eventName') != 'INSERT':
+            continue
+        image = record['dynamodb']['NewImage']
+        item = {name: _deserializer.deserialize(value) for name, value in image.items()}
+        entries.append(ChangeEntry.from_dict(convert_decimals(item)))
+    return entries
+
+
+class ChangeStream:
+    """Committed change-log entries, delivered to projectors in commit order per household
+
+    Handlers get each committed batch (one transaction's entries, or one
+    stream batch) and must tolerate seeing an entry again.
+    """
+
+    def __init__(self):
+        self._handlers: List[Callable[[List[ChangeEntry]], None]] = []
+
+    def subscribe(self, handler: Callable[[List[ChangeEntry]], None]) -> None:
+        self._handlers.append(handler)
+
+    def deliver(self, entries: List[ChangeEntry]) -> None:
+        """Run every handler on a batch; errors propagate so a stream batch is retried"""
+        if not entries:
+            return
+        for handler in self._handlers:
+            handler(entries)
+
+    def publish(self, entries: List[ChangeEntry]) -> None:
+        """Called by the service right after it commits entries"""
+        raise NotImplementedError
+
+
+class InProcessChangeStream(ChangeStream):
+    """Local stand-in for DynamoDB Streams: handlers run right after each commit, in the writer's process
+
+    The write has already committed, so a handler error is only logged; the
+    replay and check jobs repair what it missed.
+    """
+
+    def publish(self, entries: List[ChangeEntry]) -> None:
+        try:
+            self.deliver(entries)
+        except Exception as e:
+            print(f"Error projecting {len(entries)} changes: {e}")
+
+
+class DynamoDBChangeStream(ChangeStream):
+    """ChangeLog table stream: publishing is the commit itself; projector_lambda_handler calls deliver"""
+
+    def publish(self, entries: List[ChangeEntry]) -> None:
+        pass
+
+
+def create_change_stream(stream_type: str = None) -> ChangeStream:
+    """Create the configured stream: "memory" (default) or "dynamodb" (CHANGE_STREAM setting)"""
+    stream_type = stream_type or os.getenv('CHANGE_STREAM', 'memory')
+    if stream_type == 'dynamodb':
+        return DynamoDBChangeStream()
+    if stream_type == 'memory':
+        return InProcessChangeStream()
+    raise ValueError(f"Unknown change stream {stream_type}")
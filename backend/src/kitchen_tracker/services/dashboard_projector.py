@@ -0,0 +1,121 @@
+import json
+from typing import Any, Dict, List, Optional
+
+# Import with fallback for Lambda environment
+try:
+    from ..models.change_entry import ChangeEntry
+    from ..models.household_digest import HouseholdDigest
+    from ..utils.timezone_utils import get_local_date
+except ImportError:
+    # Lambda environment - use absolute imports
+    from models.change_entry import ChangeEntry
+    from models.household_digest import HouseholdDigest
+    from utils.timezone_utils import get_local_date
+
+
+class DashboardProjector:
+    """Keeps each household's materialized dashboard (HouseholdDigest) current from the change stream
+
+    For every committed batch it recomputes the status of just the activities
+    the batch touches and writes the view back over the version it read,
+    retrying from a fresh read when another projector wrote first. A member
+    change rebuilds the view, since names and counts throughout depend on it.
+    Households without a view for today are left alone: the first read or
+    the nightly job builds one from current state.
+    """
+
+    ATTEMPTS = 3
+
+    def __init__(self, service):
+        self.service = service
+
+    def apply(self, entries: List[ChangeEntry]) -> None:
+        """Change stream handler"""
+        by_household: Dict[str, List[ChangeEntry]] = {}
+        for entry in entries:
+            by_household.setdefault(entry.household_id, []).append(entry)
+        for household_id, household_entries in by_household.items():
+            self.project(household_id, household_entries)
+
+    def project(self, household_id: str, entries: List[ChangeEntry]) -> Optional[str]:
+        """Apply one household's entries; returns "patched", "rebuilt" or None if there is no view"""
+        for _ in range(self.ATTEMPTS):
+            view = self.service.digest_repo.get_digest(household_id)
+            if view is None or view.digest_date != get_local_date().isoformat():
+                return None
+            if any(entry.entity_type == 'member' for entry in entries):
+                self.service.build_household_digest(household_id)
+                return 'rebuilt'
+
+            statuses = {}
+            for entry in entries:
+                activity_id = entry.data['activity_id'] if entry.entity_type == 'completion' else entry.entity_id
+                if activity_id not in statuses:
+                    status = self.service.get_activity_status(activity_id)
+                    statuses[activity_id] = status.to_dict() if status and status.activity.is_active else None
+            view.patch(statuses, max(entry.change_key for entry in entries))
+            view.version += 1
+            if self.service.digest_repo.put_digest(view, expected_version=view.version - 1):
+                return 'patched'
+
+        self.service.build_household_digest(household_id)
+        return 'rebuilt'
+
+    def replay(self, household_id: str, since: str = None, rebuild: bool = False,
+               page_size: int = 500) -> Dict[str, Any]:
+        """Feed a household's change log (after `since`, default all retained) back through the projector
+
+        With rebuild, the view is first recomputed from current state.
+        Projection is idempotent, so replaying entries already applied is safe.
+        """
+        if rebuild:
+            self.service.build_household_digest(household_id)
+        result = {'household_id': household_id, 'entries': 0, 'batches': 0}
+        while True:
+            entries, has_more = self.service.change_log_repo.get_changes_since(household_id, since, page_size)
+            if not entries:
+                break
+            self.project(household_id, entries)
+            result['entries'] += len(entries)
+            result['batches'] += 1
+            since = entries[-1].change_key
+            if not has_more:
+                break
+        return result
+
+    def check(self, household_id: str) -> Dict[str, Any]:
+        """Compare the stored view with a full recompute from the service
+
+        differences lists each dashboard list whose activities disagree, each
+        activity whose fields disagree, and each summary section that differs.
+        """
+        view = self.service.digest_repo.get_digest(household_id)
+        if view is None:
+            return {'household_id': household_id, 'consistent': False, 'differences': ["no view stored"]}
+        # Through JSON, as the stored snapshot was
+        dashboard, summary = json.loads(json.dumps(
+            [self.service.compute_dashboard(household_id), self.service.compute_household_summary(household_id)],
+            default=str))
+
+        differences = []
+        if view.digest_date != dashboard['date']:
+            differences.append(f"date: view {view.digest_date}, recompute {dashboard['date']}")
+        for key in ('due_today', 'overdue', 'completed_today', 'upcoming'):
+            stored = [a['activity_id'] for a in view.dashboard[key]]
+            fresh = [a['activity_id'] for a in dashboard[key]]
+            if stored != fresh:
+                differences.append(f"{key}: view {stored}, recompute {fresh}")
+        fresh_activities = {a['activity_id']: a for a in HouseholdDigest(
+            household_id, dashboard['date'], None, dashboard, summary).activities()}
+        for activity in view.activities():
+            fresh = fresh_activities.get(activity['activity_id'])
+            if fresh is None:
+                continue
+            fields = sorted(f for f in set(activity) | set(fresh) if activity.get(f) != fresh.get(f))
+            if fields:
+                differences.append(f"activity {activity['activity_id']}: {', '.join(fields)}")
+        for section in summary:
+            if view.summary.get(section) != summary[section]:
+                differences.append(f"summary.{section}: view {view.summary.get(section)}, recompute {summary[section]}")
+
+        return {'household_id': household_id, 'consistent': not differences, 'differences': differences}
@@ -0,0 +1,94 @@
+import os
+import threading
+from typing import Any, Dict, Iterator, List
+from urllib.parse import unquote_plus
+
+# Import with fallback for Lambda environment
+try:
+    from ..dal.email_source import EmailSource, create_email_source
+    from ..utils.homechef_email import content_hash, parse_email_stream
+    from .meal_service import MealService
+except ImportError:
+    # Lambda environment - use absolute imports
+    from dal.email_source import EmailSource, create_email_source
+    from utils.homechef_email import content_hash, parse_email_stream
+    from services.meal_service import MealService
+
+EMAIL_MEAL_SOURCE = 'home_chef_email'
+
+
+def email_keys(event: Dict[str, Any]) -> Iterator[tuple]:
+    """(bucket or None, key) for each email in an SES receipt or S3 notification event"""
+    prefix = os.getenv('EMAIL_PREFIX', '')
+    for record in event.get('Records', []):
+        if record.get('eventSource') == 'aws:ses':
+            # The SES S3 action stores the message under its messageId
+            yield None, prefix + record['ses']['mail']['messageId']
+        elif 's3' in record:
+            yield record['s3']['bucket']['name'], unquote_plus(record['s3']['object']['key'])
+
+
+class EmailIngestor:
+    """Streams raw Home Chef emails from storage and adds their meals
+
+    Duplicates are caught at two levels. Each ingested email leaves a
+    receipt keyed by its content hash, so a repeat delivery costs one read
+    and no writes; meals repeated by a different email (a shipment update)
+    map to the same natural meal ID and are skipped by MealService.
+    """
+
+    # Dedupe counters for this process (see dedupe_info)
+    _counter_lock = threading.Lock()
+    counters = {'emails': 0, 'duplicate_emails': 0, 'meals_found': 0, 'duplicate_meals': 0, 'meals_created': 0}
+
+    def __init__(self, source: EmailSource = None, meal_service: MealService = None):
+        self.source = source or create_email_source()
+        self.meal_service = meal_service or MealService()
+
+    def parse(self, key: str) -> List[Dict]:
+        """Meals in one stored email, parsed as it streams in"""
+        return parse_email_stream(self.source.open(key))
+
+    def ingest(self, key: str, household_id: str) -> Dict[str, Any]:
+        """Parse one stored email and add its meals; returns what was found and created"""
+        parsed = self.parse(key)
+        digest = content_hash(parsed)
+        meal_repo = self.meal_service.meal_repo
+        result = {'key': key, 'content_hash': digest, 'duplicate': False, 'meals_found': len(parsed)}
+
+        if parsed and meal_repo.get_email_receipt(household_id, digest):
+            result.update({'duplicate': True, 'meals_created': 0, 'meals': []})
+            self._count(duplicate_email=True, found=len(parsed), created=0)
+            return result
+
+        created = self.meal_service.import_meals(household_id, parsed, source=EMAIL_MEAL_SOURCE)
+        if parsed:
+            # Written after the meals: an email interrupted before this is simply ingested again
+            meal_repo.create_email_receipt(household_id, digest, key, [meal.meal_id for meal in created])
+        result.update({'meals_created': len(created), 'meals': [meal.to_dict() for meal in created]})
+        self._count(duplicate_email=False, found=len(parsed), created=len(created))
+        return result
+
+    @classmethod
+    def _count(cls, duplicate_email: bool, found: int, created: int):
+        with cls._counter_lock:
+            cls.counters['emails'] += 1
+            cls.counters['duplicate_emails'] += int(duplicate_email)
+            cls.counters['meals_found'] += found
+            cls.counters['meals_created'] += created
+            if not duplicate_email:
+                cls.counters['duplicate_meals'] += found - created
+
+    @classmethod
+    def dedupe_info(cls) -> Dict[str, Any]:
+        """Dedupe hit counters since the process started (or the last reset)"""
+        with cls._counter_lock:
+            info = dict(cls.counters)
+        info['email_hit_ratio'] = round(info['duplicate_emails'] / info['emails'], 3) if info['emails'] else 0.0
+        return info
+
+    @classmethod
+    def reset_counters(cls):
+        with cls._counter_lock:
+            for counter in cls.counters:
+                cls.counters[counter] = 0
@@ -0,0 +1,141 @@
+import asyncio
+import importlib
+import json
+import os
+import threading
+from typing import Dict, Optional, Set
+
+# Import with fallback for Lambda environment
+try:
+    from ..models.change_entry import ChangeEntry
+except ImportError:
+    # Lambda environment - use absolute imports
+    from models.change_entry import ChangeEntry
+
+
+def event_from_change(change: ChangeEntry) -> dict:
+    """Build the event pushed to live subscribers for a committed change"""
+    return {
+        'id': change.change_key,
+        'type': f"{change.entity_type}.{change.operation}",  # e.g. "completion.delete" for an undo
+        'household_id': change.household_id,
+        'entity_id': change.entity_id,
+        'data': change.data
+    }
+
+
+def format_sse(event: dict) -> str:
+    """Encode an event as a Server-Sent Events frame"""
+    return f"id: {event['id']}\nevent: {event['type']}\ndata: {json.dumps(event, default=str)}\n\n"
+
+
+class Subscription:
+    """A single live listener on a household's events"""
+
+    def __init__(self, broker: 'EventBroker', household_id: str):
+        self.broker = broker
+        self.household_id = household_id
+
+    async def get(self, timeout: float = None) -> Optional[dict]:
+        """Wait for the next event; returns None if the timeout elapses first"""
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Stop receiving events"""
+        self.broker.unsubscribe(self)
+
+
+class EventBroker:
+    """Interface for fanning out household events to live subscribers
+
+    The in-process broker only reaches subscribers in the same container. Multi-process
+    deployments plug in a shared implementation (Redis pub/sub, IoT Core, ...) through
+    the EVENT_BROKER setting, see create_event_broker.
+    """
+
+    def publish(self, household_id: str, event: dict) -> None:
+        """Deliver an event to every current subscriber of the household"""
+        raise NotImplementedError
+
+    def subscribe(self, household_id: str) -> Subscription:
+        """Start listening to a household's events"""
+        raise NotImplementedError
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """Stop delivering events to a subscription"""
+        raise NotImplementedError
+
+
+class _QueueSubscription(Subscription):
+    """Subscription backed by an asyncio queue on the subscriber's event loop"""
+
+    def __init__(self, broker: 'InMemoryEventBroker', household_id: str, max_pending: int):
+        super().__init__(broker, household_id)
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize=max_pending)
+        self.dropped = 0
+
+    def offer(self, event: dict) -> None:
+        """Queue an event, dropping the oldest pending one for slow consumers"""
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(event)
+
+    async def get(self, timeout: float = None) -> Optional[dict]:
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class InMemoryEventBroker(EventBroker):
+    """Local pub/sub for subscribers within this process"""
+
+    def __init__(self, max_pending: int = 100):
+        self.max_pending = max_pending
+        self._subscribers: Dict[str, Set[_QueueSubscription]] = {}
+        self._lock = threading.Lock()
+
+    def publish(self, household_id: str, event: dict) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers.get(household_id, ()))
+
+        # Publishers may run in a worker thread; hand off to each subscriber's loop
+        for subscription in subscribers:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.offer, event)
+            except RuntimeError:
+                # Subscriber's loop is closed; it will never read again
+                self.unsubscribe(subscription)
+
+    def subscribe(self, household_id: str) -> Subscription:
+        """Must be called from the event loop that will consume the events"""
+        subscription = _QueueSubscription(self, household_id, self.max_pending)
+        with self._lock:
+            self._subscribers.setdefault(household_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.household_id)
+            if subscribers:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[subscription.household_id]
+
+    def subscriber_count(self, household_id: str) -> int:
+        """Number of live subscribers for a household"""
+        with self._lock:
+            return len(self._subscribers.get(household_id, ()))
+
+
+def create_event_broker(broker_path: str = None) -> EventBroker:
+    """Create the configured broker: "memory" (default) or a "module:ClassName" path"""
+    broker_path = broker_path or os.getenv('EVENT_BROKER', 'memory')
+    if broker_path == 'memory':
+        return InMemoryEventBroker()
+
+    module_name, _, class_name = broker_path.partition(':')
+    broker_class = getattr(importlib.import_module(module_name), class_name)
+    return broker_class()
@@ -1,5 +1,7 @@
-from typing import List, Optional, Dict, Any
-from datetime import date, datetime
+from contextlib import contextmanager
+from typing import Callable, List, Optional, Dict, Any
+from datetime import date, datetime, timedelta
+from urllib.parse import urlencode
 
 
 # Import with fallback for Lambda environment
@@ -7,25 +9,142 @@ try:
     from ..models.family_member import FamilyMember
     from ..models.recurring_activity import RecurringActivity
     from ..models.activity_completion import ActivityCompletion, ActivityStatus
+    from ..models.change_entry import ChangeEntry
+    from ..models.completion_stats import CompletionStats, build_stats, on_time_flags, period_of
+    from ..models.completion_history import CompletionHistory, day_counts
+    from ..models.schedule import ScheduleCache, expand_occurrences
+    from ..models.household_digest import HouseholdDigest, dashboard_from_statuses
     from ..dal.family_member_repository import FamilyMemberRepository
     from ..dal.recurring_activity_repository import RecurringActivityRepository
     from ..dal.activity_completion_repository import ActivityCompletionRepository
+    from ..dal.change_log_repository import ChangeLogRepository
+    from ..dal.household_repository import HouseholdRepository
+    from ..dal.base_repository import ConflictError
+    from .event_broker import EventBroker, create_event_broker, event_from_change
+    from .change_stream import ChangeStream, create_change_stream
+    from .dashboard_projector import DashboardProjector
+    from .shared_cache import HouseholdCache, create_household_cache
+    from .unit_of_work import UnitOfWork, current_unit_of_work
+    from ..utils.timezone_utils import get_local_date
 except ImportError:
     # Lambda environment - use absolute imports
     from models.family_member import FamilyMember
     from models.recurring_activity import RecurringActivity
     from models.activity_completion import ActivityCompletion, ActivityStatus
+    from models.change_entry import ChangeEntry
+    from models.completion_stats import CompletionStats, build_stats, on_time_flags, period_of
+    from models.completion_history import CompletionHistory, day_counts
+    from models.schedule import ScheduleCache, expand_occurrences
+    from models.household_digest import HouseholdDigest, dashboard_from_statuses
     from dal.family_member_repository import FamilyMemberRepository
     from dal.recurring_activity_repository import RecurringActivityRepository
     from dal.activity_completion_repository import ActivityCompletionRepository
+    from dal.change_log_repository import ChangeLogRepository
+    from dal.household_repository import HouseholdRepository
+    from dal.base_repository import ConflictError
+    from services.event_broker import EventBroker, create_event_broker, event_from_change
+    from services.change_stream import ChangeStream, create_change_stream
+    from services.dashboard_projector import DashboardProjector
+    from services.shared_cache import HouseholdCache, create_household_cache
+    from services.unit_of_work import UnitOfWork, current_unit_of_work
+    from utils.timezone_utils import get_local_date
 
 class KitchenService:
     """Service layer for kitchen tracker business logic"""
     
-    def __init__(self):
+    def __init__(self, event_broker: EventBroker = None, change_stream: ChangeStream = None,
+                 household_cache: HouseholdCache = None):
         self.family_repo = FamilyMemberRepository()
         self.activity_repo = RecurringActivityRepository()
         self.completion_repo = ActivityCompletionRepository()
+        self.change_log_repo = ChangeLogRepository()
+        # Optional single-table copy of each household, kept in step on every write
+        self.household_repo = HouseholdRepository() if HouseholdRepository.enabled() else None
+        # Daily dashboard digests live in the household table whatever the layout
+        self.digest_repo = HouseholdRepository()
+        self.event_broker = event_broker or create_event_broker()
+        # Committed changes feed projections such as the materialized dashboard
+        self.change_stream = change_stream or create_change_stream()
+        self.projector = DashboardProjector(self)
+        self.change_stream.subscribe(self.projector.apply)
+        # Optional cross-instance cache of household reads (SHARED_CACHE setting)
+        self.household_cache = household_cache or create_household_cache()
+    
+    @contextmanager
+    def unit_of_work(self):
+        """Scope reads and writes to one request
+
+        Inside the block, get_activity/get_family_member read each key once and
+        writes are buffered, then applied in one transaction on exit. An
+        exception discards the buffered writes. Nested blocks join the outer one.
+        """
+        if current_unit_of_work.get() is not None:
+            yield current_unit_of_work.get()
+            return
+        
+        uow = UnitOfWork()
+        token = current_unit_of_work.set(uow)
+        try:
+            yield uow
+            if uow.has_pending:
+                self._apply(*uow.take())
+        finally:
+            current_unit_of_work.reset(token)
+    
+    # Times a write computed from a read is redone when a concurrent write commits first
+    CONFLICT_ATTEMPTS = 3
+    
+    def retry_on_conflict(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run func in a unit of work, again from fresh reads if its commit loses to a concurrent write
+
+        Raises ConflictError once CONFLICT_ATTEMPTS runs have all lost. Inside
+        an open unit of work func just joins it: the commit, and any conflict,
+        happen when that one exits.
+        """
+        for attempt in range(self.CONFLICT_ATTEMPTS):
+            try:
+                with self.unit_of_work():
+                    return func(*args, **kwargs)
+            except ConflictError:
+                if attempt == self.CONFLICT_ATTEMPTS - 1:
+                    raise
+    
+    def _commit(self, ops: List[Dict], changes: List[ChangeEntry]) -> None:
+        """Write entities and their change log entries, buffered if a unit of work is open"""
+        uow = current_unit_of_work.get()
+        if uow is None:
+            self._apply(ops, changes)
+            return
+        
+        if uow.must_flush_before(ops, changes):
+            self._apply(*uow.take())
+        uow.add(ops, changes)
+    
+    def _mirror_ops(self, puts: List = (), deletes: List = ()) -> List[Dict]:
+        """Household-table writes matching per-entity table writes (none unless enabled)"""
+        if self.household_repo is None:
+            return []
+        return ([self.household_repo.put_op(entity) for entity in puts] +
+                [self.household_repo.delete_op(entity) for entity in deletes])
+    
+    def _load_household(self, household_id: str) -> Optional[Dict[str, List]]:
+        """A migrated household's members, activities, meals and today's completions in one query"""
+        if self.household_repo is None:
+            return None
+        return self.household_repo.get_household(household_id, completions_since=get_local_date())
+    
+    def _apply(self, ops: List[Dict], changes: List[ChangeEntry]) -> None:
+        """Apply entity writes and their change log entries in one transaction"""
+        items = ops + [self.change_log_repo.put_op(change) for change in changes]
+        self.change_log_repo.transact_write(items)
+        
+        # Only committed changes reach live subscribers
+        for change in changes:
+            ScheduleCache.invalidate(change.household_id)
+            if self.household_cache is not None:
+                self.household_cache.note_token(change.household_id, change.change_key)
+            self.event_broker.publish(change.household_id, event_from_change(change))
+        self.change_stream.publish(changes)
     
     # Family Member Operations
     def create_family_member(self, name: str, member_type: str, household_id: str, pet_type: str = None) -> FamilyMember:
@@ -36,23 +155,59 @@ class KitchenService:
             household_id=household_id,
             pet_type=pet_type
         )
-        return self.family_repo.create(member)
+        self._commit(
+            [self.family_repo.create_op(member)] + self._mirror_ops(puts=[member]),
+            [ChangeEntry(household_id, 'member', member.member_id, 'upsert', member.to_dict())]
+        )
+        self._register('member', member.member_id, member)
+        return member
     
     def get_family_members(self, household_id: str) -> List[FamilyMember]:
         """Get all family members for a household"""
-        return self.family_repo.get_by_household_id(household_id)
+        if self.household_cache is None:
+            return self.family_repo.get_by_household_id(household_id)
+        members = self._cached_read(household_id, 'members',
+                                    lambda: [m.to_dict() for m in self.family_repo.get_by_household_id(household_id)])
+        return [FamilyMember.from_dict(m) for m in members]
     
     def get_family_member(self, member_id: str) -> Optional[FamilyMember]:
         """Get a specific family member"""
+        uow = current_unit_of_work.get()
+        if uow is not None:
+            return uow.get('member', member_id, self.family_repo.get_by_id)
         return self.family_repo.get_by_id(member_id)
     
+    def _register(self, entity_type: str, entity_id: str, entity) -> None:
+        """Add an entity to the open unit of work's identity map, if any"""
+        uow = current_unit_of_work.get()
+        if uow is not None:
+            uow.register(entity_type, entity_id, entity)
+    
     def update_family_member(self, member: FamilyMember) -> FamilyMember:
         """Update a family member"""
-        return self.family_repo.update(member)
+        self._commit(
+            [self.family_repo.update_op(member)] + self._mirror_ops(puts=[member]),
+            [ChangeEntry(member.household_id, 'member', member.member_id, 'upsert', member.to_dict())]
+        )
+        self._register('member', member.member_id, member)
+        return member
     
     def delete_family_member(self, member_id: str) -> bool:
         """Soft delete a family member"""
-        return self.family_repo.soft_delete(member_id)
+        member = self.get_family_member(member_id)
+        if not member:
+            return False
+        
+        member.is_active = False
+        try:
+            self._commit(
+                [self.family_repo.update_op(member)] + self._mirror_ops(puts=[member]),
+                [ChangeEntry(member.household_id, 'member', member_id, 'delete')]
+            )
+            return True
+        except ValueError as e:
+            print(f"Error soft deleting family member {member_id}: {e}")
+            return False
     
     # Activity Operations
     def create_activity(self, name: str, assigned_to: str, frequency: str, 
@@ -67,7 +222,13 @@ class KitchenService:
             frequency_config=frequency_config or {},
             category=category
         )
-        return self.activity_repo.create(activity)
+        self._commit(
+            [self.activity_repo.create_op(activity, next_due_at=activity.next_reminder_at())] +
+            self._mirror_ops(puts=[activity]),
+            [ChangeEntry(household_id, 'activity', activity.activity_id, 'upsert', activity.to_dict())]
+        )
+        self._register('activity', activity.activity_id, activity)
+        return activity
     
     def get_activities(self, household_id: str) -> List[RecurringActivity]:
         """Get all activities for a household"""
@@ -75,19 +236,147 @@ class KitchenService:
     
     def get_activity(self, activity_id: str) -> Optional[RecurringActivity]:
         """Get a specific activity"""
+        uow = current_unit_of_work.get()
+        if uow is not None:
+            return uow.get('activity', activity_id, self.activity_repo.get_by_id)
         return self.activity_repo.get_by_id(activity_id)
     
-    def get_activities_with_status(self, household_id: str) -> List[Dict]:
-        """Get all activities with their completion status"""
-        activities = self.get_activities(household_id)
-        result = []
+    # Fields clients may select with `fields=` / order by with `sort=`
+    ACTIVITY_STATUS_FIELDS = [
+        'activity_id', 'name', 'assigned_to', 'frequency', 'frequency_config', 'category',
+        'household_id', 'created_at', 'is_active', 'member_name', 'last_completed_date',
+        'last_completed_by', 'last_completion_notes', 'is_due_today', 'is_overdue', 'status',
+        'next_due_date', 'completed', 'stats', 'period_completions'
+    ]
+    ACTIVITY_SORT_FIELDS = [
+        'name', 'category', 'frequency', 'status', 'member_name', 'next_due_date',
+        'last_completed_date', 'created_at'
+    ]
+    ACTIVITY_STATUSES = ['completed', 'due', 'overdue', 'upcoming']
+    
+    def get_activities_with_status(self, household_id: str, member_id: str = None,
+                                   category: str = None, frequency: str = None,
+                                   status: str = None, sort: str = None,
+                                   fields: str = None) -> List[Dict]:
+        """Get activities with their completion status, optionally filtered, sorted and trimmed"""
+        if status and status not in self.ACTIVITY_STATUSES:
+            raise ValueError(f"status must be one of {self.ACTIVITY_STATUSES}")
+        if self.household_cache is not None:
+            query = {'member': member_id, 'category': category, 'frequency': frequency,
+                     'status': status, 'sort': sort, 'fields': fields}
+            kind = 'activities?' + urlencode(sorted((k, v) for k, v in query.items() if v is not None))
+            return self._cached_read(household_id, kind, lambda: self._activities_with_status(
+                household_id, member_id, category, frequency, status, sort, fields))
+        return self._activities_with_status(household_id, member_id, category, frequency, status, sort, fields)
+    
+    def _activities_with_status(self, household_id: str, member_id: Optional[str], category: Optional[str],
+                                frequency: Optional[str], status: Optional[str], sort: Optional[str],
+                                fields: Optional[str]) -> List[Dict]:
+        sort_keys = self._parse_sort(sort)
+        selected_fields = self._parse_fields(fields)
         
-        for activity in activities:
-            status = self.get_activity_status(activity.activity_id)
-            result.append(status.to_dict() if status else activity.to_dict())
+        household = self._load_household(household_id)
+        if household is not None:
+            # One partition query already holds every activity and member
+            activities = [
+                a for a in household['activities']
+                if a.is_active and member_id in (None, a.assigned_to)
+                and category in (None, a.category) and frequency in (None, a.frequency)
+            ]
+            members = {m.member_id: m for m in household['members']}
+        else:
+            # member/category/frequency are pushed down to the index query
+            activities = self.activity_repo.query_activities(
+                household_id, member_id=member_id, category=category, frequency=frequency
+            )
+            members = None
+        activities.sort(key=lambda a: a.name.lower())
+        statuses = self._build_statuses(activities, household_id, members=members)
+        
+        # Status is computed, so it filters the snapshot before serialization
+        if status:
+            statuses = [s for s in statuses if s.status == status]
+        
+        result = [s.to_dict() for s in statuses]
+        for field, descending in reversed(sort_keys):
+            # Stable sorts applied last-key-first; missing values always sort last
+            present = [r for r in result if r.get(field) is not None]
+            missing = [r for r in result if r.get(field) is None]
+            present.sort(key=lambda r: r[field], reverse=descending)
+            result = present + missing
         
+        if selected_fields:
+            result = [{f: r[f] for f in selected_fields if f in r} for r in result]
         return result
     
+    def _build_statuses(self, activities: List[RecurringActivity], household_id: str,
+                        members: Dict[str, FamilyMember] = None) -> List[ActivityStatus]:
+        """Attach latest completion and member name to already-loaded activities"""
+        if members is None:
+            members = {m.member_id: m for m in self.get_family_members(household_id)}
+        
+        # One reference date for the whole listing, so statuses agree across midnight
+        today = get_local_date()
+        statuses = []
+        for activity in activities:
+            if activity.assigned_to not in members:
+                # Inactive members are not in the household listing
+                members[activity.assigned_to] = self.get_family_member(activity.assigned_to)
+            member = members[activity.assigned_to]
+            latest = self._latest_completion(activity)
+            statuses.append(ActivityStatus(activity, latest, member.name if member else "Unknown", today,
+                                           self._period_completions(activity, latest, today)))
+        return statuses
+    
+    def _latest_completion(self, activity: RecurringActivity) -> Optional[ActivityCompletion]:
+        """Latest completion from the activity's snapshot, querying only for pre-snapshot items"""
+        if activity.last_completion_known:
+            return ActivityCompletion.from_dict(activity.last_completion) if activity.last_completion else None
+        
+        latest = self.completion_repo.get_latest_completion_for_activity(activity.activity_id)
+        snapshot = latest.to_dict() if latest else None
+        if self.activity_repo.backfill_last_completion(activity.activity_id, snapshot):
+            activity.last_completion = snapshot
+            activity.last_completion_known = True
+        return latest
+    
+    def get_member_activities_with_status(self, member_id: str) -> Optional[List[Dict]]:
+        """Get a member's activities with status; None if the member does not exist
+
+        One member read and one AssignedToIndex query, whatever the number of
+        activities: latest completions come from the activity snapshots.
+        """
+        member = self.get_family_member(member_id)
+        if not member:
+            return None
+        
+        activities = self.activity_repo.get_by_member_id(member_id, member.household_id)
+        statuses = self._build_statuses(activities, member.household_id, members={member_id: member})
+        return [status.to_dict() for status in statuses]
+    
+    def _parse_sort(self, sort: Optional[str]) -> List[tuple]:
+        """Parse "field,-field" into [(field, descending)]"""
+        sort_keys = []
+        for part in (sort or '').split(','):
+            part = part.strip()
+            if not part:
+                continue
+            field = part.lstrip('-')
+            if field not in self.ACTIVITY_SORT_FIELDS:
+                raise ValueError(f"Cannot sort by '{field}'; choose from {self.ACTIVITY_SORT_FIELDS}")
+            sort_keys.append((field, part.startswith('-')))
+        return sort_keys
+    
+    def _parse_fields(self, fields: Optional[str]) -> List[str]:
+        """Parse a sparse fieldset; activity_id is always returned"""
+        if not fields:
+            return []
+        selected = [f.strip() for f in fields.split(',') if f.strip()]
+        unknown = [f for f in selected if f not in self.ACTIVITY_STATUS_FIELDS]
+        if unknown:
+            raise ValueError(f"Unknown fields {unknown}; choose from {self.ACTIVITY_STATUS_FIELDS}")
+        return ['activity_id'] + [f for f in selected if f != 'activity_id']
+    
     def get_activity_status(self, activity_id: str) -> Optional[ActivityStatus]:
         """Get the current status of an activity with completion context"""
         activity = self.get_activity(activity_id)
@@ -95,17 +384,39 @@ class KitchenService:
             return None
         
         # Get the most recent completion (without target_date parameter)
-        latest_completion = self.completion_repo.get_latest_completion_for_activity(activity_id)
+        latest_completion = self._latest_completion(activity)
         
         # Get the member name
         member = self.get_family_member(activity.assigned_to)
         member_name = member.name if member else "Unknown"
         
-        return ActivityStatus(activity, latest_completion, member_name)
+        today = get_local_date()
+        return ActivityStatus(activity, latest_completion, member_name, today,
+                              self._period_completions(activity, latest_completion, today))
+    
+    def _period_completions(self, activity: RecurringActivity, latest: Optional[ActivityCompletion],
+                            today: date) -> Optional[int]:
+        """Completions in the current slot, counted only for rules needing several a day"""
+        if activity.recurrence.times_per_day == 1 or latest is None:
+            return None
+        slot_start = activity.recurrence.slot(today)[0]
+        if latest.completion_date_obj < slot_start:
+            return 0
+        return sum(1 for _ in self.completion_repo.iter_household_range_items(
+            activity.household_id, slot_start.isoformat(), today.isoformat(), activity_id=activity.activity_id,
+            attributes=['completion_id']))
     
     def complete_activity(self, activity_id: str, completed_by: str = None, 
                         completion_date: str = None, notes: str = None) -> ActivityCompletion:
-        """Mark an activity as completed"""
+        """Mark an activity as completed
+
+        The activity's counters, history and snapshot are computed from the
+        activity as read and commit only on that read; when another completion
+        of it commits first, they are computed again (see retry_on_conflict).
+        """
+        if current_unit_of_work.get() is None:
+            return self.retry_on_conflict(self.complete_activity, activity_id, completed_by, completion_date, notes)
+        
         # Get the activity to find the assigned member and household
         activity = self.get_activity(activity_id)
         if not activity:
@@ -115,11 +426,35 @@ class KitchenService:
             activity_id=activity_id,
             member_id=activity.assigned_to,  # Use the assigned member
             household_id=activity.household_id,  # Use the activity's household
-            completion_date=completion_date or date.today().isoformat(),
+            completion_date=completion_date or get_local_date().isoformat(),
             completed_by=completed_by or activity.assigned_to,  # Default to assigned member
             notes=notes
         )
-        return self.completion_repo.create(completion)
+        ops = [self.completion_repo.create_op(completion)] + self._mirror_ops(puts=[completion])
+        
+        # Backdated completions leave a newer snapshot in place
+        current = self._latest_completion(activity)
+        backdated = current is not None and completion.completion_date < current.completion_date
+        on_time = None if backdated else (
+            current is None or not activity.is_overdue(current.completion_date_obj, completion.completion_date_obj)
+        )
+        stats = self._activity_stats_change(activity, completion, on_time, removed=False)
+        history = self._history_change(activity, completion, completed=True)
+        if not backdated:
+            ops.append(self.activity_repo.last_completion_op(
+                activity_id, completion.to_dict(), stats=stats, history=history,
+                next_due_at=self._next_reminder(activity, completion)))
+            activity.last_completion = completion.to_dict()
+        else:
+            ops.append(self.activity_repo.stats_op(activity_id, *stats, history=history))
+        ops += self._mirror_ops(puts=[activity])
+        ops += self._member_stats_ops(completion, on_time, removed=False)
+        
+        self._commit(
+            ops,
+            [ChangeEntry(completion.household_id, 'completion', completion.completion_id, 'upsert', completion.to_dict())]
+        )
+        return completion
     
     def undo_activity_completion(self, activity_id: str, completion_date: str = None) -> bool:
         """Undo the most recent completion for an activity"""
@@ -133,49 +468,280 @@ class KitchenService:
         if not completion:
             return False
         
+        ops = [self.completion_repo.delete_op(completion.completion_id)] + self._mirror_ops(deletes=[completion])
+        
+        # Removing the latest completion moves the snapshot back to the one before it
+        activity = self.get_activity(activity_id)
+        latest = self._latest_completion(activity) if activity else None
+        on_time = None
+        if activity and latest and latest.completion_id == completion.completion_id:
+            recent = self.completion_repo.get_by_activity_id(activity_id, limit=2)
+            previous = next((c for c in recent if c.completion_id != completion.completion_id), None)
+            on_time = previous is None or not activity.is_overdue(previous.completion_date_obj,
+                                                                  completion.completion_date_obj)
+            still_completed = previous is not None and (
+                period_of(previous.completion_date_obj, activity.recurrence) ==
+                period_of(completion.completion_date_obj, activity.recurrence)
+            )
+            stats = self._activity_stats_change(activity, completion, on_time, removed=True,
+                                                period_still_completed=still_completed)
+            history = self._history_change(activity, completion, completed=previous is not None and
+                                           previous.completion_date == completion.completion_date)
+            ops.append(self.activity_repo.last_completion_op(
+                activity_id, previous.to_dict() if previous else None, stats=stats, history=history,
+                next_due_at=self._next_reminder(activity, previous)))
+            activity.last_completion = previous.to_dict() if previous else None
+            ops += self._mirror_ops(puts=[activity])
+        elif activity:
+            stats = self._activity_stats_change(activity, completion, None, removed=True)
+            day = completion.completion_date
+            day_still_completed = any(
+                c.completion_id != completion.completion_id
+                for c in self.completion_repo.iter_by_household_range(
+                    completion.household_id, day, day, activity_id=activity_id)
+            )
+            history = self._history_change(activity, completion, completed=day_still_completed)
+            ops.append(self.activity_repo.stats_op(activity_id, *stats, history=history))
+            ops += self._mirror_ops(puts=[activity])
+        ops += self._member_stats_ops(completion, on_time, removed=True)
+        
         # Delete the completion record using its completion_id
-        return self.completion_repo.delete_completion(completion.completion_id)
+        try:
+            self._commit(
+                ops,
+                [ChangeEntry(completion.household_id, 'completion', completion.completion_id, 'delete',
+                             completion.to_dict())]
+            )
+            return True
+        except ValueError as e:
+            print(f"Completion with ID {completion.completion_id} does not exist: {e}")
+            return False
     
-    # Dashboard and Summary Operations
-    def get_dashboard_data(self, household_id: str) -> Dict[str, Any]:
-        """Get dashboard data for a household"""
-        activities_with_status = self.get_activities_with_status(household_id)
+    # Reminders
+    def _next_reminder(self, activity: RecurringActivity, latest: Optional[ActivityCompletion]) -> Optional[str]:
+        """next_due_at to store with the activity's latest completion; None leaves inactive ones unscheduled"""
+        if not activity.is_active:
+            return None
+        return activity.next_reminder_at(latest.completion_date_obj if latest else None)
+    
+    def backfill_reminders(self) -> Dict[str, int]:
+        """Schedule reminders for active activities written before reminders existed"""
+        result = {'scheduled': 0, 'conflicts': 0}
+        for activity in self.activity_repo.iter_unscheduled():
+            next_due_at = self._next_reminder(activity, self._latest_completion(activity))
+            if self.activity_repo.arm_reminder(activity.activity_id, next_due_at):
+                result['scheduled'] += 1
+            else:
+                result['conflicts'] += 1
+        return result
+    
+    # Completion counters
+    def _activity_stats_change(self, activity: RecurringActivity, completion: ActivityCompletion,
+                               on_time: Optional[bool], removed: bool,
+                               period_still_completed: bool = False) -> tuple:
+        """(before, after) counters for adding or removing one completion; updates the activity in place
+
+        Applied incrementally when the change is at the head of the streak
+        (on_time known); anything else is rebuilt from the activity's history.
+        """
+        before = activity.stats
+        after = None
+        if before is not None and on_time is not None:
+            period = period_of(completion.completion_date_obj, activity.recurrence)
+            if removed:
+                after = before.after_undo(period, on_time, period_still_completed, activity.recurrence)
+            else:
+                after = before.after_completion(period, on_time, activity.recurrence)
+        if after is None:
+            history = [c for c in self.completion_repo.iter_by_activity_id(activity.activity_id)
+                       if c.completion_id != completion.completion_id]
+            if not removed:
+                history.append(completion)
+            after = CompletionStats.from_history(on_time_flags(history, activity), activity.recurrence)
+        activity.stats = after
+        return before, after
+    
+    def _history_change(self, activity: RecurringActivity, completion: ActivityCompletion,
+                        completed: bool) -> Dict[str, bytes]:
+        """Bitmap attributes to write once the completion's day is (or is no longer) completed
+
+        Updates the activity in place; activities without bitmaps yet get
+        every year rebuilt from their completions.
+        """
+        if activity.history is not None:
+            return activity.history.mark(completion.completion_date_obj, completed)
+        days = [c.completion_date_obj for c in self.completion_repo.iter_by_activity_id(activity.activity_id)
+                if c.completion_id != completion.completion_id]
+        if completed:
+            days.append(completion.completion_date_obj)
+        activity.history = CompletionHistory.from_days(days)
+        return activity.history.to_item()
+    
+    def _member_stats_ops(self, completion: ActivityCompletion, on_time: Optional[bool], removed: bool) -> List[Dict]:
+        """Writes adjusting the assigned member's day-streak counters for one completion"""
+        member = self.get_family_member(completion.member_id)
+        if member is None:
+            return []
         
-        # Categorize activities
-        due_today = []
-        overdue = []
-        completed_today = []
-        upcoming = []
-        
-        for activity_data in activities_with_status:
-            status = activity_data.get('status', 'due')
-            if status == 'completed':
-                completed_today.append(activity_data)
-            elif status == 'overdue':
-                overdue.append(activity_data)
-            elif status == 'due':
-                due_today.append(activity_data)
+        day = completion.completion_date
+        before = member.stats
+        after = None
+        if before is not None and on_time is not None:
+            if removed:
+                # Another completion the same day keeps the day in the streak
+                still_completed = any(
+                    c.completion_id != completion.completion_id
+                    for c in self.completion_repo.iter_by_household_range(
+                        completion.household_id, day, day, member_id=member.member_id)
+                )
+                after = before.after_undo(day, on_time, still_completed, 'daily')
             else:
-                upcoming.append(activity_data)
+                after = before.after_completion(day, on_time, 'daily')
+        if after is None:
+            history = [c for c in self.completion_repo.iter_by_household_range(
+                           completion.household_id, member_id=member.member_id)
+                       if c.completion_id != completion.completion_id]
+            if not removed:
+                history.append(completion)
+            activities = {a.activity_id: a for a in self.activity_repo.get_by_household_id(member.household_id)}
+            _, member_stats = build_stats(activities, history)
+            after = member_stats.get(member.member_id, CompletionStats())
         
+        member.stats = after
+        # Unconditional, so the member's completions of other activities don't cancel this transaction
+        return ([self.family_repo.stats_op(member.member_id, before, after, conditional=False)] +
+                self._mirror_ops(puts=[member]))
+    
+    def get_activity_stats(self, activity_id: str) -> Optional[Dict[str, Any]]:
+        """Streak and on-time summary of an activity (one read); None if it does not exist"""
+        activity = self.get_activity(activity_id)
+        if not activity:
+            return None
+        stats = activity.stats
+        if stats is None:
+            # Stored before counters existed and not yet rebuilt
+            history = list(self.completion_repo.iter_by_activity_id(activity_id))
+            stats = CompletionStats.from_history(on_time_flags(history, activity), activity.recurrence)
+        return {'activity_id': activity_id, 'name': activity.name, **stats.summary(activity.recurrence)}
+    
+    def get_member_stats(self, member_id: str) -> Optional[Dict[str, Any]]:
+        """Day-streak and on-time summary of a member (one read); None if they do not exist"""
+        member = self.get_family_member(member_id)
+        if not member:
+            return None
+        stats = member.stats
+        if stats is None:
+            history = list(self.completion_repo.iter_by_household_range(member.household_id, member_id=member_id))
+            activities = {a.activity_id: a for a in self.activity_repo.get_by_household_id(member.household_id)}
+            stats = build_stats(activities, history)[1].get(member_id, CompletionStats())
+        return {'member_id': member_id, 'name': member.name, **stats.summary('daily')}
+    
+    def rebuild_completion_stats(self, household_id: str) -> Dict[str, int]:
+        """Recompute a household's activity and member counters, and activity history bitmaps,
+        from its completion history"""
+        activities = {a.activity_id: a for a in self.get_activities(household_id)}
+        members = self.get_family_members(household_id)
+        completions = list(self.completion_repo.iter_by_household_range(household_id))
+        activity_stats, member_stats = build_stats(activities, completions)
+        
+        days: Dict[str, List[date]] = {}
+        for completion in completions:
+            days.setdefault(completion.activity_id, []).append(completion.completion_date_obj)
+        
+        updated = {'activities': 0, 'members': 0, 'conflicts': 0}
+        targets = []
+        for activity in activities.values():
+            history = CompletionHistory.from_days(days.get(activity.activity_id, []))
+            if activity.history == history:
+                history = None
+            else:
+                # Clear bits left in years that no longer have completions
+                for year in (activity.history.years if activity.history else ()):
+                    history.years.setdefault(year, 0)
+            targets.append(('activities', activity, activity_stats.get(activity.activity_id, CompletionStats()),
+                            history, self.activity_repo.stats_op, activity.activity_id))
+        targets += [('members', m, member_stats.get(m.member_id, CompletionStats()), None,
+                     self.family_repo.stats_op, m.member_id) for m in members]
+        
+        for kind, entity, rebuilt, history, stats_op, entity_id in targets:
+            if entity.stats == rebuilt and history is None:
+                continue
+            before = entity.stats
+            entity.stats = rebuilt
+            options = {}
+            if history:
+                entity.history = history
+                options['history'] = history.to_item()
+            try:
+                self._apply([stats_op(entity_id, before, rebuilt, **options)] + self._mirror_ops(puts=[entity]), [])
+                updated[kind] += 1
+            except ValueError:
+                # A completion landed since the history was read; run again to pick it up
+                updated['conflicts'] += 1
+        return updated
+    
+    def get_activity_history(self, activity_id: str, year: int = None) -> Optional[Dict[str, Any]]:
+        """A year of an activity's periods and whether each was completed (one read); None if it does not exist"""
+        activity = self.get_activity(activity_id)
+        if not activity:
+            return None
+        year = year or get_local_date().year
+        history = activity.history
+        if history is None:
+            # Stored before bitmaps existed and not yet rebuilt
+            history = CompletionHistory.from_days(
+                c.completion_date_obj for c in self.completion_repo.iter_by_activity_id(activity_id))
+        cells = history.cells(year, activity.frequency)
+        return {
+            'activity_id': activity_id,
+            'name': activity.name,
+            'frequency': activity.frequency,
+            'year': year,
+            'completed_periods': sum(completed for _, completed in cells),
+            'cells': [{'period': period, 'completed': completed} for period, completed in cells]
+        }
+    
+    def get_household_history(self, household_id: str, year: int = None) -> Dict[str, Any]:
+        """Activities completed on each day of a year across a household, from the activities' bitmaps"""
+        year = year or get_local_date().year
+        activities = self.get_activities(household_id)
+        if any(activity.history is None for activity in activities):
+            days: Dict[str, List[date]] = {}
+            for completion in self.completion_repo.iter_by_household_range(
+                    household_id, f"{year:04d}-01-01", f"{year:04d}-12-31"):
+                days.setdefault(completion.activity_id, []).append(completion.completion_date_obj)
+            histories = [activity.history or CompletionHistory.from_days(days.get(activity.activity_id, []))
+                         for activity in activities]
+        else:
+            histories = [activity.history for activity in activities]
+        
+        counts = day_counts(histories, year)
+        start = date(year, 1, 1)
         return {
             'household_id': household_id,
-            'date': date.today().isoformat(),
-            'summary': {
-                'total_activities': len(activities_with_status),
-                'due_today': len(due_today),
-                'overdue': len(overdue), 
-                'completed_today': len(completed_today),
-                'upcoming': len(upcoming)
-            },
-            'due_today': due_today,
-            'overdue': overdue,
-            'completed_today': completed_today,
-            'upcoming': upcoming
+            'year': year,
+            'activities': len(activities),
+            'max_count': max(counts),
+            'days': [{'date': (start + timedelta(days=i)).isoformat(), 'count': count}
+                     for i, count in enumerate(counts)]
         }
     
+    # Dashboard and Summary Operations
+    def get_dashboard_data(self, household_id: str) -> Dict[str, Any]:
+        """Get dashboard data for a household, from its materialized view"""
+        return self.get_household_digest(household_id).dashboard
+    
     def get_household_summary(self, household_id: str) -> Dict[str, Any]:
-        """Get household summary information"""
+        """Get household summary information, from its materialized view"""
+        return self.get_household_digest(household_id).summary
+    
+    def compute_dashboard(self, household_id: str) -> Dict[str, Any]:
+        """Dashboard computed from scratch"""
+        today = get_local_date().isoformat()
+        return dashboard_from_statuses(household_id, today, self.get_activities_with_status(household_id))
+    
+    def compute_household_summary(self, household_id: str) -> Dict[str, Any]:
+        """Household summary computed from scratch"""
         family_members = self.get_family_members(household_id)
         activities = self.get_activities(household_id)
         
@@ -195,6 +761,186 @@ class KitchenService:
             }
         }
     
+    # Materialized dashboard: built in full nightly (jobs/build_household_digests.py) or on
+    # the first read of the day, then kept current by DashboardProjector
+    def build_household_digest(self, household_id: str) -> HouseholdDigest:
+        """Compute and store today's dashboard view for a household"""
+        # Read the token first: changes committed while building are projected onto it after
+        token = self.change_log_repo.get_latest_token(household_id)
+        # A newer version makes projectors holding the old view retry on this one
+        existing = self.digest_repo.get_digest(household_id)
+        digest = HouseholdDigest(
+            household_id, get_local_date().isoformat(), token,
+            dashboard=self.compute_dashboard(household_id),
+            summary=self.compute_household_summary(household_id),
+            version=existing.version + 1 if existing else 1
+        )
+        self.digest_repo.put_digest(digest)
+        return digest
+    
+    def get_household_digest(self, household_id: str) -> HouseholdDigest:
+        """Today's dashboard view: one GetItem, or a full build if there is none for today yet"""
+        if self.household_cache is None:
+            return self._read_household_digest(household_id)
+        # A view the projector has not caught up on yet is served but not cached
+        today = get_local_date().isoformat()
+        snapshot = self._cached_read(
+            household_id, 'digest', lambda: self._read_household_digest(household_id).to_dict(),
+            complete=lambda d, token: d['digest_date'] == today and (d['change_token'] or '') >= (token or ''))
+        return HouseholdDigest.from_dict(snapshot)
+    
+    def _read_household_digest(self, household_id: str) -> HouseholdDigest:
+        digest = self.digest_repo.get_digest(household_id)
+        if digest is None or digest.digest_date != get_local_date().isoformat():
+            return self.build_household_digest(household_id)
+        return digest
+    
+    def household_version(self, household_id: str) -> str:
+        """Changes whenever anything a household read returns can: a committed change or a new day"""
+        return self._version(self.change_log_repo.get_latest_token(household_id))
+    
+    @staticmethod
+    def _version(token: Optional[str]) -> str:
+        return f"{get_local_date().isoformat()}/{token or ''}"
+    
+    # Eventually consistent index queries see a change within this many seconds of its commit
+    GSI_SETTLE = 2.0
+    
+    def _cached_read(self, household_id: str, kind: str, load: Callable[[], Any],
+                     complete: Callable[[Any, Optional[str]], bool] = None) -> Any:
+        """A household read through the shared cache, keyed on the household's current version
+
+        complete(value, token) says whether a loaded value reflects every change
+        up to the token it was keyed on; values that don't are not cached.
+        Without it the load is taken to be index queries (HouseholdIndex,
+        AssignedToIndex), which may not show the newest change yet, so it is
+        only cached once that change is GSI_SETTLE seconds old.
+        """
+        token = self.household_cache.latest_token(household_id, self.change_log_repo.get_latest_token)
+        if complete is None:
+            # Decided before loading: only a query started after the change settled is sure to see it
+            settled = token is None or self.change_log_repo.token_age(token) >= self.GSI_SETTLE
+            cacheable = lambda value: settled
+        else:
+            cacheable = lambda value: complete(value, token)
+        return self.household_cache.get_or_load(household_id, kind, self._version(token), load, cacheable)
+    
+    COMPLETION_GROUPS = ['day', 'week', 'month', 'member', 'category']
+    
+    def get_completion_counts(self, household_id: str, start_date: str = None, end_date: str = None,
+                              member_id: str = None, activity_id: str = None,
+                              group_by: str = 'day') -> Dict[str, Any]:
+        """Count a household's completions in a date range, grouped by period, member or category
+
+        Reads only the grouping attributes through HouseholdDateIndex and counts
+        page by page, so a year of completions never sits in memory as rows.
+        Dates default to the 30 days ending today.
+        """
+        if group_by not in self.COMPLETION_GROUPS:
+            raise ValueError(f"group_by must be one of {self.COMPLETION_GROUPS}")
+        try:
+            end = date.fromisoformat(end_date) if end_date else get_local_date()
+            start = date.fromisoformat(start_date) if start_date else end - timedelta(days=30)
+        except ValueError:
+            raise ValueError("from and to must be dates (YYYY-MM-DD)")
+        if start > end:
+            raise ValueError("from must not be after to")
+        
+        if group_by == 'member':
+            attribute = 'member_id'
+        elif group_by == 'category':
+            attribute = 'activity_id'
+        else:
+            attribute = 'completion_date'
+        counts: Dict[str, int] = {}
+        for item in self.completion_repo.iter_household_range_items(
+                household_id, start.isoformat(), end.isoformat(), member_id, activity_id, attributes=[attribute]):
+            counts[item[attribute]] = counts.get(item[attribute], 0) + 1
+        
+        # Fold the raw keys into the requested groups
+        groups: Dict[str, int] = {}
+        if group_by == 'member':
+            names = {m.member_id: m.name for m in self.get_family_members(household_id)}
+            groups = counts
+        elif group_by == 'category':
+            categories = {a.activity_id: a.category for a in self.get_activities(household_id)}
+            for key, count in counts.items():
+                category = categories.get(key) or 'uncategorized'
+                groups[category] = groups.get(category, 0) + count
+        else:
+            frequency = {'day': 'daily', 'week': 'weekly', 'month': 'monthly'}[group_by]
+            for key, count in counts.items():
+                period = period_of(date.fromisoformat(key), frequency)
+                groups[period] = groups.get(period, 0) + count
+        
+        rows = []
+        for key in sorted(groups):
+            row = {'key': key, 'count': groups[key]}
+            if group_by == 'member':
+                row['name'] = names.get(key)
+            rows.append(row)
+        return {
+            'household_id': household_id,
+            'from': start.isoformat(),
+            'to': end.isoformat(),
+            'group_by': group_by,
+            'total': sum(groups.values()),
+            'groups': rows
+        }
+    
+    MAX_SCHEDULE_DAYS = 90
+    
+    def get_schedule(self, household_id: str, days: int = 14) -> Dict[str, Any]:
+        """Every activity occurrence due from today through the next `days` days, in date order
+
+        Each activity starts at its next due date (today if never completed;
+        an overdue one is listed today with overdue set) and is advanced by
+        expand_occurrences. Results are cached per household until a change
+        is committed for it.
+        """
+        if not 1 <= days <= self.MAX_SCHEDULE_DAYS:
+            raise ValueError(f"days must be between 1 and {self.MAX_SCHEDULE_DAYS}")
+        today = get_local_date()
+        token = self.change_log_repo.get_latest_token(household_id)
+        occurrences = ScheduleCache.get(household_id, today, days, token)
+        if occurrences is None:
+            occurrences = self._expand_schedule(household_id, today, days)
+            ScheduleCache.put(household_id, today, days, token, occurrences)
+        return {
+            'household_id': household_id,
+            'from': today.isoformat(),
+            'to': (today + timedelta(days=days - 1)).isoformat(),
+            'occurrences': occurrences
+        }
+    
+    def _expand_schedule(self, household_id: str, today: date, days: int) -> List[Dict]:
+        household = self._load_household(household_id)
+        if household is not None:
+            activities = [a for a in household['activities'] if a.is_active]
+            members = {m.member_id: m for m in household['members']}
+        else:
+            activities = self.get_activities(household_id)
+            members = None
+        activities.sort(key=lambda a: a.name.lower())
+        statuses = {s.activity.activity_id: s for s in self._build_statuses(activities, household_id, members)}
+        
+        starts = [(max(s.next_due_date, today), s.activity) for s in statuses.values()]
+        occurrences = []
+        for due, activity in expand_occurrences(starts, today + timedelta(days=days - 1)):
+            status = statuses[activity.activity_id]
+            occurrences.append({
+                'date': due.isoformat(),
+                'activity_id': activity.activity_id,
+                'name': activity.name,
+                'category': activity.category,
+                'frequency': activity.frequency,
+                'times_per_day': activity.recurrence.times_per_day,
+                'assigned_to': activity.assigned_to,
+                'member_name': status.member_name,
+                'overdue': due == today and status.next_due_date < today
+            })
+        return occurrences
+    
     def get_activities_due_today(self, household_id: str) -> List[Dict]:
         """Get activities due today"""
         activities_with_status = self.get_activities_with_status(household_id)
@@ -226,6 +972,78 @@ class KitchenService:
         activities_with_status = self.get_activities_with_status(household_id)
         return [a for a in activities_with_status if a.get('status') == 'completed']
 
+    def update_activity(self, activity: RecurringActivity) -> RecurringActivity:
+        """Update a recurring activity"""
+        activity.recurrence  # Raises ValueError for an invalid frequency_config
+        # A new schedule moves the pending reminder too
+        next_due_at = self._next_reminder(activity, self._latest_completion(activity))
+        self._commit(
+            [self.activity_repo.update_op(activity, next_due_at=next_due_at)] + self._mirror_ops(puts=[activity]),
+            [ChangeEntry(activity.household_id, 'activity', activity.activity_id, 'upsert', activity.to_dict())]
+        )
+        self._register('activity', activity.activity_id, activity)
+        return activity
+
     def delete_activity(self, activity_id: str) -> bool:
         """Soft delete an activity"""
-        return self.activity_repo.soft_delete(activity_id)
+        activity = self.get_activity(activity_id)
+        if not activity:
+            return False
+        
+        activity.is_active = False
+        try:
+            self._commit(
+                [self.activity_repo.soft_delete_op(activity_id)] + self._mirror_ops(puts=[activity]),
+                [ChangeEntry(activity.household_id, 'activity', activity_id, 'delete')]
+            )
+            return True
+        except ValueError as e:
+            print(f"Error soft deleting activity {activity_id}: {e}")
+            return False
+
+    # Incremental Sync Operations
+    def get_changes(self, household_id: str, since: str = None, limit: int = 500) -> Dict[str, Any]:
+        """Get members, activities and completions changed after the `since` token
+
+        Changes committed just behind the token (see
+        ChangeLogRepository.SYNC_OVERLAP_SECONDS) are sent again, so a client
+        may receive a change it already applied; the snapshots are idempotent.
+        """
+        if since and ChangeLogRepository.is_token_expired(since):
+            # The log no longer covers the gap; the client must refetch everything
+            return {
+                'household_id': household_id,
+                'reset': True,
+                'next_token': self.change_log_repo.get_latest_token(household_id),
+                'has_more': False
+            }
+        
+        entries, has_more = self.change_log_repo.get_changes_since(
+            household_id, since, limit, overlap=ChangeLogRepository.SYNC_OVERLAP_SECONDS)
+        
+        # Collapse to the latest change per entity, keeping commit order
+        latest = {}
+        for entry in entries:
+            latest.pop((entry.entity_type, entry.entity_id), None)
+            latest[(entry.entity_type, entry.entity_id)] = entry
+        
+        collections = {'member': 'members', 'activity': 'activities', 'completion': 'completions'}
+        result = {
+            'household_id': household_id,
+            'reset': False,
+            'members': [],
+            'activities': [],
+            'completions': [],
+            'deleted': {'members': [], 'activities': [], 'completions': []},
+            # Overlap entries sit behind the token; it never moves back
+            'next_token': max(entries[-1].change_key, since or '') if entries else since,
+            'has_more': has_more
+        }
+        for entry in latest.values():
+            collection = collections[entry.entity_type]
+            if entry.operation == 'delete':
+                result['deleted'][collection].append(entry.entity_id)
+            else:
+                result[collection].append(entry.data)
+        
+        return result
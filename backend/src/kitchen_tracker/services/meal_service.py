@@ -0,0 +1,235 @@
+import re
+import uuid
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+# Import with fallback for Lambda environment
+try:
+    from ..models.meal import Meal, MealRecord, WeeklyMealPlan
+    from ..dal.meal_repository import MealRepository
+    from ..dal.household_repository import HouseholdRepository
+except ImportError:
+    # Lambda environment - use absolute imports
+    from models.meal import Meal, MealRecord, WeeklyMealPlan
+    from dal.meal_repository import MealRepository
+    from dal.household_repository import HouseholdRepository
+
+
+def calculate_week_of(delivery_date: str, today: date = None) -> str:
+    """Monday (YYYY-MM-DD) of the week a delivery date falls in
+
+    Home Chef writes dates without a year ("Thursday, July 3"). The year is
+    the nearest one in which that date falls on the stated weekday, or the
+    nearest year at all when no weekday is given. Unparseable dates fall
+    back to the current week.
+    """
+    today = today or date.today()
+    delivery = _parse_delivery_date(delivery_date or "", today)
+    if delivery is None:
+        delivery = today
+    return (delivery - timedelta(days=delivery.weekday())).isoformat()
+
+
+WEEKDAYS = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']
+
+# Years either side of today considered for a yearless date (a weekday repeats within 11)
+YEAR_WINDOW = 6
+
+
+def _parse_delivery_date(text: str, today: date) -> Optional[date]:
+    text = text.strip()
+    try:
+        return date.fromisoformat(text)
+    except ValueError:
+        pass
+
+    # Split off a leading weekday ("Thursday, ") and drop ordinal suffixes ("3rd")
+    weekday = None
+    match = re.match(r'^([A-Za-z]+day),?\s+', text)
+    if match:
+        weekday = WEEKDAYS.index(match.group(1).lower()) if match.group(1).lower() in WEEKDAYS else None
+        text = text[match.end():]
+    text = re.sub(r'(\d+)(st|nd|rd|th)\b', r'\1', text)
+    for fmt in ("%B %d, %Y", "%b %d, %Y", "%B %d %Y"):
+        try:
+            return datetime.strptime(text, fmt).date()
+        except ValueError:
+            pass
+    for fmt in ("%B %d", "%b %d"):
+        try:
+            # Parse with a leap year so "February 29" is accepted
+            parsed = datetime.strptime(f"{text} 2000", f"{fmt} %Y").date()
+        except ValueError:
+            continue
+        candidates = []
+        for year in range(today.year - YEAR_WINDOW, today.year + 2):
+            try:
+                candidates.append(parsed.replace(year=year))
+            except ValueError:
+                pass
+        matching = [c for c in candidates if weekday is None or c.weekday() == weekday]
+        candidates = matching or candidates
+        return min(candidates, key=lambda candidate: abs((candidate - today).days)) if candidates else None
+    return None
+
+
+# Namespace for meal IDs derived from (household, week_of, name)
+MEAL_ID_NAMESPACE = uuid.UUID('5b7f3c2e-2a61-4a57-9d0c-6f1d3c8e4b21')
+
+
+def natural_meal_id(household_id: str, week_of: str, name: str) -> str:
+    """Stable meal ID for a household's meal in a given week, whatever email it came from"""
+    normalized = ' '.join(name.lower().split())
+    return str(uuid.uuid5(MEAL_ID_NAMESPACE, f"{household_id}|{week_of}|{normalized}"))
+
+
+class MealService:
+    """Service layer for Home Chef meals and cook history"""
+
+    def __init__(self):
+        self.meal_repo = MealRepository()
+        # Optional single-table copy of each household, kept in step on every write
+        self.household_repo = HouseholdRepository() if HouseholdRepository.enabled() else None
+
+    def _mirror_ops(self, puts: List = ()) -> List[Dict]:
+        """Household-table writes matching meals-table writes (none unless enabled)"""
+        if self.household_repo is None:
+            return []
+        return [self.household_repo.put_op(entity) for entity in puts]
+    
+    def mirror_callback(self) -> Optional[Callable[[List], List[Dict]]]:
+        """MealRepository.create_meals mirror_ops for this layout: None unless the household table is enabled"""
+        if self.household_repo is None:
+            return None
+        return lambda created: self._mirror_ops(puts=created)
+
+    def setup_meal(self, household_id: str, name: str, delivery_date: str = None,
+                   recipe_url: str = None, source: str = None) -> Meal:
+        """Add a delivered meal and put it in its week's plan"""
+        meal = Meal(
+            name=name,
+            household_id=household_id,
+            week_of=calculate_week_of(delivery_date),
+            recipe_url=recipe_url,
+            delivery_date=delivery_date,
+            source=source
+        )
+        meal.mark_delivered()
+        self.meal_repo.transact_write([self.meal_repo.create_meal_op(meal), self.meal_repo.plan_meal_op(meal)] +
+                                      self._mirror_ops(puts=[meal]))
+        return meal
+
+    def import_meals(self, household_id: str, parsed_meals: List[dict], source: str = None) -> List[Meal]:
+        """Add delivered meals parsed from an email in batch; returns the ones that were new
+
+        Meal IDs come from (household, week, name), so the same meal arriving
+        again (a resent email, a shipment update) is not added twice and a
+        meal already cooked keeps its status. Meals already in their week's
+        plan are dropped before writing (one read per week); the conditional
+        create catches any the plan does not know about.
+        """
+        meals, planned = {}, {}
+        for meal in self.meals_from_email(household_id, parsed_meals, source):
+            week = (meal.household_id, meal.week_of)
+            if week not in planned:
+                plan = self.meal_repo.get_weekly_plan(*week)
+                planned[week] = {planned_meal.meal_id for planned_meal in plan.meals} if plan else set()
+            if meal.meal_id not in planned[week]:
+                meals.setdefault(meal.meal_id, meal)
+        if not meals:
+            return []
+        return self.meal_repo.create_meals(list(meals.values()), mirror_ops=self.mirror_callback())
+
+    def meals_from_email(self, household_id: str, parsed_meals: List[dict], source: str = None) -> List[Meal]:
+        """Delivered Meals, with natural IDs, for the meals parsed from an email"""
+        meals = []
+        for parsed in parsed_meals:
+            week_of = calculate_week_of(parsed.get('delivery_date'))
+            meal = Meal(
+                name=parsed['name'],
+                household_id=household_id,
+                week_of=week_of,
+                recipe_url=parsed.get('recipe_link'),
+                delivery_date=parsed.get('delivery_date'),
+                meal_id=natural_meal_id(household_id, week_of, parsed['name']),
+                source=source
+            )
+            meal.mark_delivered()
+            meals.append(meal)
+        return meals
+
+    def get_meal(self, household_id: str, meal_id: str) -> Optional[Meal]:
+        """Get a meal by ID"""
+        return self.meal_repo.get_meal(household_id, meal_id)
+
+    def get_meals(self, household_id: str, week_of: str = None) -> List[Meal]:
+        """Get a household's meals; a single week comes from its materialized plan"""
+        if week_of:
+            return self.get_weekly_plan(household_id, week_of).meals
+        return self.meal_repo.get_household_meals(household_id)
+
+    def get_weekly_plan(self, household_id: str, week_of: str) -> WeeklyMealPlan:
+        """Get a week's plan, building it from the week's meals the first time it is read"""
+        plan = self.meal_repo.get_weekly_plan(household_id, week_of)
+        if plan is not None:
+            return plan
+
+        # Weeks stored before plans existed; later writes keep the plan current
+        plan = WeeklyMealPlan(week_of, household_id, self.meal_repo.get_meals_by_week(household_id, week_of))
+        if plan.meals:
+            self.meal_repo.save_weekly_plan(plan)
+        return plan
+
+    def update_meal_status(self, household_id: str, meal_id: str, status: str) -> Optional[Meal]:
+        """Set a meal's status; returns the updated meal, or None if it does not exist"""
+        if status not in Meal.STATUSES:
+            raise ValueError(f"status must be one of {Meal.STATUSES}")
+
+        if self.household_repo is None:
+            meal = self.meal_repo.update_meal_status(household_id, meal_id, status)
+        else:
+            meal = self._update_mirrored_meal_status(household_id, meal_id, status)
+        if meal and not self.meal_repo.set_plan_meal_status(household_id, meal.week_of, meal_id, status):
+            # The plan predates this meal (or was never built): bring it up to date
+            self.meal_repo.transact_write([self.meal_repo.plan_meal_op(meal)])
+        return meal
+
+    def _update_mirrored_meal_status(self, household_id: str, meal_id: str, status: str) -> Optional[Meal]:
+        """Status update and its household-table copy in one transaction"""
+        meal = self.meal_repo.get_meal(household_id, meal_id)
+        if meal is None:
+            return None
+        meal.status = status
+        try:
+            self.meal_repo.transact_write([self.meal_repo.meal_status_op(household_id, meal_id, status)] +
+                                          self._mirror_ops(puts=[meal]))
+        except ValueError:
+            # Removed since it was read
+            return None
+        return meal
+
+    def cook_meal(self, household_id: str, meal_id: str, cooked_by: str = None, notes: str = None) -> MealRecord:
+        """Record that a meal was cooked and mark the meal cooked
+
+        The record is kept even when the meal is unknown (e.g. cooked before
+        its delivery email was processed).
+        """
+        record = MealRecord(meal_id=meal_id, household_id=household_id, cooked_by=cooked_by, notes=notes)
+        if self.household_repo is None:
+            saved = self.meal_repo.create_meal_record(record)
+        else:
+            try:
+                self.meal_repo.transact_write([self.meal_repo.create_meal_record_op(record)] +
+                                              self._mirror_ops(puts=[record]))
+                saved = True
+            except Exception as e:
+                print(f"Error saving cook record for meal {meal_id}: {e}")
+                saved = False
+        if not saved:
+            raise RuntimeError(f"Could not save cook record for meal {meal_id}")
+        self.update_meal_status(household_id, meal_id, "cooked")
+        return record
+
+    def get_meal_records(self, household_id: str, meal_id: str = None) -> List[MealRecord]:
+        """Get cook records, optionally for one meal"""
+        return self.meal_repo.get_meal_records(household_id, meal_id)
@@ -0,0 +1,176 @@
+import heapq
+import importlib
+import os
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Tuple
+
+# Import with fallback for Lambda environment
+try:
+    from ..dal.recurring_activity_repository import RecurringActivityRepository
+    from ..models.recurring_activity import RecurringActivity
+except ImportError:
+    # Lambda environment - use absolute imports
+    from dal.recurring_activity_repository import RecurringActivityRepository
+    from models.recurring_activity import RecurringActivity
+
+
+def reminder_from_item(item: Dict) -> Dict:
+    """The notification for an activity item from the next-due index
+
+    reminder_id is the same for every attempt at one occurrence's reminder,
+    so a sink that may see a retry can drop repeats on it.
+    """
+    return {
+        'reminder_id': f"{item['activity_id']}@{item['next_due_at']}",
+        'activity_id': item['activity_id'],
+        'household_id': item['household_id'],
+        'assigned_to': item['assigned_to'],
+        'name': item['name'],
+        'category': item.get('category'),
+        'due_at': item['next_due_at']
+    }
+
+
+class ReminderSink:
+    """Where reminders are delivered; send() receives one batch and raises if it could not be delivered
+
+    Deployments plug in their own sink through the REMINDER_SINK setting,
+    see create_reminder_sink.
+    """
+
+    def send(self, reminders: List[Dict]) -> None:
+        raise NotImplementedError
+
+
+class LogReminderSink(ReminderSink):
+    """Prints each reminder (the default, for local runs and CloudWatch)"""
+
+    def send(self, reminders: List[Dict]) -> None:
+        for reminder in reminders:
+            print(f"Reminder {reminder['reminder_id']}: {reminder['name']} due {reminder['due_at']} "
+                  f"({reminder['household_id']})")
+
+
+class WebhookReminderSink(ReminderSink):
+    """Stand-in for a webhook: records the JSON body each batch would be POSTed with"""
+
+    def __init__(self, url: str = None):
+        self.url = url or os.getenv('REMINDER_WEBHOOK_URL', 'http://localhost/reminders')
+        self.deliveries: List[Dict] = []
+
+    def send(self, reminders: List[Dict]) -> None:
+        self.deliveries.append({'url': self.url, 'body': {'reminders': list(reminders)}})
+
+
+class EmailReminderSink(ReminderSink):
+    """Stand-in for email: renders one message per household in the batch into an outbox"""
+
+    def __init__(self):
+        self.outbox: List[Dict] = []
+
+    def send(self, reminders: List[Dict]) -> None:
+        by_household: Dict[str, List[Dict]] = {}
+        for reminder in reminders:
+            by_household.setdefault(reminder['household_id'], []).append(reminder)
+        for household_id, household_reminders in by_household.items():
+            lines = [f"- {r['name']} (due {r['due_at'].replace('T', ' ')})" for r in household_reminders]
+            self.outbox.append({
+                'household_id': household_id,
+                'subject': f"{len(household_reminders)} chore(s) due",
+                'body': "\n".join(lines),
+                'reminder_ids': [r['reminder_id'] for r in household_reminders]
+            })
+
+
+SINKS = {'log': LogReminderSink, 'webhook': WebhookReminderSink, 'email': EmailReminderSink}
+
+
+def create_reminder_sink(sink_path: str = None) -> ReminderSink:
+    """Create the configured sink: "log" (default), "webhook", "email" or a "module:ClassName" path"""
+    sink_path = sink_path or os.getenv('REMINDER_SINK', 'log')
+    if sink_path in SINKS:
+        return SINKS[sink_path]()
+
+    module_name, _, class_name = sink_path.partition(':')
+    sink_class = getattr(importlib.import_module(module_name), class_name)
+    return sink_class()
+
+
+class ReminderScheduler:
+    """Sends the reminders that fall due, reading only those from the next-due index
+
+    Each run merges the index's shards, already sorted by next_due_at, through
+    a min-heap of (next_due_at, activity) and stops at the end of the window,
+    so its reads follow the number of reminders due rather than the number of
+    activities. Every reminder is claimed with a conditional write that takes
+    it out of the index before it is sent: of two overlapping runs only one
+    wins each claim. Once sent, the activity is re-armed for its first
+    occurrence after the run's window, so a chore nobody completes is
+    reminded again then, once, however long it has been overdue; a
+    completion meanwhile re-arms it from the completion instead. A batch the
+    sink rejects is released back into the index for the next run.
+    """
+
+    def __init__(self, activity_repo: RecurringActivityRepository = None, sink: ReminderSink = None,
+                 batch_size: int = 25):
+        self.activity_repo = activity_repo or RecurringActivityRepository()
+        self.sink = sink or create_reminder_sink()
+        self.batch_size = batch_size
+
+    def due_items(self, until: str) -> Iterator[Dict]:
+        """Activity items with a reminder due at or before `until`, earliest first"""
+        heap = []
+        for shard in self.activity_repo.reminder_shards():
+            items = self.activity_repo.iter_due_reminders(shard, until, page_size=self.batch_size)
+            first = next(items, None)
+            if first is not None:
+                heap.append((first['next_due_at'], first['activity_id'], first, items))
+        heapq.heapify(heap)
+
+        while heap:
+            _, _, item, items = heap[0]
+            yield item
+            following = next(items, None)
+            if following is None:
+                heapq.heappop(heap)
+            else:
+                heapq.heapreplace(heap, (following['next_due_at'], following['activity_id'], following, items))
+
+    def run(self, now: datetime, window: timedelta = timedelta(minutes=15)) -> Dict[str, int]:
+        """Send every reminder due before now + window; `now` is household-local time
+
+        Returns counts: sent, skipped (claimed by another run, or the activity
+        changed meanwhile), dropped (inactive activities) and failed (released).
+        """
+        until = (now + window).strftime('%Y-%m-%dT%H:%M')
+        result = {'sent': 0, 'skipped': 0, 'dropped': 0, 'failed': 0}
+        batch = []
+        for item in self.due_items(until):
+            if not self.activity_repo.claim_reminder(item['activity_id'], item['next_due_at']):
+                result['skipped'] += 1
+                continue
+            if not item.get('is_active', True):
+                result['dropped'] += 1
+                continue
+            following = RecurringActivity.from_dict(item).following_reminder_at(item['next_due_at'], until)
+            batch.append((reminder_from_item(item), following))
+            if len(batch) >= self.batch_size:
+                self._flush(batch, result)
+                batch = []
+        if batch:
+            self._flush(batch, result)
+        return result
+
+    def _flush(self, batch: List[Tuple[Dict, str]], result: Dict[str, int]) -> None:
+        """Send (reminder, following reminder time) pairs, then re-arm them; release them if the send fails"""
+        try:
+            self.sink.send([reminder for reminder, _ in batch])
+        except Exception as e:
+            print(f"Error sending {len(batch)} reminders: {e}")
+            for reminder, _ in batch:
+                self.activity_repo.release_reminder(reminder['activity_id'], reminder['due_at'])
+            result['failed'] += len(batch)
+            return
+        result['sent'] += len(batch)
+        for reminder, following in batch:
+            self.activity_repo.rearm_reminder(reminder['activity_id'], reminder['due_at'], following)
@@ -0,0 +1,294 @@
+import importlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+# redis is optional; only the "redis" shared tier needs it
+try:
+    import redis
+except ImportError:
+    redis = None
+
+
+class CacheBackend:
+    """The Redis commands the shared tier needs (GET, SET with PX/NX, DEL), on bytes values
+
+    Deployments plug in their own backend through the SHARED_CACHE setting,
+    see create_cache_backend.
+    """
+
+    def get(self, key: str) -> Optional[bytes]:
+        raise NotImplementedError
+
+    def set(self, key: str, value: bytes, ttl: float, only_if_absent: bool = False) -> bool:
+        """Store value for ttl seconds; with only_if_absent, False if the key already exists"""
+        raise NotImplementedError
+
+    def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+
+class LocalCacheBackend(CacheBackend):
+    """Local stand-in for Redis: the same commands and expiry, held in this process
+
+    Every cache built over one instance sees the same entries, so tests and
+    local runs can stand several "instances" up against it.
+    """
+
+    def __init__(self):
+        self._entries: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[1] <= time.monotonic():
+                del self._entries[key]
+                return None
+            return entry[0]
+
+    def set(self, key: str, value: bytes, ttl: float, only_if_absent: bool = False) -> bool:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if only_if_absent and entry is not None and entry[1] > now:
+                return False
+            self._entries[key] = (value, now + ttl)
+            return True
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+
+class RedisCacheBackend(CacheBackend):
+    """Redis, or anything speaking its protocol (ElastiCache, Valkey, a fakeredis client)"""
+
+    def __init__(self, url: str = None, client=None):
+        if client is None:
+            if redis is None:
+                raise ValueError("The redis shared cache needs the redis package")
+            # Short timeouts: a slow cache must not hold up reads the tables can serve
+            client = redis.Redis.from_url(url or os.getenv('SHARED_CACHE_URL', 'redis://localhost:6379/0'),
+                                          socket_timeout=0.25, socket_connect_timeout=0.25)
+        self.client = client
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self.client.get(key)
+
+    def set(self, key: str, value: bytes, ttl: float, only_if_absent: bool = False) -> bool:
+        return bool(self.client.set(key, value, px=int(ttl * 1000), nx=only_if_absent))
+
+    def delete(self, key: str) -> None:
+        self.client.delete(key)
+
+
+BACKENDS = {'memory': LocalCacheBackend, 'redis': RedisCacheBackend}
+
+
+def create_cache_backend(backend_path: str = None) -> Optional[CacheBackend]:
+    """Create the configured shared tier: "none" (default), "memory", "redis" or a "module:ClassName" path"""
+    backend_path = backend_path or os.getenv('SHARED_CACHE', 'none')
+    if backend_path == 'none':
+        return None
+    if backend_path in BACKENDS:
+        return BACKENDS[backend_path]()
+
+    module_name, _, class_name = backend_path.partition(':')
+    backend_class = getattr(importlib.import_module(module_name), class_name)
+    return backend_class()
+
+
+class HouseholdCache:
+    """Household reads cached across instances: a per-process near cache in front of a shared backend
+
+    Keys carry the household's version (see KitchenService.household_version),
+    so a write anywhere moves readers on to new keys; nothing is invalidated,
+    and old versions age out through the TTL and the near cache's LRU bound.
+    Values are stored as JSON, so loaders return plain dicts and lists.
+
+    The household's newest change token, which every read needs for its key,
+    is itself remembered per process for TOKEN_TTL seconds (see latest_token):
+    writes made through this process move it on at once, writes made
+    elsewhere are seen within TOKEN_TTL.
+
+    When a key is missing from both levels, one caller across all instances
+    takes a short lock in the backend and loads it; the others poll for its
+    result for up to LOCK_WAIT seconds before loading it themselves. Backend
+    errors are logged and treated as misses, so reads never depend on the
+    cache being up.
+    """
+
+    NEAR_SIZE = 256
+    TTL = 3600
+    LOCK_TTL = 10
+    TOKEN_TTL = 1.0
+    LOCK_WAIT = 2.0
+    POLL_INTERVAL = 0.02
+    PREFIX = 'kt'
+
+    def __init__(self, backend: CacheBackend, near_size: int = None, ttl: float = None):
+        self.backend = backend
+        self.near_size = near_size or self.NEAR_SIZE
+        self.ttl = ttl or self.TTL
+        self._near = OrderedDict()
+        self._tokens = OrderedDict()
+        self._lock = threading.Lock()
+        self.near_hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+        self.waits = 0
+        self.errors = 0
+        self.token_hits = 0
+        self.token_fetches = 0
+
+    def key(self, household_id: str, kind: str, version: str) -> str:
+        return f"{self.PREFIX}:{household_id}:{kind}:{version}"
+
+    def get_or_load(self, household_id: str, kind: str, version: str, load: Callable[[], Any],
+                    cacheable: Callable[[Any], bool] = None) -> Any:
+        """The cached value for (household_id, kind, version), loading it on a miss
+
+        A loaded value that fails cacheable is returned but not stored.
+        """
+        key = self.key(household_id, kind, version)
+        with self._lock:
+            packed = self._near.get(key)
+            if packed is not None:
+                self._near.move_to_end(key)
+                self.near_hits += 1
+                return json.loads(packed)
+
+        packed = self._call(self.backend.get, key)
+        if packed is None:
+            lock_key = f"{key}:lock"
+            # None (backend error) also loads: there is nobody to wait for
+            locked = self._call(self.backend.set, lock_key, b'1', self.LOCK_TTL, True)
+            if locked is False:
+                packed = self._wait(key)
+            if packed is None:
+                try:
+                    return self._load(key, load, cacheable)
+                finally:
+                    if locked:
+                        self._call(self.backend.delete, lock_key)
+
+        with self._lock:
+            self.shared_hits += 1
+        self._near_put(key, packed)
+        return json.loads(packed)
+
+    def latest_token(self, household_id: str, fetch: Callable[[str], Optional[str]]) -> Optional[str]:
+        """The household's newest change token, fetched at most once per TOKEN_TTL"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._tokens.get(household_id)
+            if entry is not None and entry[1] > now:
+                self.token_hits += 1
+                return entry[0]
+            self.token_fetches += 1
+        token = fetch(household_id)
+        with self._lock:
+            entry = self._tokens.get(household_id)
+            # A commit noted while fetching is newer than what the fetch saw
+            if entry is not None and (entry[0] or '') > (token or ''):
+                return entry[0]
+            self._token_put(household_id, token, now)
+        return token
+
+    def note_token(self, household_id: str, token: str) -> None:
+        """Record a change this process committed, so its own reads move on without waiting"""
+        with self._lock:
+            entry = self._tokens.get(household_id)
+            if entry is None or (entry[0] or '') < token:
+                self._token_put(household_id, token, time.monotonic())
+
+    def _token_put(self, household_id: str, token: Optional[str], now: float) -> None:
+        """Callers hold the lock"""
+        self._tokens[household_id] = (token, now + self.TOKEN_TTL)
+        self._tokens.move_to_end(household_id)
+        if len(self._tokens) > self.near_size:
+            self._tokens.popitem(last=False)
+
+    def _load(self, key: str, load: Callable[[], Any], cacheable: Optional[Callable[[Any], bool]]) -> Any:
+        with self._lock:
+            self.misses += 1
+        value = load()
+        if cacheable is None or cacheable(value):
+            packed = json.dumps(value, default=str).encode()
+            self._call(self.backend.set, key, packed, self.ttl)
+            self._near_put(key, packed)
+        return value
+
+    def _wait(self, key: str) -> Optional[bytes]:
+        """Poll for the value another instance is loading"""
+        with self._lock:
+            self.waits += 1
+        deadline = time.monotonic() + self.LOCK_WAIT
+        while time.monotonic() < deadline:
+            time.sleep(self.POLL_INTERVAL)
+            packed = self._call(self.backend.get, key)
+            if packed is not None:
+                return packed
+        return None
+
+    def _near_put(self, key: str, packed: bytes) -> None:
+        with self._lock:
+            self._near[key] = packed
+            self._near.move_to_end(key)
+            if len(self._near) > self.near_size:
+                self._near.popitem(last=False)
+
+    def _call(self, command: Callable, *args):
+        try:
+            return command(*args)
+        except Exception as e:
+            print(f"Shared cache error: {e}")
+            with self._lock:
+                self.errors += 1
+            return None
+
+    def cache_info(self) -> dict:
+        """Hit counters per level; waits counts misses that waited on another loader
+
+        token_fetches counts change-log queries for the version, token_hits the
+        reads that reused a remembered token instead.
+        """
+        with self._lock:
+            lookups = self.near_hits + self.shared_hits + self.misses
+            return {
+                'near_hits': self.near_hits,
+                'shared_hits': self.shared_hits,
+                'misses': self.misses,
+                'waits': self.waits,
+                'errors': self.errors,
+                'token_hits': self.token_hits,
+                'token_fetches': self.token_fetches,
+                'hit_ratio': round((self.near_hits + self.shared_hits) / lookups, 4) if lookups else 0.0,
+                'near_size': len(self._near),
+                'near_max_size': self.near_size
+            }
+
+    def clear_cache(self):
+        """Drop the near cache and remembered tokens, and reset the counters (the shared tier is left alone)"""
+        with self._lock:
+            self._near.clear()
+            self._tokens.clear()
+            self.near_hits = 0
+            self.shared_hits = 0
+            self.misses = 0
+            self.waits = 0
+            self.errors = 0
+            self.token_hits = 0
+            self.token_fetches = 0
+
+
+def create_household_cache(backend_path: str = None) -> Optional[HouseholdCache]:
+    """The configured household cache, or None when no shared tier is set up"""
+    backend = create_cache_backend(backend_path)
+    return HouseholdCache(backend) if backend is not None else None
@@ -0,0 +1,68 @@
+import asyncio
+import threading
+from functools import partial
+from typing import Any, Callable, Dict, Hashable
+
+
+class SingleFlight:
+    """Runs at most one computation per key at a time; identical concurrent calls share its result
+
+    Keys are (household_id, route, version), where version changes whenever
+    the household does, so a caller never joins a computation started
+    before a write it has already seen. Nothing is kept once a computation
+    finishes: this only merges requests that overlap, it is not a cache.
+    The computation runs in a worker thread, so the event loop keeps
+    accepting the requests that join it. An error is raised to every caller
+    that shared the computation.
+    """
+
+    def __init__(self):
+        self._in_flight: Dict[Hashable, asyncio.Future] = {}
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.executions = 0
+        self.coalesced = 0
+
+    async def run(self, key: Hashable, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """Result of func(*args, **kwargs), computed once for all concurrent callers with the same key
+
+        Callers share the result object, so they must not modify it.
+        """
+        with self._lock:
+            self.calls += 1
+            future = self._in_flight.get(key)
+            if future is None:
+                self.executions += 1
+                loop = asyncio.get_running_loop()
+                future = self._in_flight[key] = loop.run_in_executor(None, partial(func, *args, **kwargs))
+                future.add_done_callback(partial(self._finished, key))
+            else:
+                self.coalesced += 1
+        # A caller that gives up (client gone) must not cancel the others' computation
+        return await asyncio.shield(future)
+
+    def _finished(self, key: Hashable, future: asyncio.Future):
+        with self._lock:
+            if self._in_flight.get(key) is future:
+                del self._in_flight[key]
+        # Every caller may have given up; don't warn about an error nobody awaited
+        if not future.cancelled():
+            future.exception()
+
+    def stats(self) -> Dict[str, Any]:
+        """Call counters; coalesced calls shared a computation another call started"""
+        with self._lock:
+            return {
+                'calls': self.calls,
+                'executions': self.executions,
+                'coalesced': self.coalesced,
+                'coalesced_ratio': round(self.coalesced / self.calls, 4) if self.calls else 0.0,
+                'in_flight': len(self._in_flight)
+            }
+
+    def reset(self):
+        """Reset the counters (in-flight computations carry on)"""
+        with self._lock:
+            self.calls = 0
+            self.executions = 0
+            self.coalesced = 0
@@ -0,0 +1,99 @@
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+# The unit of work for the request being handled; each asyncio task (and so
+# each FastAPI request) sees its own value.
+current_unit_of_work: ContextVar[Optional['UnitOfWork']] = ContextVar('current_unit_of_work', default=None)
+
+
+class UnitOfWork:
+    """Identity map and write buffer for a single request
+
+    Key lookups of the same entity return the same object and cost one read.
+    Writes are collected as TransactItems and applied together when the unit
+    of work is flushed. Queries (household listings, indexes) still go to the
+    tables and do not see buffered writes.
+    """
+
+    # DynamoDB TransactWriteItems limit
+    MAX_TRANSACTION_ITEMS = 100
+
+    def __init__(self):
+        self.identity_map: Dict[Tuple[str, str], Any] = {}
+        self.ops: List[Dict] = []
+        self.changes: List[Any] = []
+        self.reads = 0
+        self.read_hits = 0
+
+    def get(self, entity_type: str, entity_id: str, loader: Callable[[str], Any]) -> Any:
+        """Return the mapped entity, loading it (or its absence) once"""
+        key = (entity_type, entity_id)
+        if key in self.identity_map:
+            self.read_hits += 1
+            return self.identity_map[key]
+
+        self.reads += 1
+        entity = loader(entity_id)
+        self.identity_map[key] = entity
+        return entity
+
+    def register(self, entity_type: str, entity_id: str, entity: Any):
+        """Map an entity that was loaded or written by other means"""
+        self.identity_map[(entity_type, entity_id)] = entity
+
+    def add(self, ops: List[Dict], changes: List[Any]):
+        """Buffer writes and their change log entries"""
+        self.ops.extend(ops)
+        self.changes.extend(changes)
+
+    def must_flush_before(self, ops: List[Dict], changes: List[Any]) -> bool:
+        """Whether ops cannot join the pending transaction
+
+        A transaction may not touch the same item twice, and holds at most
+        MAX_TRANSACTION_ITEMS writes (each change adds a change log Put).
+        """
+        if not self.ops:
+            return False
+        pending_items = len(self.ops) + len(self.changes)
+        if pending_items + len(ops) + len(changes) > self.MAX_TRANSACTION_ITEMS:
+            return True
+        return any(_same_item(new, pending) for new in ops for pending in self.ops)
+
+    def take(self) -> Tuple[List[Dict], List[Any]]:
+        """Remove and return the pending writes"""
+        ops, changes = self.ops, self.changes
+        self.ops, self.changes = [], []
+        return ops, changes
+
+    @property
+    def has_pending(self) -> bool:
+        return bool(self.ops or self.changes)
+
+
+def _item_identity(op: Dict) -> Tuple[str, Dict]:
+    """(table, attributes identifying the item) for a TransactItems entry"""
+    body = next(iter(op.values()))
+    if 'Key' in body:
+        return body['TableName'], body['Key']
+    item = body.get('Item', {})
+    if 'pk' in item and 'sk' in item:
+        # Household-table items carry their generic key
+        return body['TableName'], {'pk': item['pk'], 'sk': item['sk']}
+    return body['TableName'], item
+
+
+def _same_item(first: Dict, second: Dict) -> bool:
+    """Whether two TransactItems entries address the same item
+
+    Update/Delete carry an explicit Key; a Put on a per-entity table only has
+    the full item, so a Key matches a Put whose item contains it. Two such
+    Puts (creates with fresh ids) only collide if identical.
+    """
+    first_table, first_attrs = _item_identity(first)
+    second_table, second_attrs = _item_identity(second)
+    if first_table != second_table:
+        return False
+    if len(first_attrs) <= len(second_attrs):
+        return all(second_attrs.get(k) == v for k, v in first_attrs.items())
+    return all(first_attrs.get(k) == v for k, v in second_attrs.items())
@@ -0,0 +1,105 @@
+import gzip
+from typing import List, Tuple
+
+# Brotli is optional; without it responses fall back to gzip
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Streaming and already-compact bodies are passed through untouched
+UNCOMPRESSED_TYPES = ('text/event-stream', 'image/', 'application/zip', 'application/gzip')
+
+
+def choose_encoding(accept_encoding: str) -> str:
+    """Pick the best encoding the client accepts: "br", "gzip" or "" for none"""
+    accepted = {}
+    for part in accept_encoding.lower().split(','):
+        name, _, params = part.strip().partition(';')
+        quality = 1.0
+        if params.strip().startswith('q='):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name.strip()] = quality
+
+    if brotli is not None and accepted.get('br', 0) > 0:
+        return 'br'
+    if accepted.get('gzip', 0) > 0:
+        return 'gzip'
+    return ''
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    """Compress a response body with the chosen encoding"""
+    if encoding == 'br':
+        # Quality 5 keeps CPU low enough for per-request use
+        return brotli.compress(body, quality=5)
+    return gzip.compress(body, compresslevel=6)
+
+
+class CompressionMiddleware:
+    """ASGI middleware that brotli/gzip-compresses single-chunk responses over a size threshold"""
+
+    def __init__(self, app, minimum_size: int = 1024):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        request_headers = dict(scope.get('headers') or [])
+        encoding = choose_encoding(request_headers.get(b'accept-encoding', b'').decode('latin-1'))
+        if not encoding:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        passthrough = False
+
+        async def send_wrapper(message):
+            nonlocal start_message, passthrough
+            if message['type'] == 'http.response.start':
+                # Hold the headers until we know whether the body gets compressed
+                start_message = message
+                return
+
+            if message['type'] != 'http.response.body' or passthrough:
+                await send(message)
+                return
+
+            body = message.get('body', b'')
+            headers = start_message['headers']
+            if message.get('more_body', False) or not self._should_compress(headers, body):
+                passthrough = True
+                await send(start_message)
+                await send(message)
+                return
+
+            compressed = compress(body, encoding)
+            start_message['headers'] = self._rewrite_headers(headers, encoding, len(compressed))
+            await send(start_message)
+            await send({'type': 'http.response.body', 'body': compressed})
+
+        await self.app(scope, receive, send_wrapper)
+
+    def _should_compress(self, headers: List[Tuple[bytes, bytes]], body: bytes) -> bool:
+        if len(body) < self.minimum_size:
+            return False
+        for name, value in headers:
+            if name == b'content-encoding':
+                return False
+            if name == b'content-type' and value.decode('latin-1').startswith(UNCOMPRESSED_TYPES):
+                return False
+        return True
+
+    def _rewrite_headers(self, headers, encoding: str, length: int) -> List[Tuple[bytes, bytes]]:
+        rewritten = [(name, value) for name, value in headers if name not in (b'content-length', b'vary')]
+        vary = [value for name, value in headers if name == b'vary']
+        rewritten.append((b'content-encoding', encoding.encode('latin-1')))
+        rewritten.append((b'content-length', str(length).encode('latin-1')))
+        rewritten.append((b'vary', b', '.join(vary + [b'Accept-Encoding'])))
+        return rewritten
@@ -0,0 +1,324 @@
+"""
+Streaming parser for Home Chef order emails
+
+Emails arrive from SES as raw MIME. MimeStream walks the message line by
+line, decoding only text/html parts (quoted-printable or base64, any
+charset) and feeding them to MealLinkParser as they go, so memory stays
+bounded by the chunk size rather than the message size. MealLinkParser only
+parses the attributes of <a> tags; the layout tables and tracking pixels
+that make up most of an order email are skipped.
+
+Meals are the bold #4a4a4a recipe links; the delivery date is the first
+"Weekday, Month D" in the text ("...arrive by end of the day on
+<strong>Thursday, July 3</strong>").
+"""
+
+import binascii
+import codecs
+import hashlib
+import re
+from html.parser import HTMLParser
+from typing import Dict, Iterable, Iterator, List, Optional, Union
+from urllib.parse import urlparse
+
+DELIVERY_DATE_PATTERN = re.compile(
+    r'\b(?:Monday|Tuesday|Wednesday|Thursday|Friday|Saturday|Sunday),\s+[A-Z][a-z]+\s+\d{1,2}\b'
+)
+
+# Bold links in the same style that are navigation, not meals
+NON_MEAL_LINKS = {
+    'menu', 'account', 'my account', 'help', 'faq', 'faqs', 'contact us', 'unsubscribe',
+    'view in browser', 'track package', 'track your package', 'manage subscription',
+    'privacy policy', 'terms', 'log in', 'login', 'shop', 'refer a friend', 'home chef'
+}
+
+MAX_MEAL_NAME_LENGTH = 120
+
+TRACKING_HOSTS = {'click.e.homechef.com'}
+
+# A complete start tag other than <a> (or an element whose content is raw text).
+# Order emails are mostly layout tables and tracking pixels; these are skipped
+# without parsing their attributes.
+OTHER_START_TAG = re.compile(
+    r'<(?!a[\s/>])(?!(?:script|style|textarea|title|xmp|iframe|noembed|noframes|noscript|plaintext)\b)'
+    r'[a-zA-Z][^>"\']*(?:(?:"[^"]*"|\'[^\']*\')[^>"\']*)*>',
+    re.I
+)
+
+# Decoded HTML is handed to the HTML parser in blocks of about this many characters
+HTML_BLOCK_SIZE = 64 * 1024
+
+
+def _style_matches(style: str) -> bool:
+    style = style.replace(' ', '').lower()
+    return 'color:#4a4a4a' in style and 'font-weight:bold' in style
+
+
+class MealLinkParser(HTMLParser):
+    """Incremental HTML parser collecting meal links and the delivery date
+
+    Feed HTML in any number of pieces; meals are available from meals()
+    once close() has been called.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.links: List[Dict[str, str]] = []
+        self.delivery_date: Optional[str] = None
+        self._anchor_href: Optional[str] = None
+        self._anchor_text: List[str] = []
+        self._text: List[str] = []
+
+    def parse_starttag(self, i):
+        match = OTHER_START_TAG.match(self.rawdata, i)
+        if match:
+            self._flush_text()
+            return match.end()
+        return super().parse_starttag(i)
+
+    def handle_starttag(self, tag, attrs):
+        self._flush_text()
+        if tag == 'a':
+            attributes = dict(attrs)
+            # A new anchor implicitly ends an unclosed one (malformed HTML)
+            self._anchor_href = None
+            self._anchor_text = []
+            if attributes.get('href') and _style_matches(attributes.get('style') or ''):
+                self._anchor_href = attributes['href']
+
+    def handle_endtag(self, tag):
+        self._flush_text()
+        if tag == 'a' and self._anchor_href is not None:
+            name = ' '.join(''.join(self._anchor_text).split())
+            if name:
+                self.links.append({'name': name, 'href': self._anchor_href})
+            self._anchor_href = None
+            self._anchor_text = []
+
+    def handle_data(self, data):
+        if self._anchor_href is not None:
+            self._anchor_text.append(data)
+        # Text nodes may arrive in pieces; they are matched whole at the next tag
+        self._text.append(data)
+
+    def _flush_text(self):
+        if not self._text:
+            return
+        text = ''.join(self._text)
+        self._text = []
+        if self.delivery_date is None:
+            match = DELIVERY_DATE_PATTERN.search(text)
+            if match:
+                self.delivery_date = match.group(0)
+
+    def close(self):
+        super().close()
+        self._flush_text()
+        # An anchor still open at the end was never closed: not a meal
+        self._anchor_href = None
+
+    def meals(self) -> List[Dict]:
+        meals, seen = [], set()
+        for link in self.links:
+            name = link['name']
+            if name.lower() in NON_MEAL_LINKS or len(name) > MAX_MEAL_NAME_LENGTH or name.lower() in seen:
+                continue
+            seen.add(name.lower())
+            meals.append({
+                'name': name,
+                'delivery_date': self.delivery_date,
+                'recipe_link': link['href'],
+                'is_tracking_link': urlparse(link['href']).hostname in TRACKING_HOSTS
+            })
+        return meals
+
+
+class _Part:
+    """Headers and body decoding state of the MIME part being read"""
+
+    def __init__(self):
+        self.headers: Dict[str, str] = {}
+        self.last_header: Optional[str] = None
+        self.in_headers = True
+        self.decoder = None
+        self.base64_pending = b''
+
+    def add_header_line(self, line: str):
+        if line[:1] in (' ', '\t') and self.last_header:
+            self.headers[self.last_header] += ' ' + line.strip()
+            return
+        name, _, value = line.partition(':')
+        self.last_header = name.strip().lower()
+        self.headers[self.last_header] = value.strip()
+
+    @property
+    def content_type(self) -> str:
+        value = self.headers.get('content-type', 'text/plain')
+        return value.split(';', 1)[0].strip().lower() or 'text/plain'
+
+    def param(self, name: str) -> Optional[str]:
+        match = re.search(rf'{name}\s*=\s*(?:"([^"]*)"|([^;\s]+))', self.headers.get('content-type', ''), re.I)
+        return (match.group(1) or match.group(2)) if match else None
+
+    @property
+    def transfer_encoding(self) -> str:
+        return self.headers.get('content-transfer-encoding', '7bit').strip().lower()
+
+
+class MimeStream:
+    """Line-by-line MIME walker that hands decoded text/html to a sink"""
+
+    def __init__(self, html_sink):
+        self.html_sink = html_sink
+        self.boundaries: List[bytes] = []
+        self.part = _Part()
+        # After a multipart's headers, its preamble runs until the first boundary
+        self.skipping = False
+        self._pending = b''
+        # Body lines of the current HTML part are decoded together, once per chunk
+        self._body: List[bytes] = []
+        self._html: List[str] = []
+        self._html_size = 0
+
+    def feed(self, chunk: bytes):
+        data = self._pending + chunk
+        lines = data.split(b'\n')
+        self._pending = lines.pop()
+        for line in lines:
+            self._line(line + b'\n')
+        self._decode_body()
+
+    def close(self):
+        if self._pending:
+            self._line(self._pending)
+            self._pending = b''
+        self._finish_part()
+
+    def _line(self, raw: bytes):
+        stripped = raw.rstrip(b'\r\n')
+        if stripped.startswith(b'--') and self.boundaries:
+            marker = stripped[2:].rstrip()
+            for depth in range(len(self.boundaries) - 1, -1, -1):
+                boundary = self.boundaries[depth]
+                if marker == boundary or marker == boundary + b'--':
+                    self._finish_part()
+                    del self.boundaries[depth + 1:]
+                    if marker == boundary:
+                        self.part = _Part()
+                        self.skipping = False
+                    else:
+                        # Closing boundary: the epilogue is skipped until an outer boundary
+                        self.boundaries.pop()
+                        self.skipping = True
+                    return
+
+        if self.skipping:
+            return
+        part = self.part
+        if part.in_headers:
+            if stripped:
+                part.add_header_line(stripped.decode('utf-8', 'replace'))
+                return
+            part.in_headers = False
+            self._start_body()
+            return
+        if part.decoder is not None:
+            self._body.append(raw)
+
+    def _start_body(self):
+        part = self.part
+        if part.content_type.startswith('multipart/'):
+            boundary = part.param('boundary')
+            if boundary:
+                self.boundaries.append(boundary.encode('utf-8', 'replace'))
+                self.skipping = True
+            return
+        if part.content_type == 'text/html':
+            charset = part.param('charset') or 'utf-8'
+            try:
+                part.decoder = codecs.getincrementaldecoder(charset)(errors='replace')
+            except LookupError:
+                part.decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+
+    def _decode_body(self):
+        if not self._body:
+            return
+        raw = b''.join(self._body)
+        self._body = []
+        part = self.part
+        encoding = part.transfer_encoding
+        if encoding == 'quoted-printable':
+            # a2b_qp drops soft line breaks ("=\n") and keeps hard ones
+            data = binascii.a2b_qp(raw.replace(b'\r\n', b'\n'))
+        elif encoding == 'base64':
+            pending = part.base64_pending + b''.join(raw.split())
+            usable = len(pending) - len(pending) % 4
+            part.base64_pending = pending[usable:]
+            try:
+                data = binascii.a2b_base64(pending[:usable]) if usable else b''
+            except binascii.Error:
+                data = b''
+        else:
+            data = raw
+        if data:
+            self._emit(part.decoder.decode(data))
+
+    def _emit(self, text: str):
+        self._html.append(text)
+        self._html_size += len(text)
+        if self._html_size >= HTML_BLOCK_SIZE:
+            self._flush_html()
+
+    def _flush_html(self):
+        if self._html:
+            self.html_sink(''.join(self._html))
+            self._html = []
+            self._html_size = 0
+
+    def _finish_part(self):
+        self._decode_body()
+        part = self.part
+        if part.decoder is not None:
+            if part.base64_pending:
+                try:
+                    self._emit(part.decoder.decode(binascii.a2b_base64(part.base64_pending + b'==')))
+                except binascii.Error:
+                    pass
+            self._emit(part.decoder.decode(b'', final=True))
+            self._flush_html()
+            part.decoder = None
+
+
+def parse_email_stream(chunks: Iterable[bytes]) -> List[Dict]:
+    """Meals from a raw email delivered as an iterable of byte chunks"""
+    html = MealLinkParser()
+    mime = MimeStream(html.feed)
+    for chunk in chunks:
+        mime.feed(chunk)
+    mime.close()
+    html.close()
+    return html.meals()
+
+
+def parse_homechef_email(raw_email: Union[str, bytes]) -> List[Dict]:
+    """Meals (name, delivery_date, recipe_link, is_tracking_link) in a raw Home Chef email"""
+    if isinstance(raw_email, str):
+        raw_email = raw_email.encode('utf-8')
+    return parse_email_stream(_chunks(raw_email))
+
+
+def content_hash(meals: List[Dict]) -> str:
+    """Hash of what an order email says: its delivery date and meal names
+
+    Headers, markup, whitespace, letter case and per-send tracking links
+    are left out, so the same notification delivered twice hashes the same.
+    """
+    delivery_dates = sorted({' '.join((meal.get('delivery_date') or '').lower().split()) for meal in meals})
+    names = sorted({' '.join(meal['name'].lower().split()) for meal in meals})
+    normalized = '\n'.join(delivery_dates) + '\n\n' + '\n'.join(names)
+    return hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+
+
+def _chunks(data: bytes, size: int = 64 * 1024) -> Iterator[bytes]:
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
@@ -0,0 +1,42 @@
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+# orjson is fastest when present; ujson ships with the Lambda requirements
+try:
+    import orjson
+except ImportError:
+    orjson = None
+import ujson
+
+
+def _default(obj: Any) -> Any:
+    """Serialize the few non-JSON types our models and DynamoDB hand back"""
+    if isinstance(obj, Decimal):
+        # Convert to int if it's a whole number, otherwise float
+        return int(obj) if obj % 1 == 0 else float(obj)
+    if isinstance(obj, (date, datetime)):
+        return obj.isoformat()
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """Encode plain dicts/lists straight to JSON bytes"""
+    if orjson is not None:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return ujson.dumps(content, default=_default, ensure_ascii=False).encode('utf-8')
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered with orjson/ujson
+
+    Returning an instance from a route skips FastAPI's jsonable_encoder walk, so
+    route results must already be plain dicts/lists (to_dict() output).
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
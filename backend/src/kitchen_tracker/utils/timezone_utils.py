@@ -25,6 +25,13 @@ def get_local_datetime_string() -> str:
     """Get current datetime as ISO string in household timezone"""
     return get_local_datetime().isoformat()
 
+def utc_to_local_date(utc_iso: str) -> date:
+    """Household-timezone date of a naive UTC ISO timestamp (as stored in created_at)"""
+    utc_time = datetime.fromisoformat(utc_iso)
+    if utc_time.tzinfo is None:
+        utc_time = pytz.UTC.localize(utc_time)
+    return utc_time.astimezone(HOUSEHOLD_TIMEZONE).date()
+
 def get_date_days_ago(days: int) -> str:
     """Get date N days ago in household timezone as ISO string"""
     local_date = get_local_date()
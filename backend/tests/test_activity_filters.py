@@ -0,0 +1,107 @@
+import pytest
+import sys
+import os
+from unittest.mock import Mock, patch
+
+# Add the src directory to the path so we can import modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src', 'kitchen_tracker'))
+
+from dal.recurring_activity_repository import RecurringActivityRepository
+from models.activity_completion import ActivityCompletion
+from models.family_member import FamilyMember
+from models.recurring_activity import RecurringActivity
+from services.kitchen_service import KitchenService
+
+class TestActivityFilters:
+    """Unit tests for /activities filtering, sorting and sparse fieldsets"""
+
+    def setup_method(self):
+        """Set up a service with mocked repositories"""
+        with patch('services.kitchen_service.FamilyMemberRepository'), \
+             patch('services.kitchen_service.RecurringActivityRepository'), \
+             patch('services.kitchen_service.ActivityCompletionRepository'), \
+             patch('services.kitchen_service.ChangeLogRepository'):
+            self.service = KitchenService()
+
+        self.household_id = "test-household-123"
+        self.bob = FamilyMember("Bob", "person", self.household_id)
+        self.lucy = FamilyMember("Lucy", "pet", self.household_id, pet_type="dog")
+        self.service.family_repo.get_by_household_id.return_value = [self.bob, self.lucy]
+
+        self.trash = RecurringActivity("Take Out Trash", self.bob.member_id, "weekly", self.household_id, category="chore")
+        self.dinner = RecurringActivity("Dog Dinner", self.lucy.member_id, "daily", self.household_id, category="feeding")
+        self.service.activity_repo.query_activities.return_value = [self.trash, self.dinner]
+
+        # Dog Dinner was done today, trash never
+        self.dinner.last_completion = ActivityCompletion(self.dinner.activity_id, self.lucy.member_id,
+                                                         self.household_id).to_dict()
+
+    def test_filters_are_pushed_to_repository(self):
+        """Test member/category/frequency go to the indexed query"""
+        self.service.get_activities_with_status(self.household_id, member_id=self.bob.member_id,
+                                                category="chore", frequency="weekly")
+
+        self.service.activity_repo.query_activities.assert_called_once_with(
+            self.household_id, member_id=self.bob.member_id, category="chore", frequency="weekly"
+        )
+
+    def test_members_loaded_once(self):
+        """Test member names come from one household lookup, not one per activity"""
+        result = self.service.get_activities_with_status(self.household_id)
+
+        assert [r['member_name'] for r in result] == ["Lucy", "Bob"]
+        self.service.family_repo.get_by_household_id.assert_called_once()
+        self.service.activity_repo.get_by_id.assert_not_called()
+
+    def test_status_filter_uses_computed_status(self):
+        """Test status filtering"""
+        result = self.service.get_activities_with_status(self.household_id, status="completed")
+
+        assert [r['name'] for r in result] == ["Dog Dinner"]
+
+    def test_sort_descending_and_sparse_fields(self):
+        """Test sort with '-' prefix and only requested fields returned"""
+        result = self.service.get_activities_with_status(self.household_id, sort="-name", fields="name,status")
+
+        assert result == [
+            {'activity_id': self.trash.activity_id, 'name': "Take Out Trash", 'status': result[0]['status']},
+            {'activity_id': self.dinner.activity_id, 'name': "Dog Dinner", 'status': "completed"}
+        ]
+
+    def test_missing_values_sort_last(self):
+        """Test activities never completed sort after completed ones"""
+        result = self.service.get_activities_with_status(self.household_id, sort="-last_completed_date")
+
+        assert [r['name'] for r in result] == ["Dog Dinner", "Take Out Trash"]
+
+    @pytest.mark.parametrize("kwargs", [{'sort': "bogus"}, {'fields': "name,bogus"}, {'status': "late"}])
+    def test_invalid_parameters_raise(self, kwargs):
+        """Test unknown sort/fields/status values are rejected"""
+        with pytest.raises(ValueError):
+            self.service.get_activities_with_status(self.household_id, **kwargs)
+
+
+class TestQueryActivities:
+    """Unit tests for index selection in RecurringActivityRepository"""
+
+    def setup_method(self):
+        with patch('dal.recurring_activity_repository.BaseRepository.__init__', return_value=None):
+            self.repo = RecurringActivityRepository()
+        self.repo.table = Mock()
+        self.repo.table.query.return_value = {'Items': []}
+
+    def test_member_uses_assigned_to_index(self):
+        """Test a member filter queries AssignedToIndex"""
+        self.repo.query_activities("household-1", member_id="member-1")
+
+        assert self.repo.table.query.call_args[1]['IndexName'] == 'AssignedToIndex'
+
+    def test_household_uses_household_index_and_pages(self):
+        """Test the household query follows LastEvaluatedKey"""
+        self.repo.table.query.side_effect = [{'Items': [], 'LastEvaluatedKey': {'activity_id': 'x'}}, {'Items': []}]
+
+        self.repo.query_activities("household-1", category="chore")
+
+        assert self.repo.table.query.call_count == 2
+        assert self.repo.table.query.call_args_list[0][1]['IndexName'] == 'HouseholdIndex'
+        assert self.repo.table.query.call_args_list[1][1]['ExclusiveStartKey'] == {'activity_id': 'x'}
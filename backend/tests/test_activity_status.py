@@ -0,0 +1,68 @@
+import sys
+import os
+from datetime import date, timedelta
+from unittest.mock import patch
+
+# Add the src directory to the path so we can import modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src', 'kitchen_tracker'))
+
+from models.activity_completion import ActivityCompletion, ActivityStatus
+from models.recurring_activity import RecurringActivity
+
+class TestActivityStatusMemo:
+    """Unit tests for computed-once, memoized ActivityStatus fields"""
+
+    def setup_method(self):
+        """Set up an activity and a clean cache"""
+        ActivityStatus.clear_cache()
+        self.household_id = "test-household-123"
+        self.activity = RecurringActivity("Take Out Trash", "member-1", "weekly", self.household_id,
+                                          frequency_config={'day_of_week': 2})
+        self.today = date(2024, 3, 6)  # a Wednesday
+        self.completion = ActivityCompletion(self.activity.activity_id, "member-1", self.household_id,
+                                             completion_date="2024-03-04")
+
+    def test_fields_match_activity_methods(self):
+        """Test the computed fields agree with RecurringActivity at the same date"""
+        status = ActivityStatus(self.activity, self.completion, "Bob", today=self.today)
+        last = self.completion.completion_date_obj
+
+        assert status.status == self.activity.get_current_period_status(last, self.today) == 'completed'
+        assert status.is_due_today == self.activity.is_due_today(last, self.today)
+        assert status.is_overdue == self.activity.is_overdue(last, self.today)
+        assert status.next_due_date == self.activity.get_next_due_date(last)
+
+    def test_repeat_render_hits_cache(self):
+        """Test a second status for the same inputs does no schedule arithmetic"""
+        ActivityStatus(self.activity, self.completion, "Bob", today=self.today)
+
+        with patch.object(RecurringActivity, 'get_current_period_status') as period_status:
+            status = ActivityStatus(self.activity, self.completion, "Bob", today=self.today)
+
+        period_status.assert_not_called()
+        assert status.to_dict()['completed'] is True
+        assert ActivityStatus.cache_info()['hits'] == 1
+
+    def test_new_day_or_config_misses(self):
+        """Test the reference date and schedule are part of the key"""
+        ActivityStatus(self.activity, self.completion, today=self.today)
+        ActivityStatus(self.activity, self.completion, today=self.today + timedelta(days=7))
+        self.activity.frequency_config = {'day_of_week': 4}
+        ActivityStatus(self.activity, self.completion, today=self.today)
+
+        assert ActivityStatus.cache_info()['misses'] == 3
+
+    def test_cache_is_bounded(self):
+        """Test the oldest entries are evicted past CACHE_SIZE"""
+        with patch.object(ActivityStatus, 'CACHE_SIZE', 3):
+            for offset in range(5):
+                ActivityStatus(self.activity, self.completion, today=self.today + timedelta(days=offset))
+
+            assert ActivityStatus.cache_info()['size'] == 3
+
+    def test_never_completed_due_on_reference_date(self):
+        """Test next_due_date is the reference date when never completed"""
+        status = ActivityStatus(self.activity, None, today=self.today)
+
+        assert status.next_due_date == self.today
+        assert status.to_dict()['last_completed_date'] is None
@@ -0,0 +1,105 @@
+import pytest
+import sys
+import os
+from datetime import datetime, timedelta
+from unittest.mock import Mock, patch
+
+# Add the src directory to the path so we can import modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src', 'kitchen_tracker'))
+
+from models.change_entry import ChangeEntry
+from models.recurring_activity import RecurringActivity
+from dal.change_log_repository import ChangeLogRepository
+from services.kitchen_service import KitchenService
+
+class TestChangeLog:
+    """Unit tests for the household change log and /changes assembly"""
+
+    def setup_method(self):
+        """Set up a service with mocked repositories"""
+        with patch('services.kitchen_service.FamilyMemberRepository'), \
+             patch('services.kitchen_service.RecurringActivityRepository'), \
+             patch('services.kitchen_service.ActivityCompletionRepository'), \
+             patch('services.kitchen_service.ChangeLogRepository') as change_log_cls:
+            change_log_cls.is_token_expired = ChangeLogRepository.is_token_expired
+            self.service = KitchenService()
+
+        self.household_id = "test-household-123"
+        self.service.change_log_repo.put_op = Mock(side_effect=lambda entry: {'Put': entry.to_dict()})
+
+    def test_change_entry_round_trip(self):
+        """Test a change entry survives to_dict/from_dict with the same token"""
+        entry = ChangeEntry(self.household_id, 'activity', 'act-1', 'upsert', {'name': 'Dog Dinner'})
+
+        restored = ChangeEntry.from_dict(entry.to_dict())
+
+        assert restored.change_key == entry.change_key
+        assert restored.data == {'name': 'Dog Dinner'}
+        assert '#' not in entry.change_key  # token must survive a query string
+
+    def test_change_key_has_fixed_width(self):
+        """Test a whole-second timestamp keeps its microseconds, so it sorts before later changes in that second"""
+        with patch('models.change_entry.datetime') as clock:
+            clock.utcnow.return_value = datetime(2026, 1, 1, 12, 0, 0)
+            whole = ChangeEntry(self.household_id, 'member', 'm-1', 'delete')
+            clock.utcnow.return_value = datetime(2026, 1, 1, 12, 0, 0, 500)
+            later = ChangeEntry(self.household_id, 'member', 'm-2', 'delete')
+
+        assert whole.changed_at == "2026-01-01T12:00:00.000000"
+        assert whole.change_key < later.change_key
+
+    def test_change_entry_rejects_unknown_entity(self):
+        """Test validation of entity_type"""
+        with pytest.raises(ValueError):
+            ChangeEntry(self.household_id, 'meal', 'meal-1', 'upsert')
+
+    def test_complete_activity_writes_change_in_same_transaction(self):
+        """Test the completion and its change entry are committed together"""
+        activity = RecurringActivity("Morning Pills", "member-1", "daily", self.household_id)
+        self.service.activity_repo.get_by_id.return_value = activity
+        self.service.completion_repo.create_op.return_value = {'Put': {'TableName': 'ActivityCompletions'}}
+
+        completion = self.service.complete_activity(activity.activity_id)
+
+        self.service.change_log_repo.transact_write.assert_called_once()
+        items = self.service.change_log_repo.transact_write.call_args[0][0]
+        assert items[0] == {'Put': {'TableName': 'ActivityCompletions'}}
+        assert items[-1]['Put']['entity_type'] == 'completion'
+        assert items[-1]['Put']['entity_id'] == completion.completion_id
+
+    def test_get_changes_collapses_to_latest_per_entity(self):
+        """Test an entity changed several times is returned once in its final state"""
+        entries = [
+            ChangeEntry(self.household_id, 'activity', 'act-1', 'upsert', {'activity_id': 'act-1', 'name': 'Old'}),
+            ChangeEntry(self.household_id, 'completion', 'comp-1', 'upsert', {'completion_id': 'comp-1'}),
+            ChangeEntry(self.household_id, 'activity', 'act-1', 'upsert', {'activity_id': 'act-1', 'name': 'New'}),
+            ChangeEntry(self.household_id, 'completion', 'comp-1', 'delete')
+        ]
+        self.service.change_log_repo.get_changes_since.return_value = (entries, False)
+
+        result = self.service.get_changes(self.household_id)
+
+        assert result['activities'] == [{'activity_id': 'act-1', 'name': 'New'}]
+        assert result['completions'] == []
+        assert result['deleted']['completions'] == ['comp-1']
+        assert result['next_token'] == entries[-1].change_key
+
+    def test_get_changes_nothing_new_keeps_token(self):
+        """Test an idle household returns an empty payload and the same token"""
+        since = ChangeEntry(self.household_id, 'member', 'm-1', 'delete').change_key
+        self.service.change_log_repo.get_changes_since.return_value = ([], False)
+
+        result = self.service.get_changes(self.household_id, since)
+
+        assert result['next_token'] == since
+        assert result['members'] == [] and result['activities'] == [] and result['completions'] == []
+
+    def test_get_changes_expired_token_requests_reset(self):
+        """Test a token older than the retention window asks the client to refetch"""
+        old = (datetime.utcnow() - timedelta(days=ChangeLogRepository.RETENTION_DAYS + 1)).isoformat()
+        since = ChangeEntry(self.household_id, 'member', 'm-1', 'delete', changed_at=old).change_key
+
+        result = self.service.get_changes(self.household_id, since)
+
+        assert result['reset'] is True
+        self.service.change_log_repo.get_changes_since.assert_not_called()
@@ -0,0 +1,87 @@
+import pytest
+import sys
+import os
+from unittest.mock import Mock
+
+# Add the src directory to the path so we can import modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src', 'kitchen_tracker'))
+
+from dal.engines import create_engine, set_engine
+from services.kitchen_service import KitchenService
+
+
+class TestCompletionCounts:
+    """Unit tests for the /completions aggregation"""
+
+    def setup_method(self):
+        """Use the in-memory storage engine with a year of completions"""
+        set_engine(create_engine('memory'))
+        self.service = KitchenService()
+        self.alice = self.service.create_family_member("Alice", "person", "household-1")
+        self.rex = self.service.create_family_member("Rex", "pet", "household-1", pet_type="dog")
+        self.pills = self.service.create_activity("Pills", self.alice.member_id, "daily", "household-1",
+                                                  category="medication")
+        self.walk = self.service.create_activity("Walk", self.rex.member_id, "daily", "household-1")
+        for day in ("2025-12-31", "2026-01-01", "2026-01-02", "2026-01-05", "2026-02-01"):
+            self.service.complete_activity(self.pills.activity_id, completion_date=day)
+        for day in ("2026-01-01", "2026-01-03"):
+            self.service.complete_activity(self.walk.activity_id, completion_date=day)
+
+    def teardown_method(self):
+        set_engine(None)
+
+    def groups(self, **kwargs):
+        result = self.service.get_completion_counts("household-1", **kwargs)
+        return {row['key']: row['count'] for row in result['groups']}
+
+    def test_groups_by_period(self):
+        """Test day, ISO-week and month grouping over an inclusive range"""
+        window = {'start_date': "2026-01-01", 'end_date': "2026-01-31"}
+
+        assert self.groups(group_by='day', **window) == {"2026-01-01": 2, "2026-01-02": 1, "2026-01-03": 1,
+                                                         "2026-01-05": 1}
+        assert self.groups(group_by='week', **window) == {"2025-12-29": 4, "2026-01-05": 1}
+        assert self.groups(group_by='month', start_date="2025-01-01", end_date="2026-12-31") == \
+            {"2025-12": 1, "2026-01": 5, "2026-02": 1}
+
+    def test_groups_by_member_and_category(self):
+        """Test member rows carry names and activities without a category are grouped together"""
+        result = self.service.get_completion_counts("household-1", "2025-01-01", "2026-12-31", group_by='member')
+
+        assert {(row['name'], row['count']) for row in result['groups']} == {("Alice", 5), ("Rex", 2)}
+        assert result['total'] == 7
+        assert self.groups(start_date="2025-01-01", end_date="2026-12-31", group_by='category') == \
+            {'medication': 5, 'uncategorized': 2}
+
+    def test_filters_by_member_and_activity(self):
+        """Test member and activity filters narrow the counts"""
+        window = {'start_date': "2025-01-01", 'end_date': "2026-12-31", 'group_by': 'month'}
+
+        assert self.groups(member_id=self.rex.member_id, **window) == {"2026-01": 2}
+        assert self.groups(activity_id=self.pills.activity_id, **window) == {"2025-12": 1, "2026-01": 3,
+                                                                            "2026-02": 1}
+
+    def test_reads_pages_of_grouping_attribute_only(self):
+        """Test the index is queried with a projection and followed across pages"""
+        table = self.service.completion_repo.table
+        pages = []
+
+        def query(**kwargs):
+            response = table.query(Limit=2, **kwargs)
+            pages.append(response)
+            return response
+
+        self.service.completion_repo.table = Mock(query=query)
+        assert sum(self.groups(start_date="2025-01-01", end_date="2026-12-31").values()) == 7
+
+        assert len(pages) == 4
+        assert all(set(item) == {'completion_date'} for page in pages for item in page['Items'])
+
+    def test_rejects_bad_parameters(self):
+        """Test unknown groupings and inverted ranges raise ValueError"""
+        with pytest.raises(ValueError):
+            self.service.get_completion_counts("household-1", group_by='year')
+        with pytest.raises(ValueError):
+            self.service.get_completion_counts("household-1", "2026-02-01", "2026-01-01")
+        with pytest.raises(ValueError):
+            self.service.get_completion_counts("household-1", "last week")
@@ -0,0 +1,123 @@
+import sys
+import os
+from datetime import date, timedelta
+
+# Add the src directory to the path so we can import modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src', 'kitchen_tracker'))
+
+from dal.engines import create_engine, set_engine
+from models.completion_history import CompletionHistory, day_counts
+from services.kitchen_service import KitchenService
+from utils.timezone_utils import get_local_date
+
+TODAY = get_local_date()
+
+
+class TestCompletionHistoryModel:
+    """Unit tests for the per-year completion bitmaps"""
+
+    def test_year_packs_into_one_small_attribute(self):
+        """Test a full year of days packs into 46 bytes and round-trips"""
+        history = CompletionHistory.from_days([date(2024, 1, 1), date(2024, 12, 31), date(2025, 3, 1)])
+
+        item = history.to_item()
+
+        assert sorted(item) == ['history_2024', 'history_2025']
+        assert len(item['history_2024']) == 46
+        assert CompletionHistory.from_item(item) == history
+        assert history.is_completed(date(2024, 12, 31))
+        assert not history.is_completed(date(2024, 12, 30))
+
+    def test_weekly_and_monthly_cells_fold_days(self):
+        """Test periods are completed when any of their days is, across the year end"""
+        history = CompletionHistory.from_days([date(2026, 1, 2), date(2026, 2, 28)])
+
+        weekly = dict(history.cells(2025, 'weekly'))
+        monthly = history.cells(2026, 'monthly')
+
+        # The week of Monday 2025-12-29 runs into 2026
+        assert weekly['2025-12-29'] is True
+        assert sum(weekly.values()) == 1
+        assert [period for period, completed in monthly if completed] == ['2026-01', '2026-02']
+        assert len(history.cells(2026, 'daily')) == 365
+
+    def test_item_without_bitmaps_is_unknown_unless_new(self):
+        """Test only an item with no completions has an empty history"""
+        assert CompletionHistory.from_item({'total_completions': 0}) == CompletionHistory()
+        assert CompletionHistory.from_item({'total_completions': 3}) is None
+        assert CompletionHistory.from_item({}) is None
+
+    def test_day_counts_add_bitmaps(self):
+        """Test the bit-sliced sum matches counting day by day"""
+        days = [date(2026, 1, 1) + timedelta(days=i) for i in range(365)]
+        histories = [CompletionHistory.from_days(days[n::n + 1]) for n in range(9)]
+
+        counts = day_counts(histories, 2026)
+
+        assert counts == [sum(h.is_completed(day) for h in histories) for day in days]
+
+
+class TestCompletionHistoryService:
+    """Bitmaps maintained by complete/undo on the in-memory engine"""
+
+    def setup_method(self):
+        """Use the in-memory storage engine"""
+        set_engine(create_engine('memory'))
+        self.service = KitchenService()
+        self.member = self.service.create_family_member("Lucy", "pet", "household-1", pet_type="dog")
+        self.activity = self.service.create_activity("Walk", self.member.member_id, "daily", "household-1")
+
+    def teardown_method(self):
+        set_engine(None)
+
+    def cells(self):
+        history = self.service.get_activity_history(self.activity.activity_id, TODAY.year)
+        return {cell['period'] for cell in history['cells'] if cell['completed']}
+
+    def test_completion_and_undo_update_bitmap(self):
+        """Test the bitmap follows completions, keeping a day another completion covers"""
+        yesterday = max(TODAY - timedelta(days=1), date(TODAY.year, 1, 1))
+        self.service.complete_activity(self.activity.activity_id, completion_date=yesterday.isoformat())
+        self.service.complete_activity(self.activity.activity_id, completion_date=TODAY.isoformat())
+        self.service.complete_activity(self.activity.activity_id, completion_date=TODAY.isoformat())
+
+        assert self.cells() == {yesterday.isoformat(), TODAY.isoformat()}
+
+        self.service.undo_activity_completion(self.activity.activity_id)
+        assert TODAY.isoformat() in self.cells()
+        self.service.undo_activity_completion(self.activity.activity_id)
+        assert self.cells() == {yesterday.isoformat()}
+
+    def test_history_reads_one_item(self):
+        """Test the history endpoint does not query completions"""
+        self.service.complete_activity(self.activity.activity_id, completion_date=TODAY.isoformat())
+        self.service.completion_repo.iter_by_activity_id = None
+
+        history = self.service.get_activity_history(self.activity.activity_id, TODAY.year)
+
+        assert history['completed_periods'] == 1
+
+    def test_household_heatmap_counts_activities_per_day(self):
+        """Test the household view adds every activity's bitmap"""
+        other = self.service.create_activity("Feed", self.member.member_id, "weekly", "household-1")
+        for activity in (self.activity, other):
+            self.service.complete_activity(activity.activity_id, completion_date=TODAY.isoformat())
+
+        history = self.service.get_household_history("household-1", TODAY.year)
+
+        assert history['activities'] == 2
+        assert history['max_count'] == 2
+        assert history['days'][TODAY.timetuple().tm_yday - 1] == {'date': TODAY.isoformat(), 'count': 2}
+
+    def test_rebuild_restores_missing_bitmaps(self):
+        """Test items written before bitmaps existed are rebuilt from completions"""
+        self.service.complete_activity(self.activity.activity_id, completion_date=TODAY.isoformat())
+        self.service.activity_repo.table.update_item(
+            Key={'activity_id': self.activity.activity_id},
+            UpdateExpression=f'REMOVE history_{TODAY.year}'
+        )
+        assert self.service.get_activity(self.activity.activity_id).history is None
+
+        self.service.rebuild_completion_stats("household-1")
+
+        assert self.service.get_activity(self.activity.activity_id).history.is_completed(TODAY)
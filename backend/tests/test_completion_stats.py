@@ -0,0 +1,186 @@
+import copy
+import pytest
+import sys
+import os
+from datetime import date, timedelta
+
+# Add the src directory to the path so we can import modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src', 'kitchen_tracker'))
+
+from dal.base_repository import ConflictError
+from dal.engines import create_engine, set_engine
+from models.completion_stats import CompletionStats, next_period, previous_period
+from services.kitchen_service import KitchenService
+from utils.timezone_utils import get_local_date
+
+TODAY = get_local_date()
+
+
+def days_ago(days: int) -> str:
+    return (TODAY - timedelta(days=days)).isoformat()
+
+
+class TestCompletionStatsModel:
+    """Unit tests for the counter arithmetic"""
+
+    def test_periods_step_across_year_ends(self):
+        """Test monthly and weekly period keys roll over correctly"""
+        assert next_period("2025-12", 'monthly') == "2026-01"
+        assert previous_period("2026-01", 'monthly') == "2025-12"
+        assert next_period("2025-12-29", 'weekly') == "2026-01-05"
+
+    def test_history_finds_current_and_longest_runs(self):
+        """Test a gap ends one run and starts the next"""
+        days = [date(2026, 3, d) for d in (1, 2, 3, 4, 7, 8)]
+        stats = CompletionStats.from_history([(d, True) for d in days] + [(date(2026, 3, 8), False)], 'daily')
+
+        assert (stats.current_streak, stats.longest_streak, stats.streak_period) == (2, 4, "2026-03-08")
+        assert (stats.total_completions, stats.on_time_completions) == (7, 6)
+
+    def test_summary_reports_broken_streak_as_zero(self):
+        """Test a streak whose last period is over two periods old reads 0"""
+        stats = CompletionStats(10, 9, 5, 5, (TODAY - timedelta(days=3)).isoformat())
+
+        summary = stats.summary('daily', TODAY)
+
+        assert summary['current_streak'] == 0
+        assert summary['longest_streak'] == 5
+        assert summary['on_time_rate'] == 0.9
+
+
+class TestCompletionStatsService:
+    """Counters maintained by complete/undo on the in-memory engine"""
+
+    def setup_method(self):
+        """Use the in-memory storage engine"""
+        set_engine(create_engine('memory'))
+        self.service = KitchenService()
+        self.member = self.service.create_family_member("Lucy", "pet", "household-1", pet_type="dog")
+        self.activity = self.service.create_activity("Heartworm Pill", self.member.member_id, "daily", "household-1")
+
+    def teardown_method(self):
+        set_engine(None)
+
+    def stored_stats(self):
+        activity = self.service.activity_repo.get_by_id(self.activity.activity_id)
+        member = self.service.family_repo.get_by_id(self.member.member_id)
+        return activity.stats, member.stats
+
+    def test_completions_extend_streak(self):
+        """Test in-order completions update both counters in the completion transaction"""
+        for days in (3, 2, 1, 0):
+            self.service.complete_activity(self.activity.activity_id, completion_date=days_ago(days))
+
+        activity_stats, member_stats = self.stored_stats()
+        assert activity_stats == CompletionStats(4, 4, 4, 4, days_ago(0))
+        assert member_stats == CompletionStats(4, 4, 4, 4, days_ago(0))
+        summary = self.service.get_activity_stats(self.activity.activity_id)
+        assert (summary['current_streak'], summary['streak_unit'], summary['on_time_rate']) == (4, 'days', 1.0)
+
+    def test_late_completion_breaks_streak_and_on_time_rate(self):
+        """Test a completion after an overdue gap restarts the streak and counts as late"""
+        self.service.complete_activity(self.activity.activity_id, completion_date=days_ago(5))
+        self.service.complete_activity(self.activity.activity_id, completion_date=days_ago(0))
+
+        activity_stats, _ = self.stored_stats()
+        assert activity_stats == CompletionStats(2, 1, 1, 1, days_ago(0))
+
+    def test_backdated_completion_joins_runs(self):
+        """Test filling a gap is rebuilt from history and merges the two runs"""
+        for days in (4, 3, 1, 0):
+            self.service.complete_activity(self.activity.activity_id, completion_date=days_ago(days))
+
+        self.service.complete_activity(self.activity.activity_id, completion_date=days_ago(2))
+
+        activity_stats, member_stats = self.stored_stats()
+        assert (activity_stats.current_streak, activity_stats.longest_streak) == (5, 5)
+        assert (member_stats.current_streak, member_stats.total_completions) == (5, 5)
+
+    def test_undo_returns_counters_to_previous_state(self):
+        """Test undoing the latest completion shortens the streak"""
+        for days in (2, 1, 0):
+            self.service.complete_activity(self.activity.activity_id, completion_date=days_ago(days))
+
+        assert self.service.undo_activity_completion(self.activity.activity_id) is True
+
+        activity_stats, member_stats = self.stored_stats()
+        assert activity_stats == CompletionStats(2, 2, 2, 2, days_ago(1))
+        assert member_stats == CompletionStats(2, 2, 2, 2, days_ago(1))
+
+    def test_stale_counters_are_rejected(self):
+        """Test an update computed from an old read fails its condition"""
+        self.service.complete_activity(self.activity.activity_id, completion_date=days_ago(0))
+        op = self.service.activity_repo.stats_op(self.activity.activity_id, CompletionStats(),
+                                                 CompletionStats(1, 1, 1, 1, days_ago(0)))
+
+        with pytest.raises(ValueError):
+            self.service.activity_repo.transact_write([op])
+
+    def test_member_completions_of_two_activities_interleave(self):
+        """Test two completions by one member, both computed from the same member read, both commit"""
+        other_activity = self.service.create_activity("Walk", self.member.member_id, "daily", "household-1")
+        stale_member = self.service.family_repo.get_by_id(self.member.member_id)
+        # A second container that read the member before the first completion committed
+        other = KitchenService()
+        other.family_repo.get_by_id = lambda member_id: stale_member
+
+        self.service.complete_activity(self.activity.activity_id, completion_date=days_ago(0))
+        other.complete_activity(other_activity.activity_id, completion_date=days_ago(0))
+
+        _, member_stats = self.stored_stats()
+        assert (member_stats.total_completions, member_stats.on_time_completions) == (2, 2)
+        assert len(self.service.get_completion_counts("household-1")['groups']) == 1
+
+    def test_concurrent_completions_of_one_activity_both_commit(self):
+        """Test a completion computed from a read another completion already moved on is redone, not lost"""
+        stale_activity = self.service.activity_repo.get_by_id(self.activity.activity_id)
+        # A second container that read the activity before the first completion committed
+        other = KitchenService()
+        reads = iter([stale_activity])
+        read_activity = other.activity_repo.get_by_id
+        other.activity_repo.get_by_id = lambda activity_id: next(reads, None) or read_activity(activity_id)
+
+        self.service.complete_activity(self.activity.activity_id, completion_date=days_ago(1))
+        other.complete_activity(self.activity.activity_id, completion_date=days_ago(0))
+
+        activity_stats, member_stats = self.stored_stats()
+        assert activity_stats == CompletionStats(2, 2, 2, 2, days_ago(0))
+        assert member_stats.total_completions == 2
+        latest = self.service.get_activity(self.activity.activity_id).last_completion
+        assert latest['completion_date'] == days_ago(0)
+
+    def test_completion_gives_up_after_repeated_conflicts(self):
+        """Test a completion that keeps losing raises ConflictError and writes nothing"""
+        stale_activity = self.service.activity_repo.get_by_id(self.activity.activity_id)
+        self.service.complete_activity(self.activity.activity_id, completion_date=days_ago(1))
+        other = KitchenService()
+        other.activity_repo.get_by_id = lambda activity_id: copy.deepcopy(stale_activity)
+
+        with pytest.raises(ConflictError):
+            other.complete_activity(self.activity.activity_id, completion_date=days_ago(0))
+
+        assert self.stored_stats()[0].total_completions == 1
+
+    def test_rebuild_repairs_drifted_counters(self):
+        """Test the rebuild recomputes counters from completion history"""
+        for days in (1, 0):
+            self.service.complete_activity(self.activity.activity_id, completion_date=days_ago(days))
+        self.service.activity_repo.table.update_item(
+            Key={'activity_id': self.activity.activity_id},
+            UpdateExpression='SET current_streak = :zero, total_completions = :zero',
+            ExpressionAttributeValues={':zero': 0}
+        )
+
+        result = self.service.rebuild_completion_stats("household-1")
+
+        assert result == {'activities': 1, 'members': 0, 'conflicts': 0}
+        activity_stats, _ = self.stored_stats()
+        assert activity_stats == CompletionStats(2, 2, 2, 2, days_ago(0))
+
+    def test_rebuild_job_covers_every_household(self):
+        """Test the job finds households from the family members table"""
+        from jobs.rebuild_completion_stats import main
+        self.service.create_family_member("Max", "person", "household-2")
+
+        assert self.service.family_repo.get_household_ids() == ["household-1", "household-2"]
+        main([])
@@ -0,0 +1,144 @@
+import pytest
+import sys
+import os
+import base64
+import quopri
+from unittest.mock import Mock
+
+# Add the src directory to the path so we can import modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src', 'kitchen_tracker'))
+
+from dal.email_source import LocalEmailSource
+from dal.engines import create_engine, set_engine
+from services.email_ingest import EmailIngestor, email_keys
+from services.meal_service import MealService
+from utils.homechef_email import parse_email_stream
+
+HTML = (
+    '<html><body><p>Your order will arrive by end of the day on <strong>Thursday, July 3</strong>.</p>'
+    '<a href="https://click.e.homechef.com/?qs=1" style="color:#4a4a4a; font-weight:bold">Margherita Chicken</a>'
+    '<a href="https://click.e.homechef.com/?qs=2" style="color:#4a4a4a; font-weight:bold">Crème Fraîche Trout</a>'
+    '<a href="https://click.e.homechef.com/?qs=3" style="color:#4a4a4a; font-weight:bold">Menu</a>'
+    '</body></html>'
+)
+
+
+def build_email(transfer_encoding: str) -> bytes:
+    """A nested multipart email with the HTML part in the given transfer encoding"""
+    body = HTML.encode('utf-8')
+    if transfer_encoding == 'base64':
+        encoded = base64.encodebytes(body)
+    else:
+        encoded = quopri.encodestring(body)
+    return (
+        b'From: noreply@homechef.com\r\n'
+        b'Subject: Your Home Chef order is on its way!\r\n'
+        b'Content-Type: multipart/mixed;\r\n boundary="outer"\r\n\r\n'
+        b'preamble\r\n'
+        b'--outer\r\n'
+        b'Content-Type: multipart/alternative; boundary="inner"\r\n\r\n'
+        b'--inner\r\n'
+        b'Content-Type: text/plain\r\n\r\n'
+        b'<a style="color:#4a4a4a; font-weight:bold" href="x">Not HTML</a>\r\n'
+        b'--inner\r\n'
+        b'Content-Type: text/html; charset="utf-8"\r\n'
+        b'Content-Transfer-Encoding: ' + transfer_encoding.encode() + b'\r\n\r\n'
+        + encoded.replace(b'\n', b'\r\n') +
+        b'\r\n--inner--\r\n'
+        b'--outer--\r\n'
+    )
+
+
+class TestStreamingParser:
+    """Unit tests for the incremental MIME and HTML parsing"""
+
+    @pytest.mark.parametrize('transfer_encoding', ['base64', 'quoted-printable'])
+    def test_meals_survive_any_chunking(self, transfer_encoding):
+        """Test decoding is the same whether the email arrives whole or a byte at a time"""
+        raw = build_email(transfer_encoding)
+
+        whole = parse_email_stream([raw])
+        bytewise = parse_email_stream(raw[i:i + 1] for i in range(len(raw)))
+
+        assert whole == bytewise
+        assert [m['name'] for m in whole] == ["Margherita Chicken", "Crème Fraîche Trout"]
+        assert all(m['delivery_date'] == "Thursday, July 3" for m in whole)
+
+    def test_plain_text_parts_are_ignored(self):
+        """Test links in non-HTML parts are not taken as meals"""
+        meals = parse_email_stream([build_email('base64')])
+
+        assert "Not HTML" not in [m['name'] for m in meals]
+
+
+class TestEmailIngest:
+    """Unit tests for ingesting stored emails"""
+
+    def setup_method(self):
+        """Use the in-memory storage engine"""
+        set_engine(create_engine('memory'))
+        EmailIngestor.reset_counters()
+
+    def teardown_method(self):
+        set_engine(None)
+
+    def test_ingest_from_local_directory_is_idempotent(self, tmp_path):
+        """Test a resent email adds no meals the second time"""
+        (tmp_path / "inbox").mkdir()
+        (tmp_path / "inbox" / "message-1").write_bytes(build_email('quoted-printable'))
+        ingestor = EmailIngestor(source=LocalEmailSource(str(tmp_path)), meal_service=MealService())
+
+        first = ingestor.ingest("inbox/message-1", "household-1")
+        second = ingestor.ingest("inbox/message-1", "household-1")
+
+        assert (first['meals_found'], first['meals_created'], first['duplicate']) == (2, 2, False)
+        assert (second['meals_found'], second['meals_created'], second['duplicate']) == (2, 0, True)
+        week_of = first['meals'][0]['week_of']
+        assert len(ingestor.meal_service.get_meals("household-1", week_of)) == 2
+
+    def test_duplicate_email_costs_one_read_and_no_writes(self, tmp_path):
+        """Test a repeat delivery (different transfer encoding, same content) only reads its receipt"""
+        (tmp_path / "first").write_bytes(build_email('quoted-printable'))
+        (tmp_path / "again").write_bytes(build_email('base64'))
+        ingestor = EmailIngestor(source=LocalEmailSource(str(tmp_path)), meal_service=MealService())
+        ingestor.ingest("first", "household-1")
+
+        meal_repo = ingestor.meal_service.meal_repo
+        meal_repo.table = Mock(wraps=meal_repo.table)
+        meal_repo.engine = Mock(wraps=meal_repo.engine)
+        result = ingestor.ingest("again", "household-1")
+
+        assert result['duplicate'] is True
+        assert meal_repo.table.get_item.call_count == 1
+        assert not meal_repo.table.put_item.called
+        assert not meal_repo.table.update_item.called
+        assert not meal_repo.engine.transact_write_items.called
+        assert EmailIngestor.dedupe_info()['duplicate_emails'] == 1
+
+    def test_shipment_update_only_adds_new_meals(self, tmp_path):
+        """Test meals repeated by a different email are counted as duplicates, not written"""
+        (tmp_path / "order").write_bytes(build_email('base64'))
+        update = HTML.replace("Crème Fraîche Trout", "Crème Fraîche Trout</a>"
+                              '<a href="https://click.e.homechef.com/?qs=4" '
+                              'style="color:#4a4a4a; font-weight:bold">Steak Frites')
+        (tmp_path / "update").write_bytes(
+            b'Content-Type: text/html; charset="utf-8"\r\n\r\n' + update.encode('utf-8')
+        )
+        ingestor = EmailIngestor(source=LocalEmailSource(str(tmp_path)), meal_service=MealService())
+
+        ingestor.ingest("order", "household-1")
+        result = ingestor.ingest("update", "household-1")
+
+        assert (result['duplicate'], result['meals_found'], result['meals_created']) == (False, 3, 1)
+        info = EmailIngestor.dedupe_info()
+        assert (info['emails'], info['duplicate_emails'], info['duplicate_meals']) == (2, 0, 2)
+
+    def test_email_keys_from_ses_and_s3_events(self, monkeypatch):
+        """Test both event shapes resolve to stored object keys"""
+        monkeypatch.setenv('EMAIL_PREFIX', 'inbound/')
+        event = {'Records': [
+            {'eventSource': 'aws:ses', 'ses': {'mail': {'messageId': 'abc123'}}},
+            {'s3': {'bucket': {'name': 'emails'}, 'object': {'key': 'inbound/with+space'}}}
+        ]}
+
+        assert list(email_keys(event)) == [(None, 'inbound/abc123'), ('emails', 'inbound/with space')]
@@ -0,0 +1,117 @@
+import asyncio
+import sys
+import os
+import threading
+
+# Add the src directory to the path so we can import modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src', 'kitchen_tracker'))
+
+from app import replay_changes
+from dal.engines import create_engine, set_engine
+from models.change_entry import ChangeEntry
+from services.kitchen_service import KitchenService
+from services.event_broker import InMemoryEventBroker, create_event_broker, event_from_change, format_sse
+
+class TestEventBroker:
+    """Unit tests for the in-process household event broker"""
+
+    def setup_method(self):
+        self.broker = InMemoryEventBroker(max_pending=2)
+        self.household_id = "test-household-123"
+
+    def make_event(self, entity_id="act-1", operation='upsert'):
+        """Helper to build an event from a change entry"""
+        return event_from_change(ChangeEntry(self.household_id, 'activity', entity_id, operation))
+
+    def test_publish_reaches_household_subscribers_only(self):
+        """Test events fan out to every subscriber of the same household"""
+        async def scenario():
+            first = self.broker.subscribe(self.household_id)
+            second = self.broker.subscribe(self.household_id)
+            other = self.broker.subscribe("other-household")
+
+            self.broker.publish(self.household_id, self.make_event())
+
+            return (await first.get(timeout=1), await second.get(timeout=1), await other.get(timeout=0.05))
+
+        first_event, second_event, other_event = asyncio.run(scenario())
+
+        assert first_event['entity_id'] == "act-1"
+        assert second_event['entity_id'] == "act-1"
+        assert other_event is None
+
+    def test_publish_from_worker_thread(self):
+        """Test sync service code running off the loop can publish"""
+        async def scenario():
+            subscription = self.broker.subscribe(self.household_id)
+            thread = threading.Thread(target=self.broker.publish, args=(self.household_id, self.make_event()))
+            thread.start()
+            thread.join()
+            return await subscription.get(timeout=1)
+
+        assert asyncio.run(scenario())['type'] == "activity.upsert"
+
+    def test_slow_subscriber_drops_oldest(self):
+        """Test a full queue keeps the newest events"""
+        async def scenario():
+            subscription = self.broker.subscribe(self.household_id)
+            for entity_id in ["a", "b", "c"]:
+                self.broker.publish(self.household_id, self.make_event(entity_id))
+            await asyncio.sleep(0)
+            events = [await subscription.get(timeout=1), await subscription.get(timeout=1)]
+            return subscription, events
+
+        subscription, events = asyncio.run(scenario())
+
+        assert [e['entity_id'] for e in events] == ["b", "c"]
+        assert subscription.dropped == 1
+
+    def test_close_unsubscribes(self):
+        """Test closed subscriptions are forgotten"""
+        async def scenario():
+            subscription = self.broker.subscribe(self.household_id)
+            subscription.close()
+
+        asyncio.run(scenario())
+
+        assert self.broker.subscriber_count(self.household_id) == 0
+
+    def test_format_sse_frame(self):
+        """Test the SSE frame carries the change token as its id"""
+        event = self.make_event(operation='delete')
+
+        frame = format_sse(event)
+
+        assert frame.startswith(f"id: {event['id']}\nevent: activity.delete\ndata: ")
+        assert frame.endswith("\n\n")
+
+    def test_create_event_broker_from_path(self):
+        """Test a broker class can be plugged in by dotted path"""
+        broker = create_event_broker("services.event_broker:InMemoryEventBroker")
+
+        assert isinstance(broker, InMemoryEventBroker)
+
+class TestEventReplay:
+    """Test the Last-Event-ID replay behind /events"""
+
+    def setup_method(self):
+        set_engine(create_engine('memory'))
+        self.service = KitchenService()
+        self.household_id = "test-household-123"
+
+    def teardown_method(self):
+        set_engine(None)
+
+    def test_replay_reads_every_page(self):
+        """Test replay carries on past the first page of the change log"""
+        members = [self.service.create_family_member(name, "person", self.household_id)
+                   for name in ("Alice", "Bob", "Cara", "Dan", "Eve")]
+        first = self.service.change_log_repo.get_changes_since(self.household_id, limit=1)[0][0]
+
+        async def scenario():
+            return [change async for change in
+                    replay_changes(self.service.change_log_repo, self.household_id, first.change_key, page_size=2)]
+
+        replayed = asyncio.run(scenario())
+
+        assert [change.entity_id for change in replayed] == [m.member_id for m in members[1:]]
@@ -0,0 +1,190 @@
+import sys
+import os
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+# Add the src directory to the path so we can import modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src', 'kitchen_tracker'))
+
+from boto3.dynamodb.types import TypeSerializer
+
+from dal.engines import create_engine, set_engine
+from models.household_digest import dashboard_from_statuses
+from services.change_stream import create_change_stream, entries_from_stream_event
+from services.kitchen_service import KitchenService
+from utils.timezone_utils import get_local_date
+
+TODAY = get_local_date()
+
+
+class TestHouseholdDigest:
+    """Dashboard and summary served from the stored digest on the in-memory engine"""
+
+    def setup_method(self):
+        """Use the in-memory storage engine"""
+        set_engine(create_engine('memory'))
+        self.service = KitchenService()
+        self.member = self.service.create_family_member("Lucy", "pet", "household-1", pet_type="dog")
+        self.pill = self.service.create_activity("Heartworm Pill", self.member.member_id, "daily", "household-1")
+        self.bath = self.service.create_activity("Bath", self.member.member_id, "weekly", "household-1",
+                                                 frequency_config={'day_of_week': TODAY.weekday()})
+
+    def teardown_method(self):
+        set_engine(None)
+
+    def live_dashboard(self):
+        return dashboard_from_statuses("household-1", TODAY.isoformat(),
+                                       self.service.get_activities_with_status("household-1"))
+
+    def test_first_read_builds_and_stores_digest(self):
+        """Test a read without a digest builds one that later reads reuse"""
+        dashboard = self.service.get_dashboard_data("household-1")
+        stored = self.service.digest_repo.get_digest("household-1")
+
+        assert dashboard['summary']['due_today'] == 2
+        assert stored.dashboard == dashboard
+        assert self.service.get_household_digest("household-1").built_at == stored.built_at
+
+    def test_completion_is_patched_in_without_rebuilding(self):
+        """Test a completion after the build moves only that activity and advances the stored token"""
+        built = self.service.build_household_digest("household-1")
+        self.service.complete_activity(self.pill.activity_id)
+
+        dashboard = self.service.get_dashboard_data("household-1")
+
+        stored = self.service.digest_repo.get_digest("household-1")
+        assert [a['name'] for a in dashboard['completed_today']] == ["Heartworm Pill"]
+        assert [a['name'] for a in dashboard['due_today']] == ["Bath"]
+        assert stored.built_at == built.built_at
+        assert stored.change_token == self.service.change_log_repo.get_latest_token("household-1")
+
+    def test_patched_digest_matches_live_dashboard(self):
+        """Test completions, undos, new and deleted activities patch to the same result as a rebuild"""
+        self.service.build_household_digest("household-1")
+        walk = self.service.create_activity("Walk", self.member.member_id, "daily", "household-1")
+        self.service.complete_activity(walk.activity_id)
+        self.service.complete_activity(self.bath.activity_id)
+        self.service.undo_activity_completion(self.bath.activity_id)
+        self.service.complete_activity(self.pill.activity_id)
+        self.service.delete_activity(self.pill.activity_id)
+
+        assert self.service.get_dashboard_data("household-1") == self.live_dashboard()
+        assert self.service.get_household_summary("household-1")['activities'] == {'total': 2, 'active': 2}
+
+    def test_member_change_rebuilds(self):
+        """Test member changes, which the patch cannot apply, rebuild the digest"""
+        self.service.build_household_digest("household-1")
+        self.service.create_family_member("Max", "person", "household-1")
+
+        summary = self.service.get_household_summary("household-1")
+
+        assert summary['family_members'] == {'total': 2, 'people': 1, 'pets': 1}
+
+    def test_yesterdays_digest_is_rebuilt(self):
+        """Test a digest from another day is never served"""
+        digest = self.service.build_household_digest("household-1")
+        digest.digest_date = (TODAY - timedelta(days=1)).isoformat()
+        self.service.digest_repo.put_digest(digest)
+
+        assert self.service.get_household_digest("household-1").digest_date == TODAY.isoformat()
+
+    def test_digest_is_dated_in_household_timezone(self):
+        """Test an evening read, already the next day in UTC, serves the household's day"""
+        class EveningInNewYork(datetime):
+            @classmethod
+            def now(cls, tz=None):
+                return datetime(2026, 3, 15, 2, 0, tzinfo=timezone.utc).astimezone(tz)
+
+        with patch('utils.timezone_utils.datetime', EveningInNewYork):
+            built = self.service.build_household_digest("household-1")
+            served = self.service.get_household_digest("household-1")
+
+        assert built.digest_date == built.dashboard['date'] == "2026-03-14"
+        assert served.built_at == built.built_at
+
+    def test_stale_projector_write_is_rejected(self):
+        """Test a view written back over an older version than the stored one fails"""
+        digest = self.service.build_household_digest("household-1")
+        self.service.complete_activity(self.pill.activity_id)
+
+        assert self.service.digest_repo.get_digest("household-1").version == digest.version + 1
+        assert not self.service.digest_repo.put_digest(digest, expected_version=digest.version)
+
+    def test_job_builds_each_household_once_a_day(self, capsys):
+        """Test the nightly job skips households that already have today's digest"""
+        from jobs.build_household_digests import main
+        self.service.create_family_member("Max", "person", "household-2")
+
+        main([])
+        main([])
+
+        output = capsys.readouterr().out
+        assert '"built": 2' in output
+        assert '"skipped": 2' in output
+
+
+class TestDashboardProjector:
+    """The materialized dashboard kept current from the change stream"""
+
+    def setup_method(self):
+        """Use the in-memory storage engine, with projection from a stream delivered by hand"""
+        set_engine(create_engine('memory'))
+        self.service = KitchenService(change_stream=create_change_stream('dynamodb'))
+        self.member = self.service.create_family_member("Lucy", "pet", "household-1", pet_type="dog")
+        self.pill = self.service.create_activity("Heartworm Pill", self.member.member_id, "daily", "household-1")
+        self.service.build_household_digest("household-1")
+
+    def teardown_method(self):
+        set_engine(None)
+
+    def stream_event(self):
+        """DynamoDB Streams event for every change-log item, as the ChangeLog table stream would send"""
+        items = self.service.change_log_repo.table.query(
+            KeyConditionExpression='household_id = :h', ExpressionAttributeValues={':h': "household-1"})['Items']
+        serializer = TypeSerializer()
+        return {'Records': [
+            {'eventName': 'INSERT', 'dynamodb': {'NewImage': {k: serializer.serialize(v) for k, v in item.items()}}}
+            for item in items
+        ]}
+
+    def test_read_is_a_single_get(self, monkeypatch):
+        """Test serving the view reads neither the change log nor any entity"""
+        self.service.get_dashboard_data("household-1")
+        monkeypatch.setattr(self.service.change_log_repo, 'get_changes_since', None)
+        monkeypatch.setattr(self.service, 'get_activities_with_status', None)
+
+        assert self.service.get_dashboard_data("household-1")['summary']['total_activities'] == 1
+
+    def test_stream_records_are_projected(self):
+        """Test stream delivery, including redelivered records, brings the view up to date"""
+        self.service.complete_activity(self.pill.activity_id)
+        assert self.service.get_dashboard_data("household-1")['summary']['completed_today'] == 0
+
+        entries = entries_from_stream_event(self.stream_event())
+        self.service.change_stream.deliver(entries)
+        self.service.change_stream.deliver(entries)
+
+        assert self.service.get_dashboard_data("household-1")['summary']['completed_today'] == 1
+        assert self.service.projector.check("household-1")['consistent']
+
+    def test_checker_reports_and_replay_repairs(self):
+        """Test the checker finds changes the projector missed and a replay applies them"""
+        walk = self.service.create_activity("Walk", self.member.member_id, "daily", "household-1")
+        self.service.complete_activity(walk.activity_id)
+
+        report = self.service.projector.check("household-1")
+        result = self.service.projector.replay("household-1")
+
+        assert not report['consistent']
+        assert any(d.startswith("completed_today") for d in report['differences'])
+        assert result['entries'] == 4
+        assert self.service.projector.check("household-1") == {
+            'household_id': "household-1", 'consistent': True, 'differences': []}
+
+    def test_check_job_repairs(self, capsys):
+        """Test the check job exits non-zero for a stale view and rebuilds it with --repair"""
+        from jobs.check_dashboard_view import main
+        self.service.complete_activity(self.pill.activity_id)
+
+        assert main(['--household-id', "household-1", '--repair']) == 1
+        assert main(['--household-id', "household-1"]) == 0
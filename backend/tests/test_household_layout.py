@@ -0,0 +1,215 @@
+import sys
+import os
+from datetime import date
+from unittest.mock import Mock, patch
+
+# Add the src directory to the path so we can import modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src', 'kitchen_tracker'))
+
+from dal.engines import create_engine, set_engine
+from dal.household_repository import HouseholdRepository
+from dal.meal_repository import MealRepository
+from jobs.migrate_single_table import Checkpoint, SingleTableMigration, meal_from_item
+from models.activity_completion import ActivityCompletion
+from models.family_member import FamilyMember
+from models.meal import Meal, MealRecord
+from models.recurring_activity import RecurringActivity
+from services.kitchen_service import KitchenService
+from services.meal_service import MealService
+
+class TestHouseholdRepository:
+    """Unit tests for the single-table household layout"""
+
+    def setup_method(self):
+        """Set up a repository over a mocked table"""
+        with patch('dal.household_repository.BaseRepository.__init__', return_value=None):
+            self.repo = HouseholdRepository()
+        self.repo.table_name = 'HouseholdData'
+        self.repo.table = Mock()
+        self.household_id = "test-household-123"
+        self.member = FamilyMember("Bob", "person", self.household_id)
+        self.activity = RecurringActivity("Take Out Trash", self.member.member_id, "weekly", self.household_id)
+
+    def test_dashboard_range_covers_recent_completions_and_state(self):
+        """Test sort keys put cook history and old completions before the dashboard range"""
+        since = HouseholdRepository.COMPLETION_PREFIX + "2024-03-01"
+        old = ActivityCompletion(self.activity.activity_id, self.member.member_id, self.household_id,
+                                 completion_date="2024-02-01")
+        recent = ActivityCompletion(self.activity.activity_id, self.member.member_id, self.household_id,
+                                    completion_date="2024-03-02")
+        cooked = MealRecord("meal-1", self.household_id, cooked_date="2024-03-02")
+
+        sort_keys = {name: self.repo.to_item(entity)['sk'] for name, entity in
+                     [('old', old), ('recent', recent), ('cooked', cooked),
+                      ('member', self.member), ('activity', self.activity)]}
+
+        assert sort_keys['old'] < since and sort_keys['cooked'] < since
+        assert all(sort_keys[name] >= since for name in ('recent', 'member', 'activity'))
+        assert sort_keys['member'] < HouseholdRepository.META_SK
+
+    def test_unmigrated_household_returns_none(self):
+        """Test a partition without the META marker is not served"""
+        self.repo.table.query.return_value = {'Items': [self.repo.to_item(self.member)]}
+
+        assert self.repo.get_household(self.household_id) is None
+
+    def test_get_household_pages_and_groups(self):
+        """Test one paginated query is split into typed collections"""
+        meta = {'pk': HouseholdRepository.partition_key(self.household_id), 'sk': HouseholdRepository.META_SK}
+        self.repo.table.query.side_effect = [
+            {'Items': [self.repo.to_item(self.activity)], 'LastEvaluatedKey': {'pk': 'x', 'sk': 'y'}},
+            {'Items': [self.repo.to_item(self.member), meta]}
+        ]
+
+        household = self.repo.get_household(self.household_id, completions_since=date(2024, 3, 1))
+
+        assert [a.activity_id for a in household['activities']] == [self.activity.activity_id]
+        assert [m.member_id for m in household['members']] == [self.member.member_id]
+        assert self.repo.table.query.call_args_list[1][1]['ExclusiveStartKey'] == {'pk': 'x', 'sk': 'y'}
+
+
+class TestSingleTableService:
+    """Unit tests for KitchenService with the single-table layout switched on"""
+
+    def setup_method(self):
+        """Set up a service with mocked repositories and the layout enabled"""
+        with patch('services.kitchen_service.FamilyMemberRepository'), \
+             patch('services.kitchen_service.RecurringActivityRepository'), \
+             patch('services.kitchen_service.ActivityCompletionRepository'), \
+             patch('services.kitchen_service.ChangeLogRepository'), \
+             patch('services.kitchen_service.HouseholdRepository') as household_cls:
+            household_cls.enabled.return_value = True
+            self.service = KitchenService(event_broker=Mock())
+
+        self.household_id = "test-household-123"
+        self.member = FamilyMember("Bob", "person", self.household_id)
+        self.trash = RecurringActivity("Take Out Trash", self.member.member_id, "weekly", self.household_id, category="chore")
+        self.pills = RecurringActivity("Pills", self.member.member_id, "daily", self.household_id, category="medication")
+
+    def test_writes_are_mirrored_in_same_transaction(self):
+        """Test a completion also writes its household-table item and the activity snapshot"""
+        self.service.activity_repo.get_by_id.return_value = self.trash
+
+        completion = self.service.complete_activity(self.trash.activity_id)
+
+        items = self.service.change_log_repo.transact_write.call_args[0][0]
+        self.service.household_repo.put_op.assert_any_call(completion)
+        self.service.household_repo.put_op.assert_any_call(self.trash)
+        assert self.service.household_repo.put_op.return_value in items
+
+    def test_listing_served_from_partition(self):
+        """Test a migrated household's listing needs no per-table queries"""
+        self.service.household_repo.get_household.return_value = {
+            'members': [self.member], 'activities': [self.trash, self.pills], 'completions': [], 'meals': []
+        }
+
+        result = self.service.get_activities_with_status(self.household_id, category="chore")
+
+        assert [r['name'] for r in result] == ["Take Out Trash"]
+        assert result[0]['member_name'] == "Bob"
+        self.service.activity_repo.query_activities.assert_not_called()
+        self.service.family_repo.get_by_household_id.assert_not_called()
+
+    def test_unmigrated_household_falls_back(self):
+        """Test households without a marker still read the per-entity tables"""
+        self.service.household_repo.get_household.return_value = None
+        self.service.activity_repo.query_activities.return_value = [self.trash]
+        self.service.family_repo.get_by_household_id.return_value = [self.member]
+
+        result = self.service.get_activities_with_status(self.household_id)
+
+        assert [r['name'] for r in result] == ["Take Out Trash"]
+
+
+class TestSingleTableMeals:
+    """Test meal writes keep a migrated household's partition current"""
+
+    def setup_method(self):
+        set_engine(create_engine('memory'))
+        self.household_id = "test-household-123"
+        with patch.dict(os.environ, {'STORAGE_LAYOUT': 'single_table'}):
+            self.service = MealService()
+        self.service.household_repo.mark_migrated(self.household_id, "2024-03-01T00:00:00")
+
+    def teardown_method(self):
+        set_engine(None)
+
+    def partition_meals(self):
+        """Helper: meals as the single-table read returns them"""
+        return {m.meal_id: m for m in self.service.household_repo.get_household(self.household_id)['meals']}
+
+    def test_meal_writes_are_mirrored(self):
+        """Test set-up, imported, re-statused and cooked meals all reach the household partition"""
+        set_up = self.service.setup_meal(self.household_id, "Tacos", delivery_date="2024-03-04")
+        imported = self.service.import_meals(self.household_id, [
+            {'name': "Curry", 'delivery_date': "2024-03-04"},
+            {'name': "Salmon", 'delivery_date': "2024-03-11"}
+        ])
+        self.service.update_meal_status(self.household_id, imported[0].meal_id, "ordered")
+        record = self.service.cook_meal(self.household_id, set_up.meal_id, cooked_by="Bob")
+
+        meals = self.partition_meals()
+        assert set(meals) == {set_up.meal_id} | {m.meal_id for m in imported}
+        assert meals[set_up.meal_id].status == "cooked"
+        assert meals[imported[0].meal_id].status == "ordered"
+        assert meals[imported[1].meal_id].status == "delivered"
+        item = self.service.household_repo.table.get_item(Key={
+            'pk': HouseholdRepository.partition_key(self.household_id),
+            'sk': self.service.household_repo.to_item(record)['sk']
+        })
+        assert item['Item']['meal_id'] == set_up.meal_id
+
+    def test_missing_meal_status_is_not_mirrored(self):
+        """Test updating a meal that does not exist writes nothing"""
+        assert self.service.update_meal_status(self.household_id, "no-such-meal", "cooked") is None
+        assert self.partition_meals() == {}
+
+
+class TestSingleTableMigration:
+    """Unit tests for the resumable migration job"""
+
+    def test_meal_record_keeps_original_meal_id(self):
+        """Test meals-table records are restored to their meal before copying"""
+        record = meal_from_item({'record_type': 'meal_record', 'record_id': 'r-1', 'meal_id': 'r-1',
+                                 'original_meal_id': 'meal-1', 'household_id': 'h', 'cooked_date': '2024-03-02',
+                                 'cooked_at': '2024-03-02T18:00:00'})
+
+        assert record.meal_id == 'meal-1'
+
+    def test_finish_recopies_meals_changed_during_scan(self, tmp_path):
+        """Test a meal re-statused after the scan copied it is current once the household is finished"""
+        set_engine(create_engine('memory'))
+        try:
+            meals = MealRepository()
+            meal = meals.create_meals([Meal("Tacos", "h1", "2024-03-04", delivery_date="2024-03-04")])[0]
+            migration = SingleTableMigration(Checkpoint(str(tmp_path / "migrate.json")), meals_table=meals.table_name)
+            household = HouseholdRepository()
+            household.batch_put([meal])
+            meals.update_meal_status("h1", meal.meal_id, "cooked")
+
+            migration.finish_household("h1")
+
+            assert [m.status for m in household.get_household("h1")['meals']] == ["cooked"]
+        finally:
+            set_engine(None)
+
+    def test_finished_segments_are_skipped_on_resume(self, tmp_path):
+        """Test a re-run reads only segments the checkpoint has not finished"""
+        path = str(tmp_path / "migrate.json")
+        checkpoint = Checkpoint(path)
+        checkpoint.record_page('FamilyMembers', 0, None, {'h1'}, 3)
+        checkpoint.record_page('FamilyMembers', 1, {'member_id': 'm-9'}, {'h2'}, 2)
+
+        resumed = Checkpoint(path)
+        migration = SingleTableMigration(resumed, segments=2)
+        repos = Mock()
+        repos.household.engine.table.return_value.scan.return_value = {'Items': []}
+        migration._repos = Mock(return_value=repos)
+
+        assert migration.copy_segment('FamilyMembers', 0) == 0
+        migration.copy_segment('FamilyMembers', 1)
+
+        repos.household.engine.table.return_value.scan.assert_called_once_with(
+            Segment=1, TotalSegments=2, ExclusiveStartKey={'member_id': 'm-9'}
+        )
+        assert resumed.state['households'] == ['h1', 'h2']
@@ -0,0 +1,80 @@
+import asyncio
+import gzip
+import json
+import sys
+import os
+from datetime import date
+from decimal import Decimal
+
+# Add the src directory to the path so we can import modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src', 'kitchen_tracker'))
+
+from utils.json_response import FastJSONResponse, dumps
+from utils.compression import CompressionMiddleware, choose_encoding
+
+class TestFastJSONResponse:
+    """Unit tests for fast JSON rendering"""
+
+    def test_dumps_handles_dynamodb_and_date_values(self):
+        """Test Decimals and dates serialize like the models expect"""
+        body = dumps({'count': Decimal('3'), 'ratio': Decimal('0.5'), 'day': date(2025, 7, 21)})
+
+        assert json.loads(body) == {'count': 3, 'ratio': 0.5, 'day': '2025-07-21'}
+
+    def test_response_renders_bytes(self):
+        """Test the response body is compact JSON"""
+        response = FastJSONResponse([{'name': 'Dog Dinner', 'completed': False}])
+
+        assert json.loads(response.body) == [{'name': 'Dog Dinner', 'completed': False}]
+        assert response.media_type == 'application/json'
+
+
+class TestCompressionMiddleware:
+    """Unit tests for response compression"""
+
+    def run_app(self, body: bytes, accept_encoding: str, content_type: bytes = b'application/json',
+                more_body: bool = False):
+        """Helper to run a one-response ASGI app through the middleware"""
+        async def inner_app(scope, receive, send):
+            await send({'type': 'http.response.start', 'status': 200,
+                        'headers': [(b'content-type', content_type), (b'content-length', str(len(body)).encode())]})
+            await send({'type': 'http.response.body', 'body': body, 'more_body': more_body})
+
+        sent = []
+
+        async def send(message):
+            sent.append(message)
+
+        scope = {'type': 'http', 'headers': [(b'accept-encoding', accept_encoding.encode())]}
+        asyncio.run(CompressionMiddleware(inner_app, minimum_size=100)(scope, None, send))
+        return dict(sent[0]['headers']), sent[1]['body']
+
+    def test_choose_encoding_respects_quality(self):
+        """Test q=0 disables an encoding"""
+        assert choose_encoding("gzip;q=0, identity") == ''
+        assert choose_encoding("deflate, gzip") == 'gzip'
+        assert choose_encoding("") == ''
+
+    def test_large_body_is_gzipped(self):
+        """Test bodies over the threshold are compressed with fixed headers"""
+        body = json.dumps([{'name': f'Activity {i}'} for i in range(50)]).encode()
+
+        headers, sent_body = self.run_app(body, 'gzip')
+
+        assert headers[b'content-encoding'] == b'gzip'
+        assert int(headers[b'content-length']) == len(sent_body)
+        assert gzip.decompress(sent_body) == body
+
+    def test_small_body_is_untouched(self):
+        """Test bodies under the threshold pass through"""
+        headers, sent_body = self.run_app(b'{"ok": true}', 'gzip')
+
+        assert b'content-encoding' not in headers
+        assert sent_body == b'{"ok": true}'
+
+    def test_event_stream_is_untouched(self):
+        """Test streamed SSE responses are never buffered"""
+        headers, sent_body = self.run_app(b'x' * 500, 'gzip', b'text/event-stream', more_body=True)
+
+        assert b'content-encoding' not in headers
+        assert sent_body == b'x' * 500
@@ -2,6 +2,7 @@ import pytest
 import sys
 import os
 from unittest.mock import Mock, patch
+from boto3.dynamodb.conditions import Key
 
 # Add the src directory to the path so we can import modules
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src', 'kitchen_tracker'))
@@ -24,6 +25,8 @@ class TestMealRepository:
         self.repo.put_item = Mock(return_value=True)
         self.repo.get_item = Mock()
         self.repo.query_by_user = Mock(return_value=[])
+        self.repo.table = Mock()
+        self.repo.table.query.return_value = {'Items': []}
     
     def create_test_meal(self, name="Test Chicken Parmesan") -> Meal:
         """Helper to create a test meal"""
@@ -60,6 +63,8 @@ class TestMealRepository:
         assert call_args['item_id'] == meal.meal_id
         assert call_args['name'] == "Test Chicken Parmesan"
         assert call_args['week_of'] == "2025-07-21"
+        assert call_args['type_date'] == "meal#2025-07-21"
+        assert 'meal_cooked' not in call_args
     
     def test_get_meal_found(self):
         """Test getting a meal that exists"""
@@ -104,16 +109,17 @@ class TestMealRepository:
         meal2_data = self.create_test_meal("Meal 2").to_dict()
         meal2_data['record_type'] = 'meal'
         
-        # Mix in non-meal data
-        pet_data = {'record_type': 'pet', 'name': 'Fluffy'}
-        
-        self.repo.query_by_user.return_value = [meal1_data, pet_data, meal2_data]
+        self.repo.table.query.return_value = {'Items': [meal1_data, meal2_data]}
         
         result = self.repo.get_household_meals(self.household_id)
         
         assert len(result) == 2
         assert result[0].name == "Meal 1"
         assert result[1].name == "Meal 2"
+        # Only meals are read, through the typed index, never the whole partition
+        call_kwargs = self.repo.table.query.call_args[1]
+        assert call_kwargs['IndexName'] == 'TypeDateIndex'
+        self.repo.query_by_user.assert_not_called()
     
     def test_get_household_meals_filtered_by_week(self):
         """Test getting meals filtered by week_of"""
@@ -123,43 +129,80 @@ class TestMealRepository:
         meal1_data = meal1.to_dict()
         meal1_data['record_type'] = 'meal'
         
-        meal2 = self.create_test_meal("Week 2 Meal") 
-        meal2.week_of = "2025-07-28"
-        meal2_data = meal2.to_dict()
-        meal2_data['record_type'] = 'meal'
-        
-        self.repo.query_by_user.return_value = [meal1_data, meal2_data]
+        self.repo.table.query.return_value = {'Items': [meal1_data]}
         
         result = self.repo.get_household_meals(self.household_id, week_of="2025-07-21")
         
         assert len(result) == 1
         assert result[0].name == "Week 1 Meal"
         assert result[0].week_of == "2025-07-21"
+        # The week is part of the key condition, not a filter
+        key_condition = self.repo.table.query.call_args[1]['KeyConditionExpression']
+        assert key_condition == Key('user_id').eq(self.household_id) & Key('type_date').eq("meal#2025-07-21")
+    
+    def test_get_household_meals_follows_pagination(self):
+        """Test every page of a week query is read"""
+        meal1_data = self.create_test_meal("Meal 1").to_dict()
+        meal2_data = self.create_test_meal("Meal 2").to_dict()
+        self.repo.table.query.side_effect = [
+            {'Items': [meal1_data], 'LastEvaluatedKey': {'user_id': self.household_id, 'item_id': 'x'}},
+            {'Items': [meal2_data]}
+        ]
+        
+        result = self.repo.get_household_meals(self.household_id)
+        
+        assert [m.name for m in result] == ["Meal 1", "Meal 2"]
+        assert self.repo.table.query.call_args_list[1][1]['ExclusiveStartKey']['item_id'] == 'x'
     
     def test_update_meal_status_success(self):
-        """Test successfully updating meal status"""
+        """Test status is set with one conditional UpdateItem, without a read or re-put"""
         meal = self.create_test_meal()
         meal_data = meal.to_dict()
-        meal_data['record_type'] = 'meal'
-        
-        self.repo.get_item.return_value = meal_data
+        meal_data.update({'record_type': 'meal', 'status': 'cooked'})
+        self.repo.table.update_item.return_value = {'Attributes': meal_data}
         
         result = self.repo.update_meal_status(self.household_id, meal.meal_id, "cooked")
         
-        assert result is True
-        # Should call create_meal to update the record
-        self.repo.put_item.assert_called_once()
+        assert result.status == "cooked"
+        assert result.meal_id == meal.meal_id
+        call_kwargs = self.repo.table.update_item.call_args[1]
+        assert call_kwargs['Key'] == {'user_id': self.household_id, 'item_id': meal.meal_id}
+        assert call_kwargs['ConditionExpression'] == 'record_type = :meal'
+        assert call_kwargs['ReturnValues'] == 'ALL_NEW'
+        self.repo.get_item.assert_not_called()
+        self.repo.put_item.assert_not_called()
     
     def test_update_meal_status_meal_not_found(self):
         """Test updating status when meal doesn't exist"""
-        self.repo.get_item.return_value = None
+        from botocore.exceptions import ClientError
+        self.repo.table.update_item.side_effect = ClientError(
+            {'Error': {'Code': 'ConditionalCheckFailedException', 'Message': 'failed'}}, 'UpdateItem')
         
         result = self.repo.update_meal_status(self.household_id, "nonexistent", "cooked")
         
-        assert result is False
+        assert result is None
         # Should not try to update anything
         self.repo.put_item.assert_not_called()
     
+    def test_get_weekly_plan_collects_meal_attributes(self):
+        """Test the materialized plan item is read back as a WeeklyMealPlan"""
+        first = self.create_test_meal("First")
+        second = self.create_test_meal("Second")
+        second.created_at = "9999-01-01T00:00:00"
+        self.repo.get_item.return_value = {
+            'user_id': self.household_id, 'item_id': 'plan#2025-07-21', 'record_type': 'weekly_plan',
+            'plan_id': 'plan-1', 'household_id': self.household_id, 'week_of': '2025-07-21',
+            'created_at': '2025-07-21T00:00:00',
+            f"meal#{second.meal_id}": second.to_dict(),
+            f"meal#{first.meal_id}": first.to_dict()
+        }
+        
+        plan = self.repo.get_weekly_plan(self.household_id, "2025-07-21")
+        
+        self.repo.get_item.assert_called_once_with(self.household_id, "plan#2025-07-21")
+        assert plan.plan_id == 'plan-1'
+        assert [m.name for m in plan.meals] == ["First", "Second"]
+    
     def test_get_meals_by_week(self):
         """Test getting meals by specific week (convenience method)"""
         week_of = "2025-07-21"
@@ -190,6 +233,8 @@ class TestMealRepository:
         assert call_args['meal_id'] == meal_record.record_id  # Should use record_id as DynamoDB key
         assert call_args['cooked_by'] == "sarah"
         assert call_args['notes'] == "Added extra cheese"
+        assert call_args['type_date'] == f"meal_record#{meal_record.cooked_date}"
+        assert call_args['meal_cooked'] == f"test-meal-456#{meal_record.cooked_date}"
     
     def test_get_meal_records_all(self):
         """Test getting all meal records for household"""
@@ -201,10 +246,7 @@ class TestMealRepository:
         record2_data['record_type'] = 'meal_record'
         record2_data['original_meal_id'] = "meal-2"
         
-        # Mix in non-meal-record data
-        pet_data = {'record_type': 'pet', 'name': 'Fluffy'}
-        
-        self.repo.query_by_user.return_value = [record1_data, pet_data, record2_data]
+        self.repo.table.query.return_value = {'Items': [record1_data, record2_data]}
         
         result = self.repo.get_meal_records(self.household_id)
         
@@ -218,13 +260,23 @@ class TestMealRepository:
         record1_data['record_type'] = 'meal_record'
         record1_data['original_meal_id'] = "target-meal"
         
-        record2_data = self.create_test_meal_record("other-meal").to_dict()
-        record2_data['record_type'] = 'meal_record' 
-        record2_data['original_meal_id'] = "other-meal"
-        
-        self.repo.query_by_user.return_value = [record1_data, record2_data]
+        self.repo.table.query.return_value = {'Items': [record1_data]}
         
         result = self.repo.get_meal_records(self.household_id, meal_id="target-meal")
         
         assert len(result) == 1
-        assert result[0].meal_id == "target-meal"
\ No newline at end of file
+        assert result[0].meal_id == "target-meal"
+        assert self.repo.table.query.call_args[1]['IndexName'] == 'MealHistoryIndex'
+    
+    def test_backfill_index_keys_updates_legacy_items(self):
+        """Test items stored without GSI keys get them added"""
+        legacy = self.create_test_meal().to_dict()
+        legacy.update({'record_type': 'meal', 'user_id': self.household_id, 'item_id': legacy['meal_id']})
+        self.repo.table.scan.return_value = {'Items': [legacy]}
+        
+        next_key = self.repo.backfill_index_keys()
+        
+        assert next_key is None
+        update_kwargs = self.repo.table.update_item.call_args[1]
+        assert update_kwargs['Key'] == {'user_id': self.household_id, 'item_id': legacy['meal_id']}
+        assert update_kwargs['ExpressionAttributeValues'] == {':type_date': "meal#2025-07-21"}
\ No newline at end of file
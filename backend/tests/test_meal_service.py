@@ -0,0 +1,102 @@
+import pytest
+import sys
+import os
+from datetime import date
+from unittest.mock import patch
+
+# Add the src directory to the path so we can import modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src', 'kitchen_tracker'))
+
+from models.meal import Meal, WeeklyMealPlan
+from services.meal_service import MealService, calculate_week_of
+
+class TestCalculateWeekOf:
+    """Unit tests for delivery date to week_of mapping"""
+
+    def test_year_closest_to_today_is_used(self):
+        """Test a yearless date resolves to the nearest year"""
+        assert calculate_week_of("Thursday, July 3", today=date(2025, 7, 1)) == "2025-06-30"
+        # Early January emails about late-December deliveries stay in the old year
+        assert calculate_week_of("Tuesday, December 30", today=date(2026, 1, 2)) == "2025-12-29"
+
+    def test_explicit_formats(self):
+        """Test ISO dates and dates with a year are taken as given"""
+        assert calculate_week_of("2024-03-07") == "2024-03-04"
+        assert calculate_week_of("March 7th, 2024") == "2024-03-04"
+
+    def test_invalid_date_falls_back_to_current_week(self):
+        """Test unparseable dates map to this week's Monday"""
+        assert calculate_week_of("soon", today=date(2025, 7, 3)) == "2025-06-30"
+        assert calculate_week_of(None, today=date(2025, 7, 3)) == "2025-06-30"
+
+
+class TestMealService:
+    """Unit tests for MealService"""
+
+    def setup_method(self):
+        """Set up a service over a mocked repository"""
+        with patch('services.meal_service.MealRepository'):
+            self.service = MealService()
+        self.repo = self.service.meal_repo
+        self.household_id = "test-household-123"
+
+    def test_setup_meal_writes_meal_and_plan_together(self):
+        """Test a new meal is delivered and added to its week's plan in one transaction"""
+        meal = self.service.setup_meal(self.household_id, "Margherita Chicken", "2025-07-24",
+                                       recipe_url="https://homechef.com/r", source="home_chef_email")
+
+        assert meal.status == "delivered"
+        assert meal.week_of == "2025-07-21"
+        assert meal.source == "home_chef_email"
+        self.repo.create_meal_op.assert_called_once_with(meal)
+        self.repo.plan_meal_op.assert_called_once_with(meal)
+        self.repo.transact_write.assert_called_once_with(
+            [self.repo.create_meal_op.return_value, self.repo.plan_meal_op.return_value])
+
+    def test_week_view_reads_the_materialized_plan(self):
+        """Test a week's meals come from one plan read"""
+        meal = Meal("Tacos", self.household_id, "2025-07-21")
+        self.repo.get_weekly_plan.return_value = WeeklyMealPlan("2025-07-21", self.household_id, [meal])
+
+        assert self.service.get_meals(self.household_id, "2025-07-21") == [meal]
+        self.repo.get_meals_by_week.assert_not_called()
+
+    def test_missing_plan_is_built_from_the_week_index(self):
+        """Test weeks stored before plans existed get a plan on first read"""
+        meal = Meal("Tacos", self.household_id, "2025-07-21")
+        self.repo.get_weekly_plan.return_value = None
+        self.repo.get_meals_by_week.return_value = [meal]
+
+        plan = self.service.get_weekly_plan(self.household_id, "2025-07-21")
+
+        assert plan.meals == [meal]
+        self.repo.save_weekly_plan.assert_called_once_with(plan)
+
+    def test_update_meal_status_patches_plan(self):
+        """Test the plan entry follows a status change"""
+        meal = Meal("Tacos", self.household_id, "2025-07-21")
+        meal.status = "cooked"
+        self.repo.update_meal_status.return_value = meal
+        self.repo.set_plan_meal_status.return_value = True
+
+        assert self.service.update_meal_status(self.household_id, meal.meal_id, "cooked") is meal
+        self.repo.set_plan_meal_status.assert_called_once_with(self.household_id, "2025-07-21",
+                                                               meal.meal_id, "cooked")
+        self.repo.transact_write.assert_not_called()
+
+    def test_update_meal_status_rejects_unknown_status(self):
+        """Test invalid statuses raise ValueError before any write"""
+        with pytest.raises(ValueError):
+            self.service.update_meal_status(self.household_id, "meal-1", "eaten")
+        self.repo.update_meal_status.assert_not_called()
+
+    def test_cook_unknown_meal_still_records(self):
+        """Test cooking a meal that does not exist keeps the record"""
+        self.repo.create_meal_record.return_value = True
+        self.repo.update_meal_status.return_value = None
+
+        record = self.service.cook_meal(self.household_id, "unknown-meal", cooked_by="sarah")
+
+        assert record.meal_id == "unknown-meal"
+        self.repo.update_meal_status.assert_called_once_with(self.household_id, "unknown-meal", "cooked")
+        self.repo.set_plan_meal_status.assert_not_called()
@@ -0,0 +1,111 @@
+import sys
+import os
+from datetime import date, timedelta
+from unittest.mock import patch
+
+# Add the src directory to the path so we can import modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src', 'kitchen_tracker'))
+
+from models.activity_completion import ActivityCompletion
+from models.family_member import FamilyMember
+from models.recurring_activity import RecurringActivity
+from services.kitchen_service import KitchenService
+from utils.timezone_utils import get_local_date
+
+class TestMemberActivities:
+    """Unit tests for the batched per-member activities view and completion snapshots"""
+
+    def setup_method(self):
+        """Set up a service with mocked repositories"""
+        with patch('services.kitchen_service.FamilyMemberRepository'), \
+             patch('services.kitchen_service.RecurringActivityRepository'), \
+             patch('services.kitchen_service.ActivityCompletionRepository'), \
+             patch('services.kitchen_service.ChangeLogRepository'):
+            self.service = KitchenService()
+
+        self.household_id = "test-household-123"
+        self.member = FamilyMember("Lucy", "pet", self.household_id, pet_type="dog")
+        self.service.family_repo.get_by_id.return_value = self.member
+
+    def create_activity(self, name: str, completed_on: date = None) -> RecurringActivity:
+        """Helper to create an activity carrying its latest-completion snapshot"""
+        activity = RecurringActivity(name, self.member.member_id, "daily", self.household_id)
+        if completed_on:
+            activity.last_completion = ActivityCompletion(
+                activity.activity_id, self.member.member_id, self.household_id,
+                completion_date=completed_on.isoformat()
+            ).to_dict()
+        return activity
+
+    def test_round_trips_constant_in_activity_count(self):
+        """Test one member read and one activity query, no per-activity lookups"""
+        activities = [self.create_activity(f"Chore {i}", get_local_date() if i % 2 else None) for i in range(25)]
+        self.service.activity_repo.get_by_member_id.return_value = activities
+
+        result = self.service.get_member_activities_with_status(self.member.member_id)
+
+        assert len(result) == 25
+        assert sum(r['completed'] for r in result) == 12
+        self.service.family_repo.get_by_id.assert_called_once_with(self.member.member_id)
+        self.service.activity_repo.get_by_member_id.assert_called_once_with(self.member.member_id, self.household_id)
+        self.service.activity_repo.get_by_id.assert_not_called()
+        self.service.completion_repo.get_latest_completion_for_activity.assert_not_called()
+        assert 'last_completion' not in result[0]
+
+    def test_unknown_member_returns_none(self):
+        """Test a missing member is reported rather than an empty list"""
+        self.service.family_repo.get_by_id.return_value = None
+
+        assert self.service.get_member_activities_with_status("nope") is None
+
+    def test_legacy_activity_falls_back_and_backfills(self):
+        """Test items stored before snapshots existed query once and store the snapshot"""
+        legacy = RecurringActivity.from_dict(
+            {k: v for k, v in self.create_activity("Old Chore").to_dict().items() if k != 'last_completion'}
+        )
+        latest = ActivityCompletion(legacy.activity_id, self.member.member_id, self.household_id)
+        self.service.activity_repo.get_by_member_id.return_value = [legacy]
+        self.service.completion_repo.get_latest_completion_for_activity.return_value = latest
+        self.service.activity_repo.backfill_last_completion.return_value = True
+
+        result = self.service.get_member_activities_with_status(self.member.member_id)
+
+        assert result[0]['status'] == 'completed'
+        self.service.activity_repo.backfill_last_completion.assert_called_once_with(legacy.activity_id, latest.to_dict())
+        assert legacy.last_completion_known is True
+
+    def test_complete_updates_snapshot_in_same_transaction(self):
+        """Test completing writes the completion and the activity snapshot together"""
+        activity = self.create_activity("Dog Dinner", get_local_date() - timedelta(days=1))
+        self.service.activity_repo.get_by_id.return_value = activity
+
+        completion = self.service.complete_activity(activity.activity_id)
+
+        self.service.activity_repo.last_completion_op.assert_called_once()
+        assert self.service.activity_repo.last_completion_op.call_args.args == (activity.activity_id, completion.to_dict())
+        items = self.service.change_log_repo.transact_write.call_args[0][0]
+        assert self.service.activity_repo.last_completion_op.return_value in items
+
+    def test_backdated_completion_keeps_newer_snapshot(self):
+        """Test a completion older than the snapshot does not replace it"""
+        activity = self.create_activity("Dog Dinner", get_local_date())
+        self.service.activity_repo.get_by_id.return_value = activity
+
+        self.service.complete_activity(activity.activity_id, completion_date=(get_local_date() - timedelta(days=3)).isoformat())
+
+        self.service.activity_repo.last_completion_op.assert_not_called()
+
+    def test_undo_latest_restores_previous_snapshot(self):
+        """Test undoing the latest completion moves the snapshot back"""
+        activity = self.create_activity("Dog Dinner", get_local_date())
+        latest = ActivityCompletion.from_dict(activity.last_completion)
+        previous = ActivityCompletion(activity.activity_id, self.member.member_id, self.household_id,
+                                      completion_date=(get_local_date() - timedelta(days=1)).isoformat())
+        self.service.activity_repo.get_by_id.return_value = activity
+        self.service.completion_repo.get_latest_completion_for_activity.return_value = latest
+        self.service.completion_repo.get_by_activity_id.return_value = [latest, previous]
+
+        assert self.service.undo_activity_completion(activity.activity_id) is True
+
+        self.service.activity_repo.last_completion_op.assert_called_once()
+        assert self.service.activity_repo.last_completion_op.call_args.args == (activity.activity_id, previous.to_dict())
@@ -0,0 +1,59 @@
+import pytest
+import sys
+import os
+from datetime import date, timedelta
+
+# Add the src directory to the path so we can import modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src', 'kitchen_tracker'))
+
+from models.activity_completion import ActivityCompletion
+from models.family_member import FamilyMember
+from models.meal import MealRecord
+from models.recurring_activity import RecurringActivity
+
+class TestSlottedModels:
+    """Unit tests for the slotted model classes and their from_dict fast paths"""
+
+    def setup_method(self):
+        """Set up sample objects"""
+        self.household_id = "test-household-123"
+        self.member = FamilyMember("Lucy", "pet", self.household_id, pet_type="dog")
+        self.activity = RecurringActivity("Dog Dinner", self.member.member_id, "daily", self.household_id)
+
+    @pytest.mark.parametrize("obj_name", ["member", "activity"])
+    def test_no_instance_dict(self, obj_name):
+        """Test model instances carry no per-object __dict__"""
+        assert not hasattr(getattr(self, obj_name), '__dict__')
+
+    def test_completion_round_trip_keeps_dates(self):
+        """Test a stored completion loads through the fast path unchanged"""
+        completion = ActivityCompletion(self.activity.activity_id, self.member.member_id, self.household_id,
+                                        completion_date="2024-03-01", notes="half portion")
+
+        restored = ActivityCompletion.from_dict(completion.to_dict())
+
+        assert restored.to_dict() == completion.to_dict()
+        assert restored.completion_date_obj == date(2024, 3, 1)
+
+    def test_completion_date_setter_reparses(self):
+        """Test reassigning completion_date refreshes the cached date object"""
+        completion = ActivityCompletion(self.activity.activity_id, self.member.member_id, self.household_id)
+
+        completion.completion_date = (date.today() - timedelta(days=2)).isoformat()
+
+        assert completion.completion_date_obj == date.today() - timedelta(days=2)
+
+    def test_activity_fast_path_validates_frequency(self):
+        """Test the fast path still rejects an invalid stored frequency"""
+        data = self.activity.to_dict()
+        data['frequency'] = 'hourly'
+
+        with pytest.raises(ValueError):
+            RecurringActivity.from_dict(data)
+
+    def test_meal_record_cooked_date_obj(self):
+        """Test MealRecord parses cooked_date once into cooked_date_obj"""
+        record = MealRecord.from_dict({'meal_id': 'meal-1', 'household_id': self.household_id,
+                                       'cooked_date': '2024-03-02'})
+
+        assert record.cooked_date_obj == date(2024, 3, 2)
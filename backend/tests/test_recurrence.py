@@ -0,0 +1,120 @@
+import pytest
+import sys
+import os
+from datetime import date, timedelta
+
+# Add the src directory to the path so we can import modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src', 'kitchen_tracker'))
+
+from models.completion_stats import CompletionStats
+from models.recurrence import Recurrence
+from models.recurring_activity import RecurringActivity
+
+MONDAY = date(2026, 3, 2)
+
+
+def occurrences(recurrence: Recurrence, start: date, days: int) -> list:
+    return [start + timedelta(days=n) for n in range(days) if recurrence.occurs_on(start + timedelta(days=n))]
+
+
+class TestRecurrence:
+    """Unit tests for compiled recurrence rules"""
+
+    def test_every_thirty_days_from_start_date(self):
+        """Test an interval counts from start_date and next_due skips the rest of the period"""
+        rule = Recurrence.compile('daily', {'interval': 30, 'start_date': "2026-01-01"})
+
+        assert occurrences(rule, date(2026, 1, 1), 95) == [date(2026, 1, 1), date(2026, 1, 31),
+                                                           date(2026, 3, 2), date(2026, 4, 1)]
+        assert rule.next_due(date(2026, 1, 10)) == date(2026, 1, 31)
+
+    def test_several_weekdays_split_the_week_into_slots(self):
+        """Test Mon/Wed/Fri occurs three times a week, each completion covering one occurrence"""
+        rule = Recurrence.compile('weekly', {'days_of_week': [0, 2, 4]})
+
+        assert occurrences(rule, MONDAY, 7) == [MONDAY, MONDAY + timedelta(days=2), MONDAY + timedelta(days=4)]
+        assert rule.slot(MONDAY + timedelta(days=3)) == (MONDAY + timedelta(days=2), MONDAY + timedelta(days=2),
+                                                         MONDAY + timedelta(days=4))
+        assert rule.next_due(MONDAY + timedelta(days=5)) == MONDAY + timedelta(days=7)
+
+    def test_every_other_week(self):
+        """Test a weekly interval skips alternate weeks from the start_date's week"""
+        rule = Recurrence.compile('weekly', {'interval': 2, 'day_of_week': 3, 'start_date': MONDAY.isoformat()})
+
+        assert occurrences(rule, MONDAY, 28) == [MONDAY + timedelta(days=3), MONDAY + timedelta(days=17)]
+
+    def test_nth_and_last_weekday_of_month(self):
+        """Test the 2nd Tuesday and the last Friday of each month"""
+        second_tuesday = Recurrence.compile('monthly', {'nth_weekday': {'n': 2, 'weekday': 1}})
+        last_friday = Recurrence.compile('monthly', {'nth_weekday': {'n': -1, 'weekday': 4}})
+
+        assert occurrences(second_tuesday, date(2026, 1, 1), 90) == [date(2026, 1, 13), date(2026, 2, 10),
+                                                                     date(2026, 3, 10)]
+        assert occurrences(last_friday, date(2026, 1, 1), 90) == [date(2026, 1, 30), date(2026, 2, 27),
+                                                                  date(2026, 3, 27)]
+
+    def test_day_of_month_clamps_to_month_end(self):
+        """Test day 31 falls on the last day of shorter months"""
+        rule = Recurrence.compile('monthly', {'day_of_month': 31})
+
+        assert rule.next_due(date(2026, 1, 31)) == date(2026, 2, 28)
+        assert rule.next_due(date(2026, 3, 31)) == date(2026, 4, 30)
+
+    def test_rules_compile_once(self):
+        """Test equal rules share one compiled object"""
+        assert Recurrence.compile('weekly', {'days_of_week': [4, 0]}) is \
+            Recurrence.compile('weekly', {'days_of_week': [0, 4]})
+
+    @pytest.mark.parametrize('frequency, config', [
+        ('hourly', {}),
+        ('daily', {'interval': 0}),
+        ('weekly', {'days_of_week': [7]}),
+        ('monthly', {'nth_weekday': {'n': 5, 'weekday': 1}}),
+        ('monthly', {'day_of_month': 'first'}),
+    ])
+    def test_invalid_rules_raise_value_error(self, frequency, config):
+        """Test invalid frequencies and configs are rejected"""
+        with pytest.raises(ValueError):
+            Recurrence.compile(frequency, config)
+
+
+class TestRecurringActivitySchedule:
+    """Status methods of RecurringActivity evaluated through its recurrence"""
+
+    def test_twice_daily_needs_two_completions(self):
+        """Test a times_per_day rule is only completed once enough completions are counted"""
+        activity = RecurringActivity("Feed Cat", "m1", "daily", "h1", frequency_config={'times_per_day': 2})
+
+        assert activity.get_current_period_status(MONDAY, MONDAY, period_completions=1) == 'due'
+        assert activity.is_due_today(MONDAY, MONDAY, period_completions=1)
+        assert activity.get_current_period_status(MONDAY, MONDAY, period_completions=2) == 'completed'
+
+    def test_missed_weekday_is_overdue(self):
+        """Test a Mon/Wed/Fri chore last done Monday is overdue on Thursday and due Friday"""
+        activity = RecurringActivity("Vacuum", "m1", "weekly", "h1", frequency_config={'days_of_week': [0, 2, 4]})
+
+        assert activity.get_current_period_status(MONDAY, MONDAY + timedelta(days=3)) == 'overdue'
+        assert activity.get_current_period_status(MONDAY + timedelta(days=2), MONDAY + timedelta(days=4)) == 'due'
+        assert activity.get_current_period_status(MONDAY + timedelta(days=2), MONDAY + timedelta(days=3)) == \
+            'completed'
+
+    def test_replacing_config_recompiles(self):
+        """Test assigning a new frequency_config recompiles the schedule, and only then"""
+        activity = RecurringActivity("Trash", "m1", "weekly", "h1", frequency_config={'day_of_week': 2})
+        first = activity.recurrence
+
+        activity.frequency_config = {'days_of_week': [2, 5]}
+
+        assert activity.recurrence is not first
+        assert activity.recurrence is activity.recurrence
+
+    def test_streaks_count_slots(self):
+        """Test streak periods follow the rule's slots, so an every-30-days rule keeps its streak"""
+        activity = RecurringActivity("Flea Meds", "m1", "daily", "h1",
+                                     frequency_config={'interval': 30, 'start_date': "2026-01-01"})
+        days = [date(2026, 1, 1), date(2026, 2, 3), date(2026, 3, 2)]
+
+        stats = CompletionStats.from_history([(day, True) for day in days], activity.recurrence)
+
+        assert (stats.current_streak, stats.streak_period) == (3, "2026-03-02")
+        assert stats.summary(activity.recurrence, date(2026, 3, 20))['streak_unit'] == 'occurrences'
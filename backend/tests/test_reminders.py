@@ -0,0 +1,141 @@
+import sys
+import os
+from datetime import datetime, timedelta
+
+# Add the src directory to the path so we can import modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src', 'kitchen_tracker'))
+
+from dal.engines import create_engine, set_engine
+from services.kitchen_service import KitchenService
+from services.reminders import (EmailReminderSink, ReminderScheduler, WebhookReminderSink,
+                                create_reminder_sink)
+from utils.timezone_utils import get_local_date
+
+TODAY = get_local_date()
+MORNING = datetime.combine(TODAY, datetime.min.time()).replace(hour=8)
+
+
+class FailingSink(WebhookReminderSink):
+    def send(self, reminders):
+        raise ConnectionError("webhook unavailable")
+
+
+class TestReminderScheduler:
+    """Reminders sent from the next-due index on the in-memory engine"""
+
+    def setup_method(self):
+        """Use the in-memory storage engine"""
+        set_engine(create_engine('memory'))
+        self.service = KitchenService()
+        self.member = self.service.create_family_member("Lucy", "pet", "household-1", pet_type="dog")
+        self.daily = self.service.create_activity("Heartworm Pill", self.member.member_id, "daily", "household-1")
+        self.weekly = self.service.create_activity("Bath", self.member.member_id, "weekly", "household-1",
+                                                   frequency_config={'day_of_week': TODAY.weekday()})
+        self.sink = WebhookReminderSink()
+        self.scheduler = ReminderScheduler(sink=self.sink, batch_size=2)
+
+    def teardown_method(self):
+        set_engine(None)
+
+    def sent(self):
+        return [r['name'] for delivery in self.sink.deliveries for r in delivery['body']['reminders']]
+
+    def test_new_activities_are_reminded_once(self):
+        """Test a run sends what is due and an overlapping or repeated run sends nothing more"""
+        first = self.scheduler.run(MORNING)
+        second = self.scheduler.run(MORNING + timedelta(minutes=5))
+
+        assert sorted(self.sent()) == ["Bath", "Heartworm Pill"]
+        assert first == {'sent': 2, 'skipped': 0, 'dropped': 0, 'failed': 0}
+        assert second['sent'] == 0
+
+    def test_window_excludes_later_reminders(self):
+        """Test reminders due after the window stay in the index"""
+        self.service.complete_activity(self.daily.activity_id)
+        self.service.complete_activity(self.weekly.activity_id)
+
+        assert self.scheduler.run(MORNING)['sent'] == 0
+        result = self.scheduler.run(MORNING + timedelta(days=1))
+
+        assert self.sent() == ["Heartworm Pill"]
+        assert result['sent'] == 1
+
+    def test_completion_rearms_the_next_reminder(self):
+        """Test completing an activity schedules its next occurrence"""
+        self.scheduler.run(MORNING)
+        self.service.complete_activity(self.daily.activity_id)
+
+        item = self.service.activity_repo.table.get_item(Key={'activity_id': self.daily.activity_id})['Item']
+        assert item['next_due_at'] == f"{(TODAY + timedelta(days=1)).isoformat()}T08:00"
+        assert item['reminder_shard'] == self.service.activity_repo.reminder_shard(self.daily.activity_id)
+
+    def test_incomplete_activity_is_reminded_again(self):
+        """Test a sent reminder is re-armed for the next occurrence while nobody completes the activity"""
+        self.scheduler.run(MORNING)
+        later = self.scheduler.run(MORNING + timedelta(days=1))
+
+        assert sorted(self.sent()) == ["Bath", "Heartworm Pill", "Heartworm Pill"]
+        assert later['sent'] == 1
+        item = self.service.activity_repo.table.get_item(Key={'activity_id': self.weekly.activity_id})['Item']
+        assert item['next_due_at'] == f"{(TODAY + timedelta(days=7)).isoformat()}T08:00"
+
+    def test_long_overdue_activity_is_reminded_once_per_occurrence(self):
+        """Test an activity overdue for weeks is sent once, then re-armed past the run instead of per missed day"""
+        self.service.complete_activity(self.daily.activity_id,
+                                       completion_date=(TODAY - timedelta(days=40)).isoformat())
+        self.service.delete_activity(self.weekly.activity_id)
+
+        first = self.scheduler.run(MORNING)
+        second = self.scheduler.run(MORNING + timedelta(minutes=15))
+
+        assert (first['sent'], second['sent']) == (1, 0)
+        item = self.service.activity_repo.table.get_item(Key={'activity_id': self.daily.activity_id})['Item']
+        assert item['next_due_at'] == f"{(TODAY + timedelta(days=1)).isoformat()}T08:00"
+
+    def test_overlapping_run_skips_claimed_reminders(self):
+        """Test a run that read the index before another run claimed its reminders sends none of them"""
+        until = MORNING.strftime('%Y-%m-%dT%H:%M')
+        stale = list(self.scheduler.due_items(until))
+        other = ReminderScheduler(sink=WebhookReminderSink())
+
+        assert other.run(MORNING)['sent'] == 2
+        assert not any(self.scheduler.activity_repo.claim_reminder(item['activity_id'], item['next_due_at'])
+                       for item in stale)
+
+    def test_failed_batch_is_released_for_the_next_run(self):
+        """Test a sink error puts the batch back into the index"""
+        failing = ReminderScheduler(sink=FailingSink())
+
+        assert failing.run(MORNING)['failed'] == 2
+        assert self.scheduler.run(MORNING)['sent'] == 2
+
+    def test_deleted_activity_is_not_reminded(self):
+        """Test soft deleting an activity takes its reminder out of the index"""
+        self.service.delete_activity(self.weekly.activity_id)
+
+        self.scheduler.run(MORNING)
+
+        assert self.sent() == ["Heartworm Pill"]
+
+    def test_backfill_schedules_older_activities(self):
+        """Test the job arms activities stored without next_due_at"""
+        from jobs.send_reminders import main
+        self.service.activity_repo.table.update_item(
+            Key={'activity_id': self.daily.activity_id},
+            UpdateExpression='REMOVE next_due_at, reminder_shard'
+        )
+
+        main(['--backfill'])
+
+        assert [a.name for a in self.service.activity_repo.iter_unscheduled()] == []
+        assert self.scheduler.run(MORNING)['sent'] == 2
+
+    def test_email_sink_groups_by_household(self):
+        """Test the email stand-in writes one message per household in a batch"""
+        sink = create_reminder_sink('email')
+        assert isinstance(sink, EmailReminderSink)
+
+        ReminderScheduler(sink=sink).run(MORNING)
+
+        assert len(sink.outbox) == 1
+        assert sink.outbox[0]['subject'] == "2 chore(s) due"
@@ -0,0 +1,117 @@
+import pytest
+import sys
+import os
+import json
+from unittest.mock import patch
+
+# Add the src directory to the path so we can import modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src', 'kitchen_tracker'))
+
+from dal.email_source import LocalEmailSource, S3EmailSource
+from dal.engines import create_engine, set_engine
+from dal.meal_repository import MealRepository
+from jobs.reprocess_emails import Checkpoint, EmailReprocessor
+
+
+def order_email(message_id: str, delivery_date: str, names: list) -> bytes:
+    """A single-part HTML order email; tracking links differ per message like real sends"""
+    links = ''.join(
+        f'<a href="https://click.e.homechef.com/?qs={message_id}-{i}" '
+        f'style="color:#4a4a4a; font-weight:bold">{name}</a>'
+        for i, name in enumerate(names)
+    )
+    return (
+        f'Message-ID: <{message_id}@homechef.com>\r\n'
+        f'Content-Type: text/html; charset="utf-8"\r\n\r\n'
+        f'<p>Your order will arrive by end of the day on <strong>{delivery_date}</strong>.</p>{links}\r\n'
+    ).encode('utf-8')
+
+
+EMAILS = {
+    'inbound/a': order_email('a', "Thursday, July 3", ["Margherita Chicken", "Steak Frites"]),
+    # SES delivered the same notification twice
+    'inbound/b': order_email('b', "Thursday, July 3", ["Margherita Chicken", "Steak Frites"]),
+    # Shipment update repeating one meal of the order
+    'inbound/c': order_email('c', "Thursday, July 3", ["steak  frites", "Pork Chops"]),
+    'inbound/d': order_email('d', "Thursday, July 10", ["Tuscan Salmon"]),
+}
+
+
+class TestEmailReprocessor:
+    """Unit tests for the backlog reprocessing job"""
+
+    def setup_method(self):
+        """Use the in-memory storage engine"""
+        set_engine(create_engine('memory'))
+
+    def teardown_method(self):
+        set_engine(None)
+
+    def write_emails(self, directory, keys):
+        for key in keys:
+            path = directory / key
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(EMAILS[key])
+
+    def test_dedupes_emails_and_meals_across_process_pool(self, tmp_path):
+        """Test repeated emails are skipped and repeated meals written once"""
+        self.write_emails(tmp_path / "mail", EMAILS)
+        checkpoint = Checkpoint(str(tmp_path / "reprocess.json"))
+
+        result = EmailReprocessor(LocalEmailSource(str(tmp_path / "mail")), checkpoint, "household-1",
+                                  prefix="inbound/", workers=2, batch_size=3).run()
+
+        assert result['emails'] == 4
+        assert result['duplicate_emails'] == 1
+        assert result['duplicate_meals'] == 1
+        assert result['meals_created'] == 4
+        names = sorted(meal.name for meal in MealRepository().get_household_meals("household-1"))
+        assert names == ["Margherita Chicken", "Pork Chops", "Steak Frites", "Tuscan Salmon"]
+
+    def test_resumes_after_last_finished_key(self, tmp_path):
+        """Test a second run with the same checkpoint only reads emails after the saved key"""
+        mail = tmp_path / "mail"
+        path = str(tmp_path / "reprocess.json")
+        self.write_emails(mail, ['inbound/a', 'inbound/b'])
+        EmailReprocessor(LocalEmailSource(str(mail)), Checkpoint(path), "household-1", workers=1).run()
+
+        self.write_emails(mail, ['inbound/c', 'inbound/d'])
+        result = EmailReprocessor(LocalEmailSource(str(mail)), Checkpoint(path), "household-1", workers=1).run()
+
+        assert result['emails'] == 2
+        # Steak Frites was already written by the first run
+        assert result['meals_created'] == 2
+        with open(path) as f:
+            state = json.load(f)
+        assert state['last_key'] == 'inbound/d'
+        assert state['emails'] == 4
+        assert len(state['content_hashes']) == 3
+
+    def test_single_table_household_partition_gets_the_meals(self, tmp_path):
+        """Test re-ingested meals reach a migrated household's partition, not only the meals table"""
+        self.write_emails(tmp_path / "mail", ['inbound/a', 'inbound/d'])
+        with patch.dict(os.environ, {'STORAGE_LAYOUT': 'single_table'}):
+            reprocessor = EmailReprocessor(LocalEmailSource(str(tmp_path / "mail")),
+                                           Checkpoint(str(tmp_path / "reprocess.json")), "household-1", workers=1)
+        household = reprocessor.meal_service.household_repo
+        household.mark_migrated("household-1", "2024-03-01T00:00:00")
+
+        reprocessor.run()
+
+        names = sorted(meal.name for meal in household.get_household("household-1")['meals'])
+        assert names == ["Margherita Chicken", "Steak Frites", "Tuscan Salmon"]
+
+    def test_reads_from_s3_bucket(self, tmp_path):
+        """Test the job against a moto S3 bucket"""
+        moto = pytest.importorskip('moto')
+        import boto3
+        with moto.mock_aws():
+            client = boto3.client('s3', region_name='us-east-1')
+            client.create_bucket(Bucket='emails')
+            for key, raw in EMAILS.items():
+                client.put_object(Bucket='emails', Key=key, Body=raw)
+
+            result = EmailReprocessor(S3EmailSource('emails', client=client), Checkpoint(str(tmp_path / "cp.json")),
+                                      "household-1", prefix="inbound/", workers=1).run()
+
+        assert (result['emails'], result['meals_created']) == (4, 4)
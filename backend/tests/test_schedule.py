@@ -0,0 +1,98 @@
+import pytest
+import sys
+import os
+from datetime import date, timedelta
+from unittest.mock import patch
+
+# Add the src directory to the path so we can import modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src', 'kitchen_tracker'))
+
+from dal.engines import create_engine, set_engine
+from models.recurring_activity import RecurringActivity
+from models.schedule import ScheduleCache, expand_occurrences
+from services.kitchen_service import KitchenService
+from utils.timezone_utils import get_local_date
+
+TODAY = get_local_date()
+
+
+class TestExpandOccurrences:
+    """Unit tests for the heap-based occurrence expander"""
+
+    def test_merges_activities_in_date_order(self):
+        """Test occurrences of every frequency come out merged by date"""
+        daily = RecurringActivity("Pills", "m1", "daily", "h1")
+        weekly = RecurringActivity("Trash", "m1", "weekly", "h1", frequency_config={'day_of_week': 2})
+        monthly = RecurringActivity("Filter", "m1", "monthly", "h1", frequency_config={'day_of_month': 3})
+        start = date(2026, 1, 1)  # a Thursday
+
+        occurrences = list(expand_occurrences(
+            [(start, daily), (date(2026, 1, 7), weekly), (date(2026, 1, 3), monthly)], date(2026, 2, 10)))
+
+        dates = [due for due, _ in occurrences]
+        assert dates == sorted(dates)
+        assert sum(a is daily for _, a in occurrences) == 41
+        assert [due for due, a in occurrences if a is weekly] == [date(2026, 1, 7) + timedelta(weeks=n)
+                                                                 for n in range(5)]
+        assert [due for due, a in occurrences if a is monthly] == [date(2026, 1, 3), date(2026, 2, 3)]
+
+    def test_skips_activities_starting_after_window(self):
+        """Test an activity first due after the window contributes nothing"""
+        monthly = RecurringActivity("Filter", "m1", "monthly", "h1")
+
+        assert list(expand_occurrences([(date(2026, 3, 1), monthly)], date(2026, 2, 28))) == []
+
+
+class TestSchedule:
+    """Unit tests for GET /schedule in the service"""
+
+    def setup_method(self):
+        """Use the in-memory storage engine and an empty schedule cache"""
+        set_engine(create_engine('memory'))
+        ScheduleCache.clear_cache()
+        self.service = KitchenService()
+        self.member = self.service.create_family_member("Alice", "person", "household-1")
+        self.pills = self.service.create_activity("Pills", self.member.member_id, "daily", "household-1")
+
+    def teardown_method(self):
+        set_engine(None)
+
+    def test_lists_overdue_activity_today_then_each_day(self):
+        """Test an overdue activity is listed today, flagged, then daily"""
+        self.service.complete_activity(self.pills.activity_id, completion_date=(TODAY - timedelta(days=3)).isoformat())
+
+        schedule = self.service.get_schedule("household-1", days=3)
+
+        assert [o['date'] for o in schedule['occurrences']] == [(TODAY + timedelta(days=n)).isoformat()
+                                                               for n in range(3)]
+        assert [o['overdue'] for o in schedule['occurrences']] == [True, False, False]
+        assert schedule['occurrences'][0]['member_name'] == "Alice"
+
+    def test_cached_until_household_changes(self):
+        """Test repeated reads reuse the expansion and a completion drops it"""
+        with patch.object(self.service, '_expand_schedule', wraps=self.service._expand_schedule) as expand:
+            first = self.service.get_schedule("household-1", days=14)
+            assert self.service.get_schedule("household-1", days=7)['occurrences'] == first['occurrences'][:7]
+            assert expand.call_count == 1
+
+            self.service.complete_activity(self.pills.activity_id)
+            after = self.service.get_schedule("household-1", days=14)
+
+        assert expand.call_count == 2
+        assert after['occurrences'][0]['date'] == (TODAY + timedelta(days=1)).isoformat()
+        assert ScheduleCache.cache_info()['hits'] == 1
+
+    def test_write_from_another_process_is_noticed(self):
+        """Test the change-log token catches writes this process did not invalidate"""
+        self.service.get_schedule("household-1")
+        with patch.object(ScheduleCache, 'invalidate'):
+            self.service.create_activity("Walk", self.member.member_id, "daily", "household-1")
+
+        names = {o['name'] for o in self.service.get_schedule("household-1")['occurrences']}
+
+        assert names == {"Pills", "Walk"}
+
+    def test_rejects_out_of_range_window(self):
+        """Test days outside 1..90 raise ValueError"""
+        with pytest.raises(ValueError):
+            self.service.get_schedule("household-1", days=0)
@@ -0,0 +1,213 @@
+import sys
+import os
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+# Add the src directory to the path so we can import modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src', 'kitchen_tracker'))
+
+from dal.engines import create_engine, set_engine
+from services.kitchen_service import KitchenService
+from services.shared_cache import (CacheBackend, HouseholdCache, LocalCacheBackend, RedisCacheBackend,
+                                   create_cache_backend, create_household_cache)
+
+class FailingBackend(CacheBackend):
+    """A shared tier that is down"""
+
+    def get(self, key):
+        raise ConnectionError("cache unavailable")
+
+    def set(self, key, value, ttl, only_if_absent=False):
+        raise ConnectionError("cache unavailable")
+
+    def delete(self, key):
+        raise ConnectionError("cache unavailable")
+
+class TestHouseholdCache:
+    """Unit tests for the near cache and shared tier"""
+
+    def setup_method(self):
+        self.backend = LocalCacheBackend()
+        # Two instances (containers) sharing one backend
+        self.first = HouseholdCache(self.backend)
+        self.second = HouseholdCache(self.backend)
+        self.loads = 0
+
+    def load(self, value=None):
+        """Helper: a household read that counts its calls"""
+        self.loads += 1
+        return value or [{'member_id': 'm1', 'name': 'Alice'}]
+
+    def test_levels_share_one_load(self):
+        """Test a value loaded by one instance is a shared hit on another, then a near hit"""
+        assert self.first.get_or_load('household-1', 'members', 'v1', self.load) == [{'member_id': 'm1', 'name': 'Alice'}]
+        assert self.second.get_or_load('household-1', 'members', 'v1', self.load) == [{'member_id': 'm1', 'name': 'Alice'}]
+        assert self.second.get_or_load('household-1', 'members', 'v1', self.load) == [{'member_id': 'm1', 'name': 'Alice'}]
+
+        assert self.loads == 1
+        assert self.first.cache_info()['misses'] == 1
+        info = self.second.cache_info()
+        assert (info['near_hits'], info['shared_hits'], info['misses'], info['hit_ratio']) == (1, 1, 0, 1.0)
+
+    def test_new_version_loads_again(self):
+        """Test keys carry the version, so a write moves every instance on to fresh values"""
+        self.first.get_or_load('household-1', 'members', 'v1', self.load)
+        fresh = self.second.get_or_load('household-1', 'members', 'v2', lambda: self.load([{'member_id': 'm2'}]))
+
+        assert fresh == [{'member_id': 'm2'}]
+        assert self.loads == 2
+        assert self.first.get_or_load('household-1', 'members', 'v2', self.load) == [{'member_id': 'm2'}]
+
+    def test_uncacheable_value_is_not_stored(self):
+        """Test a value failing cacheable is returned but loaded again next time"""
+        for _ in range(2):
+            self.first.get_or_load('household-1', 'digest', 'v1', self.load, cacheable=lambda value: False)
+
+        assert self.loads == 2
+        assert self.backend.get(self.first.key('household-1', 'digest', 'v1')) is None
+
+    def test_concurrent_misses_load_once(self):
+        """Test instances missing the same key at once wait for one loader instead of stampeding"""
+        started = threading.Event()
+        release = threading.Event()
+
+        def slow_load():
+            self.loads += 1
+            started.set()
+            release.wait(timeout=5)
+            return {'total': 3}
+
+        results = []
+        leader = threading.Thread(target=lambda: results.append(
+            self.first.get_or_load('household-1', 'summary', 'v1', slow_load)))
+        leader.start()
+        started.wait(timeout=5)
+        followers = [threading.Thread(target=lambda cache=cache: results.append(
+            cache.get_or_load('household-1', 'summary', 'v1', slow_load))) for cache in (self.second, self.second)]
+        for follower in followers:
+            follower.start()
+        release.set()
+        for thread in [leader] + followers:
+            thread.join(timeout=5)
+
+        assert results == [{'total': 3}] * 3
+        assert self.loads == 1
+        assert self.second.cache_info()['waits'] == 2
+
+    def test_backend_errors_fall_back_to_loading(self):
+        """Test reads keep working while the shared tier is down"""
+        cache = HouseholdCache(FailingBackend())
+
+        assert cache.get_or_load('household-1', 'members', 'v1', self.load) == [{'member_id': 'm1', 'name': 'Alice'}]
+        assert self.loads == 1
+        assert cache.cache_info()['errors'] == 3  # GET, lock SET, value SET
+
+    def test_local_backend_expiry_and_nx(self):
+        """Test the local stand-in follows Redis SET NX and expiry"""
+        assert self.backend.set('lock', b'1', 10, only_if_absent=True) is True
+        assert self.backend.set('lock', b'2', 10, only_if_absent=True) is False
+        self.backend.set('short', b'1', 0)
+
+        assert self.backend.get('lock') == b'1'
+        assert self.backend.get('short') is None
+
+    def test_redis_backend_against_fakeredis(self):
+        """Test the Redis backend speaks the commands the cache relies on"""
+        fakeredis = pytest.importorskip('fakeredis')
+        cache = HouseholdCache(RedisCacheBackend(client=fakeredis.FakeRedis()))
+
+        cache.get_or_load('household-1', 'members', 'v1', self.load)
+        cache.clear_cache()
+
+        assert cache.get_or_load('household-1', 'members', 'v1', self.load) == [{'member_id': 'm1', 'name': 'Alice'}]
+        assert self.loads == 1
+        assert cache.cache_info()['shared_hits'] == 1
+
+    def test_create_from_setting(self):
+        """Test the tier is off unless configured"""
+        assert create_cache_backend('none') is None
+        assert create_household_cache('none') is None
+        assert isinstance(create_cache_backend('memory'), LocalCacheBackend)
+        assert isinstance(create_cache_backend('services.shared_cache:LocalCacheBackend'), LocalCacheBackend)
+
+class TestCachedHouseholdReads:
+    """Test the service's household reads through the shared tier"""
+
+    def setup_method(self):
+        set_engine(create_engine('memory'))
+        self.backend = LocalCacheBackend()
+        self.service = KitchenService(household_cache=HouseholdCache(self.backend))
+        # Another instance that writes nothing of its own
+        self.reader = KitchenService(household_cache=HouseholdCache(self.backend))
+        # The in-memory engine's indexes are consistent: nothing to wait for
+        self.service.GSI_SETTLE = self.reader.GSI_SETTLE = 0
+        self.household_id = "test-household-123"
+        self.member = self.service.create_family_member("Alice", "person", self.household_id)
+        self.activity = self.service.create_activity("Feed cat", self.member.member_id, "daily", self.household_id)
+
+    def teardown_method(self):
+        set_engine(None)
+
+    def test_reads_are_shared_and_follow_writes(self):
+        """Test a second instance serves cached reads and sees writes made by the first"""
+        assert self.service.get_dashboard_data(self.household_id)['summary']['due_today'] == 1
+        self.service.get_activities_with_status(self.household_id, status='due')
+
+        assert self.reader.get_dashboard_data(self.household_id)['summary']['due_today'] == 1
+        assert [a['name'] for a in self.reader.get_activities_with_status(self.household_id, status='due')] == ["Feed cat"]
+        assert self.reader.household_cache.cache_info()['misses'] == 0
+
+        self.service.complete_activity(self.activity.activity_id, completed_by=self.member.member_id)
+
+        # The reader notices another instance's write once its remembered token expires
+        with patch('services.shared_cache.time.monotonic', return_value=time.monotonic() + HouseholdCache.TOKEN_TTL):
+            dashboard = self.reader.get_dashboard_data(self.household_id)
+            assert dashboard['summary']['completed_today'] == 1
+            assert self.reader.get_activities_with_status(self.household_id, status='due') == []
+        assert dashboard == self.service.compute_dashboard(self.household_id)
+
+    def test_member_map_round_trips(self):
+        """Test cached members come back as the same FamilyMember data"""
+        expected = [m.to_dict() for m in self.service.family_repo.get_by_household_id(self.household_id)]
+
+        self.service.get_family_members(self.household_id)
+        members = self.reader.get_family_members(self.household_id)
+
+        assert [m.to_dict() for m in members] == expected
+        assert self.reader.household_cache.cache_info()['shared_hits'] == 1
+
+    def test_fresh_index_read_is_not_cached(self):
+        """Test a list loaded before the newest change settled is served but not cached under its version"""
+        self.reader.GSI_SETTLE = KitchenService.GSI_SETTLE
+        before = self.reader.family_repo.get_by_household_id(self.household_id)
+        self.service.create_family_member("Bob", "person", self.household_id)
+
+        # The index has not caught up with Bob yet
+        with patch.object(self.reader.family_repo, 'get_by_household_id', return_value=before):
+            assert [m.name for m in self.reader.get_family_members(self.household_id)] == ["Alice"]
+
+        assert sorted(m.name for m in self.reader.get_family_members(self.household_id)) == ["Alice", "Bob"]
+        assert self.reader.household_cache.cache_info()['misses'] == 2
+
+    def test_latest_token_is_remembered_briefly(self):
+        """Test repeated reads query the change log once, and own writes move the version on without a query"""
+        with patch.object(self.service.change_log_repo, 'get_latest_token',
+                          wraps=self.service.change_log_repo.get_latest_token) as latest:
+            for _ in range(3):
+                self.service.get_family_members(self.household_id)
+            self.service.create_family_member("Bob", "person", self.household_id)
+            members = self.service.get_family_members(self.household_id)
+
+        assert sorted(m.name for m in members) == ["Alice", "Bob"]
+        assert latest.call_count == 0
+        info = self.service.household_cache.cache_info()
+        assert (info['token_hits'], info['token_fetches']) == (4, 0)
+
+        with patch.object(self.reader.change_log_repo, 'get_latest_token',
+                          wraps=self.reader.change_log_repo.get_latest_token) as latest:
+            for _ in range(3):
+                self.reader.get_family_members(self.household_id)
+        assert latest.call_count == 1
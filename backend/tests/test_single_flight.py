@@ -0,0 +1,93 @@
+import asyncio
+import sys
+import os
+import threading
+
+# Add the src directory to the path so we can import modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src', 'kitchen_tracker'))
+
+from dal.engines import create_engine, set_engine
+from services.kitchen_service import KitchenService
+from services.single_flight import SingleFlight
+
+class TestSingleFlight:
+    """Unit tests for coalescing concurrent identical household reads"""
+
+    def setup_method(self):
+        self.flight = SingleFlight()
+        self.release = threading.Event()
+        self.executions = 0
+
+    def compute(self, value):
+        """Helper: a read that blocks until the test releases it"""
+        self.executions += 1
+        self.release.wait(timeout=5)
+        if isinstance(value, Exception):
+            raise value
+        return {'value': value}
+
+    def run_together(self, calls):
+        """Helper: start every (key, value) call, release them once all are waiting, gather results"""
+        async def scenario():
+            tasks = [asyncio.ensure_future(self.flight.run(key, self.compute, value)) for key, value in calls]
+            while self.flight.stats()['calls'] < len(calls):
+                await asyncio.sleep(0.01)
+            self.release.set()
+            return await asyncio.gather(*tasks, return_exceptions=True)
+        return asyncio.run(scenario())
+
+    def test_concurrent_identical_calls_share_one_computation(self):
+        """Test overlapping calls with the same key await one computation and get its result"""
+        key = ('household-1', '/dashboard', 'v1')
+        results = self.run_together([(key, 1)] * 5)
+
+        assert self.executions == 1
+        assert all(result is results[0] for result in results)
+        assert self.flight.stats() == {'calls': 5, 'executions': 1, 'coalesced': 4,
+                                       'coalesced_ratio': 0.8, 'in_flight': 0}
+
+    def test_different_keys_compute_separately(self):
+        """Test other households, routes and versions are not merged"""
+        results = self.run_together([
+            (('household-1', '/dashboard', 'v1'), 1),
+            (('household-1', '/dashboard', 'v2'), 2),
+            (('household-1', '/activities', 'v1'), 3),
+            (('household-2', '/dashboard', 'v1'), 4)
+        ])
+
+        assert [result['value'] for result in results] == [1, 2, 3, 4]
+        assert self.executions == 4
+        assert self.flight.stats()['coalesced'] == 0
+
+    def test_error_reaches_every_caller_and_is_not_kept(self):
+        """Test a failed computation raises for all callers and the next call runs again"""
+        key = ('household-1', '/dashboard', 'v1')
+        results = self.run_together([(key, ValueError("boom"))] * 3)
+
+        assert self.executions == 1
+        assert all(isinstance(result, ValueError) for result in results)
+
+        assert asyncio.run(self.flight.run(key, self.compute, 7)) == {'value': 7}
+        assert self.executions == 2
+        assert self.flight.stats()['in_flight'] == 0
+
+class TestHouseholdVersion:
+    """Test the version coalesced reads are keyed on"""
+
+    def setup_method(self):
+        set_engine(create_engine('memory'))
+        self.service = KitchenService()
+        self.household_id = "test-household-123"
+
+    def teardown_method(self):
+        set_engine(None)
+
+    def test_version_changes_with_each_write(self):
+        """Test a committed change gives the household a new version, and only that household"""
+        before = self.service.household_version(self.household_id)
+        other = self.service.household_version("other-household")
+
+        self.service.create_family_member("Alice", "person", self.household_id)
+
+        assert self.service.household_version(self.household_id) != before
+        assert self.service.household_version("other-household") == other
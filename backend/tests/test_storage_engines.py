@@ -0,0 +1,342 @@
+import sys
+import os
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from boto3.dynamodb.conditions import Attr, Key
+from botocore.exceptions import ClientError
+
+# Add the src directory to the path so we can import modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src', 'kitchen_tracker'))
+
+from dal.engines import create_engine, set_engine
+from dal.engines.schemas import TABLES
+from dal.activity_completion_repository import ActivityCompletionRepository
+from dal.change_log_repository import ChangeLogRepository
+from dal.family_member_repository import FamilyMemberRepository
+from dal.meal_repository import MealRepository
+from dal.recurring_activity_repository import RecurringActivityRepository
+from models.activity_completion import ActivityCompletion
+from models.change_entry import ChangeEntry
+from models.completion_history import CompletionHistory
+from models.completion_stats import CompletionStats
+from models.family_member import FamilyMember
+from models.meal import Meal, MealRecord
+from models.recurring_activity import RecurringActivity
+from services.meal_service import MealService
+
+
+def create_dynamodb_tables():
+    """Create every registered table in (moto's) DynamoDB"""
+    import boto3
+    client = boto3.client('dynamodb')
+    for env_var, default_name, schema in TABLES.values():
+        key_names = [k for k in schema.key if k]
+        for index in schema.indexes.values():
+            key_names += [k for k in index if k and k not in key_names]
+        definition = {
+            'TableName': os.getenv(env_var, default_name),
+            'BillingMode': 'PAY_PER_REQUEST',
+            'AttributeDefinitions': [{'AttributeName': k, 'AttributeType': 'S'} for k in key_names],
+            'KeySchema': _key_schema(schema.key)
+        }
+        if schema.indexes:
+            definition['GlobalSecondaryIndexes'] = [
+                {'IndexName': name, 'KeySchema': _key_schema(index), 'Projection': {'ProjectionType': 'ALL'}}
+                for name, index in schema.indexes.items()
+            ]
+        client.create_table(**definition)
+
+
+def _key_schema(key) -> list:
+    schema = [{'AttributeName': key.hash_key, 'KeyType': 'HASH'}]
+    if key.range_key:
+        schema.append({'AttributeName': key.range_key, 'KeyType': 'RANGE'})
+    return schema
+
+
+@pytest.fixture(params=['memory', 'sqlite', 'dynamodb'])
+def engine(request, tmp_path, monkeypatch):
+    """Each conformance test runs once per storage engine"""
+    if request.param == 'dynamodb':
+        moto = pytest.importorskip('moto')
+        monkeypatch.setenv('AWS_DEFAULT_REGION', 'us-east-1')
+        monkeypatch.setenv('AWS_ACCESS_KEY_ID', 'testing')
+        monkeypatch.setenv('AWS_SECRET_ACCESS_KEY', 'testing')
+        with moto.mock_aws():
+            create_dynamodb_tables()
+            instance = create_engine('dynamodb')
+            set_engine(instance)
+            yield instance
+    else:
+        options = {'path': str(tmp_path / 'kitchen.db')} if request.param == 'sqlite' else {}
+        instance = create_engine(request.param, **options)
+        set_engine(instance)
+        yield instance
+        if request.param == 'sqlite':
+            instance.close()
+    set_engine(None)
+
+
+class TestRepositoryConformance:
+    """The repositories behave the same on every storage engine"""
+
+    household_id = "test-household-123"
+
+    def test_member_crud_and_household_index(self, engine):
+        """Test members are created, fetched, listed by household and soft deleted"""
+        repo = FamilyMemberRepository()
+        alice = repo.create(FamilyMember("Alice", "person", self.household_id))
+        rex = repo.create(FamilyMember("Rex", "pet", self.household_id, pet_type="dog"))
+        repo.create(FamilyMember("Elsewhere", "person", "other-household"))
+
+        assert repo.get_by_id(alice.member_id).name == "Alice"
+        assert repo.get_by_id("missing") is None
+        assert {m.name for m in repo.get_by_household_id(self.household_id)} == {"Alice", "Rex"}
+
+        assert repo.soft_delete(rex.member_id)
+        assert [m.name for m in repo.get_by_household_id(self.household_id)] == ["Alice"]
+
+    def test_reminder_index_claims_once(self, engine):
+        """Test due reminders are read in order from the sparse index and claimed only once"""
+        repo = RecurringActivityRepository()
+        early = RecurringActivity("Water Plants", "member-1", "daily", self.household_id)
+        late = RecurringActivity("Feed Fish", "member-1", "daily", self.household_id)
+        later = RecurringActivity("Trash", "member-1", "weekly", self.household_id)
+        unscheduled = RecurringActivity("Vacuum", "member-1", "weekly", self.household_id)
+        repo.transact_write([repo.create_op(early, next_due_at="2026-03-01T08:00"),
+                             repo.create_op(late, next_due_at="2026-03-02T08:00"),
+                             repo.create_op(later, next_due_at="2026-03-09T08:00"),
+                             repo.create_op(unscheduled)])
+
+        due = [item for shard in repo.reminder_shards()
+               for item in repo.iter_due_reminders(shard, "2026-03-02T08:00", page_size=1)]
+
+        assert sorted(item['name'] for item in due) == ["Feed Fish", "Water Plants"]
+        assert repo.claim_reminder(early.activity_id, "2026-03-01T08:00")
+        assert not repo.claim_reminder(early.activity_id, "2026-03-01T08:00")
+        assert not repo.claim_reminder(late.activity_id, "2026-03-01T08:00")
+        assert repo.release_reminder(early.activity_id, "2026-03-01T08:00")
+        assert [a.name for a in repo.iter_unscheduled()] == ["Vacuum"]
+
+    def test_duplicate_create_raises_value_error(self, engine):
+        """Test the attribute_not_exists condition rejects a second create"""
+        repo = FamilyMemberRepository()
+        member = repo.create(FamilyMember("Alice", "person", self.household_id))
+
+        with pytest.raises(ValueError):
+            repo.create(member)
+
+    def test_activity_filters_on_household_index(self, engine):
+        """Test query_activities narrows by member and category"""
+        repo = RecurringActivityRepository()
+        repo.create(RecurringActivity("Walk", "m1", "daily", self.household_id, category="chore"))
+        repo.create(RecurringActivity("Pills", "m1", "daily", self.household_id, category="medication"))
+        repo.create(RecurringActivity("Feed", "m2", "daily", self.household_id, category="feeding"))
+
+        assert len(repo.query_activities(self.household_id)) == 3
+        assert {a.name for a in repo.query_activities(self.household_id, member_id="m1")} == {"Walk", "Pills"}
+        assert [a.name for a in repo.query_activities(self.household_id, member_id="m1",
+                                                      category="medication")] == ["Pills"]
+
+    def test_completions_by_activity_are_newest_first(self, engine):
+        """Test ActivityIndex ordering, Limit and exact date lookups"""
+        repo = ActivityCompletionRepository()
+        for day in ("2024-03-01", "2024-03-03", "2024-03-02"):
+            repo.create(ActivityCompletion("act-1", "m1", self.household_id, completion_date=day))
+        repo.create(ActivityCompletion("act-2", "m1", self.household_id, completion_date="2024-03-04"))
+
+        history = repo.get_by_activity_id("act-1")
+        assert [c.completion_date for c in history] == ["2024-03-03", "2024-03-02", "2024-03-01"]
+        assert repo.get_latest_completion_for_activity("act-1").completion_date == "2024-03-03"
+        assert repo.get_completion_for_activity_and_date("act-1", "2024-03-02") is not None
+        assert repo.get_completion_for_activity_and_date("act-1", "2024-03-05") is None
+
+    def test_household_date_range_query_pages(self, engine):
+        """Test HouseholdDateIndex range conditions with Limit and ExclusiveStartKey"""
+        repo = ActivityCompletionRepository()
+        for day in range(1, 11):
+            repo.create(ActivityCompletion(f"act-{day % 3}", "m1", self.household_id,
+                                           completion_date=f"2024-03-{day:02d}"))
+
+        dates, kwargs = [], {}
+        while True:
+            response = repo.table.query(
+                IndexName='HouseholdDateIndex',
+                KeyConditionExpression=Key('household_id').eq(self.household_id) &
+                Key('completion_date').between("2024-03-03", "2024-03-08"),
+                Limit=4,
+                **kwargs
+            )
+            dates += [item['completion_date'] for item in response['Items']]
+            if 'LastEvaluatedKey' not in response:
+                break
+            kwargs = {'ExclusiveStartKey': response['LastEvaluatedKey']}
+
+        assert dates == [f"2024-03-{day:02d}" for day in range(3, 9)]
+        items = list(repo.iter_household_range_items(self.household_id, "2024-03-03", "2024-03-08",
+                                                     activity_id="act-0", attributes=['completion_date']))
+        assert items == [{'completion_date': "2024-03-03"}, {'completion_date': "2024-03-06"}]
+
+    def test_completion_bitmaps_round_trip(self, engine):
+        """Test history bitmaps written in a stats update read back as the same days"""
+        repo = RecurringActivityRepository()
+        activity = repo.create(RecurringActivity("Walk", "m1", "daily", self.household_id))
+        history = CompletionHistory.from_days([date(2024, 2, 29), date(2024, 12, 31)])
+
+        after = CompletionStats(2, 2, 1, 1, "2024-12-31")
+        repo.transact_write([repo.stats_op(activity.activity_id, activity.stats, after, history=history.to_item())])
+
+        assert repo.get_by_id(activity.activity_id).history == history
+
+    def test_change_log_paginates_in_token_order(self, engine):
+        """Test get_changes_since returns changes after a token, oldest first"""
+        repo = ChangeLogRepository()
+        entries = [ChangeEntry(self.household_id, 'activity', f"act-{i}", 'upsert', {'n': i},
+                               changed_at=f"2024-03-01T00:00:0{i}") for i in range(5)]
+        repo.transact_write([repo.put_op(entry) for entry in entries])
+
+        changes, has_more = repo.get_changes_since(self.household_id, since=entries[1].change_key, limit=2)
+        assert [c.entity_id for c in changes] == ["act-2", "act-3"] and has_more
+
+        changes, has_more = repo.get_changes_since(self.household_id, since=changes[-1].change_key)
+        assert [c.entity_id for c in changes] == ["act-4"] and not has_more
+
+    def test_change_log_overlap_returns_late_commits(self, engine):
+        """Test a change committed after a client's token, but keyed just below it, is re-read with overlap"""
+        repo = ChangeLogRepository()
+        seen = ChangeEntry(self.household_id, 'activity', "act-1", 'upsert', {'n': 1},
+                           changed_at="2024-03-01T00:00:01.000000")
+        repo.transact_write([repo.put_op(seen)])
+        late = ChangeEntry(self.household_id, 'activity', "act-2", 'upsert', {'n': 2},
+                           changed_at="2024-03-01T00:00:00.500000")
+        later = ChangeEntry(self.household_id, 'activity', "act-3", 'upsert', {'n': 3},
+                            changed_at="2024-03-01T00:00:02.000000")
+        repo.transact_write([repo.put_op(late), repo.put_op(later)])
+
+        changes, _ = repo.get_changes_since(self.household_id, since=seen.change_key)
+        assert [c.entity_id for c in changes] == ["act-3"]
+
+        changes, has_more = repo.get_changes_since(self.household_id, since=seen.change_key, limit=1, overlap=5)
+        assert [c.entity_id for c in changes] == ["act-2", "act-1", "act-3"] and not has_more
+
+    def test_transaction_is_all_or_nothing(self, engine):
+        """Test a failed condition cancels every write in the transaction"""
+        repo = RecurringActivityRepository()
+        existing = repo.create(RecurringActivity("Walk", "m1", "daily", self.household_id))
+        fresh = RecurringActivity("Feed", "m1", "daily", self.household_id)
+
+        with pytest.raises(ValueError):
+            repo.transact_write([repo.create_op(fresh), repo.create_op(existing)])
+
+        assert repo.get_by_id(fresh.activity_id) is None
+
+        repo.transact_write([repo.create_op(fresh), repo.soft_delete_op(existing.activity_id)])
+        assert repo.get_by_id(fresh.activity_id) is not None
+        assert repo.get_by_id(existing.activity_id).is_active is False
+
+
+    def test_meal_week_and_history_queries(self, engine):
+        """Test meal lookups by week, availability and per-meal cook history"""
+        repo = MealRepository()
+        this_week = Meal("Tuscan Chicken", self.household_id, week_of="2024-03-04")
+        this_week.mark_delivered()
+        last_week = Meal("Flatbreads", self.household_id, week_of="2024-02-26")
+        for meal in (this_week, last_week, Meal("Tacos", "other-household", week_of="2024-03-04")):
+            repo.create_meal(meal)
+        for cooked_date in ("2024-03-06", "2024-03-05"):
+            repo.create_meal_record(MealRecord(this_week.meal_id, self.household_id, cooked_date=cooked_date))
+        repo.create_meal_record(MealRecord(last_week.meal_id, self.household_id, cooked_date="2024-02-28"))
+
+        assert [m.name for m in repo.get_meals_by_week(self.household_id, "2024-03-04")] == ["Tuscan Chicken"]
+        assert [m.name for m in repo.get_household_meals(self.household_id)] == ["Flatbreads", "Tuscan Chicken"]
+        available = repo.get_available_meals(self.household_id, today=date(2024, 3, 7))
+        assert [m.name for m in available] == ["Tuscan Chicken"]
+
+        history = repo.get_meal_records(self.household_id, meal_id=this_week.meal_id)
+        assert [r.cooked_date for r in history] == ["2024-03-05", "2024-03-06"]
+        assert all(r.meal_id == this_week.meal_id for r in history)
+        assert len(repo.get_meal_records(self.household_id)) == 3
+
+
+    def test_weekly_plan_follows_meal_writes(self, engine):
+        """Test the materialized plan picks up new meals and status changes"""
+        service = MealService()
+        first = service.setup_meal(self.household_id, "Tuscan Chicken", "2024-03-07")
+        second = service.setup_meal(self.household_id, "Flatbreads", "2024-03-08")
+        service.cook_meal(self.household_id, first.meal_id, cooked_by="sarah")
+
+        plan = service.meal_repo.get_weekly_plan(self.household_id, "2024-03-04")
+        assert {m.meal_id: m.status for m in plan.meals} == {first.meal_id: "cooked", second.meal_id: "delivered"}
+        assert service.get_meal(self.household_id, first.meal_id).status == "cooked"
+        assert service.update_meal_status(self.household_id, "missing", "cooked") is None
+
+
+class TestTableConformance:
+    """The boto3 Table surface the repositories rely on"""
+
+    def test_update_expressions_and_return_values(self, engine):
+        """Test SET/ADD/REMOVE, if_not_exists and ALL_NEW"""
+        table = FamilyMemberRepository().table
+        table.put_item(Item={'member_id': 'm1', 'household_id': 'h1', 'nickname': 'Al'})
+
+        response = table.update_item(
+            Key={'member_id': 'm1'},
+            UpdateExpression='SET streak = if_not_exists(streak, :zero) + :one, #n = :name '
+                             'ADD completions :one REMOVE nickname',
+            ExpressionAttributeNames={'#n': 'name'},
+            ExpressionAttributeValues={':zero': 0, ':one': 1, ':name': 'Alice'},
+            ReturnValues='ALL_NEW'
+        )
+
+        item = response['Attributes']
+        assert item['streak'] == Decimal(1) and item['completions'] == Decimal(1)
+        assert item['name'] == 'Alice' and 'nickname' not in item
+        assert table.get_item(Key={'member_id': 'm1'})['Item'] == item
+
+    def test_conditional_write_failure_code(self, engine):
+        """Test failed conditions raise ConditionalCheckFailedException and leave the item alone"""
+        table = FamilyMemberRepository().table
+        table.put_item(Item={'member_id': 'm1', 'household_id': 'h1', 'version': 2})
+
+        with pytest.raises(ClientError) as error:
+            table.update_item(Key={'member_id': 'm1'}, UpdateExpression='SET version = :v',
+                              ConditionExpression=Attr('version').eq(1), ExpressionAttributeValues={':v': 3})
+
+        assert error.value.response['Error']['Code'] == 'ConditionalCheckFailedException'
+        assert table.get_item(Key={'member_id': 'm1'})['Item']['version'] == Decimal(2)
+
+    def test_scan_segments_partition_the_table(self, engine):
+        """Test parallel scan segments cover each item exactly once"""
+        table = FamilyMemberRepository().table
+        with table.batch_writer() as batch:
+            for i in range(40):
+                batch.put_item(Item={'member_id': f"m{i}", 'household_id': 'h1'})
+
+        seen = []
+        for segment in range(4):
+            response = table.scan(Segment=segment, TotalSegments=4)
+            seen += [item['member_id'] for item in response['Items']]
+
+        assert sorted(seen) == sorted(f"m{i}" for i in range(40))
+
+    def test_filtered_query_limit_counts_evaluated_items(self, engine):
+        """Test Limit applies before FilterExpression, as in DynamoDB"""
+        table = FamilyMemberRepository().table
+        for i in range(6):
+            table.put_item(Item={'member_id': f"m{i}", 'household_id': 'h1', 'is_active': i % 2 == 0})
+
+        response = table.query(IndexName='HouseholdIndex', KeyConditionExpression=Key('household_id').eq('h1'),
+                               FilterExpression=Attr('is_active').eq(True), Limit=4)
+
+        assert response['ScannedCount'] == 4
+        assert response['Count'] == len(response['Items']) == 2
+        assert 'LastEvaluatedKey' in response
+
+    def test_floats_are_rejected(self, engine):
+        """Test float attributes fail the same way boto3 does"""
+        table = FamilyMemberRepository().table
+
+        with pytest.raises(TypeError):
+            table.put_item(Item={'member_id': 'm1', 'household_id': 'h1', 'weight': 1.5})
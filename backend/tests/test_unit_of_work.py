@@ -0,0 +1,93 @@
+import pytest
+import sys
+import os
+from unittest.mock import Mock, patch
+
+# Add the src directory to the path so we can import modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src', 'kitchen_tracker'))
+
+from models.family_member import FamilyMember
+from models.recurring_activity import RecurringActivity
+from services.kitchen_service import KitchenService
+from services.unit_of_work import UnitOfWork
+
+class TestUnitOfWork:
+    """Unit tests for the request-scoped identity map and write buffer"""
+
+    def setup_method(self):
+        """Set up a service with mocked repositories"""
+        with patch('services.kitchen_service.FamilyMemberRepository'), \
+             patch('services.kitchen_service.RecurringActivityRepository'), \
+             patch('services.kitchen_service.ActivityCompletionRepository'), \
+             patch('services.kitchen_service.ChangeLogRepository'):
+            self.service = KitchenService(event_broker=Mock())
+
+        self.household_id = "test-household-123"
+        self.member = FamilyMember("Bob", "person", self.household_id)
+        self.activity = RecurringActivity("Take Out Trash", self.member.member_id, "weekly", self.household_id)
+        self.service.family_repo.get_by_id.return_value = self.member
+        self.service.activity_repo.get_by_id.return_value = self.activity
+        self.service.activity_repo.update_op.side_effect = lambda a, next_due_at=None: {
+            'Update': {'TableName': 'RecurringActivities', 'Key': {'activity_id': a.activity_id}}
+        }
+        self.service.change_log_repo.put_op.side_effect = lambda c: {'Put': {'TableName': 'ChangeLog', 'Item': c.to_dict()}}
+
+    def test_update_flow_reads_each_key_once(self):
+        """Test the PUT /activities path: lookup, update, status - one read per key, one transaction"""
+        with self.service.unit_of_work() as uow:
+            activity = self.service.get_activity(self.activity.activity_id)
+            activity.name = "Trash and Recycling"
+            self.service.update_activity(activity)
+            status = self.service.get_activity_status(activity.activity_id)
+
+            self.service.change_log_repo.transact_write.assert_not_called()
+
+        assert status.to_dict()['name'] == "Trash and Recycling"
+        self.service.activity_repo.get_by_id.assert_called_once_with(self.activity.activity_id)
+        self.service.family_repo.get_by_id.assert_called_once_with(self.member.member_id)
+        self.service.change_log_repo.transact_write.assert_called_once()
+        assert uow.read_hits == 1
+
+    def test_missing_entity_is_remembered(self):
+        """Test a key that does not exist is not re-read"""
+        self.service.activity_repo.get_by_id.return_value = None
+
+        with self.service.unit_of_work():
+            assert self.service.get_activity("nope") is None
+            assert self.service.get_activity("nope") is None
+
+        self.service.activity_repo.get_by_id.assert_called_once()
+
+    def test_exception_discards_buffered_writes(self):
+        """Test a failing request writes nothing"""
+        with pytest.raises(RuntimeError):
+            with self.service.unit_of_work():
+                self.service.update_activity(self.activity)
+                raise RuntimeError("boom")
+
+        self.service.change_log_repo.transact_write.assert_not_called()
+        self.service.event_broker.publish.assert_not_called()
+
+    def test_same_item_twice_flushes_first(self):
+        """Test a second write to a pending item starts a new transaction"""
+        with self.service.unit_of_work():
+            self.service.update_activity(self.activity)
+            self.service.update_activity(self.activity)
+
+        assert self.service.change_log_repo.transact_write.call_count == 2
+
+    def test_without_unit_of_work_writes_immediately(self):
+        """Test behavior outside a request scope is unchanged"""
+        self.service.update_activity(self.activity)
+        self.service.get_activity(self.activity.activity_id)
+        self.service.get_activity(self.activity.activity_id)
+
+        self.service.change_log_repo.transact_write.assert_called_once()
+        assert self.service.activity_repo.get_by_id.call_count == 2
+
+    def test_transaction_size_limit(self):
+        """Test buffered writes never exceed the transaction item limit"""
+        uow = UnitOfWork()
+        uow.add([{'Put': {'TableName': 'T', 'Item': {'id': str(i)}}} for i in range(50)], [object()] * 49)
+
+        assert uow.must_flush_before([{'Put': {'TableName': 'T', 'Item': {'id': 'x'}}}], [object()]) is True